@@ -0,0 +1,342 @@
+"""
+BIIS Desk Booking System - Occupancy Analytics
+Author: [Your Name]
+Date: [Date]
+Description: Vectorised occupancy analytics over the full booking history
+
+DESIGN:
+- Bookings are loaded once into a columnar DataFrame
+- Room, user and booking type columns are categorical (small integer codes)
+- Every metric is a groupby/aggregate - no per-booking Python loops
+- No Streamlit import at module level: usable from the UI, scripts and
+  batch jobs alike; get_session_frame() imports it lazily
+- The UI reuses the session's frame until the booking counters' version or
+  the usernames change
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. DATAFRAME CONSTRUCTION
+3. OCCUPANCY METRICS
+4. USER METRICS
+5. SESSION CACHE
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+from datetime import date
+from typing import Dict, Any, Optional, Iterable
+
+import numpy as np
+import pandas as pd
+
+from booking_core.rules import ROOM_LAYOUT, BOOKING_TYPES, BOOKING_TYPE_WEIGHTS, DELETED_USER_ID
+from booking_core.slots import occupants
+
+FRAME_COLUMNS = ['date', 'room', 'desk_num', 'user_id', 'username', 'booking_type', 'archived']
+
+
+# ============================================================================
+# 2. DATAFRAME CONSTRUCTION
+# ============================================================================
+
+def bookings_to_frame(bookings: Dict[str, Any], users: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Load desk bookings into a columnar DataFrame with categorical columns.
+
+    Archived bookings (DELETED_USER_ID) keep their original user id and
+    archived username so attendance history survives user deletion.
+
+    Args:
+        bookings: Booking data dictionary
+        users: User data dictionary
+
+    Returns:
+        DataFrame with one row per desk booking occupant (two for a shared desk)
+    """
+    dates, rooms, desks, user_ids, booking_types, archived = [], [], [], [], [], []
+    archived_names = {}
+
+    # Single pass to split records into columns - everything after is vectorised
+    for entry in bookings.values():
+        if entry.get('entry_type', 'desk_booking') != 'desk_booking':
+            continue
+        for booking in occupants(entry):
+            user_id = booking.get('user_id')
+            is_archived = user_id == DELETED_USER_ID
+            if is_archived:
+                user_id = booking.get('original_user_id', DELETED_USER_ID)
+                archived_names[user_id] = booking.get('archived_username', 'Deleted User')
+
+            dates.append(booking.get('date'))
+            rooms.append(booking.get('room'))
+            desks.append(booking.get('desk_num', 0))
+            user_ids.append(user_id)
+            booking_types.append(booking.get('booking_type', 'full_day'))
+            archived.append(is_archived)
+
+    if not dates:
+        return _empty_frame()
+
+    df = pd.DataFrame({
+        'date': pd.to_datetime(pd.Series(dates, dtype='string'), format='%Y-%m-%d', errors='coerce'),
+        'room': pd.Categorical(rooms, categories=list(ROOM_LAYOUT)),
+        'desk_num': np.asarray(desks, dtype=np.int16),
+        'user_id': pd.Categorical(user_ids),
+        'booking_type': pd.Categorical(booking_types, categories=list(BOOKING_TYPES)),
+        'archived': np.asarray(archived, dtype=bool)
+    })
+
+    # Map usernames per category instead of per row
+    names = {
+        user_id: users.get(user_id, {}).get('username', archived_names.get(user_id, 'Unknown User'))
+        for user_id in df['user_id'].cat.categories
+    }
+    df['username'] = df['user_id'].map(names).astype('category')
+
+    return df.dropna(subset=['date'])[FRAME_COLUMNS]
+
+
+def _empty_frame() -> pd.DataFrame:
+    """Return an empty booking frame with the expected dtypes"""
+    return pd.DataFrame({
+        'date': pd.Series([], dtype='datetime64[ns]'),
+        'room': pd.Categorical([], categories=list(ROOM_LAYOUT)),
+        'desk_num': pd.Series([], dtype=np.int16),
+        'user_id': pd.Categorical([]),
+        'username': pd.Categorical([]),
+        'booking_type': pd.Categorical([], categories=list(BOOKING_TYPES)),
+        'archived': pd.Series([], dtype=bool)
+    })[FRAME_COLUMNS]
+
+
+def filter_frame(
+    df: pd.DataFrame,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    room: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Restrict the booking frame to an inclusive date range and optional room.
+
+    Args:
+        df: Booking frame from bookings_to_frame
+        start: First date to include (optional)
+        end: Last date to include (optional)
+        room: Room identifier (optional)
+
+    Returns:
+        Filtered view of the frame
+    """
+    mask = np.ones(len(df), dtype=bool)
+    if start is not None:
+        mask &= (df['date'] >= pd.Timestamp(start)).to_numpy()
+    if end is not None:
+        mask &= (df['date'] <= pd.Timestamp(end)).to_numpy()
+    if room is not None:
+        mask &= (df['room'] == room).to_numpy()
+    return df[mask]
+
+
+def count_workdays(start: date, end: date, holidays: Optional[Iterable[str]] = None) -> int:
+    """
+    Count Monday-Friday workdays in an inclusive range, excluding holidays.
+
+    Args:
+        start: First date of the range
+        end: Last date of the range
+        holidays: Iterable of 'YYYY-MM-DD' holiday keys (optional)
+
+    Returns:
+        Number of workdays
+    """
+    if end < start:
+        return 0
+    holiday_days = np.array(sorted(holidays or []), dtype='datetime64[D]')
+    return int(np.busday_count(start, np.datetime64(end) + 1, holidays=holiday_days))
+
+
+# ============================================================================
+# 3. OCCUPANCY METRICS
+# ============================================================================
+
+def _with_weights(df: pd.DataFrame) -> pd.DataFrame:
+    """Add occupancy weight and AM/PM slot columns from the booking type codes"""
+    codes = df['booking_type'].cat.codes.to_numpy()
+    # Code -1 (unknown type) picks the trailing full-weight entry
+    weights = np.array([BOOKING_TYPE_WEIGHTS[t] for t in BOOKING_TYPES] + [1.0])
+    return df.assign(
+        weight=weights[codes],
+        am=codes != BOOKING_TYPES.index('half_pm'),
+        pm=codes != BOOKING_TYPES.index('half_am')
+    )
+
+
+def occupancy_per_desk(df: pd.DataFrame, workdays: int) -> pd.DataFrame:
+    """
+    Occupancy per desk over a range with a known number of workdays.
+
+    Args:
+        df: Filtered booking frame
+        workdays: Number of workdays in the range
+
+    Returns:
+        DataFrame indexed by room/desk with booked days and occupancy rate
+    """
+    weighted = _with_weights(df)
+    result = weighted.groupby(['room', 'desk_num'], observed=True).agg(
+        bookings=('weight', 'size'),
+        booked_days=('weight', 'sum')
+    )
+
+    # Include desks that were never booked
+    full_index = pd.MultiIndex.from_tuples(
+        [(room, desk) for room, count in ROOM_LAYOUT.items() for desk in range(1, count + 1)],
+        names=['room', 'desk_num']
+    )
+    result = result.reindex(full_index, fill_value=0)
+    result['occupancy'] = result['booked_days'] / workdays if workdays else 0.0
+    return result
+
+
+def occupancy_per_day(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Occupancy per calendar day across all desks.
+
+    Args:
+        df: Filtered booking frame
+
+    Returns:
+        DataFrame indexed by date with desks booked and occupancy rate
+    """
+    total_desks = sum(ROOM_LAYOUT.values())
+    weighted = _with_weights(df)
+    result = weighted.groupby('date').agg(desk_days=('weight', 'sum'))
+    # A desk shared by two half-day bookers is one booked desk
+    desks = weighted.drop_duplicates(['date', 'room', 'desk_num']).groupby('date').size()
+    result.insert(0, 'desks_booked', desks)
+    result['occupancy'] = result['desk_days'] / total_desks
+    return result
+
+
+def occupancy_per_week(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Occupancy per ISO week (Monday start) across all desks.
+
+    Args:
+        df: Filtered booking frame
+
+    Returns:
+        DataFrame indexed by week start with booked desk-days and occupancy rate
+    """
+    total_desk_days = sum(ROOM_LAYOUT.values()) * 5
+    weighted = _with_weights(df)
+    week_start = weighted['date'] - pd.to_timedelta(weighted['date'].dt.weekday, unit='D')
+    result = weighted.groupby(week_start.rename('week_start')).agg(
+        bookings=('weight', 'size'),
+        desk_days=('weight', 'sum')
+    )
+    result['occupancy'] = result['desk_days'] / total_desk_days
+    return result
+
+
+def half_day_utilisation(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Morning and afternoon slot utilisation per day.
+
+    Args:
+        df: Filtered booking frame
+
+    Returns:
+        DataFrame indexed by date with AM/PM slots used and utilisation rates
+    """
+    total_desks = sum(ROOM_LAYOUT.values())
+    weighted = _with_weights(df)
+    result = weighted.groupby('date').agg(am_slots=('am', 'sum'), pm_slots=('pm', 'sum'))
+    result['am_utilisation'] = result['am_slots'] / total_desks
+    result['pm_utilisation'] = result['pm_slots'] / total_desks
+    return result
+
+
+# ============================================================================
+# 4. USER METRICS
+# ============================================================================
+
+def maybe_booking_shares(df: pd.DataFrame, as_of: Optional[date] = None) -> pd.DataFrame:
+    """
+    Share of past bookings per user that stayed tentative ("maybe").
+
+    There is no check-in data, so this is not a no-show rate: it only shows
+    how often a user's bookings were never confirmed.
+
+    Args:
+        df: Filtered booking frame
+        as_of: Reference date (defaults to today)
+
+    Returns:
+        DataFrame indexed by user with maybe counts and maybe share
+    """
+    as_of = pd.Timestamp(as_of or date.today())
+    past = df[(df['date'] < as_of).to_numpy()]
+    is_maybe = (past['booking_type'] == 'maybe').to_numpy()
+
+    result = past.assign(is_maybe=is_maybe).groupby(['user_id', 'username'], observed=True).agg(
+        past_bookings=('is_maybe', 'size'),
+        maybe_bookings=('is_maybe', 'sum')
+    )
+    result['maybe_share'] = result['maybe_bookings'] / result['past_bookings']
+    return result.sort_values('maybe_share', ascending=False)
+
+
+def user_attendance(df: pd.DataFrame, workdays: int) -> pd.DataFrame:
+    """
+    Per-user attendance over a range with a known number of workdays.
+
+    Args:
+        df: Filtered booking frame
+        workdays: Number of workdays in the range
+
+    Returns:
+        DataFrame indexed by user with day counts and attendance rate
+    """
+    weighted = _with_weights(df)
+    booking_type = weighted['booking_type']
+    weighted = weighted.assign(
+        full_day=(booking_type == 'full_day').to_numpy(),
+        half_day=booking_type.isin(['half_am', 'half_pm']).to_numpy(),
+        maybe=(booking_type == 'maybe').to_numpy()
+    )
+
+    result = weighted.groupby(['user_id', 'username'], observed=True).agg(
+        days=('date', 'nunique'),
+        desk_days=('weight', 'sum'),
+        full_days=('full_day', 'sum'),
+        half_days=('half_day', 'sum'),
+        maybe_days=('maybe', 'sum'),
+        last_booking=('date', 'max')
+    )
+    result['attendance'] = result['desk_days'] / workdays if workdays else 0.0
+    return result.sort_values('desk_days', ascending=False)
+
+
+# ============================================================================
+# 5. SESSION CACHE
+# ============================================================================
+
+def get_session_frame() -> pd.DataFrame:
+    """
+    Return the session's booking frame, rebuilding it only when the booking
+    data version or a username has changed.
+    """
+    # Import streamlit only when needed to keep this module UI-free
+    import streamlit as st
+    from booking_aggregates import get_session_counters
+
+    version = get_session_counters().version
+    usernames = {user_id: user.get('username') for user_id, user in st.session_state.users.items()}
+    cached = st.session_state.get('analytics_frame')
+    if cached is None or cached[0] != version or cached[1] != usernames:
+        cached = (version, usernames, bookings_to_frame(st.session_state.bookings, st.session_state.users))
+        st.session_state.analytics_frame = cached
+    return cached[2]
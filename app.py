@@ -29,18 +29,43 @@ INDEX:
 # ============================================================================
 
 import streamlit as st
-import json
+import copy
 import os
 from datetime import datetime, timedelta
-from PIL import Image
-import pandas as pd
-import uuid
 
 # Import our modular sidebar
 from sidebar_settings import create_sidebar
 
 # Import shared utilities
-from shared_functions import get_user_colors, save_data_utility, save_avatar_utility
+from shared_functions import (
+    get_user_colors,
+    save_data_utility,
+    save_avatar_utility
+)
+
+# Import Streamlit-free booking domain core
+from booking_core import (
+    BLOCKER_TIME_RANGES,
+    blockers_overlapping,
+    can_override_booking,
+    load_data_warm,
+    read_generation
+)
+from booking_core import rules as booking_rules
+from booking_core import blockers as booking_blockers
+from booking_core import slots as booking_slots
+from booking_core import recurring as booking_recurring
+from booking_core import workdays as booking_calendar
+from booking_core import batch as booking_batch
+
+# Import incrementally maintained booking counters
+from booking_aggregates import get_session_counters
+
+# Import per-rerun timing instrumentation and metrics
+from booking_core import span
+from booking_core.metrics import record_bookings, start_metrics_exporter
+from instrumentation import begin_rerun, end_rerun, render_timing_panel
+from session_janitor import sweep_session_state, render_memory_panel
 
 # Page configuration - must be first streamlit command
 st.set_page_config(
@@ -50,6 +75,12 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# Start timing this script run (shown in the Debug Mode panel)
+begin_rerun()
+
+# Prometheus metrics file/port, once per process (BIIS_METRICS_FILE, BIIS_METRICS_PORT)
+start_metrics_exporter()
+
 # ============================================================================
 # 2. SESSION STATE & INITIALIZATION
 # ============================================================================
@@ -57,24 +88,12 @@ st.set_page_config(
 # Define all session state defaults with smart week calculation
 def initialize_session_state():
     """Initialize session state with optimized defaults"""
-    today = datetime.now()
+    now = datetime.now()
 
     # Smart week logic: Friday after 2pm or weekend shows next week
-    if (today.weekday() == 4 and today.hour >= 14) or today.weekday() >= 5:
-        days_until_monday = (7 - today.weekday()) % 7
-        if days_until_monday == 0:
-            days_until_monday = 7
-        next_monday = today + timedelta(days=days_until_monday)
-        current_week_start = next_monday.date()
-        current_tab = 0
-        is_viewing_next_week_as_current = True
-    else:
-        # Normal week: show current Monday
-        days_since_monday = today.weekday()
-        monday = today - timedelta(days=days_since_monday)
-        current_week_start = monday.date()
-        current_tab = today.weekday() if today.weekday() < 5 else 0
-        is_viewing_next_week_as_current = False
+    current_week_start = booking_calendar.effective_week_start(now)
+    current_tab = booking_calendar.default_tab(now)
+    is_viewing_next_week_as_current = booking_calendar.shows_next_week(now)
 
     # Session state defaults
     session_defaults = {
@@ -86,6 +105,7 @@ def initialize_session_state():
         'team_news': "",
         'desk_names': {},
         'holidays': {},
+        'blocker_rules': {},
         # User session selection - PREMIUM UX FEATURE
         'selected_user_for_session': None,
         # UI state
@@ -100,6 +120,13 @@ def initialize_session_state():
         'show_desk_naming': False,
         'show_holidays': False,
         'show_room_blocker': False,
+        'show_analytics': False,
+        'show_export': False,
+        'show_heatmap': False,
+        'show_find_desk': False,
+        'show_team': False,
+        'show_cancel_bookings': False,
+        'batch_cancel_undo': None,
         'blocking_room': None,
         'show_sidebar_menu': False,
         'booking_desk': None
@@ -113,6 +140,10 @@ def initialize_session_state():
 # Initialize session state on startup
 initialize_session_state()
 
+# Drop transient keys of other weeks and idle dialogs (long-lived wall displays)
+with span('janitor'):
+    sweep_session_state()
+
 # ============================================================================
 # 3. OPTIMIZED CSS & UI MANAGEMENT
 # ============================================================================
@@ -167,62 +198,72 @@ apply_css_always()
 # 4. DATA MANAGEMENT FUNCTIONS (FIXED)
 # ============================================================================
 
-@st.cache_data
-def load_data_cached():
-    """Load data with caching for better performance"""
+@st.cache_resource(max_entries=1)
+def load_data_cached(generation=None, _reload=False):
+    """
+    Load data once per process, shared by all sessions (read-only!).
+
+    Booking entries are immutable compact records, so sessions share them
+    and only copy the bookings dict itself (see session_copy); a pickled
+    copy per session and rerun (st.cache_data) would duplicate them all.
+    Keyed by the data generation, so saves from dialogs, the API or the
+    admin CLI are picked up on the next rerun.
+
+    Sessions build their own counters (get_session_counters), so only the
+    first load of a process builds counters for the warm-start snapshot;
+    reloads after a save (_reload, not part of the cache key) just parse.
+    """
     data = {'users': {}, 'bookings': {}, 'settings': {}}
 
     try:
-        # Load user data
-        if os.path.exists('data/users.json'):
-            with open('data/users.json', 'r', encoding='utf-8') as f:
-                data['users'] = json.load(f)
-
-        # Load booking data
-        if os.path.exists('data/bookings.json'):
-            with open('data/bookings.json', 'r', encoding='utf-8') as f:
-                data['bookings'] = json.load(f)
-
-        # Load settings
-        if os.path.exists('data/settings.json'):
-            with open('data/settings.json', 'r', encoding='utf-8') as f:
-                data['settings'] = json.load(f)
-        elif os.path.exists('data/team_news.json'):  # Fallback
-            with open('data/team_news.json', 'r', encoding='utf-8') as f:
-                news_data = json.load(f)
-                data['settings'] = {'team_news': news_data.get('news', '')}
+        # Users, bookings and settings - from the binary snapshot when it is
+        # still valid, otherwise parsed from JSON (team_news.json fallback)
+        warm = load_data_warm('data', write=not _reload, counters=not _reload)
+        data = {name: warm[name] for name in ('users', 'bookings', 'settings')}
 
     except Exception as e:
         st.error(f"Error loading data: {e}")
 
     return data
 
+def session_copy(data):
+    """Per-session copy of the shared data: bookings shallow, users/settings deep"""
+    return {
+        'users': copy.deepcopy(data['users']),
+        'bookings': dict(data['bookings']),
+        'settings': copy.deepcopy(data['settings'])
+    }
+
 def load_data():
     """Load all application data from JSON files with caching - FIXED to not override session state"""
-    data = load_data_cached()
+    with span('load'):
+        data = load_data_cached(read_generation('data'), 'booking_counters' in st.session_state)
 
     # FIXED: Don't override session state if it already has data (prevents cache override problem)
     if 'users' not in st.session_state or not st.session_state.users:
-        st.session_state.users = data['users']
+        st.session_state.users = copy.deepcopy(data['users'])
 
     if 'bookings' not in st.session_state or not st.session_state.bookings:
-        st.session_state.bookings = data['bookings']
+        st.session_state.bookings = dict(data['bookings'])
 
     # Handle settings
     settings = data['settings']
     st.session_state.team_news = settings.get('team_news', '')
-    st.session_state.desk_names = settings.get('desk_names', {})
-    st.session_state.holidays = settings.get('holidays', {})
+    st.session_state.desk_names = copy.deepcopy(settings.get('desk_names', {}))
+    st.session_state.holidays = copy.deepcopy(settings.get('holidays', {}))
+    st.session_state.blocker_rules = copy.deepcopy(settings.get('blocker_rules', {}))
 
 def save_data():
     """Save all application data using shared utility"""
-    save_data_utility(
-        st.session_state.users,
-        st.session_state.bookings,
-        st.session_state.team_news,
-        st.session_state.desk_names,
-        st.session_state.holidays
-    )
+    with span('save'):
+        save_data_utility(
+            st.session_state.users,
+            st.session_state.bookings,
+            st.session_state.team_news,
+            st.session_state.desk_names,
+            st.session_state.holidays,
+            st.session_state.blocker_rules
+        )
     # Clear cache to ensure fresh data on next load
     load_data_cached.clear()
 
@@ -232,7 +273,8 @@ def force_reload_data():
     load_data_cached.clear()
 
     # Load fresh data
-    data = load_data_cached()
+    with span('load'):
+        data = session_copy(load_data_cached(read_generation('data'), True))
 
     # Force update session state with fresh data
     st.session_state.users = data['users']
@@ -243,6 +285,7 @@ def force_reload_data():
     st.session_state.team_news = settings.get('team_news', '')
     st.session_state.desk_names = settings.get('desk_names', {})
     st.session_state.holidays = settings.get('holidays', {})
+    st.session_state.blocker_rules = settings.get('blocker_rules', {})
 
 # ============================================================================
 # 5. HELPER FUNCTIONS
@@ -250,8 +293,7 @@ def force_reload_data():
 
 def get_desk_name(room, desk_num):
     """Get custom desk name or fallback to default naming"""
-    desk_key = f"{room}_{desk_num}"
-    return st.session_state.desk_names.get(desk_key, f"Desk {desk_num}")
+    return booking_rules.get_desk_name(st.session_state.desk_names, room, desk_num)
 
 def set_desk_name(room, desk_num, name):
     """Set custom desk name with 20 character limit"""
@@ -269,14 +311,19 @@ def set_desk_name(room, desk_num, name):
 
 def get_week_dates(start_date):
     """Generate list of 5 weekday dates from Monday start date"""
-    return [start_date + timedelta(days=i) for i in range(5)]
+    return booking_calendar.week_dates(start_date)
+
+def get_calendar():
+    """Shared precomputed calendar for the session's holidays"""
+    return booking_calendar.get_calendar(st.session_state.holidays)
 
 def format_date_key(date):
     """Convert date to string key for booking storage"""
-    return date.strftime('%Y-%m-%d')
+    return booking_rules.format_date_key(date)
 
 def generate_user_id():
     """Generate unique 8-character user ID"""
+    import uuid
     return str(uuid.uuid4())[:8]
 
 @st.cache_data
@@ -301,7 +348,7 @@ def save_avatar(uploaded_file, user_id):
 
 def get_booking_key(date, room, desk_num):
     """Generate unique key for booking storage"""
-    return f"{format_date_key(date)}_{room}_{desk_num}"
+    return booking_rules.get_booking_key(date, room, desk_num)
 
 def get_desk_status(date, room, desk_num):
     """Get current booking status for specific desk"""
@@ -309,49 +356,97 @@ def get_desk_status(date, room, desk_num):
     return st.session_state.bookings.get(booking_key)
 
 def create_booking(date, room, desk_num, user_id, booking_type):
-    """Create new desk booking"""
+    """Create new desk booking (sharing the desk with a booking of the other half-day)"""
     booking_key = get_booking_key(date, room, desk_num)
+    existing = st.session_state.bookings.get(booking_key)
+    booking_data = booking_slots.combine_booking(
+        existing, booking_rules.build_booking(date, room, desk_num, user_id, booking_type)
+    )
 
-    booking_data = {
-        'user_id': user_id,
-        'booking_type': booking_type,
-        'created_at': datetime.now().isoformat(),
-        'date': format_date_key(date),
-        'room': room,
-        'desk_num': desk_num,
-        'entry_type': 'desk_booking'
-    }
-
+    get_session_counters().replace(booking_key, existing, booking_data)
     st.session_state.bookings[booking_key] = booking_data
     save_data()
+    record_bookings(created=1, source='app')
     return True
 
-def remove_booking(date, room, desk_num):
-    """Remove existing desk booking"""
-    booking_key = get_booking_key(date, room, desk_num)
-    if booking_key in st.session_state.bookings:
-        del st.session_state.bookings[booking_key]
-        save_data()
-        return True
-    return False
-
-def can_override_booking(current_booking, new_booking_type):
-    """Check if current booking can be overridden by new booking type"""
-    if not current_booking:
-        return True
+def plan_bookings(dates, room, desk_num, user_id, booking_type):
+    """Plan bookings of one desk on several dates (nothing is changed)"""
+    counters = get_session_counters()
+    counters.expand_blocker_rules(st.session_state.blocker_rules, min(dates), max(dates))
+    return booking_batch.plan_desk_bookings(
+        st.session_state.bookings, dates, room, desk_num, user_id, booking_type,
+        holidays=st.session_state.holidays, counters=counters, today=datetime.now().date()
+    )
 
-    current_type = current_booking.get('booking_type', '')
+def create_bookings(dates, room, desk_num, user_id, booking_type):
+    """Book one desk on several dates with a single save; returns the applied plan"""
+    plan = plan_bookings(dates, room, desk_num, user_id, booking_type)
+    counters = get_session_counters()
+    for booking_key, booking_data in plan.bookings.items():
+        counters.replace(booking_key, st.session_state.bookings.get(booking_key), booking_data)
+        st.session_state.bookings[booking_key] = booking_data
+    if plan.bookings:
+        save_data()
+        record_bookings(created=len(plan.bookings), source='app')
+    return plan
+
+def cancel_user_bookings(user_id, start, end, room=None):
+    """Cancel all of a user's bookings in a date range with a single save; keeps one undo handle"""
+    counters = get_session_counters()
+    plan = booking_batch.plan_cancellations(st.session_state.bookings, counters, user_id, start, end, room)
+    if not plan.changes:
+        return 0
+
+    for booking_key, remaining in plan.changes.items():
+        counters.replace(booking_key, plan.previous[booking_key], remaining)
+        if remaining is None:
+            del st.session_state.bookings[booking_key]
+        else:
+            st.session_state.bookings[booking_key] = remaining
+    save_data()
+    record_bookings(cancelled=len(plan.changes), source='app')
 
-    # Maybe bookings can be overridden by any other type
-    if current_type == 'maybe' and new_booking_type != 'maybe':
-        return True
+    # Only the latest batch cancellation can be undone
+    st.session_state.batch_cancel_undo = {
+        'user_id': user_id,
+        'previous': plan.previous,
+        'summary': f"Cancelled {len(plan.changes)} booking(s) of "
+                   f"{st.session_state.users.get(user_id, {}).get('username', user_id)} "
+                   f"({start.strftime('%d.%m.')} - {end.strftime('%d.%m.%Y')})"
+    }
+    return len(plan.changes)
+
+def undo_batch_cancel():
+    """Restore the latest batch cancellation where the slots are still free; returns (restored, conflicts)"""
+    undo = st.session_state.get('batch_cancel_undo')
+    st.session_state.batch_cancel_undo = None
+    if not undo:
+        return 0, 0
+
+    changes, conflicts = booking_batch.plan_restore(st.session_state.bookings, undo['user_id'], undo['previous'])
+    counters = get_session_counters()
+    for booking_key, booking_data in changes.items():
+        counters.replace(booking_key, st.session_state.bookings.get(booking_key), booking_data)
+        st.session_state.bookings[booking_key] = booking_data
+    if changes:
+        save_data()
+        record_bookings(created=len(changes), source='app')
+    return len(changes), len(conflicts)
 
-    # Half-day bookings can be combined
-    if current_type == 'half_am' and new_booking_type == 'half_pm':
-        return True
-    if current_type == 'half_pm' and new_booking_type == 'half_am':
+def remove_booking(date, room, desk_num, slots=booking_slots.SLOT_ALL):
+    """Remove existing desk booking, or only the occupant of the given half-day slots"""
+    booking_key = get_booking_key(date, room, desk_num)
+    if booking_key in st.session_state.bookings:
+        existing = st.session_state.bookings[booking_key]
+        remaining = booking_slots.remove_occupants(existing, slots)
+        get_session_counters().replace(booking_key, existing, remaining)
+        if remaining is None:
+            del st.session_state.bookings[booking_key]
+        else:
+            st.session_state.bookings[booking_key] = remaining
+        save_data()
+        record_bookings(cancelled=1, source='app')
         return True
-
     return False
 
 # ============================================================================
@@ -360,78 +455,96 @@ def can_override_booking(current_booking, new_booking_type):
 
 def get_room_blocker_key(date, room):
     """Generate unique key for room blocker storage"""
-    return f"{format_date_key(date)}_{room}_ROOM_BLOCKER"
+    return booking_blockers.get_room_blocker_key(date, room)
+
+def get_blocker_counters(date):
+    """Session counters with recurring room blockers expanded for the week of a date"""
+    week_start = date - timedelta(days=date.weekday())
+    counters = get_session_counters()
+    counters.expand_blocker_rules(st.session_state.blocker_rules, week_start, week_start + timedelta(days=6))
+    return counters
+
+def get_room_blockers_with_keys(date, room, start_time=None, end_time=None):
+    """(key, blocker) pairs of a room on a date overlapping a time window (default: whole day)"""
+    return blockers_overlapping(st.session_state.bookings, date, room, start_time, end_time,
+                                get_blocker_counters(date))
+
+def get_room_blockers(date, room):
+    """All room blockers for specific date and room, ordered by start time"""
+    return booking_blockers.get_room_blockers(st.session_state.bookings, date, room, get_blocker_counters(date))
 
 def get_room_blocker(date, room):
-    """Get current room blocker for specific date and room"""
-    blocker_key = get_room_blocker_key(date, room)
-    return st.session_state.bookings.get(blocker_key)
+    """Get earliest room blocker for specific date and room"""
+    blockers = get_room_blockers(date, room)
+    return blockers[0] if blockers else None
 
 def create_room_blocker(date, room, user_id, blocker_type, custom_time_start=None, custom_time_end=None, reason=""):
-    """Create new room blocker"""
-    blocker_key = get_room_blocker_key(date, room)
-
-    # Define time ranges for blocker types
-    time_ranges = {
-        'morning': ('09:00', '12:00'),
-        'afternoon': ('13:00', '17:00'),
-        'full_day': ('08:00', '18:00'),
-        'custom': (custom_time_start, custom_time_end)
-    }
+    """Create new room blocker (False when its times are invalid, it overlaps another blocker or the day is full)"""
+    if blocker_type == 'custom' and not booking_blockers.valid_blocker_window(custom_time_start, custom_time_end):
+        return False
+    blocker_key = booking_blockers.next_room_blocker_key(st.session_state.bookings, date, room)
+    blocker_data = booking_blockers.build_room_blocker(
+        date, room, user_id, blocker_type, custom_time_start, custom_time_end, reason
+    )
+    if blocker_key is None or get_room_blockers_with_keys(date, room, blocker_data['start_time'],
+                                                          blocker_data['end_time']):
+        return False
 
-    start_time, end_time = time_ranges[blocker_type]
+    get_session_counters().replace(blocker_key, None, blocker_data)
+    st.session_state.bookings[blocker_key] = blocker_data
+    save_data()
+    return True
 
-    blocker_data = {
-        'user_id': user_id,
-        'blocker_type': blocker_type,
-        'start_time': start_time,
-        'end_time': end_time,
-        'reason': reason[:20] if reason else "",
-        'created_at': datetime.now().isoformat(),
-        'date': format_date_key(date),
-        'room': room,
-        'entry_type': 'room_blocker'
-    }
+def create_blocker_rule(date, room, user_id, blocker_type, frequency, end_date=None,
+                        custom_time_start=None, custom_time_end=None, reason=""):
+    """Create recurring room blocker starting on date (False when any occurrence overlaps a blocker)"""
+    if blocker_type == 'custom' and not booking_blockers.valid_blocker_window(custom_time_start, custom_time_end):
+        return False
+    rule = booking_recurring.build_blocker_rule(
+        room, user_id, blocker_type, frequency, date, end_date, custom_time_start, custom_time_end, reason
+    )
+    if booking_recurring.rule_conflicts(st.session_state.bookings, st.session_state.blocker_rules, rule,
+                                        get_session_counters()):
+        return False
 
-    st.session_state.bookings[blocker_key] = blocker_data
+    st.session_state.blocker_rules[generate_user_id()] = rule
+    save_data()
+    return True
+
+def remove_blocker_rule(rule_id):
+    """Remove a recurring room blocker with all its occurrences"""
+    if st.session_state.blocker_rules.pop(rule_id, None) is None:
+        return False
     save_data()
     return True
 
-def remove_room_blocker(date, room):
-    """Remove existing room blocker"""
-    blocker_key = get_room_blocker_key(date, room)
-    if blocker_key in st.session_state.bookings:
-        del st.session_state.bookings[blocker_key]
+def remove_room_blocker(date, room, blocker_key=None):
+    """Remove one room blocker by key, or all blockers of the room on that date
+
+    Occurrences of recurring blockers are skipped for that date; the rule is kept.
+    """
+    blockers = [(key, blocker) for key, blocker in get_room_blockers_with_keys(date, room)
+                if blocker_key is None or key == blocker_key]
+    for key, blocker in blockers:
+        if key in st.session_state.bookings:
+            get_session_counters().replace(key, blocker, None)
+            del st.session_state.bookings[key]
+        elif blocker.get('rule_id') in st.session_state.blocker_rules:
+            booking_recurring.skip_occurrence(st.session_state.blocker_rules[blocker['rule_id']], date)
+    if blockers:
         save_data()
         return True
     return False
 
 def is_room_blocked(date, room):
-    """Check if room is blocked on specific date"""
-    return get_room_blocker(date, room) is not None
+    """Check if room has any blocker on specific date"""
+    return bool(get_room_blockers(date, room))
 
 def get_room_block_message(date, room):
-    """Get formatted room block message"""
-    blocker = get_room_blocker(date, room)
-    if not blocker:
-        return None
-
-    user_id = blocker.get('user_id')
-    if user_id == 'DELETED_USER':
-        username = blocker.get('archived_username', 'Deleted User')
-    else:
-        user_data = st.session_state.users.get(user_id, {})
-        username = user_data.get('username', 'Unknown User')
-
-    start_time = blocker.get('start_time', '')
-    end_time = blocker.get('end_time', '')
-    reason = blocker.get('reason', '')
-
-    message = f"This room is blocked from {start_time} to {end_time} by {username}"
-    if reason:
-        message += f" ({reason})"
-
-    return message
+    """Get formatted room block message (one line per blocker)"""
+    messages = [booking_blockers.get_room_block_message(blocker, st.session_state.users)
+                for blocker in get_room_blockers(date, room)]
+    return '<br>'.join(messages) if messages else None
 
 # ============================================================================
 # 8. DIALOG DEFINITIONS
@@ -508,27 +621,6 @@ def book_desk_dialog(date, room, desk_num):
     st.markdown(f"**Desk:** {desk_display_name}")
     st.markdown(f"**Date:** {date.strftime('%A, %d. %B %Y')}")
 
-    # Check for room blocker and show warning
-    room_blocker = get_room_blocker(date, room)
-    if room_blocker:
-        user_id = room_blocker.get('user_id')
-        if user_id == 'DELETED_USER':
-            blocker_username = room_blocker.get('archived_username', 'Deleted User')
-        else:
-            blocker_user_data = st.session_state.users.get(user_id, {})
-            blocker_username = blocker_user_data.get('username', 'Unknown User')
-
-        start_time = room_blocker.get('start_time', '')
-        end_time = room_blocker.get('end_time', '')
-        reason = room_blocker.get('reason', '')
-
-        warning_message = f"⚠️ **Please be aware, this room is blocked from {start_time} to {end_time} by {blocker_username}"
-        if reason:
-            warning_message += f" ({reason})"
-        warning_message += " and this desk might not be available during that time.**"
-
-        st.warning(warning_message)
-
     existing_booking = get_desk_status(date, room, desk_num)
 
     # FIXED: User selection with mandatory selection
@@ -565,17 +657,59 @@ def book_desk_dialog(date, room, desk_num):
         st.error("No users available. Please create users first.")
         selected_user_id = None
 
-    # Booking type selection
+    # Booking type selection (half-booked desks only offer the free half)
     if selected_user_id:
         booking_options = {
-            'Full Day': 'full_day',
-            'Morning (AM)': 'half_am',
-            'Afternoon (PM)': 'half_pm',
-            'Maybe (Tentative)': 'maybe'
+            label: value for label, value in {
+                'Full Day': 'full_day',
+                'Morning (AM)': 'half_am',
+                'Afternoon (PM)': 'half_pm',
+                'Maybe (Tentative)': 'maybe'
+            }.items()
+            if can_override_booking(existing_booking, value)
         }
 
-        booking_type_display = st.selectbox("Booking Type", options=list(booking_options.keys()))
-        booking_type = booking_options[booking_type_display]
+        for slot, occupant in booking_slots.slot_occupants(existing_booking).items():
+            st.caption(f"{booking_slots.SLOT_NAMES[slot]} is booked by "
+                       f"{booking_rules.get_username(occupant, st.session_state.users)}")
+
+        if booking_options:
+            booking_type_display = st.selectbox("Booking Type", options=list(booking_options.keys()))
+            booking_type = booking_options[booking_type_display]
+        else:
+            st.info("This desk is fully booked.")
+            booking_type = None
+
+        # Several days at once: validated in one pass, saved once
+        if booking_type:
+            day_options = {
+                'This Day': [date],
+                'Rest of Week': booking_batch.rest_of_week(date),
+                f"Every {date.strftime('%A')} this Month": booking_batch.same_weekday_in_month(date),
+                'Pick Dates': None
+            }
+            days_display = st.radio("Days", options=list(day_options.keys()), horizontal=True,
+                                    key="book_desk_days")
+            booking_dates = day_options[days_display]
+            if booking_dates is None:
+                # Weekdays of the next four weeks
+                pick_options = [date + timedelta(days=offset) for offset in range(28)
+                                if (date + timedelta(days=offset)).weekday() < 5]
+                booking_dates = st.multiselect("Dates", options=pick_options, default=[date],
+                                               format_func=lambda d: d.strftime('%a %d.%m.'),
+                                               key="book_desk_dates")
+
+            if booking_dates and booking_dates != [date]:
+                plan = plan_bookings(booking_dates, room, desk_num, selected_user_id, booking_type)
+                booked_days = sorted(booking['date'] for booking in plan.bookings.values())
+                st.caption(f"Books {len(booked_days)} day(s): " + ", ".join(
+                    datetime.strptime(date_key, '%Y-%m-%d').strftime('%a %d.%m.') for date_key in booked_days
+                ))
+                for date_key, reason in plan.skipped.items():
+                    st.caption(f"Skips {datetime.strptime(date_key, '%Y-%m-%d').strftime('%a %d.%m.')}: "
+                               f"{booking_batch.SKIP_REASONS[reason]}")
+        else:
+            booking_dates = [date]
 
         # User preview
         user_data = st.session_state.users[selected_user_id]
@@ -587,13 +721,42 @@ def book_desk_dialog(date, room, desk_num):
             st.image(user_data['avatar_path'], width=80)
     else:
         booking_type = None
+        booking_dates = [date]
+
+    # Room blocker warnings: only blockers overlapping the chosen half (all of the day without a type)
+    if booking_type:
+        window = booking_slots.slot_window(booking_slots.booking_slots(booking_type))
+        room_blockers = [blocker for _, blocker in get_room_blockers_with_keys(date, room, *window)]
+    else:
+        room_blockers = get_room_blockers(date, room)
+    for room_blocker in room_blockers:
+        blocker_username = booking_rules.get_username(room_blocker, st.session_state.users)
+        start_time = room_blocker.get('start_time', '')
+        end_time = room_blocker.get('end_time', '')
+        reason = room_blocker.get('reason', '')
+
+        warning_message = f"⚠️ **Please be aware, this room is blocked from {start_time} to {end_time} by {blocker_username}"
+        if reason:
+            warning_message += f" ({reason})"
+        warning_message += " and this desk might not be available during that time.**"
+
+        st.warning(warning_message)
 
     # Action buttons
     col1, col2 = st.columns(2)
 
     with col1:
         if st.button("✓ Confirm Booking", key="dialog_confirm_booking", use_container_width=True):
-            if selected_user_id and booking_type:
+            if selected_user_id and booking_type and not booking_dates:
+                st.error("Please select at least one date")
+            elif selected_user_id and booking_type and booking_dates != [date]:
+                plan = create_bookings(booking_dates, room, desk_num, selected_user_id, booking_type)
+                if plan.bookings:
+                    st.success(f"{len(plan.bookings)} booking(s) created!")
+                    st.rerun()
+                else:
+                    st.error("None of the selected days can be booked")
+            elif selected_user_id and booking_type:
                 if not existing_booking or can_override_booking(existing_booking, booking_type):
                     success = create_booking(date, room, desk_num, selected_user_id, booking_type)
                     if success:
@@ -618,28 +781,27 @@ def block_room_dialog(date, room):
     st.markdown(f"### Block {room.replace('_', ' ').title()}")
     st.markdown(f"**Date:** {date.strftime('%A, %d. %B %Y')}")
 
-    # Check if room is already blocked
-    existing_blocker = get_room_blocker(date, room)
-    if existing_blocker:
-        user_id = existing_blocker.get('user_id')
-        if user_id == 'DELETED_USER':
-            blocker_username = existing_blocker.get('archived_username', 'Deleted User')
-        else:
-            blocker_user_data = st.session_state.users.get(user_id, {})
-            blocker_username = blocker_user_data.get('username', 'Unknown User')
-
-        st.warning(
-            f"Room is already blocked by {blocker_username} from {existing_blocker.get('start_time')} to {existing_blocker.get('end_time')}")
-
-        # Option to remove existing blocker
-        if st.button("🗑️ Remove Existing Block", key="dialog_remove_blocker", use_container_width=True):
-            remove_room_blocker(date, room)
-            st.success("Room blocker removed!")
-            st.rerun()
-
-        if st.button("✖ Cancel", key="dialog_cancel_block_existing", use_container_width=True):
-            st.rerun()
-        return
+    # Existing blockers of the day, each removable; new blockers must not overlap them
+    for i, (blocker_key, existing_blocker) in enumerate(get_room_blockers_with_keys(date, room)):
+        blocker_username = booking_rules.get_username(existing_blocker, st.session_state.users)
+        rule_id = existing_blocker.get('rule_id')
+        col1, col2, col3 = st.columns([3, 1, 1])
+        with col1:
+            st.warning(f"{'🔁 ' if rule_id else ''}Blocked by {blocker_username} from "
+                       f"{existing_blocker.get('start_time')} to {existing_blocker.get('end_time')}")
+            if rule_id in st.session_state.blocker_rules:
+                st.caption(booking_recurring.describe_rule(st.session_state.blocker_rules[rule_id]))
+        with col2:
+            label = "⏭️ Skip" if rule_id else "🗑️ Remove"
+            if st.button(label, key=f"dialog_remove_blocker_{i}", use_container_width=True):
+                remove_room_blocker(date, room, blocker_key)
+                st.success("Room blocker removed for this day!")
+                st.rerun()
+        with col3:
+            if rule_id and st.button("🗑️ Series", key=f"dialog_remove_rule_{i}", use_container_width=True):
+                remove_blocker_rule(rule_id)
+                st.success("Recurring room blocker removed!")
+                st.rerun()
 
     # FIXED: User selection with SESSION PRE-SELECTION
     if st.session_state.users:
@@ -704,14 +866,21 @@ def block_room_dialog(date, room):
         reason = st.text_input("Reason (Optional, max 20 chars)", max_chars=20,
                                placeholder="Meeting, maintenance, etc.")
 
+        # Repetition: stored as one rule, occurrences are computed when viewed
+        repeat_options = {
+            'Does not repeat': None,
+            'Weekly': 'weekly',
+            'Every 2 weeks': 'biweekly',
+            'Monthly (same weekday)': 'monthly'
+        }
+        frequency = repeat_options[st.selectbox("Repeat", options=list(repeat_options.keys()))]
+        repeat_until = None
+        if frequency:
+            repeat_until = st.date_input("Until (optional)", value=None, min_value=date, format="DD.MM.YYYY")
+
         # Preview
         if blocker_type != 'custom':
-            time_ranges = {
-                'morning': ('09:00', '12:00'),
-                'afternoon': ('13:00', '17:00'),
-                'full_day': ('08:00', '18:00')
-            }
-            start_time, end_time = time_ranges[blocker_type]
+            start_time, end_time = BLOCKER_TIME_RANGES[blocker_type]
         else:
             start_time, end_time = custom_start, custom_end
 
@@ -719,24 +888,37 @@ def block_room_dialog(date, room):
         preview_text = f"Room will be blocked from {start_time} to {end_time}"
         if reason:
             preview_text += f" ({reason})"
+        if frequency:
+            preview_text += " - " + booking_recurring.describe_rule({
+                'frequency': frequency, 'start_date': format_date_key(date), 'start_time': start_time,
+                'end_time': end_time, 'end_date': format_date_key(repeat_until) if repeat_until else None
+            })
         st.info(preview_text)
     else:
         blocker_type = None
+        frequency = repeat_until = None
 
     # Action buttons
     col1, col2 = st.columns(2)
 
     with col1:
         if st.button("🚫 Block Room", key="dialog_confirm_block", use_container_width=True):
-            if selected_user_id and blocker_type:
-                success = create_room_blocker(date, room, selected_user_id, blocker_type, custom_start, custom_end,
-                                              reason)
+            if blocker_type == 'custom' and not booking_blockers.valid_blocker_window(custom_start, custom_end):
+                st.error("The end time must be after the start time")
+            elif selected_user_id and blocker_type:
+                if frequency:
+                    success = create_blocker_rule(date, room, selected_user_id, blocker_type, frequency,
+                                                  repeat_until, custom_start, custom_end, reason)
+                else:
+                    success = create_room_blocker(date, room, selected_user_id, blocker_type, custom_start,
+                                                  custom_end, reason)
                 if success:
                     # FIXED: Use success message instead of balloons
                     st.success("Room blocked successfully!")
                     st.rerun()
                 else:
-                    st.error("Failed to block room")
+                    st.error("Failed to block room: the time overlaps an existing block "
+                             "or the room has no free block slot that day")
             else:
                 st.error("Please select a user and block type")
 
@@ -871,61 +1053,116 @@ def settings_dialog():
         if st.button("✖ Close", key="dialog_close_settings", use_container_width=True):
             st.rerun()
 
+@st.dialog("Cancel Bookings")
+def cancel_bookings_dialog():
+    """Dialog for cancelling all of a user's bookings in a date range at once (sick leave, vacation)"""
+    st.markdown("### 🗓️ Cancel Bookings")
+
+    if not st.session_state.users:
+        st.error("No users available.")
+        return
+
+    user_options = {data['username']: user_id for user_id, data in st.session_state.users.items()}
+    default_index = None
+    if st.session_state.get('selected_user_for_session') in st.session_state.users:
+        session_username = st.session_state.users[st.session_state.selected_user_for_session]['username']
+        default_index = list(user_options.keys()).index(session_username)
+    selected_username = st.selectbox(
+        "Select User",
+        options=list(user_options.keys()),
+        index=default_index,
+        placeholder="Choose a user...",
+        key="cancel_bookings_user_select"
+    )
+
+    today = datetime.now().date()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        start_date = st.date_input("From", value=today, min_value=today, key="cancel_bookings_start")
+    with col2:
+        end_date = st.date_input("To", value=today + timedelta(days=4 - today.weekday() if today.weekday() < 5 else 0),
+                                 min_value=today, key="cancel_bookings_end")
+    with col3:
+        room_options = {'All Rooms': None, 'Büro Klein': 'klein', 'Büro Gross': 'gross'}
+        room_display = st.selectbox("Room", options=list(room_options.keys()), key="cancel_bookings_room")
+
+    if not selected_username:
+        st.warning("⚠️ Please select a user first.")
+        cancel_count = 0
+    elif end_date < start_date:
+        st.error("'From' date must be before 'To' date!")
+        cancel_count = 0
+    else:
+        # Preview from the per-user index, nothing is changed yet
+        user_id = user_options[selected_username]
+        plan = booking_batch.plan_cancellations(st.session_state.bookings, get_session_counters(), user_id,
+                                                start_date, end_date, room_options[room_display])
+        cancel_count = len(plan.changes)
+        if not cancel_count:
+            st.info("No bookings in the selected range.")
+        for booking_key, entry in plan.previous.items():
+            for occupant in booking_slots.occupants(entry):
+                if occupant.get('user_id') == user_id:
+                    booking_date = datetime.strptime(occupant['date'], '%Y-%m-%d')
+                    st.caption(f"{booking_date.strftime('%a %d.%m.%Y')} · "
+                               f"{occupant['room'].title()} {get_desk_name(occupant['room'], occupant['desk_num'])} · "
+                               f"{occupant.get('booking_type', '').replace('_', ' ')}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button(f"🗑️ Cancel {cancel_count} Booking(s)", key="dialog_confirm_cancel_bookings",
+                     type="primary", disabled=not cancel_count, use_container_width=True):
+            cancel_user_bookings(user_options[selected_username], start_date, end_date, room_options[room_display])
+            st.rerun()
+
+    with col2:
+        if st.button("✖ Close", key="dialog_close_cancel_bookings", use_container_width=True):
+            st.rerun()
+
 def render_desk(date, room, desk_num):
     """Render individual desk component with booking status and controls"""
     booking = get_desk_status(date, room, desk_num)
     desk_key = f"{room}_{desk_num}_{format_date_key(date)}"
     desk_display_name = get_desk_name(room, desk_num)
 
-    # Determine desk status and display properties
+    # Determine desk status and display properties (one or two half-day occupants)
+    occupants = booking_slots.occupants(booking)
     if booking:
-        user_id = booking.get('user_id')
-
-        # Handle archived bookings (deleted users)
-        if user_id == 'DELETED_USER':
-            username = booking.get('archived_username', 'Deleted User')
-            username_display = f"{username} 📋"  # Archive indicator
-        else:
-            user_data = st.session_state.users.get(user_id, {})
-            username = user_data.get('username', 'Unknown User')
-            username_display = username
-
-        booking_type = booking.get('booking_type', 'full_day')
+        status_parts = []
+        for occupant in occupants:
+            # Handle archived bookings (deleted users)
+            if occupant.get('user_id') == 'DELETED_USER':
+                username = occupant.get('archived_username', 'Deleted User')
+                username_display = f"{username} 📋"  # Archive indicator
+            else:
+                user_data = st.session_state.users.get(occupant.get('user_id'), {})
+                username_display = user_data.get('username', 'Unknown User')
+
+            booking_type = occupant.get('booking_type', 'full_day')
+
+            # Determine desk styling based on booking type
+            if booking_type == 'half_am':
+                desk_class = "desk-half-am"
+                status_parts.append(f"{username_display} (AM)")
+            elif booking_type == 'half_pm':
+                desk_class = "desk-half-pm"
+                status_parts.append(f"{username_display} (PM)")
+            elif booking_type == 'maybe':
+                desk_class = "desk-maybe"
+                status_parts.append(f"{username_display} (?)")
+            else:
+                desk_class = "desk-booked"
+                status_parts.append(username_display)
 
-        # Determine desk styling based on booking type
-        if booking_type == 'full_day':
+        # Both halves taken: the desk is fully booked
+        if len(occupants) > 1:
             desk_class = "desk-booked"
-            status_text = username_display
-        elif booking_type == 'half_am':
-            desk_class = "desk-half-am"
-            status_text = f"{username_display} (AM)"
-        elif booking_type == 'half_pm':
-            desk_class = "desk-half-pm"
-            status_text = f"{username_display} (PM)"
-        elif booking_type == 'maybe':
-            desk_class = "desk-maybe"
-            status_text = f"{username_display} (?)"
+        status_text = ' / '.join(status_parts)
     else:
         # Free desk styling
         desk_class = "desk-free"
         status_text = 'Free'
 
-    # Debug mode: show file system information
-    if st.session_state.debug_mode:
-        in_use_exists = os.path.exists("media/images/in_use.png")
-        not_used_exists = os.path.exists("media/images/not_used.png")
-
-        st.error(f"🐛 DEBUG - Desk {desk_display_name}:")
-        st.error(f"🐛 in_use.png exists: {in_use_exists}")
-        st.error(f"🐛 not_used.png exists: {not_used_exists}")
-
-        try:
-            import glob
-            all_images = glob.glob("media/images/*")
-            st.error(f"🐛 All files in media/images/: {all_images}")
-        except Exception as e:
-            st.error(f"🐛 Could not list files: {e}")
-
     # Determine icon for embedded display
     if booking:
         icon_path = "media/images/in_use.png" if os.path.exists("media/images/in_use.png") else None
@@ -957,47 +1194,56 @@ def render_desk(date, room, desk_num):
     </div>
     ''', unsafe_allow_html=True)
 
-    # Render action buttons based on desk status
-    if booking:
-        if user_id == 'DELETED_USER':
+    # Render action buttons per occupant; shared desks get one set per half
+    # (keys keep the date last so the session janitor can expire them)
+    shared = len(occupants) > 1
+    for occupant in occupants:
+        slots = booking_slots.booking_slots(occupant.get('booking_type'))
+        half = f" {booking_slots.SLOT_NAMES[slots]}" if shared else ""
+        occupant_key = f"{half.strip().lower()}_{desk_key}" if shared else desk_key
+
+        if occupant.get('user_id') == 'DELETED_USER':
             # Archived booking: show clear archive option
-            if st.button("Clear Archive", key=f"clear_{desk_key}",
+            if st.button(f"Clear Archive{half}", key=f"clear_{occupant_key}",
                         help=f"Remove archived booking for {desk_display_name}"):
-                st.session_state[f'confirm_clear_{desk_key}'] = True
+                st.session_state[f'confirm_clear_{occupant_key}'] = True
 
             # Confirmation dialog for clearing archive
-            if st.session_state.get(f'confirm_clear_{desk_key}', False):
-                st.warning(f"Clear archived booking for {desk_display_name}?")
+            if st.session_state.get(f'confirm_clear_{occupant_key}', False):
+                st.warning(f"Clear archived booking{half} for {desk_display_name}?")
 
                 # Simple buttons without columns
-                if st.button("No", key=f"no_clear_{desk_key}"):
-                    st.session_state[f'confirm_clear_{desk_key}'] = False
+                if st.button("No", key=f"no_clear_{occupant_key}"):
+                    st.session_state[f'confirm_clear_{occupant_key}'] = False
                     st.rerun()
-                if st.button("Yes", key=f"yes_clear_{desk_key}"):
-                    remove_booking(date, room, desk_num)
-                    st.session_state[f'confirm_clear_{desk_key}'] = False
+                if st.button("Yes", key=f"yes_clear_{occupant_key}"):
+                    remove_booking(date, room, desk_num, slots)
+                    st.session_state[f'confirm_clear_{occupant_key}'] = False
                     st.rerun()
         else:
             # Active booking: show cancel option
-            if st.button("Cancel", key=f"cancel_{desk_key}",
+            if st.button(f"Cancel{half}", key=f"cancel_{occupant_key}",
                          help=f"Cancel booking for {desk_display_name}"):
-                st.session_state[f'confirm_remove_{desk_key}'] = True
+                st.session_state[f'confirm_remove_{occupant_key}'] = True
 
             # Confirmation dialog for removing booking
-            if st.session_state.get(f'confirm_remove_{desk_key}', False):
-                st.warning(f"Cancel booking for {desk_display_name}?")
+            if st.session_state.get(f'confirm_remove_{occupant_key}', False):
+                st.warning(f"Cancel booking{half} for {desk_display_name}?")
 
                 # Simple buttons without columns
-                if st.button("❌ No", key=f"no_{desk_key}"):
-                    st.session_state[f'confirm_remove_{desk_key}'] = False
+                if st.button("❌ No", key=f"no_{occupant_key}"):
+                    st.session_state[f'confirm_remove_{occupant_key}'] = False
                     st.rerun()
-                if st.button("✅ Yes", key=f"yes_{desk_key}"):
-                    remove_booking(date, room, desk_num)
-                    st.session_state[f'confirm_remove_{desk_key}'] = False
+                if st.button("✅ Yes", key=f"yes_{occupant_key}"):
+                    remove_booking(date, room, desk_num, slots)
+                    st.session_state[f'confirm_remove_{occupant_key}'] = False
                     st.rerun()
-    else:
-        # Free desk: show booking option
-        if st.button("Book", key=f"book_{desk_key}",
+
+    # Free desk or free half: show booking option
+    free = booking_slots.free_slots(booking)
+    if free:
+        label = "Book" if free == booking_slots.SLOT_ALL else f"Book {booking_slots.SLOT_NAMES[free]}"
+        if st.button(label, key=f"book_{desk_key}",
                     help=f"Book {desk_display_name}"):
             st.session_state.booking_desk = (date, room, desk_num)
             st.rerun()
@@ -1095,24 +1341,63 @@ if 'app_loaded' not in st.session_state:
 # Check for modal triggers and display dialogs
 if st.session_state.get('show_add_user', False):
     st.session_state.show_add_user = False
-    add_user_dialog()
+    with span('dialog:add_user'):
+        add_user_dialog()
 
 if st.session_state.get('show_manage_users', False):
     st.session_state.show_manage_users = False
     # Import and call manage users dialog from sidebar module
     from sidebar_settings import manage_users_dialog
-    manage_users_dialog()
+    with span('dialog:manage_users'):
+        manage_users_dialog()
 
 if st.session_state.get('show_all_users', False):
     st.session_state.show_all_users = False
     # Import and call all users dialog from sidebar module
     from sidebar_settings import all_users_dialog
-    all_users_dialog()
+    with span('dialog:all_users'):
+        all_users_dialog()
 
 if st.session_state.get('show_holidays', False):
     st.session_state.show_holidays = False
     from sidebar_settings import holidays_dialog
-    holidays_dialog()
+    with span('dialog:holidays'):
+        holidays_dialog()
+
+if st.session_state.get('show_analytics', False):
+    st.session_state.show_analytics = False
+    from sidebar_settings import analytics_dialog
+    with span('dialog:analytics'):
+        analytics_dialog()
+
+if st.session_state.get('show_export', False):
+    st.session_state.show_export = False
+    from sidebar_settings import export_dialog
+    with span('dialog:export'):
+        export_dialog()
+
+if st.session_state.get('show_heatmap', False):
+    st.session_state.show_heatmap = False
+    from sidebar_settings import heatmap_dialog
+    with span('dialog:heatmap'):
+        heatmap_dialog()
+
+if st.session_state.get('show_find_desk', False):
+    st.session_state.show_find_desk = False
+    from sidebar_settings import find_desk_dialog
+    with span('dialog:find_desk'):
+        find_desk_dialog()
+
+if st.session_state.get('show_cancel_bookings', False):
+    st.session_state.show_cancel_bookings = False
+    with span('dialog:cancel_bookings'):
+        cancel_bookings_dialog()
+
+if st.session_state.get('show_team', False):
+    st.session_state.show_team = False
+    from sidebar_settings import team_dialog
+    with span('dialog:team'):
+        team_dialog()
 
 # WORKING: Template management dialog trigger with proper state handling
 if st.session_state.get('show_template_management', False):
@@ -1120,20 +1405,24 @@ if st.session_state.get('show_template_management', False):
     # WORKING FIX: Always reset to main view when opening dialog
     st.session_state.template_dialog_fresh_start = True
     from template_management import show_template_dialog
-    show_template_dialog()
+    with span('dialog:templates'):
+        show_template_dialog()
 
 if st.session_state.get('booking_desk'):
     date, room, desk_num = st.session_state.booking_desk
     st.session_state.booking_desk = None
-    book_desk_dialog(date, room, desk_num)
+    with span('dialog:book_desk'):
+        book_desk_dialog(date, room, desk_num)
 
 if st.session_state.get('show_settings', False):
     st.session_state.show_settings = False
-    settings_dialog()
+    with span('dialog:settings'):
+        settings_dialog()
 
 if st.session_state.get('show_desk_naming', False):
     st.session_state.show_desk_naming = False
-    desk_naming_dialog()
+    with span('dialog:desk_naming'):
+        desk_naming_dialog()
 
 # Room blocker dialog trigger
 if st.session_state.get('show_room_blocker', False):
@@ -1141,10 +1430,12 @@ if st.session_state.get('show_room_blocker', False):
     if st.session_state.blocking_room:
         date, room = st.session_state.blocking_room
         st.session_state.blocking_room = None
-        block_room_dialog(date, room)
+        with span('dialog:block_room'):
+            block_room_dialog(date, room)
 
 # Create sidebar using modular approach
-create_sidebar()
+with span('sidebar'):
+    create_sidebar()
 
 # Header with logo and title - OPTIMIZED
 header_container = st.container()
@@ -1181,16 +1472,37 @@ if st.session_state.team_news:
     </div>
     ''', unsafe_allow_html=True)
 
+# Undo handle of the latest batch cancellation
+if st.session_state.get('batch_cancel_undo'):
+    undo_col1, undo_col2, undo_col3 = st.columns([6, 1, 1])
+    with undo_col1:
+        st.info(st.session_state.batch_cancel_undo['summary'])
+    with undo_col2:
+        if st.button("↩ Undo", key="undo_batch_cancel", use_container_width=True):
+            restored, conflicts = undo_batch_cancel()
+            if conflicts:
+                st.session_state.batch_cancel_notice = (f"Restored {restored} booking(s); {conflicts} desk(s) "
+                                                        f"were booked by someone else in the meantime.")
+            st.rerun()
+    with undo_col3:
+        if st.button("✖", key="dismiss_batch_cancel", use_container_width=True):
+            st.session_state.batch_cancel_undo = None
+            st.rerun()
+
+if st.session_state.get('batch_cancel_notice'):
+    st.warning(st.session_state.batch_cancel_notice)
+    st.session_state.batch_cancel_notice = None
+
 st.markdown("---")
 
 # Week navigation controls
-# Smart week switching for Friday afternoon
-today = datetime.now()
-if today.weekday() == 4 and today.hour >= 14:  # Friday after 2pm
-    current_monday = today - timedelta(days=today.weekday())
-    if st.session_state.current_week_start == current_monday.date():
-        st.session_state.current_week_start = (today + timedelta(days=3)).date()
-        st.session_state.current_tab = 0
+# Smart week switching for Friday afternoon (sessions left open on the ending week)
+now = datetime.now()
+effective_current_week = booking_calendar.effective_week_start(now)
+if (booking_calendar.shows_next_week(now)
+        and st.session_state.current_week_start == booking_calendar.monday_of(now.date())):
+    st.session_state.current_week_start = effective_current_week
+    st.session_state.current_tab = 0
 
 # Week navigation buttons
 col1, col2, col3 = st.columns([1, 2, 1])
@@ -1205,21 +1517,8 @@ with col2:
     week_dates = get_week_dates(st.session_state.current_week_start)
     week_end = week_dates[-1]
 
-    # Determine if viewing current week
-    today = datetime.now().date()
-    current_monday = today - timedelta(days=today.weekday())
-
-    # Handle Friday afternoon / weekend logic
-    if (today.weekday() == 4 and datetime.now().hour >= 14) or today.weekday() >= 5:
-        days_until_monday = (7 - today.weekday()) % 7
-        if days_until_monday == 0:
-            days_until_monday = 7
-        next_monday = today + timedelta(days=days_until_monday)
-        effective_current_week = next_monday
-        is_current_week = st.session_state.current_week_start == next_monday
-    else:
-        effective_current_week = current_monday
-        is_current_week = st.session_state.current_week_start == current_monday
+    # Determine if viewing current week (next week from Friday afternoon)
+    is_current_week = st.session_state.current_week_start == effective_current_week
 
     # Display current week range (Swiss format)
     week_display = f"{st.session_state.current_week_start.strftime('%d.%m')} - {week_end.strftime('%d.%m.%Y')}"
@@ -1230,10 +1529,7 @@ with col2:
         st.markdown('<div style="display: flex; justify-content: center; margin-top: 10px;">', unsafe_allow_html=True)
         if st.button("↩ Return to Current Week", key="return_current", use_container_width=False):
             st.session_state.current_week_start = effective_current_week
-            if today.weekday() < 5:
-                st.session_state.current_tab = today.weekday()
-            else:
-                st.session_state.current_tab = 0
+            st.session_state.current_tab = booking_calendar.default_tab(now)
             st.rerun()
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -1260,19 +1556,24 @@ tab_container = st.container()
 with tab_container:
     st.markdown('<div class="centered-tabs">', unsafe_allow_html=True)
 
-    # Generate tab names with today indicator and holiday icons
+    # Generate tab names with today indicator, holiday icons and free desk badge
+    booking_counters = get_blocker_counters(week_dates[0])
+    calendar = get_calendar()
     tab_names = []
     for i, (day, date) in enumerate(zip(weekdays, week_dates)):
         date_key = format_date_key(date)
-        is_holiday = date_key in st.session_state.holidays
+        holiday = calendar.is_holiday(date)
 
         if date == today:
             tab_name = f"📍 {day[:3]} {date.strftime('%d.%m')}"
         else:
             tab_name = f"{day[:3]} {date.strftime('%d.%m')}"
 
-        if is_holiday:
+        if holiday:
             tab_name += " 🎉"
+        else:
+            free_desks, total_desks = booking_counters.free_desks(date_key)
+            tab_name += f" · {free_desks}/{total_desks} free"
 
         tab_names.append(tab_name)
 
@@ -1288,10 +1589,10 @@ with tab_container:
 
 # Render each day's office layout
 for tab_idx, (tab, date, weekday) in enumerate(zip(tabs, week_dates, weekdays)):
-    with tab:
+    with tab, span(f"tab:{weekday}"):
         is_today = date == today
         date_key = format_date_key(date)
-        is_holiday = date_key in st.session_state.holidays
+        holiday = calendar.is_holiday(date)
 
         # Create header row with date on left and user selection on right
         header_col1, header_col2, header_col3 = st.columns([2, 3, 2])
@@ -1303,10 +1604,11 @@ for tab_idx, (tab, date, weekday) in enumerate(zip(tabs, week_dates, weekdays)):
             else:
                 header_text = f"### {weekday}, {date.strftime('%d. %B %Y')}"
 
-            if is_holiday:
+            if holiday:
                 header_text += " 🎉"
                 st.markdown(header_text)
-                st.warning("⚠️ **Caution: This is a holiday**")
+                holiday_name = calendar.holiday_name(date)
+                st.warning(f"⚠️ **Caution: This is a holiday{f' ({holiday_name})' if holiday_name else ''}**")
             else:
                 st.markdown(header_text)
 
@@ -1386,7 +1688,10 @@ for tab_idx, (tab, date, weekday) in enumerate(zip(tabs, week_dates, weekdays)):
             klein_container = st.container()
             with klein_container:
                 # Just the room title - NO BLOCK BUTTON
-                st.markdown('<div class="room-title klein-title">Büro Klein</div>', unsafe_allow_html=True)
+                klein_free, klein_total = booking_counters.free_desks(date_key, "klein")
+                st.markdown(f'<div class="room-title klein-title">Büro Klein'
+                            f'<span class="room-free-badge">{klein_free}/{klein_total} free</span></div>',
+                            unsafe_allow_html=True)
 
                 # Show room block message if exists
                 klein_block_message = get_room_block_message(date, "klein")
@@ -1404,7 +1709,10 @@ for tab_idx, (tab, date, weekday) in enumerate(zip(tabs, week_dates, weekdays)):
             gross_container = st.container()
             with gross_container:
                 # Just the room title - NO BLOCK BUTTON
-                st.markdown('<div class="room-title gross-title">Büro Gross</div>', unsafe_allow_html=True)
+                gross_free, gross_total = booking_counters.free_desks(date_key, "gross")
+                st.markdown(f'<div class="room-title gross-title">Büro Gross'
+                            f'<span class="room-free-badge">{gross_free}/{gross_total} free</span></div>',
+                            unsafe_allow_html=True)
 
                 # Show room block message if exists
                 gross_block_message = get_room_block_message(date, "gross")
@@ -1418,8 +1726,10 @@ for tab_idx, (tab, date, weekday) in enumerate(zip(tabs, week_dates, weekdays)):
 
         # Daily bookings summary
         st.markdown("---")
-        daily_bookings = [booking for key, booking in st.session_state.bookings.items()
-                          if booking['date'] == format_date_key(date) and booking.get('entry_type') == 'desk_booking']
+        daily_bookings = [occupant
+                          for key in sorted(booking_counters.booking_keys_on(date_key))
+                          if st.session_state.bookings[key].get('entry_type') == 'desk_booking'
+                          for occupant in booking_slots.occupants(st.session_state.bookings[key])]
 
         if daily_bookings:
             st.markdown("**📋 Today's Bookings:**")
@@ -1468,4 +1778,10 @@ st.markdown('''
     <p>Built with ❤️ by <strong>Mathias Bäumli</strong> for the needs of the <strong>Testex Group BIIS Team</strong></p>
     <p class="footer-subtitle">© 2024 - Making office life easier, one desk at a time</p>
 </div>
-''', unsafe_allow_html=True)
\ No newline at end of file
+''', unsafe_allow_html=True)
+
+# Finish timing this run; Debug Mode shows the timing panel
+end_rerun()
+if st.session_state.debug_mode:
+    render_timing_panel()
+    render_memory_panel()
@@ -0,0 +1,302 @@
+"""
+BIIS Desk Booking System - Synthetic Data Generator
+Author: [Your Name]
+Date: [Date]
+Description: Writes realistic users/bookings/settings JSON files at scale
+
+DESIGN:
+- Deterministic for a given --seed, so benchmark runs are comparable
+- Bookings fill workdays backwards from a few weeks in the future, at most
+  --years back; the office only has 7 desks (about 1,500 desk-days a year),
+  so the history length follows the booking count and very large counts
+  need a longer span (scale tests only)
+- Mix of booking types, weekly templates, shared desks (an AM and a PM
+  booker in one entry), room blockers (fixed and custom times, up to
+  three non-overlapping ones per room and day) and archived DELETED_USER
+  bookings, in the app's storage format with keys from booking_core
+- Bookings are streamed to bookings.json entry by entry (no giant dict)
+
+USAGE:
+    python benchmarks/generate_data.py --out /tmp/biis-bench/data
+    python benchmarks/generate_data.py --users 500 --bookings 20000 --out /tmp/small/data
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. GENERATORS
+3. COMMAND LINE INTERFACE
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from booking_core.rules import ROOM_LAYOUT, DELETED_USER_ID, build_booking, get_booking_key  # noqa: E402
+from booking_core.blockers import BLOCKER_TIME_RANGES, build_room_blocker, get_room_blocker_key  # noqa: E402
+from booking_core.slots import SECOND_HALF_FIELD, combine_booking  # noqa: E402
+from booking_core.templates import WEEKDAY_KEYS  # noqa: E402
+from shared_functions import get_user_colors  # noqa: E402
+
+# Relative frequency of booking types
+BOOKING_TYPE_MIX = [('full_day', 70), ('half_am', 10), ('half_pm', 10), ('maybe', 10)]
+
+# Non-overlapping custom windows for days with several blockers in one room
+MULTI_BLOCKER_WINDOWS = [('08:00', '09:00'), ('10:00', '11:30'), ('13:00', '14:00'), ('16:00', '17:00')]
+
+# Other half of a half-day booking type, for shared desks
+OTHER_HALF = {'half_am': 'half_pm', 'half_pm': 'half_am'}
+
+DEFAULT_USERS = 10_000
+DEFAULT_BOOKINGS = 50_000
+DEFAULT_YEARS = 40
+DEFAULT_SEED = 42
+
+
+# ============================================================================
+# 2. GENERATORS
+# ============================================================================
+
+def generate_users(count: int, rng: random.Random, template_share: float = 0.2) -> Dict[str, Any]:
+    """Generate users, a share of them with 1-3 weekly templates"""
+    colors = get_user_colors()
+    booking_types = [booking_type for booking_type, _ in BOOKING_TYPE_MIX]
+    users = {}
+
+    for i in range(count):
+        user_id = f"{i:08x}"
+        user = {
+            'username': f"user{i:05d}",
+            'full_name': f"Synthetic User {i}",
+            'color': colors[i % len(colors)],
+            'avatar_path': None,
+            'created_date': datetime(2020, 1, 1).isoformat()
+        }
+
+        if rng.random() < template_share:
+            templates = {}
+            for t in range(rng.randint(1, 3)):
+                days = rng.sample(WEEKDAY_KEYS, rng.randint(1, 5))
+                templates[f"Template {t + 1}"] = {
+                    'name': f"Template {t + 1}",
+                    'schedule': {day: rng.choice(booking_types[:3]) for day in days},
+                    'created_at': datetime(2024, 1, 1).isoformat(),
+                    'updated_at': datetime(2024, 1, 1).isoformat(),
+                    'version': 1
+                }
+            user['templates'] = templates
+
+        users[user_id] = user
+
+    return users
+
+
+def _workdays_backwards(last_day: date, first_day: date) -> Iterator[date]:
+    """Yield Monday-Friday dates going back in time from last_day to first_day"""
+    current = last_day
+    while current >= first_day:
+        if current.weekday() < 5:
+            yield current
+        current -= timedelta(days=1)
+
+
+def _day_blockers(day: date, room: str, user_ids: List[str], rng: random.Random,
+                  created_at: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """One to three non-overlapping room blockers of a room and day"""
+    count = rng.choice([1, 1, 2, 3])
+    if count == 1:
+        blocker_type = rng.choice(list(BLOCKER_TIME_RANGES) + ['custom'])
+        windows = [('10:00', '11:30')]
+    else:
+        blocker_type = 'custom'
+        windows = sorted(rng.sample(MULTI_BLOCKER_WINDOWS, count))
+
+    blockers = []
+    for seq, (start_time, end_time) in enumerate(windows):
+        blocker = build_room_blocker(day, room, rng.choice(user_ids), blocker_type,
+                                     start_time, end_time, 'Workshop')
+        blocker['created_at'] = created_at
+        blockers.append((get_room_blocker_key(day, room, seq), blocker))
+    return blockers
+
+
+def iter_bookings(
+    users: Dict[str, Any],
+    booking_count: int,
+    rng: random.Random,
+    today: date,
+    years: int = DEFAULT_YEARS,
+    blocker_share: float = 0.02,
+    archive_share: float = 0.05,
+    occupancy: float = 0.8,
+    shared_share: float = 0.5
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield (key, entry) pairs in storage format, newest workday first.
+
+    Stops after booking_count bookings or when the history reaches years
+    back, whichever comes first.
+
+    Args:
+        users: Generated users (bookings reference their IDs)
+        booking_count: Number of desk bookings (occupants) to produce
+        rng: Seeded random generator
+        today: Reference date; bookings extend ~4 weeks past it
+        years: Longest history in years
+        blocker_share: Probability that a room is blocked on a day
+        archive_share: Share of past bookings archived as DELETED_USER
+        occupancy: Probability that a desk is booked on a workday
+        shared_share: Probability that a half-day booking shares its desk
+            with a booker of the other half
+    """
+    user_ids = list(users)
+    type_names = [booking_type for booking_type, _ in BOOKING_TYPE_MIX]
+    type_weights = [weight for _, weight in BOOKING_TYPE_MIX]
+    created_at = datetime(2024, 1, 1).isoformat()
+    produced = 0
+
+    def occupant(day: date, room: str, desk_num: int, booking_type: str) -> Dict[str, Any]:
+        """One booking of a random user, archived for a share of past days"""
+        user_id = rng.choice(user_ids)
+        booking = build_booking(day, room, desk_num, user_id, booking_type)
+        booking['created_at'] = created_at
+        if day < today and rng.random() < archive_share:
+            booking.update({
+                'user_id': DELETED_USER_ID,
+                'archived_username': users[user_id]['username'],
+                'archived_at': created_at,
+                'original_user_id': user_id
+            })
+        return booking
+
+    first_day = today - timedelta(days=round(years * 365.25))
+    for day in _workdays_backwards(today + timedelta(weeks=4), first_day):
+        for room, desk_count in ROOM_LAYOUT.items():
+            if rng.random() < blocker_share:
+                yield from _day_blockers(day, room, user_ids, rng, created_at)
+
+            for desk_num in range(1, desk_count + 1):
+                if rng.random() > occupancy:
+                    continue
+
+                booking_type = rng.choices(type_names, type_weights)[0]
+                entry = occupant(day, room, desk_num, booking_type)
+                produced += 1
+                if booking_type in OTHER_HALF and produced < booking_count and rng.random() < shared_share:
+                    entry = combine_booking(entry, occupant(day, room, desk_num, OTHER_HALF[booking_type]))
+                    produced += 1
+
+                yield get_booking_key(day, room, desk_num), entry
+                if produced >= booking_count:
+                    return
+
+
+def write_dataset(
+    data_dir: str,
+    user_count: int = DEFAULT_USERS,
+    booking_count: int = DEFAULT_BOOKINGS,
+    seed: int = DEFAULT_SEED,
+    today: Optional[date] = None,
+    years: int = DEFAULT_YEARS
+) -> Dict[str, Any]:
+    """
+    Write users.json, bookings.json and settings.json to a directory.
+
+    Returns:
+        Summary dict (counts, date range, parameters)
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    os.makedirs(data_dir, exist_ok=True)
+
+    users = generate_users(user_count, rng)
+    with open(os.path.join(data_dir, 'users.json'), 'w', encoding='utf-8') as f:
+        json.dump(users, f, ensure_ascii=False)
+
+    # Stream bookings as a JSON object without holding them all in memory
+    entries = bookings = shared = blockers = archived = 0
+    first_date = last_date = None
+    with open(os.path.join(data_dir, 'bookings.json'), 'w', encoding='utf-8') as f:
+        f.write('{')
+        for key, entry in iter_bookings(users, booking_count, rng, today, years):
+            f.write(',' if entries else '')
+            f.write(f"\n{json.dumps(key)}: {json.dumps(entry, ensure_ascii=False)}")
+            entries += 1
+            if entry['entry_type'] == 'room_blocker':
+                blockers += 1
+            else:
+                second = entry.get(SECOND_HALF_FIELD)
+                bookings += 2 if second else 1
+                shared += bool(second)
+                archived += (second or {}).get('user_id') == DELETED_USER_ID
+            archived += entry['user_id'] == DELETED_USER_ID
+            first_date = entry['date']
+            last_date = last_date or entry['date']
+        f.write('\n}')
+
+    holidays = {}
+    for year in range(today.year - 2, today.year + 2):
+        for month, day in ((1, 1), (8, 1), (12, 25), (12, 26)):
+            key = date(year, month, day).isoformat()
+            holidays[key] = {'date': key, 'display_date': date(year, month, day).strftime('%d.%m.%Y'),
+                             'added_date': datetime(2024, 1, 1).isoformat()}
+
+    settings = {
+        'team_news': 'Synthetic benchmark data',
+        'desk_names': {f"{room}_1": f"{room.capitalize()} Window" for room in ROOM_LAYOUT},
+        'holidays': holidays,
+        'updated': datetime(2024, 1, 1).isoformat()
+    }
+    with open(os.path.join(data_dir, 'settings.json'), 'w', encoding='utf-8') as f:
+        json.dump(settings, f, ensure_ascii=False, indent=2)
+
+    return {
+        'users': user_count,
+        'bookings': bookings,
+        'shared_desks': shared,
+        'blockers': blockers,
+        'archived': archived,
+        'first_date': first_date,
+        'last_date': last_date,
+        'seed': seed,
+        'today': today.isoformat()
+    }
+
+
+# ============================================================================
+# 3. COMMAND LINE INTERFACE
+# ============================================================================
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the generator command line parser"""
+    parser = argparse.ArgumentParser(description="Generate synthetic BIIS booking data")
+    parser.add_argument('--out', required=True, help="Target data directory")
+    parser.add_argument('--users', type=int, default=DEFAULT_USERS)
+    parser.add_argument('--bookings', type=int, default=DEFAULT_BOOKINGS)
+    parser.add_argument('--years', type=int, default=DEFAULT_YEARS,
+                        help="Longest history in years (the office has 7 desks, so large --bookings need more)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--today', type=lambda value: datetime.strptime(value, '%Y-%m-%d').date(),
+                        help="Reference date (default: today)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    args = build_parser().parse_args(argv)
+    summary = write_dataset(args.out, args.users, args.bookings, args.seed, args.today, args.years)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+BIIS Desk Booking System - Import Time Report
+Author: [Your Name]
+Date: [Date]
+Description: Measures module import cost and fails when a budget is exceeded
+
+DESIGN:
+- Each module is imported in a fresh interpreter with -X importtime
+- Interpreter start-up imports (site, encodings, ...) are subtracted
+- The best of several runs is reported to reduce noise
+- Budgets (max ms + modules that must stay lazy) live in import_budget.json
+
+USAGE:
+    python benchmarks/import_times.py                 # report + budget check
+    python benchmarks/import_times.py --top 15        # show heaviest imports
+    python benchmarks/import_times.py booking_core    # single module
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. MEASUREMENT
+3. BUDGET CHECK
+4. COMMAND LINE INTERFACE
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'import_budget.json')
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)')
+
+
+# ============================================================================
+# 2. MEASUREMENT
+# ============================================================================
+
+def _run_importtime(statement: str) -> List[Tuple[int, int, int, str]]:
+    """Run a statement with -X importtime and parse (self_us, cumulative_us, depth, module)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else statement)
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append((int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2, match.group(4)))
+    return entries
+
+
+def _startup_modules() -> Set[str]:
+    """Modules the interpreter imports before running any code"""
+    return {entry[3] for entry in _run_importtime('pass')}
+
+
+def measure_module(module: str, startup: Set[str], runs: int = 3) -> Dict[str, Any]:
+    """
+    Measure the import cost of one module.
+
+    Args:
+        module: Module name to import
+        startup: Start-up modules to exclude
+        runs: Number of fresh-interpreter runs (the fastest is kept)
+
+    Returns:
+        Dict with 'total_ms', 'modules' (all imported names) and 'heaviest'
+        (list of (cumulative ms, module) for top-level imports)
+    """
+    best = None
+    for _ in range(runs):
+        entries = [entry for entry in _run_importtime(f"import {module}") if entry[3] not in startup]
+        # Top-level entries have the smallest indentation; their cumulative times add up
+        top_level = [entry for entry in entries if entry[2] == 0]
+        total_us = sum(entry[1] for entry in top_level)
+        if best is None or total_us < best[0]:
+            best = (total_us, entries, top_level)
+
+    total_us, entries, top_level = best
+    return {
+        'total_ms': total_us / 1000,
+        'modules': {entry[3] for entry in entries},
+        'heaviest': sorted(((entry[1] / 1000, entry[3]) for entry in entries if entry[2] <= 1), reverse=True)
+    }
+
+
+# ============================================================================
+# 3. BUDGET CHECK
+# ============================================================================
+
+def check_budget(module: str, measurement: Dict[str, Any], budget: Dict[str, Any]) -> List[str]:
+    """
+    Compare a measurement against its budget.
+
+    Returns:
+        List of violations (empty when within budget)
+    """
+    violations = []
+    max_ms = budget.get('max_ms')
+    if max_ms is not None and measurement['total_ms'] > max_ms:
+        violations.append(f"{module}: {measurement['total_ms']:.0f} ms exceeds budget of {max_ms} ms")
+
+    imported_roots = {name.split('.')[0] for name in measurement['modules']}
+    for forbidden in budget.get('forbid', []):
+        if forbidden in imported_roots:
+            violations.append(f"{module}: imports '{forbidden}' eagerly (must stay lazy)")
+    return violations
+
+
+def load_budgets(filepath: str = BUDGET_FILE) -> Dict[str, Dict[str, Any]]:
+    """Load per-module budgets"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ============================================================================
+# 4. COMMAND LINE INTERFACE
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Import time report and budget check")
+    parser.add_argument('modules', nargs='*', help="Modules to measure (default: all budgeted modules)")
+    parser.add_argument('--runs', type=int, default=3, help="Runs per module (fastest is kept)")
+    parser.add_argument('--top', type=int, default=0, help="Show the N heaviest imports per module")
+    parser.add_argument('--json', dest='json_output', help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    budgets = load_budgets()
+    modules = args.modules or list(budgets)
+    startup = _startup_modules()
+
+    results, violations = {}, []
+    print(f"{'module':<24}{'import ms':>10}{'budget ms':>11}")
+    for module in modules:
+        measurement = measure_module(module, startup, args.runs)
+        budget = budgets.get(module, {})
+        results[module] = {'total_ms': round(measurement['total_ms'], 1), 'budget_ms': budget.get('max_ms')}
+        print(f"{module:<24}{measurement['total_ms']:>10.1f}{str(budget.get('max_ms', '-')):>11}")
+
+        for ms, name in measurement['heaviest'][:args.top]:
+            print(f"    {ms:>8.1f}  {name}")
+
+        violations.extend(check_budget(module, measurement, budget))
+
+    if args.json_output:
+        with open(args.json_output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if violations:
+        print("\nImport budget exceeded:")
+        for violation in violations:
+            print(f"  - {violation}")
+        return 1
+
+    print("\nAll modules within import budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
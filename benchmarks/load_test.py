@@ -0,0 +1,442 @@
+"""
+BIIS Desk Booking System - Concurrent Session Load Test
+Author: [Your Name]
+Date: [Date]
+Description: Drives many simulated browser sessions through the app and measures capacity
+
+DESIGN:
+- Every simulated session is a streamlit.testing AppTest instance running
+  the real app.py in its own thread, all against one temporary data
+  directory (copied from --data or generated with generate_data.py)
+- Sessions pick a user and then perform a seeded random mix of actions
+  through the UI: book a free desk, cancel one of their bookings, apply a
+  weekly template and navigate between weeks
+- Every script run is timed. AppTest has no fragment reruns, so each
+  interaction inside the booking dialog re-opens it through its session
+  flag and reruns the whole script (an upper bound for the browser cost)
+- The template dialog resets to its main view whenever it is reopened, so
+  it cannot be driven that way; template applications go through the
+  BookingStore instead, like the API and admin CLI, which also exercises
+  writers outside the Streamlit sessions
+- Each session remembers what it booked and cancelled; after the run the
+  data files on disk are compared against that, so bookings that vanished
+  or came back (another session saved a stale copy over them) are reported
+  as lost updates
+- Writes are counted through the data generation number every save bumps
+
+USAGE:
+    python benchmarks/load_test.py --sessions 8 --actions 25
+    python benchmarks/load_test.py --data /tmp/biis-bench/data --sessions 16 --output load.json
+    python benchmarks/load_test.py --sessions 8 --max-lost 0   # exit 1 on any lost update
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. SIMULATED SESSION
+3. LOAD RUN & REPORTING
+4. COMMAND LINE INTERFACE
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional, Set
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from booking_core.snapshot import SNAPSHOT_FILE, GENERATION_FILE, read_generation  # noqa: E402
+from booking_core.store import get_store, load_data_files  # noqa: E402
+from booking_core.templates import get_future_weeks, validate_template_application, build_template_bookings  # noqa: E402
+
+APP_PATH = os.path.join(REPO_ROOT, 'app.py')
+
+# Relative frequency of session actions
+ACTION_MIX = [('book', 45), ('cancel', 20), ('navigate', 25), ('template', 10)]
+
+# Sessions stay within this many weeks of the start week
+MAX_WEEK_OFFSET = 2
+
+PERCENTILES = (50, 90, 95, 99)
+
+_COMPILE_LOCK = threading.Lock()
+
+
+def _serialize_script_compilation() -> None:
+    """
+    Let only one thread at a time parse app.py.
+
+    AppTest compiles the script on every run, and concurrent ast.parse calls
+    can fail on CPython 3.11 ("AST constructor recursion depth mismatch").
+    A running server compiles once and caches, so serialising the parse does
+    not distort the measurement.
+    """
+    from streamlit.runtime.scriptrunner import magic
+
+    if getattr(magic.add_magic, '_load_test_locked', False):
+        return
+    add_magic = magic.add_magic
+
+    def locked_add_magic(code, script_path):
+        with _COMPILE_LOCK:
+            return add_magic(code, script_path)
+
+    locked_add_magic._load_test_locked = True
+    magic.add_magic = locked_add_magic
+
+
+# ============================================================================
+# 2. SIMULATED SESSION
+# ============================================================================
+
+class SimulatedSession:
+    """One browser session driving the app through AppTest"""
+
+    def __init__(self, index: int, user_id: str, seed: int, timeout: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.user_id = user_id
+        self.username = ''
+        self.rng = random.Random(seed)
+        self.app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.week_offset = 0
+
+        self.latencies_ms: List[float] = []
+        self.store_latencies_ms: List[float] = []
+        self.actions: Dict[str, int] = {}
+        self.errors: List[str] = []
+        self.booked: Dict[str, str] = {}  # booking key -> user_id we expect on disk
+        self.cancelled: Set[str] = set()
+
+    # Script runs -----------------------------------------------------------
+
+    def _run(self, element=None) -> None:
+        """Run the script (or the fragment of a clicked element) and time it"""
+        start = time.perf_counter()
+        if element is None:
+            self.app.run()
+        else:
+            element.run()
+        self.latencies_ms.append((time.perf_counter() - start) * 1000)
+        if self.app.exception:
+            raise RuntimeError(self.app.exception[0].message)
+
+    def _buttons(self, prefix: str) -> list:
+        return [button for button in self.app.button if button.key and button.key.startswith(prefix)]
+
+    def _bookings(self) -> Dict[str, Any]:
+        return self.app.session_state['bookings']
+
+    def _in_booking_dialog(self, element, booking_desk: tuple) -> None:
+        """Interact with the booking dialog, keeping it open for the rerun"""
+        self.app.session_state['booking_desk'] = booking_desk
+        self._run(element)
+
+    def start(self) -> None:
+        """First page load"""
+        self._run()
+        self.username = self.app.session_state['users'][self.user_id]['username']
+
+    # Actions ---------------------------------------------------------------
+
+    def book(self) -> bool:
+        """Book a random free desk in the visible week"""
+        buttons = self._buttons('book_')
+        if not buttons:
+            return False
+
+        button = self.rng.choice(buttons)
+        _, room, desk_num, date_key = button.key.split('_', 3)
+        booking_key = f"{date_key}_{room}_{desk_num}"
+
+        booking_desk = (date.fromisoformat(date_key), room, int(desk_num))
+
+        self._run(button.click())
+        user_select = [selectbox for selectbox in self.app.selectbox if selectbox.key == 'book_desk_user_select']
+        if not user_select:
+            return False
+        if user_select[0].value != self.username:
+            self._in_booking_dialog(user_select[0].select(self.username), booking_desk)
+        confirm = self._buttons('dialog_confirm_booking')
+        if not confirm:
+            return False
+        self._in_booking_dialog(confirm[0].click(), booking_desk)
+
+        booking = self._bookings().get(booking_key)
+        if booking and booking.get('user_id') == self.user_id:
+            self.booked[booking_key] = self.user_id
+            self.cancelled.discard(booking_key)
+            return True
+        return False
+
+    def cancel(self) -> bool:
+        """Cancel one of our own bookings in the visible week"""
+        bookings = self._bookings()
+        own = []
+        for button in self._buttons('cancel_'):
+            _, room, desk_num, date_key = button.key.split('_', 3)
+            booking_key = f"{date_key}_{room}_{desk_num}"
+            if bookings.get(booking_key, {}).get('user_id') == self.user_id:
+                own.append((button, booking_key))
+        if not own:
+            return False
+
+        button, booking_key = self.rng.choice(own)
+        desk_key = button.key[len('cancel_'):]
+        self._run(button.click())
+        confirm = self._buttons(f"yes_{desk_key}")
+        if not confirm:
+            return False
+        self._run(confirm[0].click())
+
+        if booking_key not in self._bookings():
+            self.booked.pop(booking_key, None)
+            self.cancelled.add(booking_key)
+            return True
+        return False
+
+    def navigate(self) -> bool:
+        """Move one week forward or back, staying near the start week"""
+        forward = self.week_offset <= -MAX_WEEK_OFFSET or (
+            self.week_offset < MAX_WEEK_OFFSET and self.rng.random() < 0.5)
+        label = "Next Week →" if forward else "← Previous Week"
+        buttons = [button for button in self.app.button if button.label == label]
+        if not buttons:
+            return False
+        self._run(buttons[0].click())
+        self.week_offset += 1 if forward else -1
+        return True
+
+    def apply_template(self) -> bool:
+        """Apply the user's first template to a random future week via the store"""
+        store = get_store('data')
+        templates = store.users.get(self.user_id, {}).get('templates')
+        if not templates:
+            return False
+        schedule = next(iter(templates.values()))['schedule']
+        week_start, _ = self.rng.choice(get_future_weeks(5))
+
+        start = time.perf_counter()
+        with store.transaction('bookings') as data:
+            validation = validate_template_application(data['bookings'], week_start, schedule)
+            desk_selections = {}
+            for weekday, info in validation['valid_days'].items():
+                room, availability = next((room, availability) for room, availability
+                                          in info['availability'].items() if availability['available_desks'])
+                desk_selections[weekday] = {'date': info['date'], 'room': room,
+                                            'desk': availability['available_desks'][0],
+                                            'booking_type': info['booking_type']}
+            created = build_template_bookings(self.user_id, desk_selections, data['bookings'])
+            data['bookings'].update(created)
+        self.store_latencies_ms.append((time.perf_counter() - start) * 1000)
+
+        for booking_key in created:
+            self.booked[booking_key] = self.user_id
+            self.cancelled.discard(booking_key)
+        return bool(created)
+
+    def perform(self, action: str) -> None:
+        """Run one named action and count its outcome"""
+        handler = {'book': self.book, 'cancel': self.cancel,
+                   'navigate': self.navigate, 'template': self.apply_template}[action]
+        try:
+            done = handler()
+        except Exception as e:  # Keep the other sessions going
+            self.errors.append(f"{action}: {e}")
+            self.app = self.app.__class__.from_file(APP_PATH, default_timeout=self.app.default_timeout)
+            self.week_offset = 0
+            self.start()
+            return
+        outcome = action if done else f"{action}_skipped"
+        self.actions[outcome] = self.actions.get(outcome, 0) + 1
+
+
+# ============================================================================
+# 3. LOAD RUN & REPORTING
+# ============================================================================
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    """Latency percentiles in milliseconds"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    result = {f"p{p}": round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))], 1)
+              for p in PERCENTILES}
+    result['mean'] = round(statistics.mean(ordered), 1)
+    result['max'] = round(ordered[-1], 1)
+    return result
+
+
+def count_lost_updates(sessions: List[SimulatedSession], bookings: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Compare what the sessions did with the bookings on disk.
+
+    Returns:
+        Dict with 'missing' (our booking gone or owned by someone else),
+        'resurrected' (a cancelled booking is back) and 'total'
+    """
+    missing = resurrected = 0
+    for session in sessions:
+        for booking_key, user_id in session.booked.items():
+            if bookings.get(booking_key, {}).get('user_id') != user_id:
+                missing += 1
+        for booking_key in session.cancelled:
+            if bookings.get(booking_key, {}).get('user_id') == session.user_id:
+                resurrected += 1
+    return {'missing': missing, 'resurrected': resurrected, 'total': missing + resurrected}
+
+
+def run_load_test(
+    work_dir: str,
+    session_count: int,
+    actions_per_session: int,
+    seed: int,
+    timeout: float
+) -> Dict[str, Any]:
+    """
+    Run the sessions concurrently in work_dir and collect the results.
+
+    Args:
+        work_dir: Directory containing the 'data' directory (becomes the cwd)
+        session_count: Number of concurrent sessions
+        actions_per_session: Actions each session performs after loading
+        seed: Seed for user choice and action mix
+        timeout: Per script run timeout in seconds
+
+    Returns:
+        Report dict (latency, throughput, lost updates, action counts)
+    """
+    data_dir = os.path.join(work_dir, 'data')
+    rng = random.Random(seed)
+    users = load_data_files(data_dir)['users']
+    with_templates = [user_id for user_id, user in users.items() if user.get('templates')]
+    candidates = with_templates if len(with_templates) >= session_count else list(users)
+    user_ids = rng.sample(candidates, min(session_count, len(candidates)))
+    if not user_ids:
+        raise ValueError("The data set has no users")
+
+    action_names = [name for name, _ in ACTION_MIX]
+    action_weights = [weight for _, weight in ACTION_MIX]
+    plans = [rng.choices(action_names, action_weights, k=actions_per_session) for _ in range(session_count)]
+
+    _serialize_script_compilation()
+    sessions = [SimulatedSession(i, user_ids[i % len(user_ids)], seed + i, timeout) for i in range(session_count)]
+    for session in sessions:
+        session.start()
+
+    start_generation = read_generation(data_dir)
+    barrier = threading.Barrier(session_count)
+
+    def drive(session: SimulatedSession, plan: List[str]) -> None:
+        barrier.wait()
+        for action in plan:
+            session.perform(action)
+
+    threads = [threading.Thread(target=drive, args=(session, plan), daemon=True)
+               for session, plan in zip(sessions, plans)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    writes = read_generation(data_dir) - start_generation
+    final_bookings = load_data_files(data_dir)['bookings']
+
+    actions: Dict[str, int] = {}
+    for session in sessions:
+        for name, count in session.actions.items():
+            actions[name] = actions.get(name, 0) + count
+    latencies = [latency for session in sessions for latency in session.latencies_ms]
+
+    return {
+        'elapsed_s': round(elapsed, 2),
+        'script_runs': len(latencies),
+        'rerun_latency_ms': _percentiles(latencies),
+        'store_write_latency_ms': _percentiles(
+            [latency for session in sessions for latency in session.store_latencies_ms]),
+        'writes': writes,
+        'writes_per_s': round(writes / elapsed, 2) if elapsed else 0.0,
+        'lost_updates': count_lost_updates(sessions, final_bookings),
+        'actions': dict(sorted(actions.items())),
+        'errors': [error for session in sessions for error in session.errors][:20]
+    }
+
+
+# ============================================================================
+# 4. COMMAND LINE INTERFACE
+# ============================================================================
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the load test command line parser"""
+    parser = argparse.ArgumentParser(description="Concurrent session load test for the booking app")
+    parser.add_argument('--data', help="Data directory to copy (default: generate a small data set)")
+    parser.add_argument('--sessions', type=int, default=8)
+    parser.add_argument('--actions', type=int, default=25, help="Actions per session")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--timeout', type=float, default=120.0, help="Per script run timeout in seconds")
+    parser.add_argument('--output', help="Write the report JSON to this file")
+    parser.add_argument('--max-lost', type=int, help="Exit 1 when more lost updates than this occur")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    args = build_parser().parse_args(argv)
+    previous_cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory(prefix='biis-load-') as work_dir:
+        data_dir = os.path.join(work_dir, 'data')
+        if args.data:
+            shutil.copytree(os.path.abspath(args.data), data_dir,
+                            ignore=shutil.ignore_patterns(SNAPSHOT_FILE, GENERATION_FILE))
+            dataset = {'source': os.path.abspath(args.data)}
+        else:
+            from benchmarks.generate_data import write_dataset
+            dataset = write_dataset(data_dir, user_count=max(50, args.sessions), booking_count=2000,
+                                    seed=args.seed)
+
+        # The app always reads and writes the relative 'data' directory
+        os.chdir(work_dir)
+        try:
+            results = run_load_test(work_dir, args.sessions, args.actions, args.seed, args.timeout)
+        finally:
+            os.chdir(previous_cwd)
+
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sessions': args.sessions,
+        'actions_per_session': args.actions,
+        'seed': args.seed,
+        'dataset': dataset,
+        **results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+    if args.max_lost is not None and results['lost_updates']['total'] > args.max_lost:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,347 @@
+"""
+BIIS Desk Booking System - Benchmark Suite
+Author: [Your Name]
+Date: [Date]
+Description: Times the hot paths against a synthetic data set and writes comparable JSON
+
+DESIGN:
+- Works on a throwaway copy of a generated data directory (see
+  generate_data.py) and chdirs into it, because the app and
+  save_data_utility always use the relative 'data' directory
+- Each benchmark runs a setup step outside the timed region (e.g. copying
+  the bookings before a destructive delete), then the timed call
+- Results report min/median/max milliseconds over --repeat runs plus the
+  data set parameters, Python version and git commit, so two JSON files from
+  different commits can be compared with --compare
+- load_data_cached is measured through what it does: the loader (cold
+  JSON parse, warm snapshot) and the copy each new session takes of the
+  shared st.cache_resource data (bookings shallow, users/settings deep)
+- render_desk cannot be called outside a running script (app.py renders at
+  import), so the render benchmark times full page reruns through
+  streamlit.testing AppTest (7 desks x 5 weekdays per rerun); --skip-render
+  leaves it out
+
+USAGE:
+    python benchmarks/generate_data.py --out /tmp/biis-bench/data
+    python benchmarks/run_benchmarks.py --data /tmp/biis-bench/data --output before.json
+    python benchmarks/run_benchmarks.py --data /tmp/biis-bench/data --compare before.json
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. TIMING HELPERS
+3. BENCHMARKS
+4. REPORTING
+5. COMMAND LINE INTERFACE
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import argparse
+import copy
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional, Callable
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from booking_core.counters import OccupancyCounters  # noqa: E402
+from booking_core.snapshot import SNAPSHOT_FILE, load_data_warm  # noqa: E402
+from booking_core.store import load_data_files  # noqa: E402
+from booking_core.templates import validate_template_application  # noqa: E402
+from shared_functions import save_data_utility, delete_user_and_handle_bookings_utility  # noqa: E402
+
+RESULT_FORMAT = 1
+DEFAULT_REPEAT = 5
+
+
+# ============================================================================
+# 2. TIMING HELPERS
+# ============================================================================
+
+def measure(
+    function: Callable[[Any], Any],
+    repeat: int,
+    setup: Optional[Callable[[], Any]] = None
+) -> Dict[str, Any]:
+    """
+    Time function(setup()) repeat times; setup is not timed.
+
+    Returns:
+        Dict with runs, min_ms, median_ms and max_ms
+    """
+    timings = []
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        gc.collect()
+        start = time.perf_counter()
+        function(argument)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'runs': repeat,
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'max_ms': round(max(timings), 3)
+    }
+
+
+def _remove_snapshot(data_dir: str) -> None:
+    """Delete the warm-start snapshot so the next load parses JSON"""
+    try:
+        os.remove(os.path.join(data_dir, SNAPSHOT_FILE))
+    except FileNotFoundError:
+        pass
+
+
+# ============================================================================
+# 3. BENCHMARKS
+# ============================================================================
+
+def bench_load(data_dir: str, repeat: int) -> Dict[str, Any]:
+    """Loader behind load_data_cached: JSON parse, snapshot, cache-hit copy"""
+    results = {
+        'load_json_files': measure(lambda _: load_data_files(data_dir), repeat),
+        'load_data_warm_cold': measure(lambda _: load_data_warm(data_dir, write=False), repeat,
+                                       setup=lambda: _remove_snapshot(data_dir)),
+        # Reload in the app after a save: no counters, no snapshot write
+        'load_data_app_reload': measure(lambda _: load_data_warm(data_dir, write=False, counters=False), repeat,
+                                        setup=lambda: _remove_snapshot(data_dir))
+    }
+
+    load_data_warm(data_dir)  # Write the snapshot once
+    results['load_data_warm_snapshot'] = measure(lambda _: load_data_warm(data_dir), repeat)
+
+    # st.cache_resource shares the records; sessions copy the containers
+    warm = load_data_warm(data_dir)
+    results['load_data_session_copy'] = measure(
+        lambda _: (copy.deepcopy(warm['users']), dict(warm['bookings']), copy.deepcopy(warm['settings'])),
+        repeat
+    )
+    return results
+
+
+def bench_save(data: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """save_data_utility writing all three files to ./data"""
+    settings = data['settings']
+    return {
+        'save_data_utility': measure(
+            lambda _: save_data_utility(data['users'], data['bookings'], settings.get('team_news', ''),
+                                        settings.get('desk_names', {}), settings.get('holidays', {}),
+                                        settings.get('blocker_rules', {})),
+            repeat
+        )
+    }
+
+
+def bench_delete_user(data: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """delete_user_and_handle_bookings_utility on a copy, with and without counters"""
+    counts: Dict[str, int] = {}
+    for booking in data['bookings'].values():
+        counts[booking.get('user_id')] = counts.get(booking.get('user_id'), 0) + 1
+    user_id = max((uid for uid in counts if uid in data['users']), key=counts.get)
+
+    def fresh_copy(with_counters: bool):
+        users = dict(data['users'])
+        bookings = dict(data['bookings'])
+        counters = OccupancyCounters(bookings) if with_counters else None
+        return users, bookings, counters
+
+    def delete(arguments):
+        users, bookings, counters = arguments
+        # Avatar paths are None in generated data, so no file is touched
+        delete_user_and_handle_bookings_utility(user_id, users, bookings, counters)
+
+    return {
+        'delete_user': measure(delete, repeat, setup=lambda: fresh_copy(False)),
+        'delete_user_with_counters': measure(delete, repeat, setup=lambda: fresh_copy(True))
+    }
+
+
+def bench_templates(data: Dict[str, Any], today: date, repeat: int) -> Dict[str, Any]:
+    """validate_template_application over the next five weeks"""
+    schedule = {'monday': 'full_day', 'tuesday': 'half_am', 'wednesday': 'full_day',
+                'thursday': 'half_pm', 'friday': 'full_day'}
+    monday = today - timedelta(days=today.weekday())
+
+    def validate(_):
+        for week in range(5):
+            validate_template_application(data['bookings'], monday + timedelta(weeks=week), schedule, today)
+
+    return {'validate_template_application_5_weeks': measure(validate, repeat)}
+
+
+def bench_daily_scan(data: Dict[str, Any], today: date, repeat: int) -> Dict[str, Any]:
+    """One week of daily booking lookups and a month range: full scan vs. indexes"""
+    bookings = data['bookings']
+    monday = today - timedelta(days=today.weekday())
+    date_keys = [(monday + timedelta(days=i)).isoformat() for i in range(5)]
+    counters = OccupancyCounters(bookings)
+
+    def full_scan(_):
+        for date_key in date_keys:
+            [booking for booking in bookings.values()
+             if booking.get('date') == date_key and booking.get('entry_type') == 'desk_booking']
+
+    def indexed(_):
+        for date_key in date_keys:
+            [bookings[key] for key in sorted(counters.booking_keys_on(date_key))
+             if bookings[key].get('entry_type') == 'desk_booking']
+
+    month_start, month_end = monday - timedelta(days=28), monday + timedelta(days=4)
+
+    def month_scan(_):
+        sorted(key for key, booking in bookings.items()
+               if month_start.isoformat() <= booking.get('date', '') <= month_end.isoformat()
+               and booking.get('room') == 'gross')
+
+    return {
+        'daily_bookings_full_scan_week': measure(full_scan, repeat),
+        'daily_bookings_indexed_week': measure(indexed, repeat),
+        'room_month_full_scan': measure(month_scan, repeat),
+        'room_month_key_slice': measure(lambda _: counters.keys_between(month_start, month_end, 'gross'), repeat),
+        'build_occupancy_counters': measure(lambda _: OccupancyCounters(bookings), repeat)
+    }
+
+
+def bench_render(repeat: int) -> Dict[str, Any]:
+    """Full page reruns (35 render_desk calls each) through AppTest"""
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return {}
+
+    app_test = AppTest.from_file(os.path.join(REPO_ROOT, 'app.py'), default_timeout=600)
+    start = time.perf_counter()
+    app_test.run()
+    first_run_ms = (time.perf_counter() - start) * 1000
+    if app_test.exception:
+        raise RuntimeError(f"App raised during benchmark: {app_test.exception}")
+
+    result = {'page_rerun': measure(lambda _: app_test.run(), repeat)}
+    result['page_first_run'] = {'runs': 1, 'min_ms': round(first_run_ms, 3),
+                                'median_ms': round(first_run_ms, 3), 'max_ms': round(first_run_ms, 3)}
+    return result
+
+
+# ============================================================================
+# 4. REPORTING
+# ============================================================================
+
+def _git_commit() -> Optional[str]:
+    """Current commit of the repository, if available"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def dataset_info(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Size parameters of the data set under test"""
+    bookings = data['bookings']
+    blockers = sum(1 for booking in bookings.values() if booking.get('entry_type') == 'room_blocker')
+    archived = sum(1 for booking in bookings.values() if booking.get('user_id') == 'DELETED_USER')
+    return {
+        'users': len(data['users']),
+        'bookings': len(bookings) - blockers,
+        'blockers': blockers,
+        'archived': archived,
+        'holidays': len(data['settings'].get('holidays', {}))
+    }
+
+
+def print_comparison(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print median deltas against a previous result file"""
+    if baseline.get('dataset') != results.get('dataset'):
+        print("Warning: baseline was measured on a different data set")
+
+    print(f"{'benchmark':<42} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, current in results['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous:
+            print(f"{name:<42} {'-':>12} {current['median_ms']:>10.1f}ms {'new':>9}")
+            continue
+        change = (current['median_ms'] - previous['median_ms']) / previous['median_ms'] * 100 \
+            if previous['median_ms'] else 0.0
+        print(f"{name:<42} {previous['median_ms']:>10.1f}ms {current['median_ms']:>10.1f}ms {change:>+8.1f}%")
+
+
+# ============================================================================
+# 5. COMMAND LINE INTERFACE
+# ============================================================================
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the benchmark command line parser"""
+    parser = argparse.ArgumentParser(description="Benchmark BIIS hot paths on a data set")
+    parser.add_argument('--data', required=True, help="Data directory (e.g. from generate_data.py); not modified")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--today', type=lambda value: datetime.strptime(value, '%Y-%m-%d').date(),
+                        default=date.today(), help="Reference date (default: today)")
+    parser.add_argument('--skip-render', action='store_true', help="Skip the AppTest page rerun benchmark")
+    parser.add_argument('--output', help="Write results JSON to this file")
+    parser.add_argument('--compare', help="Previous results JSON to compare against")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    args = build_parser().parse_args(argv)
+    source_dir = os.path.abspath(args.data)
+    previous_cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory(prefix='biis-bench-') as work_dir:
+        data_dir = os.path.join(work_dir, 'data')
+        shutil.copytree(source_dir, data_dir, ignore=shutil.ignore_patterns(SNAPSHOT_FILE, '.generation'))
+        os.chdir(work_dir)
+        try:
+            data = load_data_files(data_dir)
+            results: Dict[str, Any] = {}
+            results.update(bench_load(data_dir, args.repeat))
+            results.update(bench_daily_scan(data, args.today, args.repeat))
+            results.update(bench_templates(data, args.today, args.repeat))
+            results.update(bench_delete_user(data, args.repeat))
+            results.update(bench_save(copy.copy(data), args.repeat))
+            if not args.skip_render:
+                results.update(bench_render(args.repeat))
+        finally:
+            os.chdir(previous_cwd)
+
+    report = {
+        'format': RESULT_FORMAT,
+        'created_at': datetime.now().isoformat(),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'today': args.today.isoformat(),
+        'dataset': dataset_info(data),
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print_comparison(report, json.load(f))
+    else:
+        for name, result in results.items():
+            print(f"{name:<42} median {result['median_ms']:>10.1f}ms  (min {result['min_ms']:.1f}, max {result['max_ms']:.1f})")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,543 @@
+"""
+BIIS Desk Booking System - Admin CLI
+Author: [Your Name]
+Date: [Date]
+Description: Command-line bulk operations on the data directory
+
+DESIGN:
+- Uses the same BookingStore as the JSON API (booking_core.store)
+- Every mutating command runs in one store transaction: all changes are
+  validated in memory and each touched file is written once, atomically
+- --dry-run runs the same code and discards the changes
+- CSV imports are read row by row; exports stream via booking_export
+
+USAGE:
+    python booking_admin.py stats
+    python booking_admin.py validate
+    python booking_admin.py export --from 2024-01-01 -o bookings.csv
+    python booking_admin.py import bookings.csv --on-conflict skip
+    python booking_admin.py import excel_export.csv --from-export
+    python booking_admin.py book --user Matt --from 2025-03-03 --to 2025-03-28 --room gross --desk 2 --weekdays mon,wed
+    python booking_admin.py cancel --user Matt --from 2025-03-10 --to 2025-03-14
+    python booking_admin.py purge-archives --before 2024-01-01
+    python booking_admin.py rename-desk gross 3 "Window"
+    python booking_admin.py feed-url user Matt --base-url https://desks.example.org
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. HELPERS
+3. READ-ONLY COMMANDS
+4. BULK COMMANDS
+5. COMMAND LINE INTERFACE
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import argparse
+import csv
+import os
+import sys
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Optional, List, Iterator
+from urllib.parse import quote
+
+from booking_core.rules import (
+    ROOM_LAYOUT, BOOKING_TYPES, DELETED_USER_ID, DESK_NAME_MAX_LENGTH,
+    build_booking, find_user_id, format_date_key, get_booking_key
+)
+from booking_core.blockers import BLOCKER_TYPES, build_room_blocker, next_room_blocker_key
+from booking_core.intervals import blockers_overlapping
+from booking_core.recurring import expand_rules
+from booking_core.batch import plan_desk_bookings
+from booking_core.slots import booking_slots, combine_booking, occupants, occupied_slots, remove_occupants
+from booking_core.snapshot import flush_snapshots
+from booking_core.integrity import iter_integrity_issues
+from booking_core.ical import FEED_KINDS, feed_key
+from booking_core.store import BookingStore, DATA_FILES, get_store
+from booking_export import EXPORT_FORMATS, iter_export_rows, unescape_formula, write_export, xlsx_available
+
+WEEKDAY_ABBREVIATIONS = ['mon', 'tue', 'wed', 'thu', 'fri']
+
+
+class AdminError(Exception):
+    """Admin command rejected before any data was changed"""
+
+
+class _DryRun(Exception):
+    """Raised inside a transaction to discard its changes"""
+
+
+# ============================================================================
+# 2. HELPERS
+# ============================================================================
+
+def _parse_date(value: str) -> date:
+    """Parse an ISO date argument"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid date '{value}', use YYYY-MM-DD")
+
+
+def _parse_weekdays(value: str) -> List[int]:
+    """Parse a 'mon,wed,fri' list into weekday numbers"""
+    weekdays = []
+    for part in value.split(','):
+        part = part.strip().lower()[:3]
+        if part not in WEEKDAY_ABBREVIATIONS:
+            raise argparse.ArgumentTypeError(f"Invalid weekday '{part}', use mon..fri")
+        weekdays.append(WEEKDAY_ABBREVIATIONS.index(part))
+    return weekdays
+
+
+def _resolve_user_id(users: Dict[str, Any], user: str) -> str:
+    """Resolve a user ID or username, rejecting unknown users"""
+    user_id = find_user_id(users, user)
+    if user_id is None:
+        raise AdminError(f"Unknown user '{user}'")
+    return user_id
+
+
+def _iter_dates(start: date, end: date, weekdays: Optional[List[int]] = None) -> Iterator[date]:
+    """Yield Monday-Friday dates in an inclusive range, optionally filtered by weekday"""
+    weekdays = weekdays if weekdays is not None else list(range(5))
+    current = start
+    while current <= end:
+        if current.weekday() in weekdays:
+            yield current
+        current += timedelta(days=1)
+
+
+def _run(store: BookingStore, names: tuple, dry_run: bool, operation) -> Any:
+    """Run an operation in one store transaction, discarding it on dry runs"""
+    try:
+        with store.transaction(*names) as data:
+            result = operation(data)
+            if dry_run:
+                raise _DryRun()
+    except _DryRun:
+        print("Dry run - no changes written")
+    return result
+
+
+# ============================================================================
+# 3. READ-ONLY COMMANDS
+# ============================================================================
+
+def cmd_stats(store: BookingStore, args: argparse.Namespace) -> int:
+    """Print data volume statistics"""
+    data = store.load()
+    with store.lock:
+        desk_bookings = blockers = archived = 0
+        per_room, per_type = Counter(), Counter()
+        first_date = last_date = None
+
+        for booking in data['bookings'].values():
+            date_key = booking.get('date', '')
+            if date_key:
+                first_date = min(first_date or date_key, date_key)
+                last_date = max(last_date or date_key, date_key)
+
+            if booking.get('entry_type') == 'room_blocker':
+                blockers += 1
+                continue
+
+            # Both half-day bookers of a shared desk count
+            for occupant in occupants(booking):
+                desk_bookings += 1
+                per_room[occupant.get('room')] += 1
+                per_type[occupant.get('booking_type')] += 1
+                if occupant.get('user_id') == DELETED_USER_ID:
+                    archived += 1
+
+        templates = sum(len(user.get('templates', {})) for user in data['users'].values())
+
+    print(f"Users:          {len(data['users'])} ({templates} templates)")
+    print(f"Desk bookings:  {desk_bookings} ({archived} archived)")
+    print(f"Room blockers:  {blockers}")
+    print(f"Date range:     {first_date or '-'} .. {last_date or '-'}")
+    print(f"Holidays:       {len(data['settings'].get('holidays', {}))}")
+    print("Per room:       " + ", ".join(f"{room}={per_room[room]}" for room in ROOM_LAYOUT))
+    print("Per type:       " + ", ".join(f"{booking_type}={per_type[booking_type]}" for booking_type in BOOKING_TYPES))
+
+    for filename in DATA_FILES.values():
+        path = os.path.join(store.data_dir, filename)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        print(f"{filename + ':':<16}{size / 1024:.1f} KB")
+    return 0
+
+
+def cmd_validate(store: BookingStore, args: argparse.Namespace) -> int:
+    """Print integrity problems; exit code 1 when any are found"""
+    data = store.load()
+    issues = 0
+    with store.lock:
+        for key, problem in iter_integrity_issues(data['users'], data['bookings'], data['settings']):
+            print(f"{key}: {problem}")
+            issues += 1
+
+    print(f"{issues} issue(s) found" if issues else "No integrity issues found")
+    return 1 if issues else 0
+
+
+def cmd_feed_url(store: BookingStore, args: argparse.Namespace) -> int:
+    """Print the keyed calendar URL of a user or room feed"""
+    secret = os.environ.get('BIIS_FEED_SECRET') or os.environ.get('BIIS_API_TOKEN')
+    if not secret:
+        raise AdminError("Set BIIS_FEED_SECRET (or BIIS_API_TOKEN) to sign feed URLs")
+    if args.kind == 'user':
+        ident = _resolve_user_id(store.users, args.ident)
+    elif args.ident in ROOM_LAYOUT:
+        ident = args.ident
+    else:
+        raise AdminError(f"Unknown room '{args.ident}'")
+
+    print(f"{args.base_url.rstrip('/')}/calendar/{args.kind}/{quote(ident)}.ics"
+          f"?key={feed_key(secret, args.kind, ident)}")
+    return 0
+
+
+def cmd_export(store: BookingStore, args: argparse.Namespace) -> int:
+    """Stream bookings to CSV/Excel (same options as booking_export.py)"""
+    if args.export_format == 'xlsx' and not (args.output and xlsx_available()):
+        raise AdminError("Excel export needs --output and openpyxl")
+
+    data = store.load()
+    with store.lock:
+        rows = iter_export_rows(
+            data['bookings'], data['users'], data['settings'].get('desk_names', {}),
+            start=args.start, end=args.end, room=args.room, user=args.user,
+            include_blockers=args.include_blockers, counters=store.counters
+        )
+        if args.output:
+            with open(args.output, 'wb') as f:
+                write_export(rows, f, args.export_format)
+        else:
+            write_export(rows, sys.stdout.buffer, args.export_format)
+    return 0
+
+
+# ============================================================================
+# 4. BULK COMMANDS
+# ============================================================================
+
+def _iter_import_rows(filepath: str, unescape: bool = False) -> Iterator[Dict[str, str]]:
+    """
+    Read an exported CSV row by row (plain or Excel-style ';' + BOM).
+
+    Args:
+        filepath: CSV file
+        unescape: Undo the formula quoting of an Excel export (booking_export.escape_formula)
+    """
+    with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
+        header = f.readline()
+        delimiter = ';' if header.count(';') > header.count(',') else ','
+        f.seek(0)
+        rows = csv.DictReader(f, delimiter=delimiter)
+        if unescape:
+            rows = ({field: unescape_formula(value) for field, value in row.items()} for row in rows)
+        yield from rows
+
+
+def _entry_from_row(row: Dict[str, str], users: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a storage entry from an export row"""
+    booking_date = datetime.strptime(row['date'], '%Y-%m-%d').date()
+    room = row['room']
+    if room not in ROOM_LAYOUT:
+        raise ValueError(f"unknown room '{room}'")
+
+    user_id = row.get('user_id', '')
+    archived_at = row.get('archived_at', '')
+    if user_id not in users and not archived_at:
+        raise ValueError(f"unknown user '{user_id}'")
+
+    if row.get('entry_type') == 'room_blocker':
+        blocker_type = row.get('booking_type') or 'custom'
+        if blocker_type not in BLOCKER_TYPES:
+            raise ValueError(f"invalid blocker type '{blocker_type}'")
+        entry = build_room_blocker(booking_date, room, user_id, blocker_type,
+                                   row.get('start_time'), row.get('end_time'), row.get('reason', ''))
+    else:
+        desk_num = int(row['desk_num'])
+        if not 1 <= desk_num <= ROOM_LAYOUT[room]:
+            raise ValueError(f"invalid desk {desk_num}")
+        if row.get('booking_type') not in BOOKING_TYPES:
+            raise ValueError(f"invalid booking type '{row.get('booking_type')}'")
+        entry = build_booking(booking_date, room, desk_num, user_id, row['booking_type'],
+                              row.get('created_via') or None)
+
+    if row.get('created_at'):
+        entry['created_at'] = row['created_at']
+
+    # Archived rows carry the original user and preserved username
+    if archived_at:
+        entry.update({
+            'user_id': DELETED_USER_ID,
+            'archived_username': row.get('username', 'Deleted User'),
+            'archived_at': archived_at,
+            'original_user_id': user_id
+        })
+    return entry
+
+
+def cmd_import(store: BookingStore, args: argparse.Namespace) -> int:
+    """Import bookings from an exported CSV file"""
+    def operation(data: Dict[str, Dict[str, Any]]) -> Counter:
+        bookings = data['bookings']
+        result = Counter()
+        for line_num, row in enumerate(_iter_import_rows(args.file, args.from_export), start=2):
+            try:
+                entry = _entry_from_row(row, data['users'])
+            except (KeyError, ValueError) as e:
+                print(f"Line {line_num}: skipped ({e})", file=sys.stderr)
+                result['invalid'] += 1
+                continue
+
+            entry_date = datetime.strptime(entry['date'], '%Y-%m-%d').date()
+            if entry.get('entry_type') == 'room_blocker':
+                # Blockers conflict with blockers of the same room whose time windows overlap
+                overlapping = [key for key, _ in blockers_overlapping(
+                    bookings, entry_date, entry['room'], entry.get('start_time'), entry.get('end_time'))]
+                if overlapping and args.on_conflict == 'skip':
+                    result['conflicts'] += 1
+                    continue
+                for key in overlapping:
+                    del bookings[key]
+                key = next_room_blocker_key(bookings, entry_date, entry['room'])
+                if key is None:
+                    result['conflicts'] += 1
+                    continue
+                result['replaced' if overlapping else 'imported'] += 1
+                bookings[key] = entry
+                continue
+
+            # Any occupant of the same slots is a conflict - including a 'maybe',
+            # which the import must not silently take over
+            key = get_booking_key(entry_date, entry['room'], entry['desk_num'])
+            conflict = bool(occupied_slots(bookings.get(key)) & booking_slots(entry.get('booking_type')))
+            if conflict and args.on_conflict == 'skip':
+                result['conflicts'] += 1
+                continue
+
+            # Free half of a shared desk (exports list each half-day booker) or a replacement
+            result['replaced' if conflict else 'imported'] += 1
+            bookings[key] = combine_booking(bookings.get(key), entry)
+        return result
+
+    result = _run(store, ('bookings',), args.dry_run, operation)
+    print(f"Imported {result['imported']}, replaced {result['replaced']}, "
+          f"skipped {result['conflicts']} conflicts and {result['invalid']} invalid rows")
+    return 1 if result['invalid'] else 0
+
+
+def cmd_book(store: BookingStore, args: argparse.Namespace) -> int:
+    """Book one desk for a user on every matching workday of a range"""
+    if args.desk < 1 or args.desk > ROOM_LAYOUT[args.room]:
+        raise AdminError(f"Room '{args.room}' has no desk {args.desk}")
+
+    def operation(data: Dict[str, Dict[str, Any]]) -> Counter:
+        user_id = _resolve_user_id(data['users'], args.user)
+        plan = plan_desk_bookings(
+            data['bookings'], _iter_dates(args.start, args.end, args.weekdays), args.room, args.desk,
+            user_id, args.booking_type,
+            holidays=data['settings'].get('holidays'),
+            occurrences=expand_rules(data['settings'].get('blocker_rules'), args.start, args.end),
+            created_via='admin'
+        )
+        data['bookings'].update(plan.bookings)
+        result = Counter(plan.skipped.values())
+        result['booked'] = len(plan.bookings)
+        return result
+
+    result = _run(store, ('bookings',), args.dry_run, operation)
+    print(f"Booked {result['booked']} day(s); skipped {result['taken']} taken, "
+          f"{result['blocked']} blocked and {result['holiday']} holiday(s)")
+    return 0
+
+
+def cmd_cancel(store: BookingStore, args: argparse.Namespace) -> int:
+    """Cancel bookings (and optionally room blockers) in a date range"""
+    start_key, end_key = format_date_key(args.start), format_date_key(args.end)
+
+    def operation(data: Dict[str, Dict[str, Any]]) -> Counter:
+        user_id = _resolve_user_id(data['users'], args.user) if args.user else None
+        bookings = data['bookings']
+        result = Counter()
+
+        # Candidates from the counters' indexes (built before this transaction changes anything)
+        if user_id:
+            candidates = sorted(store.counters.keys_for_user(user_id))
+        else:
+            candidates = store.counters.keys_between(args.start, args.end, args.room)
+            candidates.extend(store.counters.key_index.unindexed)
+
+        for booking_key in candidates:
+            booking = bookings.get(booking_key)
+            if booking is None or not start_key <= booking.get('date', '') <= end_key:
+                continue
+            if args.room and booking.get('room') != args.room:
+                continue
+
+            if booking.get('entry_type') == 'room_blocker':
+                owner = booking.get('user_id')
+                if args.include_blockers and owner != DELETED_USER_ID and user_id in (None, owner):
+                    del bookings[booking_key]
+                    result['blockers'] += 1
+                continue
+
+            if args.desk and booking.get('desk_num') != args.desk:
+                continue
+
+            # Per occupant: archived bookings stay, on a shared desk only the matching half goes
+            cancelled = [occupant for occupant in occupants(booking)
+                         if occupant.get('user_id') != DELETED_USER_ID
+                         and (not user_id or occupant.get('user_id') == user_id)]
+            if not cancelled:
+                continue
+            slots = 0
+            for occupant in cancelled:
+                slots |= booking_slots(occupant.get('booking_type'))
+            remaining = remove_occupants(booking, slots, user_id)
+            if remaining is None:
+                del bookings[booking_key]
+            else:
+                bookings[booking_key] = remaining
+            result['bookings'] += len(cancelled)
+        return result
+
+    result = _run(store, ('bookings',), args.dry_run, operation)
+    print(f"Cancelled {result['bookings']} booking(s) and {result['blockers']} room blocker(s)")
+    return 0
+
+
+def cmd_purge_archives(store: BookingStore, args: argparse.Namespace) -> int:
+    """Delete archived bookings of deleted users"""
+    before_key = format_date_key(args.before) if args.before else None
+
+    def operation(data: Dict[str, Dict[str, Any]]) -> int:
+        bookings = data['bookings']
+        purge_keys = [
+            key for key, booking in bookings.items()
+            if booking.get('user_id') == DELETED_USER_ID
+            and (before_key is None or booking.get('date', '') < before_key)
+        ]
+        for key in purge_keys:
+            del bookings[key]
+        return len(purge_keys)
+
+    purged = _run(store, ('bookings',), args.dry_run, operation)
+    print(f"Purged {purged} archived booking(s)")
+    return 0
+
+
+def cmd_rename_desk(store: BookingStore, args: argparse.Namespace) -> int:
+    """Set or reset the custom name of a desk"""
+    if args.desk < 1 or args.desk > ROOM_LAYOUT[args.room]:
+        raise AdminError(f"Room '{args.room}' has no desk {args.desk}")
+    name = args.name.strip()[:DESK_NAME_MAX_LENGTH]
+
+    def operation(data: Dict[str, Dict[str, Any]]) -> None:
+        desk_names = data['settings'].setdefault('desk_names', {})
+        desk_key = f"{args.room}_{args.desk}"
+        if name:
+            desk_names[desk_key] = name
+        else:
+            desk_names.pop(desk_key, None)
+
+    _run(store, ('settings',), args.dry_run, operation)
+    print(f"Desk {args.room} {args.desk} " + (f"renamed to '{name}'" if name else "reset to default name"))
+    return 0
+
+
+# ============================================================================
+# 5. COMMAND LINE INTERFACE
+# ============================================================================
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the admin command line parser"""
+    parser = argparse.ArgumentParser(description="BIIS desk booking admin tools")
+    parser.add_argument('--data-dir', default='data', help="Directory with the JSON data files")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def mutating(name: str, help_text: str) -> argparse.ArgumentParser:
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('--dry-run', action='store_true', help="Show the result without writing")
+        return command
+
+    commands.add_parser('stats', help="Print data statistics").set_defaults(handler=cmd_stats)
+    commands.add_parser('validate', help="Check data integrity").set_defaults(handler=cmd_validate)
+
+    feed_url = commands.add_parser('feed-url', help="Print the keyed URL of a calendar feed")
+    feed_url.add_argument('kind', choices=list(FEED_KINDS))
+    feed_url.add_argument('ident', help="User ID/username or room")
+    feed_url.add_argument('--base-url', default='http://127.0.0.1:8502', help="Public address of the API")
+    feed_url.set_defaults(handler=cmd_feed_url)
+
+    export = commands.add_parser('export', help="Export bookings to CSV/Excel")
+    export.add_argument('--from', dest='start', type=_parse_date)
+    export.add_argument('--to', dest='end', type=_parse_date)
+    export.add_argument('--room', choices=list(ROOM_LAYOUT))
+    export.add_argument('--user', help="User ID or username")
+    export.add_argument('--include-blockers', action='store_true')
+    export.add_argument('--format', dest='export_format', choices=list(EXPORT_FORMATS), default='csv')
+    export.add_argument('-o', '--output', help="Output file (default: stdout)")
+    export.set_defaults(handler=cmd_export)
+
+    import_cmd = mutating('import', "Import bookings from an exported CSV")
+    import_cmd.add_argument('file', help="CSV file written by the export")
+    import_cmd.add_argument('--on-conflict', choices=['skip', 'replace'], default='skip')
+    import_cmd.add_argument('--from-export', action='store_true',
+                            help="File is an Excel CSV from export: strip the quote added before formula-like text")
+    import_cmd.set_defaults(handler=cmd_import)
+
+    book = mutating('book', "Book a desk for a user over a date range")
+    book.add_argument('--user', required=True, help="User ID or username")
+    book.add_argument('--from', dest='start', type=_parse_date, required=True)
+    book.add_argument('--to', dest='end', type=_parse_date, required=True)
+    book.add_argument('--room', choices=list(ROOM_LAYOUT), required=True)
+    book.add_argument('--desk', type=int, required=True)
+    book.add_argument('--type', dest='booking_type', choices=list(BOOKING_TYPES), default='full_day')
+    book.add_argument('--weekdays', type=_parse_weekdays, help="Comma-separated, e.g. mon,wed (default: mon-fri)")
+    book.set_defaults(handler=cmd_book)
+
+    cancel = mutating('cancel', "Cancel bookings over a date range")
+    cancel.add_argument('--from', dest='start', type=_parse_date, required=True)
+    cancel.add_argument('--to', dest='end', type=_parse_date, required=True)
+    cancel.add_argument('--user', help="User ID or username")
+    cancel.add_argument('--room', choices=list(ROOM_LAYOUT))
+    cancel.add_argument('--desk', type=int)
+    cancel.add_argument('--include-blockers', action='store_true', help="Also remove room blockers")
+    cancel.set_defaults(handler=cmd_cancel)
+
+    purge = mutating('purge-archives', "Delete archived bookings of deleted users")
+    purge.add_argument('--before', type=_parse_date, help="Only archives dated before this day")
+    purge.set_defaults(handler=cmd_purge_archives)
+
+    rename = mutating('rename-desk', "Set or reset a desk name")
+    rename.add_argument('room', choices=list(ROOM_LAYOUT))
+    rename.add_argument('desk', type=int)
+    rename.add_argument('name', help="New name (empty string resets to default)")
+    rename.set_defaults(handler=cmd_rename_desk)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    args = build_parser().parse_args(argv)
+    store = get_store(args.data_dir)
+
+    try:
+        return args.handler(store, args)
+    except AdminError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        flush_snapshots()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""
+BIIS Desk Booking System - Booking Aggregates
+Author: [Your Name]
+Date: [Date]
+Description: Session access to the occupancy counters (booking_core.counters)
+
+DESIGN:
+- The counters themselves live in the Streamlit-free booking core
+- Each session keeps one counters instance next to its bookings dict
+- The counters are rebuilt only when the bookings dict is replaced
+
+INDEX:
+1. IMPORTS
+2. SESSION ACCESS
+"""
+
+# ============================================================================
+# 1. IMPORTS
+# ============================================================================
+
+from booking_core.counters import OccupancyCounters
+
+
+# ============================================================================
+# 2. SESSION ACCESS
+# ============================================================================
+
+def get_session_counters() -> OccupancyCounters:
+    """
+    Return the counters for the session's bookings, rebuilding on reload.
+
+    A rebuild only happens when st.session_state.bookings has been replaced
+    by a freshly loaded dict (cold start, refresh, forced reload).
+    """
+    # Import streamlit only when needed to keep this module UI-free
+    import streamlit as st
+
+    counters = st.session_state.get('booking_counters')
+    if counters is None or not counters.is_built_from(st.session_state.bookings):
+        counters = OccupancyCounters(st.session_state.bookings)
+        st.session_state.booking_counters = counters
+    return counters
@@ -0,0 +1,400 @@
+"""
+BIIS Desk Booking System - Headless JSON API
+Author: [Your Name]
+Date: [Date]
+Description: Small JSON HTTP API over the shared booking store
+
+DESIGN:
+- Standard library only (http.server) - no extra dependencies
+- Threaded server with HTTP/1.1 keep-alive for many requests per second
+- All handler threads share one pooled BookingStore per data directory
+- Same validation and override rules as the Streamlit app
+
+ENDPOINTS:
+    GET    /health
+    GET    /metrics                        (Prometheus text format)
+    GET    /users
+    GET    /bookings?from=YYYY-MM-DD&to=YYYY-MM-DD&room=klein&user=<id>
+    GET    /availability?date=YYYY-MM-DD
+    GET    /free-desks?from=YYYY-MM-DD&to=YYYY-MM-DD&room=klein&half=am|pm
+    GET    /teams
+    GET    /teams/<team>?from=YYYY-MM-DD&to=YYYY-MM-DD&min=3   (days with at least min members in)
+    POST   /bookings                       {"date", "room", "desk_num", "user_id", "booking_type"}
+    DELETE /bookings/<date>/<room>/<desk>?half=am|pm  (half: one half of a shared desk)
+    POST   /blockers                       {"date", "room", "user_id", "blocker_type", "start_time", "end_time", "reason"}
+    DELETE /blockers/<date>/<room>?start=HH:MM        (start: only the blocker starting then)
+    GET    /calendar/user/<user_id or username>.ics?key=<feed key>
+    GET    /calendar/room/<room>.ics?key=<feed key>   (ETag / If-None-Match supported)
+    HEAD   any GET route                      (headers only)
+
+USAGE:
+    python booking_api.py --port 8502 --data-dir data
+    Set BIIS_API_TOKEN to require "Authorization: Bearer <token>" on every request.
+    Tokens are never accepted in the query string, which ends up in access and proxy logs.
+    Calendar clients cannot send headers: the .ics routes also accept a per-feed
+    ?key= (HMAC of the feed path, see booking_admin.py feed-url) that unlocks only
+    that feed. Keys are signed with BIIS_FEED_SECRET, or BIIS_API_TOKEN when unset.
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. REQUEST HELPERS
+3. REQUEST HANDLER
+4. SERVER ENTRY POINT
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import argparse
+import hmac
+import json
+import os
+import sys
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, List, Tuple, NamedTuple
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from booking_core.ical import feed_key
+from booking_core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY, start_metrics_exporter
+from booking_core.slots import SLOT_ALL, SLOT_AM, SLOT_PM
+from booking_core.snapshot import flush_snapshots
+from booking_core.store import BookingStore, BookingError, get_store
+from booking_core.teams import DEFAULT_MIN_MEMBERS, all_teams, team_members
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8502
+MAX_BODY_BYTES = 64 * 1024
+
+
+class RawResponse(NamedTuple):
+    """Non-JSON response body returned by a route"""
+    body: bytes
+    content_type: str
+    etag: Optional[str] = None
+
+
+# ============================================================================
+# 2. REQUEST HELPERS
+# ============================================================================
+
+def _parse_date(value: Optional[str], field: str = 'date') -> date:
+    """Parse an ISO date, raising a 400 BookingError when invalid"""
+    if not value:
+        raise BookingError(f"Missing '{field}'")
+    if not isinstance(value, str):
+        raise BookingError(f"Invalid {field}, use YYYY-MM-DD")
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise BookingError(f"Invalid {field} '{value}', use YYYY-MM-DD")
+
+
+def _payload_str(payload: Dict[str, Any], field: str, default: Optional[str] = '') -> Optional[str]:
+    """String field of a JSON body (default when absent), raising a 400 BookingError for other types"""
+    value = payload.get(field, default)
+    if value is not None and not isinstance(value, str):
+        raise BookingError(f"Invalid '{field}', expected a string")
+    return value
+
+
+def _parse_desk(value: Any) -> int:
+    """Parse a desk number, raising a 400 BookingError when invalid"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise BookingError(f"Invalid desk number '{value}'")
+
+
+def _query_value(query: Dict[str, List[str]], name: str) -> Optional[str]:
+    """Return the first value of a query parameter"""
+    values = query.get(name)
+    return values[0] if values else None
+
+
+def _feed_ident(segment: str) -> str:
+    """User/room identifier of a calendar URL segment ('<ident>.ics')"""
+    return unquote(segment[:-4] if segment.endswith('.ics') else segment)
+
+
+def _parse_half(value: Optional[str]) -> int:
+    """Slot mask of a 'half' parameter (am/pm, whole desk when omitted)"""
+    slots = {None: SLOT_ALL, 'am': SLOT_AM, 'pm': SLOT_PM}.get(value.lower() if value else None)
+    if slots is None:
+        raise BookingError(f"Invalid half '{value}', use am or pm")
+    return slots
+
+
+# ============================================================================
+# 3. REQUEST HANDLER
+# ============================================================================
+
+class BookingAPIHandler(BaseHTTPRequestHandler):
+    """Routes JSON requests to the shared booking store"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'BIISDeskBooking/1.0'
+    # Headers and body are written separately - avoid Nagle/delayed-ACK stalls on keep-alive
+    disable_nagle_algorithm = True
+
+    @property
+    def store(self) -> BookingStore:
+        return self.server.store
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep request logging quiet unless the server runs verbose"""
+        if getattr(self.server, 'verbose', False):
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        """Serialize a payload and send it with a Content-Length (keep-alive)"""
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _send_raw(self, status: int, response: RawResponse) -> None:
+        """Send a non-JSON body, answering 304 when the client's ETag matches"""
+        if response.etag and self.headers.get('If-None-Match') == response.etag:
+            self.send_response(304)
+            self.send_header('ETag', response.etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header('Content-Type', response.content_type)
+        self.send_header('Content-Length', str(len(response.body)))
+        if response.etag:
+            self.send_header('ETag', response.etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(response.body)
+
+    def _read_json(self) -> Dict[str, Any]:
+        """Read and decode the JSON request body"""
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            raise BookingError("Request body too large", status=413)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            payload = json.loads(raw or b'{}')
+        except ValueError:
+            raise BookingError("Request body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise BookingError("Request body must be a JSON object")
+        return payload
+
+    def _authorized(self) -> bool:
+        """Check the Authorization bearer token when the server was started with one"""
+        token = getattr(self.server, 'token', None)
+        if not token:
+            return True
+        # Constant-time comparison so response timing does not leak the token
+        return hmac.compare_digest(self.headers.get('Authorization', '').encode('utf-8'),
+                                   f"Bearer {token}".encode('utf-8'))
+
+    def _feed_key_valid(self, method: str, parts: List[str], query: Dict[str, List[str]]) -> bool:
+        """Check the ?key= of a read-only calendar feed URL against that feed's HMAC"""
+        secret = getattr(self.server, 'feed_secret', None)
+        key = _query_value(query, 'key')
+        if not (secret and key and method == 'GET' and len(parts) == 3 and parts[0] == 'calendar'):
+            return False
+        expected = feed_key(secret, parts[1], _feed_ident(parts[2]))
+        return hmac.compare_digest(key.encode('utf-8'), expected.encode('utf-8'))
+
+    def _dispatch(self, method: str) -> None:
+        """Resolve the route and translate BookingErrors into JSON errors"""
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        query = parse_qs(url.query)
+
+        try:
+            if not (self._authorized() or self._feed_key_valid(method, parts, query)):
+                raise BookingError("Missing or invalid API token", status=401)
+            status, payload = self._route(method, parts, query)
+        except BookingError as e:
+            status, payload = e.status, {'error': str(e)}
+        except Exception as e:  # pragma: no cover - keep the server alive
+            status, payload = 500, {'error': f"Internal error: {e}"}
+
+        if isinstance(payload, RawResponse):
+            self._send_raw(status, payload)
+        else:
+            self._send_json(status, payload)
+
+    def _route(self, method: str, parts: List[str], query: Dict[str, List[str]]) -> Tuple[int, Any]:
+        """Handle one request, returning (status, payload)"""
+        resource = parts[0] if parts else ''
+
+        if method == 'GET' and parts == ['health']:
+            return 200, {'status': 'ok'}
+
+        if method == 'GET' and parts == ['metrics']:
+            return 200, RawResponse(REGISTRY.render().encode('utf-8'), METRICS_CONTENT_TYPE)
+
+        if method == 'GET' and parts == ['users']:
+            users = self.store.users
+            return 200, [
+                {'user_id': user_id, 'username': data.get('username'), 'color': data.get('color')}
+                for user_id, data in users.items()
+            ]
+
+        if method == 'GET' and parts == ['availability']:
+            booking_date = _parse_date(_query_value(query, 'date'))
+            return 200, {'date': booking_date.isoformat(), 'rooms': self.store.availability(booking_date)}
+
+        if method == 'GET' and parts == ['free-desks']:
+            start = _parse_date(_query_value(query, 'from'), 'from')
+            end = _parse_date(_query_value(query, 'to'), 'to')
+            return 200, self.store.free_desks(start, end, _query_value(query, 'room'),
+                                              _parse_half(_query_value(query, 'half')))
+
+        if method == 'GET' and parts == ['teams']:
+            users = self.store.users
+            return 200, {team: team_members(users, team) for team in all_teams(users)}
+
+        if method == 'GET' and resource == 'teams' and len(parts) == 2:
+            min_members = _query_value(query, 'min')
+            if min_members is not None and not min_members.isdigit():
+                raise BookingError(f"Invalid min '{min_members}'")
+            return 200, self.store.team_days(
+                unquote(parts[1]),
+                _parse_date(_query_value(query, 'from'), 'from'),
+                _parse_date(_query_value(query, 'to'), 'to'),
+                int(min_members) if min_members is not None else DEFAULT_MIN_MEMBERS
+            )
+
+        if resource == 'bookings':
+            if method == 'GET' and len(parts) == 1:
+                start = _query_value(query, 'from')
+                end = _query_value(query, 'to')
+                return 200, self.store.list_bookings(
+                    start=_parse_date(start, 'from') if start else None,
+                    end=_parse_date(end, 'to') if end else None,
+                    room=_query_value(query, 'room'),
+                    user_id=_query_value(query, 'user'),
+                    include_blockers=_query_value(query, 'blockers') != '0'
+                )
+
+            if method == 'POST' and len(parts) == 1:
+                payload = self._read_json()
+                booking = self.store.create_booking(
+                    _parse_date(payload.get('date')),
+                    _payload_str(payload, 'room'),
+                    _parse_desk(payload.get('desk_num')),
+                    _payload_str(payload, 'user_id'),
+                    _payload_str(payload, 'booking_type', 'full_day'),
+                    created_via='api'
+                )
+                return 201, booking
+
+            if method == 'DELETE' and len(parts) == 4:
+                if not self.store.remove_booking(_parse_date(parts[1]), parts[2], _parse_desk(parts[3]),
+                                                 cancelled_via='api',
+                                                 slots=_parse_half(_query_value(query, 'half'))):
+                    raise BookingError("Booking not found", status=404)
+                return 200, {'deleted': True}
+
+        if resource == 'blockers':
+            if method == 'POST' and len(parts) == 1:
+                payload = self._read_json()
+                blocker = self.store.create_room_blocker(
+                    _parse_date(payload.get('date')),
+                    _payload_str(payload, 'room'),
+                    _payload_str(payload, 'user_id'),
+                    _payload_str(payload, 'blocker_type', 'full_day'),
+                    _payload_str(payload, 'start_time', None),
+                    _payload_str(payload, 'end_time', None),
+                    _payload_str(payload, 'reason')
+                )
+                return 201, blocker
+
+            if method == 'DELETE' and len(parts) == 3:
+                if not self.store.remove_room_blocker(_parse_date(parts[1]), parts[2],
+                                                      start_time=_query_value(query, 'start')):
+                    raise BookingError("Room blocker not found", status=404)
+                return 200, {'deleted': True}
+
+        if method == 'GET' and resource == 'calendar' and len(parts) == 3:
+            etag, body = self.store.calendar_feed(parts[1], _feed_ident(parts[2]))
+            return 200, RawResponse(body, 'text/calendar; charset=utf-8', etag)
+
+        raise BookingError(f"No route for {method} /{'/'.join(parts)}", status=404)
+
+    def do_GET(self) -> None:
+        self._dispatch('GET')
+
+    def do_HEAD(self) -> None:
+        # Same headers as GET (ETag, Content-Length), the senders skip the body
+        self._dispatch('GET')
+
+    def do_POST(self) -> None:
+        self._dispatch('POST')
+
+    def do_DELETE(self) -> None:
+        self._dispatch('DELETE')
+
+
+# ============================================================================
+# 4. SERVER ENTRY POINT
+# ============================================================================
+
+def create_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, data_dir: str = 'data',
+                  token: Optional[str] = None, verbose: bool = False,
+                  feed_secret: Optional[str] = None) -> ThreadingHTTPServer:
+    """
+    Create a threaded API server bound to the pooled store of a data directory.
+
+    Args:
+        host: Interface to bind
+        port: TCP port to bind
+        data_dir: Directory with the JSON data files
+        token: Optional bearer token required on every request
+        verbose: Log every request to stderr
+        feed_secret: Secret of the per-feed calendar URL keys (default: token)
+
+    Returns:
+        Server instance (call serve_forever() to run it)
+    """
+    server = ThreadingHTTPServer((host, port), BookingAPIHandler)
+    server.daemon_threads = True
+    server.store = get_store(data_dir)
+    server.token = token
+    server.feed_secret = feed_secret or token
+    server.verbose = verbose
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="BIIS desk booking JSON API")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--data-dir', default='data', help="Directory with the JSON data files")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    args = parser.parse_args(argv)
+
+    server = create_server(args.host, args.port, args.data_dir,
+                           token=os.environ.get('BIIS_API_TOKEN'), verbose=args.verbose,
+                           feed_secret=os.environ.get('BIIS_FEED_SECRET'))
+    # Optional metrics file / port (BIIS_METRICS_FILE, BIIS_METRICS_PORT)
+    start_metrics_exporter(data_dir=args.data_dir)
+    print(f"BIIS booking API listening on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        flush_snapshots()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
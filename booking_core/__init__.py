@@ -0,0 +1,108 @@
+"""
+BIIS Desk Booking System - Booking Core
+Author: [Your Name]
+Date: [Date]
+Description: Pure-Python booking domain shared by the UI, API, CLIs and benchmarks
+
+DESIGN:
+- No Streamlit (or other UI) imports anywhere in this package
+- Functions take plain users/bookings/settings dicts; BookingStore adds
+  thread-safe, file-backed access for headless callers
+- app.py, sidebar_settings.py and template_management.py wrap these with
+  session state and widgets
+
+MODULES:
+- keys: structured (date, room, desk) keys and the ordered key index
+- slots: AM/PM slot bitmasks and shared half-day desk entries
+- intervals: time-interval index of room blockers and overlap queries
+- rules: office layout, booking keys, override rules, user archiving
+- blockers: room blocker keys, entries and messages
+- recurring: recurring room blocker rules and their occurrences
+- holidays: holiday parsing (single, ranges, yearly, bulk) and workday checks
+- workdays: calendar service with precomputed workday/holiday/ISO-week tables
+- finder: free desks per day across a date range
+- teams: team membership and teammate co-location
+- batch: multi-day bookings and cancellations planned in one pass
+- templates: weekly template validation and application
+- records: compact read-only booking records (slots, interned values)
+- counters: incrementally maintained occupancy counters
+- integrity: consistency checks over the data files
+- store: JSON file helpers and the pooled BookingStore
+- snapshot: generation number and warm-start binary snapshot
+- profiling: per-run timing spans and counters with a JSON-lines log
+- metrics: Prometheus text-format counters, gauges and histograms
+"""
+
+from booking_core.keys import BookingKey, KeyIndex, MAX_BLOCKERS_PER_ROOM_DAY, parse_key, format_key
+from booking_core.slots import (
+    SLOT_AM,
+    SLOT_PM,
+    SLOT_ALL,
+    booking_slots,
+    blocker_slots,
+    free_slots,
+    can_book,
+    occupants,
+    combine_booking,
+    remove_occupants
+)
+from booking_core.intervals import IntervalIndex, blockers_overlapping
+from booking_core.rules import (
+    ROOM_LAYOUT,
+    BOOKING_TYPES,
+    BOOKING_TYPE_WEIGHTS,
+    DELETED_USER_ID,
+    format_date_key,
+    get_booking_key,
+    get_desk_name,
+    get_username,
+    can_override_booking,
+    build_booking,
+    check_desk_availability,
+    archive_user_bookings
+)
+from booking_core.blockers import (
+    BLOCKER_TYPES,
+    BLOCKER_TIME_RANGES,
+    get_room_blocker_key,
+    next_room_blocker_key,
+    get_room_blockers,
+    get_room_blocker,
+    build_room_blocker,
+    valid_blocker_window,
+    get_room_block_message
+)
+from booking_core.recurring import (
+    RECURRENCE_FREQUENCIES,
+    build_blocker_rule,
+    describe_rule,
+    rule_dates,
+    expand_rules,
+    rule_conflicts,
+    skip_occurrence
+)
+from booking_core.holidays import parse_holiday_input, parse_holiday_lines, is_holiday, is_workday
+from booking_core.workdays import WorkCalendar, get_calendar, effective_week_start
+from booking_core.finder import FreeDesk, find_free_desks
+from booking_core.teams import Placement, parse_teams, team_members, co_location_days
+from booking_core.batch import BookingPlan, CancellationPlan, plan_desk_bookings, plan_cancellations, plan_restore
+from booking_core.templates import (
+    MAX_TEMPLATES_PER_USER,
+    validate_template,
+    build_template,
+    get_future_weeks,
+    validate_template_application,
+    build_template_bookings
+)
+from booking_core.records import BookingRecord, compact_bookings
+from booking_core.counters import OccupancyCounters
+from booking_core.integrity import iter_integrity_issues
+from booking_core.store import (
+    BookingError,
+    BookingStore,
+    get_store,
+    load_data_files,
+    save_data_files
+)
+from booking_core.snapshot import load_data_warm, read_generation
+from booking_core.profiling import RunProfile, start_profile, finish_profile, current_profile, span, count
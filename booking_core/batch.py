@@ -0,0 +1,224 @@
+"""
+BIIS Desk Booking System - Booking Core: Batch Bookings
+Author: [Your Name]
+Date: [Date]
+Description: Multi-day bookings and cancellations planned in one pass and committed as one write
+
+DESIGN:
+- plan_desk_bookings() checks every requested date of one desk against the
+  calendar, the room blockers and the desk's occupants (one dict lookup
+  and one interval query per date) and returns the new entries plus the
+  skipped dates with a reason; nothing is modified
+- Callers apply the planned entries (keeping their counters in sync) and
+  write the bookings file once, whatever the number of days
+- Date pickers for the common cases ("rest of the week", "every Tuesday
+  this month") are plain date arithmetic
+- plan_cancellations() finds a user's bookings in a range through the
+  counters' user -> date -> keys index (one lookup per day, however many
+  bookings exist) and removes only that user's occupants of shared desks
+- The replaced entries of a cancellation are its undo handle:
+  plan_restore() puts the user's occupants back wherever their slots are
+  still free and reports the ones booked by someone else in the meantime -
+  a 'maybe' booked since the cancellation is kept, never displaced
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. DATE SELECTIONS
+3. BOOKING PLANS
+4. CANCELLATION PLANS
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+from datetime import date, timedelta
+from typing import Dict, Any, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from booking_core.intervals import blockers_overlapping
+from booking_core.rules import build_booking, can_override_booking, format_date_key, get_booking_key
+from booking_core.slots import (
+    booking_slots, combine_booking, occupants, occupied_slots, remove_occupants, slot_window
+)
+from booking_core.workdays import WORKDAYS_PER_WEEK, get_calendar
+
+# Reasons a date is left out of a batch, with their display text
+SKIP_REASONS = {
+    'past': 'Past date',
+    'weekend': 'Weekend',
+    'holiday': 'Holiday',
+    'blocked': 'Room blocked',
+    'taken': 'Desk taken'
+}
+
+
+class BookingPlan(NamedTuple):
+    """New desk entries of a batch and the dates left out"""
+
+    bookings: Dict[str, Dict[str, Any]]  # booking key -> new desk entry
+    skipped: Dict[str, str]              # date key -> SKIP_REASONS key
+
+
+class CancellationPlan(NamedTuple):
+    """Changed desk entries of a batch cancellation and the entries they replace (the undo handle)"""
+
+    changes: Dict[str, Optional[Dict[str, Any]]]  # booking key -> remaining entry (None: desk freed)
+    previous: Dict[str, Mapping[str, Any]]         # booking key -> entry before the cancellation
+
+
+# ============================================================================
+# 2. DATE SELECTIONS
+# ============================================================================
+
+def rest_of_week(day: date) -> List[date]:
+    """Weekdays from a date to the Friday of its week (empty on weekends)"""
+    return [day + timedelta(days=offset) for offset in range(max(WORKDAYS_PER_WEEK - day.weekday(), 0))]
+
+
+def same_weekday_in_month(day: date) -> List[date]:
+    """A date and the same weekday in every later week of its month"""
+    dates = []
+    current = day
+    while current.month == day.month:
+        dates.append(current)
+        current += timedelta(days=7)
+    return dates
+
+
+# ============================================================================
+# 3. BOOKING PLANS
+# ============================================================================
+
+def plan_desk_bookings(
+    bookings: Mapping[str, Any],
+    dates: Iterable[date],
+    room: str,
+    desk_num: int,
+    user_id: str,
+    booking_type: str,
+    holidays: Optional[Mapping[str, Any]] = None,
+    counters: Optional[Any] = None,
+    occurrences: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    today: Optional[date] = None,
+    created_via: Optional[str] = None
+) -> BookingPlan:
+    """
+    Plan bookings of one desk for one user on several dates.
+
+    A half-day booking next to a booking of the other half is combined
+    with it into one shared desk entry (same rule as a single booking).
+
+    Args:
+        bookings: Booking data dictionary (not modified)
+        dates: Requested dates (duplicates are ignored)
+        room: Room identifier
+        desk_num: Desk number
+        user_id: Booking user
+        booking_type: One of BOOKING_TYPES
+        holidays: settings['holidays'] (optional)
+        counters: OccupancyCounters tracking bookings, with the recurring
+            blocker rules expanded for the dates (optional)
+        occurrences: Expanded recurring blockers, used when no counters are given (optional)
+        today: Dates before this are skipped as past (optional, no check when omitted)
+        created_via: Origin marker stored on the new entries (optional)
+
+    Returns:
+        BookingPlan with the new entries and the skipped dates, in date order
+    """
+    calendar = get_calendar(holidays)
+    start_time, end_time = slot_window(booking_slots(booking_type))
+    plan = BookingPlan({}, {})
+
+    for booking_date in sorted(set(dates)):
+        date_key = format_date_key(booking_date)
+        booking_key = get_booking_key(booking_date, room, desk_num)
+        existing = bookings.get(booking_key)
+
+        if today is not None and booking_date < today:
+            plan.skipped[date_key] = 'past'
+        elif booking_date.weekday() >= WORKDAYS_PER_WEEK:
+            plan.skipped[date_key] = 'weekend'
+        elif calendar.is_holiday(booking_date):
+            plan.skipped[date_key] = 'holiday'
+        elif blockers_overlapping(bookings, booking_date, room, start_time, end_time, counters, occurrences):
+            plan.skipped[date_key] = 'blocked'
+        elif not can_override_booking(existing, booking_type):
+            plan.skipped[date_key] = 'taken'
+        else:
+            plan.bookings[booking_key] = combine_booking(existing, build_booking(
+                booking_date, room, desk_num, user_id, booking_type, created_via=created_via
+            ))
+    return plan
+
+
+# ============================================================================
+# 4. CANCELLATION PLANS
+# ============================================================================
+
+def plan_cancellations(
+    bookings: Mapping[str, Any],
+    counters: Any,
+    user_id: str,
+    start: date,
+    end: date,
+    room: Optional[str] = None
+) -> CancellationPlan:
+    """
+    Plan the cancellation of all of a user's desk bookings from start to end (inclusive).
+
+    Args:
+        bookings: Booking data dictionary (not modified)
+        counters: OccupancyCounters tracking bookings
+        user_id: User whose bookings are cancelled
+        start: First date
+        end: Last date
+        room: Only bookings in this room (optional)
+
+    Returns:
+        CancellationPlan in date order; on a shared desk only the user's half is removed
+    """
+    plan = CancellationPlan({}, {})
+    for offset in range((end - start).days + 1):
+        date_key = format_date_key(start + timedelta(days=offset))
+        for booking_key in sorted(counters.user_keys_on(user_id, date_key)):
+            entry = bookings.get(booking_key)
+            if entry is None or (room is not None and entry.get('room') != room):
+                continue
+            plan.changes[booking_key] = remove_occupants(entry, user_id=user_id)
+            plan.previous[booking_key] = entry
+    return plan
+
+
+def plan_restore(
+    bookings: Mapping[str, Any],
+    user_id: str,
+    previous: Mapping[str, Mapping[str, Any]]
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    Plan undoing a cancellation from its replaced entries.
+
+    Args:
+        bookings: Booking data dictionary (not modified)
+        user_id: User whose bookings were cancelled
+        previous: CancellationPlan.previous of the cancellation
+
+    Returns:
+        Tuple of (booking key -> restored entry, keys whose slots were
+        booked by someone else in the meantime, 'maybe' bookings included)
+    """
+    changes, conflicts = {}, []
+    for booking_key, old_entry in previous.items():
+        current = bookings.get(booking_key)
+        restored = current
+        for occupant in occupants(old_entry):
+            if occupant.get('user_id') != user_id:
+                continue
+            # Unlike a new booking, a restore never takes over a 'maybe'
+            if booking_slots(occupant.get('booking_type')) & occupied_slots(restored):
+                conflicts.append(booking_key)
+                break
+            restored = combine_booking(restored, dict(occupant))
+        else:
+            if restored is not current:
+                changes[booking_key] = restored
+    return changes, conflicts
@@ -0,0 +1,168 @@
+"""
+BIIS Desk Booking System - Booking Core: Room Blockers
+Author: [Your Name]
+Date: [Date]
+Description: Room blocker keys, entries and messages without any UI
+
+DESIGN:
+- A room can have several blockers per day (up to MAX_BLOCKERS_PER_ROOM_DAY),
+  each with its own time window; overlapping blockers are rejected
+- Time-overlap lookups go through booking_core.intervals (indexed when the
+  caller passes the OccupancyCounters)
+- Custom time windows are parsed with intervals.time_to_minutes, the same
+  parser the overlap index uses; unreadable or inverted windows are rejected
+  when a blocker is built instead of silently covering the whole day
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. BLOCKER FUNCTIONS
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+from datetime import date, datetime
+from typing import Dict, Any, Optional, List
+
+from booking_core.intervals import blockers_overlapping, time_to_minutes
+from booking_core.keys import MAX_BLOCKERS_PER_ROOM_DAY, blocker_key_for, format_key
+from booking_core.rules import format_date_key, get_username
+
+BLOCKER_TYPES = ('morning', 'afternoon', 'full_day', 'custom')
+
+# Fixed time ranges for room blocker types ('custom' supplies its own)
+BLOCKER_TIME_RANGES = {
+    'morning': ('09:00', '12:00'),
+    'afternoon': ('13:00', '17:00'),
+    'full_day': ('08:00', '18:00')
+}
+
+BLOCKER_REASON_MAX_LENGTH = 20
+
+
+# ============================================================================
+# 2. BLOCKER FUNCTIONS
+# ============================================================================
+
+def get_room_blocker_key(booking_date: date, room: str, seq: int = 0) -> str:
+    """Generate unique key for room blocker storage (seq: blocker number on that day)"""
+    return format_key(blocker_key_for(booking_date, room, seq))
+
+
+def next_room_blocker_key(bookings: Dict[str, Any], booking_date: date, room: str) -> Optional[str]:
+    """First unused blocker key of a room and date, None when the day is full"""
+    for seq in range(MAX_BLOCKERS_PER_ROOM_DAY):
+        blocker_key = get_room_blocker_key(booking_date, room, seq)
+        if blocker_key not in bookings:
+            return blocker_key
+    return None
+
+
+def get_room_blockers(
+    bookings: Dict[str, Any],
+    booking_date: date,
+    room: str,
+    counters: Optional[Any] = None
+) -> List[Dict[str, Any]]:
+    """
+    All room blockers of a room on a date, ordered by start time.
+
+    Args:
+        bookings: Booking data dictionary
+        booking_date: Date to check
+        room: Room identifier
+        counters: OccupancyCounters tracking bookings, for an indexed lookup (optional)
+
+    Returns:
+        List of blocker entries
+    """
+    if counters is not None and not counters.is_room_blocked(format_date_key(booking_date), room):
+        return []
+    return [blocker for _, blocker in blockers_overlapping(bookings, booking_date, room, counters=counters)]
+
+
+def get_room_blocker(bookings: Dict[str, Any], booking_date: date, room: str) -> Optional[Dict[str, Any]]:
+    """Get the earliest room blocker for specific date and room"""
+    blockers = get_room_blockers(bookings, booking_date, room)
+    return blockers[0] if blockers else None
+
+
+def valid_blocker_window(start_time: Optional[str], end_time: Optional[str]) -> bool:
+    """Check that a custom blocker window has HH:MM times with start_time before end_time"""
+    start, end = time_to_minutes(start_time), time_to_minutes(end_time)
+    return start is not None and end is not None and start < end
+
+
+def build_room_blocker(
+    booking_date: date,
+    room: str,
+    user_id: str,
+    blocker_type: str,
+    custom_time_start: Optional[str] = None,
+    custom_time_end: Optional[str] = None,
+    reason: str = ""
+) -> Dict[str, Any]:
+    """
+    Build a room blocker entry in the storage format.
+
+    Args:
+        booking_date: Date of the blocker
+        room: Room identifier
+        user_id: Blocking user
+        blocker_type: One of BLOCKER_TYPES
+        custom_time_start: Start time for 'custom' blockers (HH:MM)
+        custom_time_end: End time for 'custom' blockers (HH:MM)
+        reason: Short reason, truncated to BLOCKER_REASON_MAX_LENGTH
+
+    Returns:
+        Room blocker entry dict
+
+    Raises:
+        ValueError: If a 'custom' window is not valid (see valid_blocker_window)
+    """
+    # Fixed time ranges per blocker type, custom uses the given times
+    if blocker_type == 'custom':
+        if not valid_blocker_window(custom_time_start, custom_time_end):
+            raise ValueError("Custom blockers need HH:MM times with start_time before end_time")
+        start_time, end_time = custom_time_start, custom_time_end
+    else:
+        start_time, end_time = BLOCKER_TIME_RANGES[blocker_type]
+
+    return {
+        'user_id': user_id,
+        'blocker_type': blocker_type,
+        'start_time': start_time,
+        'end_time': end_time,
+        'reason': reason[:BLOCKER_REASON_MAX_LENGTH] if reason else "",
+        'created_at': datetime.now().isoformat(),
+        'date': format_date_key(booking_date),
+        'room': room,
+        'entry_type': 'room_blocker'
+    }
+
+
+def get_room_block_message(blocker: Optional[Dict[str, Any]], users: Dict[str, Any]) -> Optional[str]:
+    """
+    Format the message shown for a blocked room.
+
+    Args:
+        blocker: Room blocker entry (or None)
+        users: User data dictionary
+
+    Returns:
+        Message text, or None when there is no blocker
+    """
+    if not blocker:
+        return None
+
+    username = get_username(blocker, users)
+    start_time = blocker.get('start_time', '')
+    end_time = blocker.get('end_time', '')
+    reason = blocker.get('reason', '')
+
+    message = f"This room is blocked from {start_time} to {end_time} by {username}"
+    if reason:
+        message += f" ({reason})"
+
+    return message
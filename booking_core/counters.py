@@ -0,0 +1,375 @@
+"""
+BIIS Desk Booking System - Booking Core: Occupancy Counters
+Author: [Your Name]
+Date: [Date]
+Description: Incrementally maintained occupancy counters per date, room and user
+
+DESIGN:
+- Counters are built once from the bookings dict (cold start / reload)
+- Every create/remove/archive mutation updates them in place
+- UI badges ("3/7 desks free") and per-user totals read them in O(1)
+- A process-wide version number changes on every mutation or rebuild,
+  so derived caches can be keyed by it
+- An ordered key index (booking_core.keys.KeyIndex) answers date-range and
+  room-within-date-range queries as slices; it only changes when an entry
+  is created or removed, not when one is replaced
+- Desk counts are per entry (a desk shared by two half-day bookers is one
+  booked desk); per-user counts and keys include every occupant
+- Per-user totals, booking type counts and the future/past split are
+  running counts; the split's cutoff date only moves when asked for
+  another day, touching just the dates in between
+- Free-desk figures come from the occupied slot masks per desk-day: a desk
+  is free while one half-day slot is neither booked nor covered by the
+  room's blockers, matching slot availability (booking_core.slots)
+- A user -> date -> desk booking keys index answers "where does this user
+  sit on this day" with two dict lookups (team co-location, booking_core.teams)
+- Room blockers are kept in one time-interval index per room
+  (booking_core.intervals), so "which blockers overlap this window" is a
+  bisect; a room counts as blocked for the free-desk badge only when its
+  blockers cover both half-day slots
+- Recurring blocker rules (booking_core.recurring) are expanded into the
+  same interval index for one contiguous date range at a time
+  (expand_blocker_rules); their occurrences are never stored as bookings
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. OCCUPANCY COUNTERS
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import copy
+import itertools
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Dict, Any, Optional, Set, Tuple, List
+
+from booking_core.intervals import IntervalIndex, build_interval_index, day_interval, entry_interval
+from booking_core.keys import KeyIndex
+from booking_core.profiling import span
+from booking_core.recurring import expand_rules
+from booking_core.rules import ROOM_LAYOUT
+from booking_core.slots import SECOND_HALF_FIELD, SLOT_ALL, SLOT_NAMES, occupant_ids, occupied_slots, slot_window
+
+# Shared sequence so versions never repeat across rebuilds or sessions
+_VERSION_SEQUENCE = itertools.count(1)
+
+
+# ============================================================================
+# 2. OCCUPANCY COUNTERS
+# ============================================================================
+
+class OccupancyCounters:
+    """Materialised booking counts kept in sync with a bookings dict"""
+
+    def __init__(self, bookings: Dict[str, Any]):
+        self._source = bookings
+        self._bookings_per_date = Counter()     # date_key -> desk bookings
+        self._bookings_per_room = Counter()     # (date_key, room) -> desk bookings
+        self._blockers_per_room = Counter()     # (date_key, room) -> room blockers
+        self._desk_slots = Counter()            # (date_key, room, occupied slot mask) -> desks
+        self._user_totals = Counter()           # user_id -> desk bookings
+        self._user_types = defaultdict(Counter)  # user_id -> Counter(booking_type)
+        self._user_future = Counter()           # user_id -> desk bookings dated on/after _split_key
+        self._split_key = ''                    # Cutoff date of _user_future (see user_split)
+        self._user_day_keys = defaultdict(dict)  # user_id -> date_key -> desk booking keys
+        self._keys_per_date = defaultdict(set)  # date_key -> desk booking keys
+        self._keys_per_user = defaultdict(set)  # user_id -> booking + blocker keys
+        self._keys_per_room = defaultdict(set)  # room -> booking + blocker keys
+        self._feed_versions = {}                # ('user'|'room', id) -> version of last change
+        self.rule_occurrences = {}              # occurrence key -> expanded recurring blocker
+        self._rules_expanded = None             # (rules, first day, last day) of rule_occurrences
+        self.version = self.generation = next(_VERSION_SEQUENCE)
+
+        with span('index_build'):
+            for booking_key, booking in bookings.items():
+                self._apply(booking_key, booking, 1)
+            self.key_index = KeyIndex(bookings, ROOM_LAYOUT)
+            self.blocker_intervals = build_interval_index(bookings)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore from a snapshot with fresh versions for this process"""
+        self.__dict__.update(state)
+        self.version = self.generation = next(_VERSION_SEQUENCE)
+        self._feed_versions = {}
+
+    def is_built_from(self, bookings: Dict[str, Any]) -> bool:
+        """Check whether the counters track this exact bookings dict"""
+        return self._source is bookings
+
+    def _apply(self, booking_key: str, booking: Dict[str, Any], delta: int) -> None:
+        """Add (delta=1) or subtract (delta=-1) one booking from all counters"""
+        date_key = booking.get('date')
+        room = booking.get('room')
+        user_ids = occupant_ids(booking)
+
+        # Per-user/per-room key indexes (calendar feeds), blockers included
+        room_keys = self._keys_per_room[room]
+        if delta > 0:
+            room_keys.add(booking_key)
+        else:
+            room_keys.discard(booking_key)
+        change = next(_VERSION_SEQUENCE)
+        self._feed_versions[('room', room)] = change
+        for user_id in user_ids:
+            if delta > 0:
+                self._keys_per_user[user_id].add(booking_key)
+            else:
+                self._keys_per_user[user_id].discard(booking_key)
+            self._feed_versions[('user', user_id)] = change
+
+        if booking.get('entry_type') == 'room_blocker':
+            self._blockers_per_room[(date_key, room)] += delta
+            return
+
+        self._bookings_per_date[date_key] += delta
+        self._bookings_per_room[(date_key, room)] += delta
+        self._desk_slots[(date_key, room, occupied_slots(booking))] += delta
+        second = booking.get(SECOND_HALF_FIELD)
+        booking_types = [booking.get('booking_type')] + ([second.get('booking_type')] if second else [])
+        is_future = (date_key or '') >= self._split_key
+        for user_id, booking_type in zip(user_ids, booking_types):
+            self._user_totals[user_id] += delta
+            self._user_types[user_id][booking_type] += delta
+            if is_future:
+                self._user_future[user_id] += delta
+            day_keys = self._user_day_keys[user_id]
+            if delta > 0:
+                day_keys.setdefault(date_key, set()).add(booking_key)
+            elif booking_key in day_keys.get(date_key, ()):
+                day_keys[date_key].discard(booking_key)
+                if not day_keys[date_key]:
+                    del day_keys[date_key]
+
+        if delta > 0:
+            self._keys_per_date[date_key].add(booking_key)
+        else:
+            self._keys_per_date[date_key].discard(booking_key)
+
+    def replace(self, booking_key: str, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+        """
+        Record a mutation of one booking entry.
+
+        Args:
+            booking_key: Key of the mutated entry
+            old: Entry before the mutation (None when created)
+            new: Entry after the mutation (None when removed)
+        """
+        if old:
+            self._apply(booking_key, old, -1)
+        if new:
+            self._apply(booking_key, new, 1)
+        if new and not old:
+            self.key_index.add(booking_key)
+        elif old and not new:
+            self.key_index.discard(booking_key)
+        self._replace_interval(booking_key, old, new)
+        self.version = next(_VERSION_SEQUENCE)
+
+    def _replace_interval(self, booking_key: str, old: Optional[Dict[str, Any]],
+                          new: Optional[Dict[str, Any]]) -> None:
+        """Keep the blocker interval indexes in sync with one mutation"""
+        for entry, add in ((old, False), (new, True)):
+            interval = entry_interval(entry) if entry else None
+            if interval is None:
+                continue
+            index = self.blocker_intervals.setdefault(entry.get('room'), IntervalIndex())
+            if add:
+                index.add(*interval, booking_key)
+            else:
+                index.discard(*interval, booking_key)
+
+    def expand_blocker_rules(self, rules: Optional[Dict[str, Any]], start: date, end: date) -> None:
+        """
+        Include the occurrences of recurring blocker rules from start to end in the blocker index.
+
+        Only one contiguous range is kept: a range touching the expanded one
+        extends it, any other range replaces it. Repeated calls for an
+        expanded range with unchanged rules are a no-op.
+
+        Args:
+            rules: Rule id -> rule entry (settings['blocker_rules'])
+            start: First date of the range
+            end: Last date of the range
+        """
+        rules = rules or {}
+        expanded = self._rules_expanded
+        if expanded is not None and expanded[0] == rules:
+            first, last = expanded[1], expanded[2]
+            if first <= start and end <= last:
+                return
+            if start <= last + timedelta(days=1) and first <= end + timedelta(days=1):
+                start, end = min(start, first), max(end, last)
+
+        occurrences = expand_rules(rules, start, end)
+        changed = False
+        for key, entry in self.rule_occurrences.items():
+            if occurrences.get(key) != entry:
+                self._apply_occurrence(key, entry, -1)
+                changed = True
+        for key, entry in occurrences.items():
+            if self.rule_occurrences.get(key) != entry:
+                self._apply_occurrence(key, entry, 1)
+                changed = True
+        self.rule_occurrences = occurrences
+        self._rules_expanded = (copy.deepcopy(rules), start, end)
+        if changed:
+            self.version = next(_VERSION_SEQUENCE)
+
+    def _apply_occurrence(self, occurrence_key: str, entry: Dict[str, Any], delta: int) -> None:
+        """Add (delta=1) or subtract (delta=-1) one rule occurrence from the blocker counts and index"""
+        self._blockers_per_room[(entry.get('date'), entry.get('room'))] += delta
+        if delta > 0:
+            self._replace_interval(occurrence_key, None, entry)
+        else:
+            self._replace_interval(occurrence_key, entry, None)
+
+    def bookings_on(self, date_key: str) -> int:
+        """Number of desk bookings on a date"""
+        return self._bookings_per_date[date_key]
+
+    def booking_keys_on(self, date_key: str) -> Set[str]:
+        """Keys of all desk bookings on a date"""
+        return self._keys_per_date.get(date_key, set())
+
+    def booked_desks(self, date_key: str, room: str) -> int:
+        """Number of booked desks in a room on a date"""
+        return self._bookings_per_room[(date_key, room)]
+
+    def is_room_blocked(self, date_key: str, room: str) -> bool:
+        """Check whether a room has a blocker on a date"""
+        return self._blockers_per_room[(date_key, room)] > 0
+
+    def blockers_overlapping(self, room: str, start: int, end: int) -> List[str]:
+        """
+        Keys of a room's blockers overlapping a window.
+
+        Args:
+            room: Room identifier
+            start: Window start in absolute minutes (see intervals.day_interval)
+            end: Window end in absolute minutes
+
+        Returns:
+            Blocker keys ordered by start time
+        """
+        index = self.blocker_intervals.get(room)
+        return index.overlapping(start, end) if index is not None else []
+
+    def blocked_slots(self, date_key: str, room: str) -> int:
+        """Half-day slot mask of a date covered by the room's blockers"""
+        if not self.is_room_blocked(date_key, room):
+            return 0
+        booking_date = date.fromisoformat(date_key)
+        mask = 0
+        for slot in SLOT_NAMES:
+            if self.blockers_overlapping(room, *day_interval(booking_date, *slot_window(slot))):
+                mask |= slot
+        return mask
+
+    def free_desks(self, date_key: str, room: Optional[str] = None) -> Tuple[int, int]:
+        """
+        Free and total desks on a date, for one room or the whole office.
+
+        A desk is free while at least one half-day slot is neither booked
+        nor covered by the room's blockers; rooms blocked for both slots
+        have no free desks.
+
+        Args:
+            date_key: Date in 'YYYY-MM-DD' format
+            room: Room identifier (optional, all rooms when omitted)
+
+        Returns:
+            Tuple of (free desks, total desks)
+        """
+        rooms = [room] if room else list(ROOM_LAYOUT)
+        free = total = 0
+        for room_id in rooms:
+            desk_count = ROOM_LAYOUT.get(room_id, 0)
+            total += desk_count
+            blocked = self.blocked_slots(date_key, room_id)
+            if blocked == SLOT_ALL:
+                continue
+            # Desks whose occupied slots plus the blocked slots leave nothing free
+            taken = sum(self._desk_slots[(date_key, room_id, mask)]
+                        for mask in range(1, SLOT_ALL + 1) if mask | blocked == SLOT_ALL)
+            free += max(desk_count - taken, 0)
+        return free, total
+
+    def keys_between(self, start: date, end: date, room: Optional[str] = None) -> List[str]:
+        """
+        Keys of all bookings and room blockers from start to end (inclusive).
+
+        Keys that are not in the storage format are not included (see
+        key_index.unindexed).
+
+        Args:
+            start: First date
+            end: Last date
+            room: Only this room (optional)
+
+        Returns:
+            Keys in date, room and desk order
+        """
+        return self.key_index.between(start, end, room)
+
+    def keys_for_user(self, user_id: str) -> Set[str]:
+        """Keys of all bookings and room blockers held by a user"""
+        return self._keys_per_user.get(user_id, set())
+
+    def user_keys_on(self, user_id: str, date_key: str) -> Set[str]:
+        """Keys of the desk bookings a user holds on a date (usually zero or one)"""
+        return self._user_day_keys.get(user_id, {}).get(date_key, set())
+
+    def keys_for_room(self, room: str) -> Set[str]:
+        """Keys of all bookings and room blockers in a room"""
+        return self._keys_per_room.get(room, set())
+
+    def feed_version(self, kind: str, ident: str) -> int:
+        """
+        Version of the last change affecting one user's or room's entries.
+
+        Args:
+            kind: 'user' or 'room'
+            ident: User ID or room identifier
+
+        Returns:
+            Version number (the build generation if nothing was recorded)
+        """
+        return self._feed_versions.get((kind, ident), self.generation)
+
+    def user_total(self, user_id: str) -> int:
+        """Total desk bookings held by a user"""
+        return self._user_totals[user_id]
+
+    def user_type_counts(self, user_id: str) -> Dict[str, int]:
+        """A user's desk bookings per booking type"""
+        return dict(self._user_types.get(user_id, {}))
+
+    def user_split(self, user_id: str, today_key: str) -> Tuple[int, int]:
+        """
+        Split a user's bookings into future (incl. today) and past counts.
+
+        Args:
+            user_id: User identifier
+            today_key: Today's date in 'YYYY-MM-DD' format
+
+        Returns:
+            Tuple of (future bookings, past bookings)
+        """
+        if today_key != self._split_key:
+            self._move_split(today_key)
+        future = self._user_future[user_id]
+        return future, self._user_totals[user_id] - future
+
+    def _move_split(self, split_key: str) -> None:
+        """Move the cutoff of the running future counts, recounting only the dates in between"""
+        low, high = sorted((self._split_key, split_key))
+        # Moving forward, the dates in between leave the future; moving back, they rejoin it
+        delta = -1 if split_key > self._split_key else 1
+        for date_key in [key for key in self._keys_per_date if low <= key < high]:
+            for booking_key in self._keys_per_date[date_key]:
+                for user_id in occupant_ids(self._source.get(booking_key)):
+                    self._user_future[user_id] += delta
+        self._split_key = split_key
@@ -0,0 +1,148 @@
+"""
+BIIS Desk Booking System - Booking Core: Free-Desk Finder
+Author: [Your Name]
+Date: [Date]
+Description: Free desks per day across a date range, optionally per room and half-day
+
+DESIGN:
+- One slice of the ordered key index (counters.keys_between) holds every
+  booking and room blocker of the range in date order; a single pass over
+  it collects the taken slots per desk-day and the blocked slots per
+  room-day, so the cost follows the bookings in the range, not the days
+  times desks probed one by one
+- Recurring blocker occurrences are passed in (recurring.expand_rules) or
+  taken from the counters' expanded range (callers expand the range first)
+- Days come from the work calendar (booking_core.workdays): weekends and
+  holidays are never offered
+- A desk is free for a request when none of the requested slots is booked
+  (any booking type, 'maybe' included) or covered by a room blocker
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. FREE-DESK QUERIES
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Any, List, Mapping, NamedTuple, Optional, Tuple
+
+from booking_core.rules import ROOM_LAYOUT
+from booking_core.slots import SLOT_ALL, blocker_slots, occupied_slots
+from booking_core.workdays import get_calendar
+
+# Longest range answered in one query (in calendar days)
+MAX_FINDER_DAYS = 366
+
+
+class FreeDesk(NamedTuple):
+    """One free desk on a day; slots is the mask of its free half-days"""
+
+    room: str
+    desk_num: int
+    slots: int
+
+
+# ============================================================================
+# 2. FREE-DESK QUERIES
+# ============================================================================
+
+def _entries_between(
+    bookings: Mapping[str, Any],
+    start: date,
+    end: date,
+    room: Optional[str],
+    counters: Optional[Any]
+) -> List[Mapping[str, Any]]:
+    """Bookings and room blockers from start to end (inclusive), of one room if given"""
+    if counters is not None:
+        keys = counters.keys_between(start, end, room)
+        keys.extend(counters.key_index.unindexed)
+        entries = [bookings[key] for key in keys if key in bookings]
+    else:
+        entries = list(bookings.values())
+
+    start_key, end_key = start.isoformat(), end.isoformat()
+    return [
+        entry for entry in entries
+        if start_key <= entry.get('date', '') <= end_key and (room is None or entry.get('room') == room)
+    ]
+
+
+def find_free_desks(
+    bookings: Mapping[str, Any],
+    start: date,
+    end: date,
+    room: Optional[str] = None,
+    slots: int = SLOT_ALL,
+    counters: Optional[Any] = None,
+    holidays: Optional[Mapping[str, Any]] = None,
+    occurrences: Optional[Mapping[str, Mapping[str, Any]]] = None
+) -> Dict[str, List[FreeDesk]]:
+    """
+    Free desks on each workday from start to end (inclusive).
+
+    Args:
+        bookings: Booking data dictionary
+        start: First date
+        end: Last date
+        room: Only this room (optional, all rooms when omitted)
+        slots: Half-days that must be free (SLOT_AM, SLOT_PM or SLOT_ALL)
+        counters: OccupancyCounters tracking bookings, for an indexed lookup (optional)
+        holidays: settings['holidays'], skipped like weekends (optional)
+        occurrences: Expanded recurring blockers of the range (see
+            recurring.expand_rules); default: the counters' rule_occurrences
+
+    Returns:
+        Date key -> free desks in room layout and desk order; every workday
+        of the range is present, with an empty list when nothing is free
+
+    Raises:
+        ValueError: If the range is inverted or longer than MAX_FINDER_DAYS,
+            the room is unknown or slots is empty
+    """
+    if end < start:
+        raise ValueError("End date is before the start date")
+    if (end - start).days >= MAX_FINDER_DAYS:
+        raise ValueError(f"Ranges are limited to {MAX_FINDER_DAYS} days")
+    if room is not None and room not in ROOM_LAYOUT:
+        raise ValueError(f"Unknown room '{room}'")
+    if not slots & SLOT_ALL:
+        raise ValueError("No half-day selected")
+    slots &= SLOT_ALL
+
+    # One pass: taken slots per desk-day, blocked slots per room-day
+    taken: Dict[Tuple[str, str, Any], int] = defaultdict(int)
+    blocked: Dict[Tuple[str, str], int] = defaultdict(int)
+    entries = _entries_between(bookings, start, end, room, counters)
+    if occurrences is None and counters is not None:
+        occurrences = counters.rule_occurrences
+    start_key, end_key = start.isoformat(), end.isoformat()
+    entries.extend(
+        entry for entry in (occurrences or {}).values()
+        if start_key <= entry.get('date', '') <= end_key and (room is None or entry.get('room') == room)
+    )
+    for entry in entries:
+        if entry.get('entry_type') == 'room_blocker':
+            blocked[(entry.get('date'), entry.get('room'))] |= blocker_slots(entry)
+        else:
+            taken[(entry.get('date'), entry.get('room'), entry.get('desk_num'))] |= occupied_slots(entry)
+
+    rooms = [room] if room else list(ROOM_LAYOUT)
+    result: Dict[str, List[FreeDesk]] = {}
+    for day in get_calendar(holidays).workdays(start, end):
+        date_key = day.isoformat()
+        free_desks = []
+        for room_id in rooms:
+            room_free = SLOT_ALL & ~blocked.get((date_key, room_id), 0)
+            if room_free & slots != slots:
+                continue
+            for desk_num in range(1, ROOM_LAYOUT[room_id] + 1):
+                desk_free = room_free & ~taken.get((date_key, room_id, desk_num), 0)
+                if desk_free & slots == slots:
+                    free_desks.append(FreeDesk(room_id, desk_num, desk_free))
+        result[date_key] = free_desks
+    return result
@@ -0,0 +1,208 @@
+"""
+BIIS Desk Booking System - Booking Core: Holidays
+Author: [Your Name]
+Date: [Date]
+Description: Holiday parsing, storage entries and workday checks without any UI
+
+DESIGN:
+- settings['holidays'] maps a key to a holiday entry: 'YYYY-MM-DD' for a
+  single date, 'MM-DD' for a holiday recurring every year (e.g. '12-25')
+- Ranges are stored as one dated entry per day sharing the range's name,
+  so every reader of dated keys keeps working
+- Bulk input has one holiday per line: 'DD.MM.YYYY', 'DD.MM.YYYY - DD.MM.YYYY'
+  or 'DD.MM.' (recurring), each optionally followed by a name
+- Date tables and week math live in booking_core.workdays; the checks here
+  are single dict lookups
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. HOLIDAY FUNCTIONS
+3. BULK IMPORT
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+from booking_core.rules import format_date_key
+
+# Swiss date format used for holiday input and display
+HOLIDAY_INPUT_FORMAT = '%d.%m.%Y'
+
+# Key format of holidays recurring every year
+RECURRING_KEY_FORMAT = '%m-%d'
+
+# Longest range accepted in one bulk line (company shutdowns, not whole years)
+MAX_HOLIDAY_RANGE_DAYS = 62
+
+# 'DD.MM.YYYY', 'DD.MM.YYYY - DD.MM.YYYY' or 'DD.MM.' followed by an optional name
+_BULK_LINE = re.compile(
+    r'^(?P<start>\d{1,2}\.\d{1,2}\.(?P<year>\d{4})?)'
+    r'(?:\s*-\s*(?P<end>\d{1,2}\.\d{1,2}\.\d{4}))?'
+    r'(?:\s+(?P<name>.+))?$'
+)
+
+
+# ============================================================================
+# 2. HOLIDAY FUNCTIONS
+# ============================================================================
+
+def build_holiday_entry(holiday_date: date, name: str = "") -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the storage entry of a single-date holiday.
+
+    Returns:
+        Tuple of (holiday key 'YYYY-MM-DD', holiday entry)
+    """
+    holiday_key = format_date_key(holiday_date)
+    entry = {
+        'date': holiday_key,
+        'display_date': holiday_date.strftime(HOLIDAY_INPUT_FORMAT),
+        'added_date': datetime.now().isoformat()
+    }
+    if name:
+        entry['name'] = name
+    return holiday_key, entry
+
+
+def build_recurring_holiday_entry(day: int, month: int, name: str = "") -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the storage entry of a holiday recurring every year.
+
+    Returns:
+        Tuple of (holiday key 'MM-DD', holiday entry)
+
+    Raises:
+        ValueError: If the day does not exist in any year
+    """
+    date(2000, month, day)  # leap year: accepts 29.02.
+    holiday_key = f"{month:02d}-{day:02d}"
+    entry = {
+        'date': holiday_key,
+        'display_date': f"{day:02d}.{month:02d}.",
+        'added_date': datetime.now().isoformat(),
+        'recurring': True
+    }
+    if name:
+        entry['name'] = name
+    return holiday_key, entry
+
+
+def parse_holiday_input(holiday_input: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Parse a DD.MM.YYYY holiday and build its storage entry.
+
+    Args:
+        holiday_input: Date in Swiss format, e.g. '25.12.2025'
+
+    Returns:
+        Tuple of (holiday key 'YYYY-MM-DD', holiday entry)
+
+    Raises:
+        ValueError: If the date is empty or not in DD.MM.YYYY format
+    """
+    holiday_input = (holiday_input or '').strip()
+    holiday_date = datetime.strptime(holiday_input, HOLIDAY_INPUT_FORMAT)
+    holiday_key = holiday_date.strftime('%Y-%m-%d')
+
+    return holiday_key, {
+        'date': holiday_key,
+        'display_date': holiday_input,
+        'added_date': datetime.now().isoformat()
+    }
+
+
+def is_recurring_key(holiday_key: str) -> bool:
+    """Check whether a holiday key is a yearly 'MM-DD' key"""
+    return len(holiday_key) == 5 and holiday_key[2] == '-'
+
+
+def is_holiday(holidays: Dict[str, Any], check_date: date) -> bool:
+    """Check whether a date is a configured holiday (dated or recurring)"""
+    return format_date_key(check_date) in holidays or check_date.strftime(RECURRING_KEY_FORMAT) in holidays
+
+
+def is_workday(holidays: Dict[str, Any], check_date: date) -> bool:
+    """Check whether a date is a Monday-Friday non-holiday"""
+    return check_date.weekday() < 5 and not is_holiday(holidays, check_date)
+
+
+def holiday_label(holiday_key: str, entry: Dict[str, Any]) -> str:
+    """Display text of a holiday entry, e.g. '25.12. (every year) Christmas'"""
+    label = entry.get('display_date', holiday_key)
+    if entry.get('recurring') or is_recurring_key(holiday_key):
+        label += " (every year)"
+    if entry.get('name'):
+        label += f" {entry['name']}"
+    return label
+
+
+# ============================================================================
+# 3. BULK IMPORT
+# ============================================================================
+
+def parse_holiday_line(line: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse one bulk holiday line into storage entries.
+
+    Args:
+        line: 'DD.MM.YYYY [name]', 'DD.MM.YYYY - DD.MM.YYYY [name]' or 'DD.MM. [name]'
+
+    Returns:
+        Holiday key -> entry (one entry per day of a range)
+
+    Raises:
+        ValueError: If the line does not match, a date is invalid or the range is inverted/too long
+    """
+    match = _BULK_LINE.match(line.strip())
+    if not match:
+        raise ValueError("expected DD.MM.YYYY, DD.MM.YYYY - DD.MM.YYYY or DD.MM.")
+    name = (match.group('name') or '').strip()
+
+    if not match.group('year'):
+        if match.group('end'):
+            raise ValueError("ranges need full dates")
+        day, month = (int(part) for part in match.group('start').split('.')[:2])
+        holiday_key, entry = build_recurring_holiday_entry(day, month, name)
+        return {holiday_key: entry}
+
+    start = datetime.strptime(match.group('start'), HOLIDAY_INPUT_FORMAT).date()
+    end = datetime.strptime(match.group('end'), HOLIDAY_INPUT_FORMAT).date() if match.group('end') else start
+    if end < start:
+        raise ValueError("range ends before it starts")
+    if (end - start).days >= MAX_HOLIDAY_RANGE_DAYS:
+        raise ValueError(f"ranges are limited to {MAX_HOLIDAY_RANGE_DAYS} days")
+
+    entries = {}
+    for offset in range((end - start).days + 1):
+        holiday_key, entry = build_holiday_entry(start + timedelta(days=offset), name)
+        entries[holiday_key] = entry
+    return entries
+
+
+def parse_holiday_lines(text: Optional[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    Parse a bulk holiday list (one holiday or range per line).
+
+    Empty lines and lines starting with '#' are ignored.
+
+    Args:
+        text: Bulk input
+
+    Returns:
+        Tuple of (holiday key -> entry, error messages per rejected line)
+    """
+    holidays: Dict[str, Dict[str, Any]] = {}
+    errors = []
+    for line_num, line in enumerate((text or '').splitlines(), start=1):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        try:
+            holidays.update(parse_holiday_line(line))
+        except ValueError as e:
+            errors.append(f"Line {line_num}: {e}")
+    return holidays, errors
@@ -0,0 +1,284 @@
+"""
+BIIS Desk Booking System - Booking Core: iCalendar Feeds
+Author: [Your Name]
+Date: [Date]
+Description: Per-user and per-room iCalendar (.ics) feeds of bookings and room blockers
+
+DESIGN:
+- Feeds are assembled from the per-user/per-room key indexes kept by
+  OccupancyCounters, never by scanning all bookings
+- Rendered VEVENTs are cached per entry and reused until the entry changes
+- A desk shared by two half-day bookers yields one event per occupant; the
+  second occupant's UID carries a '_pm' suffix
+- Whole feeds are cached by their ETag (feed version + user/settings
+  version), so unchanged feeds cost one dict lookup and clients can use
+  If-None-Match
+- Times are floating local times (the office calendar), all-day events for
+  full-day and maybe bookings
+- Calendar clients cannot send headers, so each feed URL can carry its own
+  HMAC key that unlocks only that read-only feed
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. ICS FORMATTING
+3. EVENT RENDERING
+4. FEED CACHE
+5. FEED URL KEYS
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import hashlib
+import hmac
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Tuple, Optional
+
+from booking_core.rules import get_desk_name, get_username
+from booking_core.slots import occupants
+
+PRODID = '-//BIIS//Desk Booking//EN'
+UID_DOMAIN = 'biis-desk-booking'
+CALENDAR_TIMEZONE = 'Europe/Zurich'
+
+FEED_KINDS = ('user', 'room')
+FEED_KEY_LENGTH = 32  # Hex characters of the HMAC kept in feed URLs
+
+# Timed booking types; other types become all-day events
+BOOKING_TIME_RANGES = {
+    'half_am': ('08:00', '12:00'),
+    'half_pm': ('13:00', '17:00')
+}
+
+BOOKING_TYPE_LABELS = {
+    'full_day': 'Full day',
+    'half_am': 'Morning',
+    'half_pm': 'Afternoon',
+    'maybe': 'Maybe'
+}
+
+
+# ============================================================================
+# 2. ICS FORMATTING
+# ============================================================================
+
+def _escape(text: str) -> str:
+    """Escape a TEXT property value (RFC 5545 3.3.11)"""
+    return (str(text).replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _fold(line: str) -> str:
+    """Fold a content line to 75 octets per physical line (RFC 5545 3.1)"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+
+    parts, current, size = [], '', 0
+    for char in line:
+        char_size = len(char.encode('utf-8'))
+        if size + char_size > (75 if not parts else 74):
+            parts.append(current)
+            current, size = '', 0
+        current += char
+        size += char_size
+    parts.append(current)
+    return '\r\n '.join(parts)
+
+
+def _local_datetime(date_key: str, time_value: str) -> str:
+    """Floating local date-time, e.g. 20250613T090000"""
+    return f"{date_key.replace('-', '')}T{time_value.replace(':', '')[:4]}00"
+
+
+def _utc_stamp(created_at: Optional[str]) -> str:
+    """UTC timestamp for DTSTAMP from an ISO created_at value"""
+    try:
+        moment = datetime.fromisoformat(created_at).astimezone(timezone.utc)
+    except (TypeError, ValueError):
+        moment = datetime.now(timezone.utc)
+    return moment.strftime('%Y%m%dT%H%M%SZ')
+
+
+# ============================================================================
+# 3. EVENT RENDERING
+# ============================================================================
+
+def render_event(
+    booking_key: str,
+    entry: Dict[str, Any],
+    kind: str,
+    users: Dict[str, Any],
+    desk_names: Dict[str, str]
+) -> str:
+    """
+    Render one booking or room blocker as a VEVENT.
+
+    Args:
+        booking_key: Storage key (used for the stable UID)
+        entry: Booking or room blocker entry
+        kind: Feed kind ('user' or 'room') - controls the summary wording
+        users: User data dictionary
+        desk_names: Desk name mappings
+
+    Returns:
+        VEVENT block with CRLF line endings
+    """
+    date_key = entry.get('date', '')
+    room_label = str(entry.get('room', '')).capitalize()
+    username = get_username(entry, users)
+
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:{booking_key}@{UID_DOMAIN}",
+        f"DTSTAMP:{_utc_stamp(entry.get('created_at'))}"
+    ]
+
+    if entry.get('entry_type') == 'room_blocker':
+        summary = f"Room {room_label} blocked"
+        if entry.get('reason'):
+            summary += f" ({entry['reason']})"
+        lines += [
+            f"DTSTART:{_local_datetime(date_key, entry.get('start_time') or '08:00')}",
+            f"DTEND:{_local_datetime(date_key, entry.get('end_time') or '18:00')}",
+            f"SUMMARY:{_escape(summary)}",
+            f"DESCRIPTION:{_escape(f'Blocked by {username}')}"
+        ]
+    else:
+        booking_type = entry.get('booking_type', 'full_day')
+        desk_name = get_desk_name(desk_names, entry.get('room', ''), entry.get('desk_num', ''))
+        type_label = BOOKING_TYPE_LABELS.get(booking_type, booking_type)
+        if kind == 'room':
+            summary = f"{username} · {desk_name} ({type_label})"
+        else:
+            summary = f"{desk_name} · {room_label} ({type_label})"
+
+        if booking_type in BOOKING_TIME_RANGES:
+            start_time, end_time = BOOKING_TIME_RANGES[booking_type]
+            lines += [
+                f"DTSTART:{_local_datetime(date_key, start_time)}",
+                f"DTEND:{_local_datetime(date_key, end_time)}"
+            ]
+        else:
+            start = datetime.strptime(date_key, '%Y-%m-%d')
+            lines += [
+                f"DTSTART;VALUE=DATE:{start.strftime('%Y%m%d')}",
+                f"DTEND;VALUE=DATE:{(start + timedelta(days=1)).strftime('%Y%m%d')}",
+                'TRANSP:TRANSPARENT'
+            ]
+
+        lines.append(f"SUMMARY:{_escape(summary)}")
+        lines.append(f"LOCATION:{_escape(f'{room_label} office, {desk_name}')}")
+        if booking_type == 'maybe':
+            lines.append('STATUS:TENTATIVE')
+
+    lines.append('END:VEVENT')
+    return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
+
+
+# ============================================================================
+# 4. FEED CACHE
+# ============================================================================
+
+class CalendarFeedCache:
+    """Caches rendered events and whole feeds between requests"""
+
+    def __init__(self):
+        self._events: Dict[Tuple[str, str], Tuple[Dict[str, Any], Any, str]] = {}
+        self._feeds: Dict[Tuple[str, str], Tuple[str, bytes]] = {}
+
+    @staticmethod
+    def etag(kind: str, ident: str, feed_version: int, names_version: Any) -> str:
+        """Strong ETag for one feed state"""
+        digest = hashlib.sha1(f"{kind}|{ident}|{feed_version}|{names_version}".encode('utf-8')).hexdigest()
+        return f'"{digest[:20]}"'
+
+    def feed(
+        self,
+        kind: str,
+        ident: str,
+        bookings: Dict[str, Any],
+        counters: Any,
+        users: Dict[str, Any],
+        desk_names: Dict[str, str],
+        names_version: Any,
+        calendar_name: str
+    ) -> Tuple[str, bytes]:
+        """
+        Return (etag, ics body) for a user or room feed.
+
+        Args:
+            kind: 'user' or 'room'
+            ident: User ID or room identifier
+            bookings: Booking data dictionary
+            counters: OccupancyCounters tracking the bookings
+            users: User data dictionary
+            desk_names: Desk name mappings
+            names_version: Changes whenever users or settings change
+            calendar_name: Display name of the calendar
+
+        Returns:
+            Tuple of (ETag header value, UTF-8 encoded calendar)
+        """
+        etag = self.etag(kind, ident, counters.feed_version(kind, ident), names_version)
+        cached = self._feeds.get((kind, ident))
+        if cached and cached[0] == etag:
+            return cached
+
+        keys = counters.keys_for_user(ident) if kind == 'user' else counters.keys_for_room(ident)
+        events: List[str] = []
+        for booking_key in sorted(keys):
+            entry = bookings.get(booking_key)
+            if entry is None:
+                continue
+            cache_key = (kind, booking_key)
+            cached_event = self._events.get(cache_key)
+            if cached_event and cached_event[0] is entry and cached_event[1] == names_version:
+                events.append(cached_event[2])
+                continue
+            text = ''.join(
+                render_event(booking_key if position == 0 else f"{booking_key}_pm", occupant, kind, users, desk_names)
+                for position, occupant in enumerate(occupants(entry))
+                if kind == 'room' or occupant.get('user_id') == ident
+            )
+            self._events[cache_key] = (entry, names_version, text)
+            events.append(text)
+
+        header = [
+            'BEGIN:VCALENDAR',
+            'VERSION:2.0',
+            f"PRODID:{PRODID}",
+            'CALSCALE:GREGORIAN',
+            'METHOD:PUBLISH',
+            _fold(f"X-WR-CALNAME:{_escape(calendar_name)}"),
+            f"X-WR-TIMEZONE:{CALENDAR_TIMEZONE}"
+        ]
+        body = ('\r\n'.join(header) + '\r\n' + ''.join(events) + 'END:VCALENDAR\r\n').encode('utf-8')
+
+        # Drop cached events of entries that no longer exist
+        if len(self._events) > 2 * len(bookings) + 1000:
+            self._events = {key: value for key, value in self._events.items() if key[1] in bookings}
+
+        self._feeds[(kind, ident)] = (etag, body)
+        return etag, body
+
+
+# ============================================================================
+# 5. FEED URL KEYS
+# ============================================================================
+
+def feed_key(secret: str, kind: str, ident: str) -> str:
+    """
+    URL key unlocking one calendar feed (HMAC-SHA256 of the feed path).
+
+    Args:
+        secret: Server-side feed secret
+        kind: 'user' or 'room'
+        ident: User ID or room identifier as it appears in the feed URL
+
+    Returns:
+        Hex key for the feed's ?key= parameter
+    """
+    digest = hmac.new(secret.encode('utf-8'), f"{kind}/{ident}".encode('utf-8'), hashlib.sha256)
+    return digest.hexdigest()[:FEED_KEY_LENGTH]
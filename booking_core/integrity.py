@@ -0,0 +1,154 @@
+"""
+BIIS Desk Booking System - Booking Core: Data Integrity
+Author: [Your Name]
+Date: [Date]
+Description: Consistency checks for users, bookings and settings
+
+DESIGN:
+- One pass over the bookings, yielding issues as they are found
+- Checks mirror what the app relies on: key format, rooms, desks, users,
+  booking/blocker types and archived-entry fields
+- Desks shared by two half-day bookers are checked per occupant, and the
+  two halves must not overlap
+- Recurring blocker rules are checked for room, user, type, frequency and dates
+- User team memberships must be lists of names
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. INTEGRITY CHECKS
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Any, Iterator, Tuple
+
+from booking_core.rules import ROOM_LAYOUT, BOOKING_TYPES, DELETED_USER_ID
+from booking_core.blockers import BLOCKER_TYPES, valid_blocker_window
+from booking_core.holidays import is_recurring_key
+from booking_core.keys import parse_key
+from booking_core.recurring import RECURRENCE_FREQUENCIES
+from booking_core.slots import SECOND_HALF_FIELD, booking_slots, occupants
+from booking_core.teams import TEAMS_FIELD
+
+ARCHIVE_FIELDS = ('archived_username', 'archived_at', 'original_user_id')
+
+
+# ============================================================================
+# 2. INTEGRITY CHECKS
+# ============================================================================
+
+def iter_integrity_issues(
+    users: Dict[str, Any],
+    bookings: Dict[str, Any],
+    settings: Dict[str, Any]
+) -> Iterator[Tuple[str, str]]:
+    """
+    Yield integrity problems in the data files.
+
+    Args:
+        users: User data dictionary
+        bookings: Booking data dictionary
+        settings: Settings dictionary
+
+    Yields:
+        Tuples of (entry key, problem description)
+    """
+    for booking_key, booking in bookings.items():
+        if not isinstance(booking, Mapping):
+            yield booking_key, "entry is not an object"
+            continue
+
+        date_key = booking.get('date', '')
+        room = booking.get('room')
+        try:
+            datetime.strptime(date_key, '%Y-%m-%d')
+        except (TypeError, ValueError):
+            yield booking_key, f"invalid date '{date_key}'"
+
+        if room not in ROOM_LAYOUT:
+            yield booking_key, f"unknown room '{room}'"
+            continue
+
+        parsed_key = parse_key(booking_key)
+        is_blocker = booking.get('entry_type') == 'room_blocker' or bool(parsed_key and parsed_key.is_blocker)
+        second = None
+        if is_blocker:
+            # Further blockers of a day are numbered: _ROOM_BLOCKER_2, _ROOM_BLOCKER_3, ...
+            seq = parsed_key.seq if parsed_key and parsed_key.is_blocker else 0
+            expected_key = f"{date_key}_{room}_ROOM_BLOCKER" + (f"_{seq + 1}" if seq else "")
+            if booking.get('blocker_type') not in BLOCKER_TYPES:
+                yield booking_key, f"invalid blocker type '{booking.get('blocker_type')}'"
+            if not booking.get('start_time') or not booking.get('end_time'):
+                yield booking_key, "blocker without start/end time"
+            elif not valid_blocker_window(booking.get('start_time'), booking.get('end_time')):
+                yield booking_key, "unreadable blocker times (blocks the whole day)"
+        else:
+            desk_num = booking.get('desk_num')
+            expected_key = f"{date_key}_{room}_{desk_num}"
+            if not isinstance(desk_num, int) or not 1 <= desk_num <= ROOM_LAYOUT[room]:
+                yield booking_key, f"invalid desk '{desk_num}' for room '{room}'"
+            if booking.get('booking_type') not in BOOKING_TYPES:
+                yield booking_key, f"invalid booking type '{booking.get('booking_type')}'"
+            second = booking.get(SECOND_HALF_FIELD)
+            if second is not None:
+                if not isinstance(second, Mapping) or second.get('booking_type') not in BOOKING_TYPES:
+                    yield booking_key, "invalid second half-day occupant"
+                    second = None
+                elif booking_slots(booking.get('booking_type')) & booking_slots(second.get('booking_type')):
+                    yield booking_key, "half-day occupants overlap"
+
+        if booking_key != expected_key:
+            yield booking_key, f"key does not match entry (expected '{expected_key}')"
+
+        for occupant in occupants(booking) if second is not None else (booking,):
+            user_id = occupant.get('user_id')
+            if user_id == DELETED_USER_ID:
+                missing = [field for field in ARCHIVE_FIELDS if not occupant.get(field)]
+                if missing:
+                    yield booking_key, f"archived entry missing {', '.join(missing)}"
+            elif user_id not in users:
+                yield booking_key, f"unknown user '{user_id}'"
+
+    for desk_key in settings.get('desk_names', {}):
+        room, _, desk = desk_key.rpartition('_')
+        if room not in ROOM_LAYOUT or not desk.isdigit() or not 1 <= int(desk) <= ROOM_LAYOUT[room]:
+            yield desk_key, "desk name for a desk that does not exist"
+
+    for holiday_key in settings.get('holidays', {}):
+        try:
+            if is_recurring_key(holiday_key):
+                datetime.strptime(f"2000-{holiday_key}", '%Y-%m-%d')
+            else:
+                datetime.strptime(holiday_key, '%Y-%m-%d')
+        except ValueError:
+            yield holiday_key, "invalid holiday date"
+
+    for rule_id, rule in settings.get('blocker_rules', {}).items():
+        if not isinstance(rule, Mapping):
+            yield rule_id, "blocker rule is not an object"
+            continue
+        if rule.get('room') not in ROOM_LAYOUT:
+            yield rule_id, f"blocker rule for unknown room '{rule.get('room')}'"
+        if rule.get('user_id') not in users and rule.get('user_id') != DELETED_USER_ID:
+            yield rule_id, f"blocker rule of unknown user '{rule.get('user_id')}'"
+        if rule.get('blocker_type') not in BLOCKER_TYPES:
+            yield rule_id, f"invalid blocker type '{rule.get('blocker_type')}'"
+        if rule.get('frequency') not in RECURRENCE_FREQUENCIES:
+            yield rule_id, f"invalid frequency '{rule.get('frequency')}'"
+        if not valid_blocker_window(rule.get('start_time'), rule.get('end_time')):
+            yield rule_id, "unreadable blocker rule times (blocks the whole day)"
+        for field in ('start_date', 'end_date'):
+            if field == 'start_date' or rule.get(field):
+                try:
+                    datetime.strptime(rule.get(field) or '', '%Y-%m-%d')
+                except ValueError:
+                    yield rule_id, f"invalid {field.replace('_', ' ')}"
+
+    for user_id, user in users.items():
+        teams = user.get(TEAMS_FIELD) if isinstance(user, Mapping) else None
+        if teams is not None and not (isinstance(teams, list) and all(isinstance(team, str) for team in teams)):
+            yield user_id, "teams must be a list of names"
@@ -0,0 +1,216 @@
+"""
+BIIS Desk Booking System - Booking Core: Room Blocker Intervals
+Author: [Your Name]
+Date: [Date]
+Description: Time-interval index of room blockers and overlap queries
+
+DESIGN:
+- Every room blocker covers a time window on one day; as absolute minutes
+  (day ordinal * 1440 + minute of day) all blockers of a room form one
+  sorted list of intervals
+- IntervalIndex keeps (start, end, key) tuples sorted by start and tracks
+  the longest interval, so an overlap query is a bisect to
+  start - longest followed by a short forward scan: O(log n + k) with
+  intervals bounded by one day
+- OccupancyCounters keeps one IntervalIndex per room in sync with the
+  bookings; callers without counters fall back to looking up the (at most
+  MAX_BLOCKERS_PER_ROOM_DAY) blocker keys of the day
+- Missing or unreadable blocker times cover the whole day, so a damaged
+  entry never frees a room
+- Occurrences of recurring blocker rules are not in the bookings dict: the
+  counters resolve them from their expanded rule_occurrences, callers
+  without counters pass the occurrences they expanded themselves
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. TIME WINDOWS
+3. INTERVAL INDEX
+4. BLOCKER QUERIES
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+from bisect import bisect_left
+from datetime import date
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+
+from booking_core.keys import MAX_BLOCKERS_PER_ROOM_DAY, blocker_key_for, format_key
+
+MINUTES_PER_DAY = 24 * 60
+
+
+# ============================================================================
+# 2. TIME WINDOWS
+# ============================================================================
+
+def time_to_minutes(value: Optional[str]) -> Optional[int]:
+    """Minute of day of an 'HH:MM' time ('24:00' is the end of the day), None if invalid"""
+    if not isinstance(value, str) or len(value) != 5 or value[2] != ':':
+        return None
+    hours, minutes = value[:2], value[3:]
+    if not (hours.isdigit() and minutes.isdigit()):
+        return None
+    total = int(hours) * 60 + int(minutes)
+    return total if int(minutes) < 60 and total <= MINUTES_PER_DAY else None
+
+
+def blocker_window(blocker: Mapping[str, Any]) -> Tuple[int, int]:
+    """
+    Minutes of day covered by a room blocker.
+
+    Returns:
+        (start, end) with start < end; the whole day when the times are
+        missing, invalid or inverted
+    """
+    start = time_to_minutes(blocker.get('start_time'))
+    end = time_to_minutes(blocker.get('end_time'))
+    if start is None or end is None or start >= end:
+        return 0, MINUTES_PER_DAY
+    return start, end
+
+
+def day_interval(booking_date: date, start_time: Optional[str] = None,
+                 end_time: Optional[str] = None) -> Tuple[int, int]:
+    """Absolute minutes of a time window on a date (whole day without times)"""
+    base = booking_date.toordinal() * MINUTES_PER_DAY
+    start, end = time_to_minutes(start_time), time_to_minutes(end_time)
+    return base + (start if start is not None else 0), base + (end if end is not None else MINUTES_PER_DAY)
+
+
+# ============================================================================
+# 3. INTERVAL INDEX
+# ============================================================================
+
+class IntervalIndex:
+    """Half-open [start, end) intervals sorted by start, with overlap queries"""
+
+    def __init__(self):
+        self._items: List[Tuple[int, int, str]] = []
+        self._longest = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, start: int, end: int, key: str) -> None:
+        """Insert an interval (no-op if present)"""
+        item = (start, end, key)
+        position = bisect_left(self._items, item)
+        if position == len(self._items) or self._items[position] != item:
+            self._items.insert(position, item)
+            self._longest = max(self._longest, end - start)
+
+    def discard(self, start: int, end: int, key: str) -> None:
+        """Remove an interval (no-op if absent)"""
+        item = (start, end, key)
+        position = bisect_left(self._items, item)
+        if position < len(self._items) and self._items[position] == item:
+            del self._items[position]
+
+    def overlapping(self, start: int, end: int) -> List[str]:
+        """
+        Keys of intervals overlapping [start, end).
+
+        Returns:
+            Keys ordered by interval start
+        """
+        items = self._items
+        keys = []
+        # No interval starting before start - longest can reach start
+        for position in range(bisect_left(items, (start - self._longest,)), len(items)):
+            item_start, item_end, key = items[position]
+            if item_start >= end:
+                break
+            if item_end > start:
+                keys.append(key)
+        return keys
+
+
+def build_interval_index(entries: Dict[str, Any]) -> Dict[str, IntervalIndex]:
+    """One IntervalIndex per room over the room blockers of a bookings dict"""
+    indexes: Dict[str, IntervalIndex] = {}
+    items: Dict[str, List[Tuple[int, int, str]]] = {}
+    for booking_key, entry in entries.items():
+        interval = entry_interval(entry)
+        if interval is not None:
+            items.setdefault(entry.get('room'), []).append(interval + (booking_key,))
+    for room, room_items in items.items():
+        index = indexes[room] = IntervalIndex()
+        room_items.sort()
+        index._items = room_items
+        index._longest = max(end - start for start, end, _ in room_items)
+    return indexes
+
+
+def entry_interval(entry: Mapping[str, Any]) -> Optional[Tuple[int, int]]:
+    """Absolute minutes of a room blocker entry, None for desk bookings or undated entries"""
+    if entry.get('entry_type') != 'room_blocker':
+        return None
+    try:
+        day = date.fromisoformat(entry.get('date', '')).toordinal()
+    except (TypeError, ValueError):
+        return None
+    start, end = blocker_window(entry)
+    return day * MINUTES_PER_DAY + start, day * MINUTES_PER_DAY + end
+
+
+# ============================================================================
+# 4. BLOCKER QUERIES
+# ============================================================================
+
+def room_blocker_keys(bookings: Dict[str, Any], booking_date: date, room: str) -> List[str]:
+    """Storage keys of a room's blockers on a date (direct key lookups, no index)"""
+    keys = (format_key(blocker_key_for(booking_date, room, seq)) for seq in range(MAX_BLOCKERS_PER_ROOM_DAY))
+    return [key for key in keys if key in bookings]
+
+
+def blockers_overlapping(
+    bookings: Dict[str, Any],
+    booking_date: date,
+    room: str,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    counters: Optional[Any] = None,
+    occurrences: Optional[Mapping[str, Mapping[str, Any]]] = None
+) -> List[Tuple[str, Mapping[str, Any]]]:
+    """
+    Room blockers of a room whose time window overlaps a window on a date.
+
+    Args:
+        bookings: Booking data dictionary
+        booking_date: Date to check
+        room: Room identifier
+        start_time: Window start (HH:MM, default: start of day)
+        end_time: Window end (HH:MM, default: end of day)
+        counters: OccupancyCounters tracking bookings, for an indexed lookup (optional)
+        occurrences: Expanded recurring blockers (see recurring.expand_rules) to
+            include when no counters are given (optional)
+
+    Returns:
+        List of (key, blocker entry) ordered by blocker start time
+    """
+    start, end = day_interval(booking_date, start_time, end_time)
+    if counters is not None:
+        keys = counters.blockers_overlapping(room, start, end)
+        occurrences = counters.rule_occurrences
+    else:
+        occurrences = occurrences or {}
+        date_key = booking_date.isoformat()
+        candidates = [(key, bookings[key]) for key in room_blocker_keys(bookings, booking_date, room)]
+        candidates.extend((key, entry) for key, entry in occurrences.items()
+                          if entry.get('date') == date_key and entry.get('room') == room)
+        base = booking_date.toordinal() * MINUTES_PER_DAY
+        windows = []
+        for key, entry in candidates:
+            window_start, window_end = blocker_window(entry)
+            if base + window_start < end and start < base + window_end:
+                windows.append((window_start, window_end, key))
+        keys = [key for _, _, key in sorted(windows)]
+
+    result = []
+    for key in keys:
+        entry = bookings.get(key) or occurrences.get(key)
+        if entry is not None:
+            result.append((key, entry))
+    return result
@@ -0,0 +1,269 @@
+"""
+BIIS Desk Booking System - Booking Core: Structured Booking Keys
+Author: [Your Name]
+Date: [Date]
+Description: Structured (date, room, desk) booking keys and an ordered key index
+
+DESIGN:
+- Storage keys stay strings ('2025-06-25_klein_2', '2025-06-25_klein_ROOM_BLOCKER')
+  in the bookings dict, the JSON files and the API, so existing data needs
+  no migration; every key is built and parsed here and nowhere else
+- A room can hold several blockers per day: the first keeps the plain
+  '_ROOM_BLOCKER' key, further ones are '_ROOM_BLOCKER_2', '_ROOM_BLOCKER_3', ...
+- BookingKey is the structured form: (day ordinal, room, desk, seq), with
+  desk 0 for room blockers so they sort before the room's desks, and seq
+  numbering the blockers of one room and day from 0
+- KeyIndex keeps all keys as sorted 64-bit integers
+  (day << 24 | room id << 16 | desk << 8 | seq) in an array: a date range,
+  or a room within a date range, is a bisect slice instead of a scan over
+  all entries
+- Room ids follow ROOM_LAYOUT order; rooms not in the layout get the next
+  free id, stored with the index so pickled indexes decode the same way
+- Keys that do not parse (corrupt or hand-edited data) are kept in a side
+  set so callers can still include them; integrity checks report them
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. KEY FORMAT
+3. ORDERED KEY INDEX
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+from array import array
+from bisect import bisect_left
+from datetime import date
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Set, Tuple
+
+BLOCKER_SUFFIX = 'ROOM_BLOCKER'
+
+# Desk number used for a room's blockers in structured keys
+BLOCKER_DESK = 0
+
+# Room blockers one room can hold on one day
+MAX_BLOCKERS_PER_ROOM_DAY = 8
+
+# Bit layout of integer-encoded keys: day ordinal | room id | desk | seq (8 bits each)
+_DESK_SHIFT = 8
+_ROOM_SHIFT = 16
+_DAY_SHIFT = 24
+_FIELD_MASK = 0xFF
+
+
+# ============================================================================
+# 2. KEY FORMAT
+# ============================================================================
+
+class BookingKey(NamedTuple):
+    """Structured booking key; desk is BLOCKER_DESK for room blockers, seq numbers a room's blockers"""
+
+    day: int
+    room: str
+    desk: int
+    seq: int = 0
+
+    @property
+    def booking_date(self) -> date:
+        return date.fromordinal(self.day)
+
+    @property
+    def is_blocker(self) -> bool:
+        return self.desk == BLOCKER_DESK
+
+
+@lru_cache(maxsize=4096)
+def _day_string(day: int) -> str:
+    """ISO date string of a day ordinal"""
+    return date.fromordinal(day).isoformat()
+
+
+@lru_cache(maxsize=4096)
+def _day_ordinal(date_key: str) -> Optional[int]:
+    """Day ordinal of an exact 'YYYY-MM-DD' string, None otherwise"""
+    try:
+        parsed = date.fromisoformat(date_key)
+    except ValueError:
+        return None
+    return parsed.toordinal() if parsed.isoformat() == date_key else None
+
+
+def format_key(key: BookingKey) -> str:
+    """Storage string of a structured key"""
+    if key.desk != BLOCKER_DESK:
+        return f"{_day_string(key.day)}_{key.room}_{key.desk}"
+    if key.seq:
+        return f"{_day_string(key.day)}_{key.room}_{BLOCKER_SUFFIX}_{key.seq + 1}"
+    return f"{_day_string(key.day)}_{key.room}_{BLOCKER_SUFFIX}"
+
+
+def _is_number(text: str) -> bool:
+    """Plain positive decimal without a leading zero"""
+    return text.isascii() and text.isdigit() and text[0] != '0'
+
+
+def _split_key(booking_key: str) -> Optional[Tuple[int, str, int, int]]:
+    """(day, room, desk, seq) of a storage key, None when not exactly in the storage format"""
+    if len(booking_key) < 14 or booking_key[10] != '_':
+        return None
+    day = _day_ordinal(booking_key[:10])
+    if day is None:
+        return None
+
+    room, _, desk = booking_key[11:].rpartition('_')
+    seq = 0
+    if desk == 'BLOCKER':
+        if not room.endswith('_ROOM'):
+            return None
+        room, desk_num = room[:-5], BLOCKER_DESK
+    elif not _is_number(desk):
+        return None
+    elif room.endswith('_' + BLOCKER_SUFFIX):
+        # Further blockers of the day: '_ROOM_BLOCKER_<n>' with n >= 2
+        seq = int(desk) - 1
+        if not seq:
+            return None
+        room, desk_num = room[:-len(BLOCKER_SUFFIX) - 1], BLOCKER_DESK
+    else:
+        desk_num = int(desk)
+    return (day, room, desk_num, seq) if room else None
+
+
+def parse_key(booking_key: str) -> Optional[BookingKey]:
+    """
+    Structured form of a storage key.
+
+    Returns:
+        BookingKey, or None when the string is not exactly in the storage format
+    """
+    parts = _split_key(booking_key)
+    return BookingKey(*parts) if parts else None
+
+
+def booking_key_for(booking_date: date, room: str, desk_num: int) -> BookingKey:
+    """Structured key of a desk booking"""
+    return BookingKey(booking_date.toordinal(), room, desk_num)
+
+
+def blocker_key_for(booking_date: date, room: str, seq: int = 0) -> BookingKey:
+    """Structured key of a room blocker (seq: number of the blocker on that day, from 0)"""
+    return BookingKey(booking_date.toordinal(), room, BLOCKER_DESK, seq)
+
+
+# ============================================================================
+# 3. ORDERED KEY INDEX
+# ============================================================================
+
+class KeyIndex:
+    """All booking keys in (date, room, desk) order as a sorted integer array"""
+
+    def __init__(self, booking_keys: Iterable[str] = (), rooms: Iterable[str] = ()):
+        self._rooms: List[str] = []
+        self._room_ids = {}
+        for room in rooms:
+            self._room_id(room)
+        self.unindexed: Set[str] = set()
+
+        codes = []
+        for booking_key in booking_keys:
+            code = self._encode(booking_key)
+            if code is None:
+                self.unindexed.add(booking_key)
+            else:
+                codes.append(code)
+        codes.sort()
+        self._codes = array('q', codes)
+
+    def __len__(self) -> int:
+        return len(self._codes) + len(self.unindexed)
+
+    def _room_id(self, room: str) -> Optional[int]:
+        """Id of a room, registering unknown rooms (None when the id space is full)"""
+        room_id = self._room_ids.get(room)
+        if room_id is None and len(self._rooms) <= _FIELD_MASK:
+            room_id = self._room_ids[room] = len(self._rooms)
+            self._rooms.append(room)
+        return room_id
+
+    def _encode(self, booking_key: str) -> Optional[int]:
+        """Integer code of a storage key, None if it cannot be indexed"""
+        parts = _split_key(booking_key)
+        if parts is None or parts[2] > _FIELD_MASK or parts[3] > _FIELD_MASK:
+            return None
+        day, room, desk, seq = parts
+        room_id = self._room_ids.get(room)
+        if room_id is None:
+            room_id = self._room_id(room)
+            if room_id is None:
+                return None
+        return (day << _DAY_SHIFT) | (room_id << _ROOM_SHIFT) | (desk << _DESK_SHIFT) | seq
+
+    def _decode(self, code: int) -> str:
+        """Storage key of an integer code"""
+        room = self._rooms[(code >> _ROOM_SHIFT) & _FIELD_MASK]
+        return format_key(BookingKey(code >> _DAY_SHIFT, room, (code >> _DESK_SHIFT) & _FIELD_MASK,
+                                     code & _FIELD_MASK))
+
+    def add(self, booking_key: str) -> None:
+        """Insert a key (no-op if present)"""
+        code = self._encode(booking_key)
+        if code is None:
+            self.unindexed.add(booking_key)
+            return
+        position = bisect_left(self._codes, code)
+        if position == len(self._codes) or self._codes[position] != code:
+            self._codes.insert(position, code)
+
+    def discard(self, booking_key: str) -> None:
+        """Remove a key (no-op if absent)"""
+        code = self._encode(booking_key)
+        if code is None:
+            self.unindexed.discard(booking_key)
+            return
+        position = bisect_left(self._codes, code)
+        if position < len(self._codes) and self._codes[position] == code:
+            del self._codes[position]
+
+    def _slice(self, low: int, high: int) -> List[str]:
+        """Storage keys with low <= code < high"""
+        codes = self._codes
+        return [self._decode(code) for code in codes[bisect_left(codes, low):bisect_left(codes, high)]]
+
+    def between(self, start: date, end: date, room: Optional[str] = None) -> List[str]:
+        """
+        Keys of bookings and blockers from start to end (inclusive), in order.
+
+        Args:
+            start: First date
+            end: Last date
+            room: Only this room (optional)
+
+        Returns:
+            Storage keys sorted by date, room (layout order) and desk; the
+            room's blockers come before its desks
+        """
+        first, last = start.toordinal(), end.toordinal()
+        if room is None:
+            return self._slice(first << _DAY_SHIFT, (last + 1) << _DAY_SHIFT)
+
+        room_id = self._room_ids.get(room)
+        if room_id is None or not self._codes:
+            return []
+        # Only visit days that can hold keys (open ranges use date.min/max)
+        first = max(first, self._codes[0] >> _DAY_SHIFT)
+        last = min(last, self._codes[-1] >> _DAY_SHIFT)
+        keys = []
+        for day in range(first, last + 1):
+            low = (day << _DAY_SHIFT) | (room_id << _ROOM_SHIFT)
+            keys.extend(self._slice(low, low + (1 << _ROOM_SHIFT)))
+        return keys
+
+    def blockers_on(self, booking_date: date, room: str) -> List[str]:
+        """Keys of a room's blockers on one date, in seq order"""
+        room_id = self._room_ids.get(room)
+        if room_id is None:
+            return []
+        low = (booking_date.toordinal() << _DAY_SHIFT) | (room_id << _ROOM_SHIFT)
+        return self._slice(low, low + (1 << _DESK_SHIFT))
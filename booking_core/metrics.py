@@ -0,0 +1,343 @@
+"""
+BIIS Desk Booking System - Booking Core: Metrics
+Author: [Your Name]
+Date: [Date]
+Description: Process-wide counters, gauges and histograms in Prometheus text format
+
+DESIGN:
+- Standard library only; one registry per process shared by all threads
+- Core code records saves (latency, bytes) and data file sizes; the app
+  and the store record bookings created/cancelled with a 'source' label
+- Active Streamlit sessions are tracked by last-seen time, so sessions that
+  closed their browser tab age out without a disconnect hook
+- start_metrics_exporter() periodically writes the text format atomically
+  to a file (node_exporter textfile collector) and/or serves it on a local
+  HTTP port; both are opt-in via BIIS_METRICS_FILE / BIIS_METRICS_PORT
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. METRIC TYPES
+3. REGISTRY & BIIS METRICS
+4. EXPORTERS
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from booking_core.snapshot import JSON_FILES
+
+METRICS_FILE_ENV = 'BIIS_METRICS_FILE'
+METRICS_PORT_ENV = 'BIIS_METRICS_PORT'
+METRICS_INTERVAL_ENV = 'BIIS_METRICS_INTERVAL'
+
+DEFAULT_INTERVAL_SECONDS = 15.0
+
+# A session counts as active when it ran a script within this window
+SESSION_ACTIVE_SECONDS = 15 * 60
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 1e6, 5e6, 1e7, 5e7, 1e8, 5e8)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+# ============================================================================
+# 2. METRIC TYPES
+# ============================================================================
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    """Render a label set, e.g. {source="app"}"""
+    if not labels:
+        return ''
+    rendered = []
+    for name, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        rendered.append(f'{name}="{value}"')
+    return '{' + ','.join(rendered) + '}'
+
+
+def _format_value(value: float) -> str:
+    """Prometheus number formatting (integers without a decimal point)"""
+    if value == float('inf'):
+        return '+Inf'
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    """Base class: name, help text and a lock shared with the registry"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, help_text: str, lock: threading.Lock):
+        self.name = name
+        self.help_text = help_text
+        self._lock = lock
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, lock: threading.Lock):
+        super().__init__(name, help_text, lock)
+        self._values: Dict[Tuple[Tuple[str, str], ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def render(self) -> List[str]:
+        return self.header() + [f"{self.name}{_format_labels(key)} {_format_value(value)}"
+                                for key, value in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    """Value that can go up and down per label set"""
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[tuple(sorted(labels.items()))] = value
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count of observations"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, lock: threading.Lock, buckets: Tuple[float, ...]):
+        super().__init__(name, help_text, lock)
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot: above the largest bucket
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), self._counts):
+            cumulative += bucket_count
+            lines.append(f'{self.name}_bucket{{le="{_format_value(bound)}"}} {cumulative}')
+        lines.append(f"{self.name}_sum {_format_value(self._sum)}")
+        lines.append(f"{self.name}_count {self._count}")
+        return lines
+
+
+# ============================================================================
+# 3. REGISTRY & BIIS METRICS
+# ============================================================================
+
+class MetricsRegistry:
+    """All metrics of this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._sessions: Dict[str, float] = {}  # session id -> last seen (monotonic)
+        self._collectors: List[Callable[[], None]] = []
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(Counter(name, help_text, self._lock))
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._register(Gauge(name, help_text, self._lock))
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...]) -> Histogram:
+        return self._register(Histogram(name, help_text, self._lock, buckets))
+
+    def _register(self, metric: _Metric) -> Any:
+        return self._metrics.setdefault(metric.name, metric)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callable that refreshes gauges right before rendering"""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def touch_session(self, session_id: str) -> None:
+        """Mark a session as active now"""
+        with self._lock:
+            self._sessions[session_id] = time.monotonic()
+
+    def active_sessions(self) -> int:
+        """Sessions seen within SESSION_ACTIVE_SECONDS (expired ones are dropped)"""
+        cutoff = time.monotonic() - SESSION_ACTIVE_SECONDS
+        with self._lock:
+            for session_id in [sid for sid, seen in self._sessions.items() if seen < cutoff]:
+                del self._sessions[session_id]
+            return len(self._sessions)
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format"""
+        ACTIVE_SESSIONS.set(self.active_sessions())
+        for collector in list(self._collectors):
+            collector()
+        with self._lock:
+            lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+BOOKINGS_CREATED = REGISTRY.counter('biis_bookings_created_total', 'Desk bookings created')
+BOOKINGS_CANCELLED = REGISTRY.counter('biis_bookings_cancelled_total', 'Desk bookings cancelled or deleted')
+SAVE_DURATION = REGISTRY.histogram('biis_save_duration_seconds', 'Duration of one data save', LATENCY_BUCKETS)
+SAVE_BYTES = REGISTRY.histogram('biis_save_bytes', 'Bytes written by one data save', BYTES_BUCKETS)
+BYTES_WRITTEN = REGISTRY.counter('biis_bytes_written_total', 'Bytes written to data files')
+DATA_FILE_BYTES = REGISTRY.gauge('biis_data_file_bytes', 'Size of each JSON data file')
+ACTIVE_SESSIONS = REGISTRY.gauge('biis_active_sessions', 'Streamlit sessions active in the last 15 minutes')
+RERUN_DURATION = REGISTRY.histogram('biis_rerun_duration_seconds', 'Duration of one Streamlit script run',
+                                    LATENCY_BUCKETS)
+SESSION_KEYS_EXPIRED = REGISTRY.counter('biis_session_keys_expired_total',
+                                        'Transient session state keys removed by the janitor')
+
+
+def record_file_written(filepath: str, size: int) -> None:
+    """Account for one data file write"""
+    BYTES_WRITTEN.inc(size)
+    DATA_FILE_BYTES.set(size, file=os.path.basename(filepath))
+
+
+def record_save(duration_seconds: float, size: int) -> None:
+    """Account for one save (one or more data files written together)"""
+    SAVE_DURATION.observe(duration_seconds)
+    SAVE_BYTES.observe(size)
+
+
+def collect_data_file_sizes(data_dir: str) -> None:
+    """Set the file size gauge from the JSON data files on disk"""
+    for filename in JSON_FILES:
+        try:
+            DATA_FILE_BYTES.set(os.path.getsize(os.path.join(data_dir, filename)), file=filename)
+        except OSError:
+            pass
+
+
+def record_bookings(created: int = 0, cancelled: int = 0, source: str = 'app') -> None:
+    """Count bookings created/cancelled by a source ('app', 'template', 'api', 'admin')"""
+    if created:
+        BOOKINGS_CREATED.inc(created, source=source)
+    if cancelled:
+        BOOKINGS_CANCELLED.inc(cancelled, source=source)
+
+
+# ============================================================================
+# 4. EXPORTERS
+# ============================================================================
+
+def write_metrics_file(path: str, registry: MetricsRegistry = REGISTRY) -> bool:
+    """Atomically write the metrics text to a file; True on success"""
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(registry.render())
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        return False
+
+
+def _serve_metrics(host: str, port: int, registry: MetricsRegistry = REGISTRY) -> bool:
+    """Serve GET /metrics on a background thread; False if the port is taken"""
+    # Imported here: http.server is slow to import and only needed when enabled
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    try:
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError:
+        # Another process (e.g. a second app worker) already serves the port
+        return False
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='biis-metrics-http', daemon=True).start()
+    return True
+
+
+_EXPORTER_LOCK = threading.Lock()
+_EXPORTER_STARTED = False
+
+
+def start_metrics_exporter(
+    path: Optional[str] = None,
+    port: Optional[int] = None,
+    interval: Optional[float] = None,
+    host: str = '127.0.0.1',
+    data_dir: str = 'data'
+) -> bool:
+    """
+    Start the file writer and/or HTTP endpoint once per process.
+
+    Arguments default to BIIS_METRICS_FILE, BIIS_METRICS_PORT and
+    BIIS_METRICS_INTERVAL; nothing starts when neither target is set.
+    The sizes of the JSON files in data_dir are read at every export.
+
+    Returns:
+        True if an exporter is running after the call
+    """
+    global _EXPORTER_STARTED
+
+    path = path or os.environ.get(METRICS_FILE_ENV)
+    port = port or int(os.environ.get(METRICS_PORT_ENV) or 0)
+    interval = interval or float(os.environ.get(METRICS_INTERVAL_ENV) or DEFAULT_INTERVAL_SECONDS)
+
+    with _EXPORTER_LOCK:
+        if _EXPORTER_STARTED:
+            return True
+        if not path and not port:
+            return False
+
+        REGISTRY.add_collector(lambda: collect_data_file_sizes(data_dir))
+
+        if path:
+            def write_periodically() -> None:
+                while True:
+                    write_metrics_file(path)
+                    time.sleep(interval)
+
+            threading.Thread(target=write_periodically, name='biis-metrics-file', daemon=True).start()
+
+        if port:
+            _serve_metrics(host, port)
+
+        _EXPORTER_STARTED = True
+        return True
@@ -0,0 +1,198 @@
+"""
+BIIS Desk Booking System - Booking Core: Profiling
+Author: [Your Name]
+Date: [Date]
+Description: Lightweight timing spans and counters for one script run or request
+
+DESIGN:
+- A RunProfile collects nested timing spans and named counters
+  (e.g. bytes written, markdown deltas) for one unit of work
+- The active profile is thread-local: Streamlit runs each session's script
+  in its own thread, the API server each request
+- span() and count() are no-ops without an active profile, so core
+  functions are instrumented unconditionally at near-zero cost
+- Finished profiles are appended as JSON lines to the file named by the
+  BIIS_PROFILE_LOG environment variable (structured log, opt-in)
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. RUN PROFILE
+3. ACTIVE PROFILE & SPANS
+4. STRUCTURED LOG
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterator
+
+PROFILE_LOG_ENV = 'BIIS_PROFILE_LOG'
+
+# Spans beyond this many per profile are counted but not recorded
+MAX_SPANS = 500
+
+
+# ============================================================================
+# 2. RUN PROFILE
+# ============================================================================
+
+class RunProfile:
+    """Timing spans and counters of one script run or request"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.now().isoformat(timespec='milliseconds')
+        self.status = 'running'
+        self.duration_ms: Optional[float] = None
+        self.spans: List[Dict[str, Any]] = []  # name, start_ms, duration_ms, depth
+        self.counters: Dict[str, int] = {}
+        self.dropped_spans = 0
+        self._start = time.perf_counter()
+        self._depth = 0
+
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the profile started"""
+        return (time.perf_counter() - self._start) * 1000
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add to a named counter"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def totals(self) -> Dict[str, float]:
+        """Total milliseconds per span name (repeated spans are summed)"""
+        totals: Dict[str, float] = {}
+        for recorded in self.spans:
+            totals[recorded['name']] = totals.get(recorded['name'], 0.0) + recorded['duration_ms']
+        return totals
+
+    def finish(self, status: str = 'complete') -> 'RunProfile':
+        """Stop the clock; later calls keep the first result"""
+        if self.status == 'running':
+            self.duration_ms = round(self.elapsed_ms(), 3)
+            self.status = status
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable representation"""
+        return {
+            'name': self.name,
+            'started_at': self.started_at,
+            'status': self.status,
+            'duration_ms': self.duration_ms,
+            'spans': self.spans,
+            'dropped_spans': self.dropped_spans,
+            'counters': self.counters
+        }
+
+
+# ============================================================================
+# 3. ACTIVE PROFILE & SPANS
+# ============================================================================
+
+_local = threading.local()
+
+
+def start_profile(name: str = 'rerun') -> RunProfile:
+    """Start a profile and make it the active one for this thread"""
+    profile = RunProfile(name)
+    _local.profile = profile
+    return profile
+
+
+def current_profile() -> Optional[RunProfile]:
+    """The active profile of this thread, if any"""
+    return getattr(_local, 'profile', None)
+
+
+def finish_profile(profile: Optional[RunProfile] = None, status: str = 'complete') -> Optional[RunProfile]:
+    """
+    Finish a profile (default: the active one) and write it to the log.
+
+    Args:
+        profile: Profile to finish; deactivated if it is the active one
+        status: 'complete', or e.g. 'interrupted' for a run cut short by a rerun
+
+    Returns:
+        The finished profile, or None when there was none
+    """
+    profile = profile or current_profile()
+    if profile is None:
+        return None
+    if current_profile() is profile:
+        _local.profile = None
+
+    if profile.status == 'running':
+        profile.finish(status)
+        write_profile_log(profile)
+    return profile
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block as a span of the active profile (no-op without one)"""
+    profile = current_profile()
+    if profile is None:
+        yield
+        return
+
+    start_ms = profile.elapsed_ms()
+    depth = profile._depth
+    profile._depth += 1
+    try:
+        yield
+    finally:
+        profile._depth = depth
+        if len(profile.spans) < MAX_SPANS:
+            profile.spans.append({
+                'name': name,
+                'start_ms': round(start_ms, 3),
+                'duration_ms': round(profile.elapsed_ms() - start_ms, 3),
+                'depth': depth
+            })
+        else:
+            profile.dropped_spans += 1
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add to a counter of the active profile (no-op without one)"""
+    profile = current_profile()
+    if profile is not None:
+        profile.count(name, amount)
+
+
+# ============================================================================
+# 4. STRUCTURED LOG
+# ============================================================================
+
+_LOG_LOCK = threading.Lock()
+
+
+def write_profile_log(profile: RunProfile, path: Optional[str] = None) -> bool:
+    """
+    Append a finished profile as one JSON line.
+
+    Args:
+        profile: Finished profile
+        path: Log file (default: $BIIS_PROFILE_LOG; nothing is written when unset)
+
+    Returns:
+        True if the line was written
+    """
+    path = path or os.environ.get(PROFILE_LOG_ENV)
+    if not path:
+        return False
+
+    line = json.dumps(profile.to_dict(), ensure_ascii=False)
+    try:
+        with _LOG_LOCK, open(path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,246 @@
+"""
+BIIS Desk Booking System - Booking Core: Compact Booking Records
+Author: [Your Name]
+Date: [Date]
+Description: Memory-compact, read-only booking entries backed by __slots__
+
+DESIGN:
+- A parsed booking is a dict of 7-10 fields whose values repeat on every
+  entry (date, room, type, entry type, user id); with hundreds of thousands
+  of entries, times one copy per session, this dominates memory
+- BookingRecord keeps the same fields in slots: dates as day ordinals,
+  booking/blocker and entry types as small integer codes, rooms and user
+  ids as interned strings shared by all records
+- Records are read-only Mappings, so record['date'] and record.get('room')
+  keep working everywhere a dict was read; new entries are still built as
+  plain dicts (rules.build_booking etc.) and are compacted on the next load
+- The original field order is kept as a shared shape tuple and unknown or
+  unexpected values are kept verbatim, so records write back to exactly the
+  same JSON; JSON stays the interchange format
+- created_at timestamps are unique per entry and stay strings: parsing and
+  re-verifying them costs more load time than the few bytes it would save
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. FIELD ENCODING
+3. BOOKING RECORD
+4. CONVERSION HELPERS
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+from sys import intern
+from collections.abc import Mapping
+from datetime import date
+from typing import Dict, Any, Optional, Tuple, Iterator
+
+from booking_core.rules import BOOKING_TYPES
+from booking_core.blockers import BLOCKER_TYPES
+
+# Closed vocabularies stored as small integer codes (append only: codes are pickled)
+KIND_NAMES = tuple(dict.fromkeys(BOOKING_TYPES + BLOCKER_TYPES))
+ENTRY_TYPES = ('desk_booking', 'room_blocker')
+
+KIND_CODES = {name: code for code, name in enumerate(KIND_NAMES)}
+ENTRY_CODES = {name: code for code, name in enumerate(ENTRY_TYPES)}
+
+# Short free-text values (times, created_via, usernames) are interned too
+INTERN_MAX_LENGTH = 32
+
+
+# ============================================================================
+# 2. FIELD ENCODING
+# ============================================================================
+
+# Process-wide memos: one shared str/int object per distinct value
+_DAY_ORDINALS: Dict[str, int] = {}
+_DAY_STRINGS: Dict[int, str] = {}
+_SHAPES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _encode_day(value: Any) -> Optional[int]:
+    """Day ordinal of an ISO date string, None if it is not exactly YYYY-MM-DD"""
+    ordinal = _DAY_ORDINALS.get(value) if isinstance(value, str) else None
+    if ordinal is not None or not isinstance(value, str) or len(value) != 10:
+        return ordinal
+    try:
+        parsed = date.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.isoformat() != value:
+        return None
+    ordinal = _DAY_ORDINALS.setdefault(value, parsed.toordinal())
+    _DAY_STRINGS.setdefault(ordinal, intern(value))
+    return ordinal
+
+
+def _intern_extra(value: Any) -> Any:
+    """Intern short strings among the remaining fields"""
+    if isinstance(value, str) and len(value) <= INTERN_MAX_LENGTH:
+        return intern(value)
+    return value
+
+
+# Field -> value of the slot it is stored in (fields not in _extra)
+_DECODERS = {
+    'date': lambda record: _DAY_STRINGS[record._day],
+    'room': lambda record: record._room,
+    'desk_num': lambda record: record._desk,
+    'user_id': lambda record: record._user,
+    'booking_type': lambda record: KIND_NAMES[record._kind],
+    'blocker_type': lambda record: KIND_NAMES[record._kind],
+    'entry_type': lambda record: ENTRY_TYPES[record._entry],
+    'created_at': lambda record: record._created
+}
+
+
+# ============================================================================
+# 3. BOOKING RECORD
+# ============================================================================
+
+class BookingRecord(Mapping):
+    """Read-only booking or room blocker entry with compact field storage"""
+
+    __slots__ = ('_shape', '_day', '_room', '_desk', '_user', '_kind', '_entry', '_created', '_extra')
+
+    def __init__(self, entry: Mapping):
+        shape = tuple(entry)
+        self._shape = _SHAPES.get(shape) or _SHAPES.setdefault(shape, shape)
+
+        # Encoded fields are popped; values that do not encode go back into rest
+        # (inlined: this runs once per entry while bookings.json is parsed)
+        rest = dict(entry)
+        pop = rest.pop
+
+        value = pop('date', None)
+        day = _DAY_ORDINALS.get(value) if type(value) is str else None
+        if day is None and value is not None:
+            day = _encode_day(value)
+            if day is None:
+                rest['date'] = value
+
+        room = pop('room', None)
+        if type(room) is str:
+            room = intern(room)
+        elif room is not None:
+            rest['room'], room = room, None
+
+        desk = pop('desk_num', None)
+        if desk is not None and type(desk) is not int:
+            rest['desk_num'], desk = desk, None
+
+        user = pop('user_id', None)
+        if type(user) is str:
+            user = intern(user)
+        elif user is not None:
+            rest['user_id'], user = user, None
+
+        name = 'booking_type' if 'booking_type' in rest else 'blocker_type'
+        value = pop(name, None)
+        kind = KIND_CODES.get(value) if type(value) is str else None
+        if kind is None and value is not None:
+            rest[name] = value
+
+        value = pop('entry_type', None)
+        entry_code = ENTRY_CODES.get(value) if type(value) is str else None
+        if entry_code is None and value is not None:
+            rest['entry_type'] = value
+
+        created = pop('created_at', None)
+        if created is not None and type(created) is not str:
+            rest['created_at'], created = created, None
+
+        self._day, self._room, self._desk, self._user = day, room, desk, user
+        self._kind, self._entry, self._created = kind, entry_code, created
+        self._extra = {name: _intern_extra(value) for name, value in rest.items()} if rest else None
+
+    # Mapping interface -------------------------------------------------------
+
+    def __getitem__(self, name: str) -> Any:
+        extra = self._extra
+        if extra is not None and name in extra:
+            return extra[name]
+        if name in self._shape:
+            return _DECODERS[name](self)
+        raise KeyError(name)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        extra = self._extra
+        if extra is not None and name in extra:
+            return extra[name]
+        if name in self._shape:
+            return _DECODERS[name](self)
+        return default
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._shape
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._shape)
+
+    def __len__(self) -> int:
+        return len(self._shape)
+
+    def __repr__(self) -> str:
+        return f"BookingRecord({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return (_restore_record, (self._shape, self._day, self._room, self._desk, self._user,
+                                  self._kind, self._entry, self._created, self._extra))
+
+    # Typed access ------------------------------------------------------------
+
+    @property
+    def ordinal(self) -> Optional[int]:
+        """Day ordinal of the entry's date (None if the date is malformed)"""
+        return self._day
+
+    @property
+    def booking_date(self) -> Optional[date]:
+        """Date of the entry (None if the date is malformed)"""
+        return date.fromordinal(self._day) if self._day is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict in the original field order (storage format)"""
+        return {name: self[name] for name in self._shape}
+
+
+def _restore_record(shape: Tuple[str, ...], day: Optional[int], room: Optional[str], desk: Optional[int],
+                    user: Optional[str], kind: Optional[int], entry: Optional[int], created: Optional[str],
+                    extra: Optional[Dict[str, Any]]) -> BookingRecord:
+    """Unpickle a record, re-registering its shape and date in the memos"""
+    record = BookingRecord.__new__(BookingRecord)
+    record._shape = _SHAPES.setdefault(shape, shape)
+    if day is not None:
+        _DAY_STRINGS.setdefault(day, date.fromordinal(day).isoformat())
+    record._day, record._room, record._desk, record._user = day, room, desk, user
+    record._kind, record._entry, record._created, record._extra = kind, entry, created, extra
+    return record
+
+
+# ============================================================================
+# 4. CONVERSION HELPERS
+# ============================================================================
+
+def compact_entry(entry: Any) -> Any:
+    """BookingRecord for a booking/blocker dict; anything else is returned unchanged"""
+    # Nested occupant dicts (second_half) carry a user_id but no date and stay plain
+    if type(entry) is dict and ('date' in entry or 'entry_type' in entry):
+        return BookingRecord(entry)
+    return entry
+
+
+def compact_bookings(bookings: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace the plain dict entries of a bookings dict with records (in place)"""
+    for booking_key, entry in bookings.items():
+        bookings[booking_key] = compact_entry(entry)
+    return bookings
+
+
+def json_default(obj: Any) -> Any:
+    """json.dump default= hook writing records as plain objects"""
+    if isinstance(obj, BookingRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
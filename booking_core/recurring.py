@@ -0,0 +1,319 @@
+"""
+BIIS Desk Booking System - Booking Core: Recurring Room Blockers
+Author: [Your Name]
+Date: [Date]
+Description: Recurring room blocker rules and their expansion into occurrences
+
+DESIGN:
+- A rule stores one blocker pattern (room, time window, user, reason) plus a
+  frequency, a start date, an optional end date and a list of skipped dates;
+  rules live in settings.json under 'blocker_rules', keyed by rule id, so
+  storage grows per rule, not per occurrence
+- Occurrences are computed arithmetically for a date range: weekly and
+  biweekly step from the start date, monthly repeats the start date's nth
+  weekday (e.g. 2nd Tuesday); months without that weekday are skipped
+- Occurrences are regular room blocker entries with an extra 'rule_id' and
+  a synthetic key (never stored in bookings.json); OccupancyCounters adds
+  them to the blocker interval index only for the range being viewed
+- Removing a single occurrence adds its date to the rule's exceptions
+- A new rule is checked against existing blockers on every occurrence:
+  its whole span, or for open-ended rules RULE_CHECK_DAYS ahead (at least
+  up to the room's last one-off blocker), before it is saved; one-off
+  blockers come from the counters' interval index, and since all
+  occurrences of a rule share its time window, other rules are compared
+  by window once and by date set, never occurrence by occurrence
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. RULE ENTRIES
+3. OCCURRENCES
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+from datetime import date, timedelta
+from typing import Dict, Any, List, Mapping, Optional
+
+from booking_core.blockers import build_room_blocker
+from booking_core.intervals import MINUTES_PER_DAY, blocker_window, blockers_overlapping
+from booking_core.rules import format_date_key
+
+RECURRENCE_FREQUENCIES = ('weekly', 'biweekly', 'monthly')
+
+# Days between occurrences of the fixed-step frequencies
+FREQUENCY_STEPS = {'weekly': 7, 'biweekly': 14}
+
+# Synthetic key prefix of expanded occurrences (never a valid booking key)
+OCCURRENCE_PREFIX = 'RULE_'
+
+# Days ahead of its start an open-ended rule is checked for overlaps
+RULE_CHECK_DAYS = 366
+
+
+# ============================================================================
+# 2. RULE ENTRIES
+# ============================================================================
+
+def build_blocker_rule(
+    room: str,
+    user_id: str,
+    blocker_type: str,
+    frequency: str,
+    start_date: date,
+    end_date: Optional[date] = None,
+    custom_time_start: Optional[str] = None,
+    custom_time_end: Optional[str] = None,
+    reason: str = ""
+) -> Dict[str, Any]:
+    """
+    Build a recurring blocker rule in the storage format.
+
+    Args:
+        room: Room identifier
+        user_id: Blocking user
+        blocker_type: One of BLOCKER_TYPES
+        frequency: One of RECURRENCE_FREQUENCIES
+        start_date: First occurrence
+        end_date: Last possible occurrence (optional, open-ended when omitted)
+        custom_time_start: Start time for 'custom' blockers (HH:MM)
+        custom_time_end: End time for 'custom' blockers (HH:MM)
+        reason: Short reason
+
+    Returns:
+        Rule entry dict
+
+    Raises:
+        ValueError: If the frequency is unknown, the end date is before the start
+            date or a 'custom' time window is not valid
+    """
+    if frequency not in RECURRENCE_FREQUENCIES:
+        raise ValueError(f"Invalid frequency '{frequency}'")
+    if end_date is not None and end_date < start_date:
+        raise ValueError("End date is before the start date")
+
+    blocker = build_room_blocker(start_date, room, user_id, blocker_type,
+                                 custom_time_start, custom_time_end, reason)
+    return {
+        'room': room,
+        'user_id': user_id,
+        'blocker_type': blocker_type,
+        'start_time': blocker['start_time'],
+        'end_time': blocker['end_time'],
+        'reason': blocker['reason'],
+        'frequency': frequency,
+        'start_date': format_date_key(start_date),
+        'end_date': format_date_key(end_date) if end_date else None,
+        'exceptions': [],
+        'created_at': blocker['created_at']
+    }
+
+
+def describe_rule(rule: Mapping[str, Any]) -> str:
+    """Short human readable summary, e.g. 'Weekly on Tuesday 09:00-12:00 until 2025-12-31'"""
+    try:
+        start = date.fromisoformat(rule['start_date'])
+    except (KeyError, TypeError, ValueError):
+        return "Invalid rule"
+    weekday = start.strftime('%A')
+    if rule.get('frequency') == 'monthly':
+        pattern = f"Monthly on the {_ordinal((start.day - 1) // 7 + 1)} {weekday}"
+    elif rule.get('frequency') == 'biweekly':
+        pattern = f"Every second {weekday}"
+    else:
+        pattern = f"Weekly on {weekday}"
+    text = f"{pattern} {rule.get('start_time')}-{rule.get('end_time')}"
+    if rule.get('end_date'):
+        text += f" until {rule['end_date']}"
+    if rule.get('reason'):
+        text += f" ({rule['reason']})"
+    return text
+
+
+def _ordinal(number: int) -> str:
+    """'1st', '2nd', '3rd', '4th', '5th'"""
+    return f"{number}{ {1: 'st', 2: 'nd', 3: 'rd'}.get(number, 'th')}"
+
+
+# ============================================================================
+# 3. OCCURRENCES
+# ============================================================================
+
+def occurrence_key(rule_id: str, date_key: str) -> str:
+    """Synthetic key of one expanded occurrence"""
+    return f"{OCCURRENCE_PREFIX}{rule_id}_{date_key}"
+
+
+def is_occurrence_key(blocker_key: str) -> bool:
+    """Check whether a blocker key belongs to an expanded rule occurrence"""
+    return blocker_key.startswith(OCCURRENCE_PREFIX)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, nth: int) -> Optional[date]:
+    """The nth (1-5) given weekday of a month, None if the month has fewer"""
+    first = date(year, month, 1)
+    day = first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (nth - 1))
+    return day if day.month == month else None
+
+
+def rule_dates(rule: Mapping[str, Any], start: date, end: date) -> List[date]:
+    """
+    Dates of a rule's occurrences from start to end (inclusive).
+
+    Args:
+        rule: Rule entry
+        start: First date of the range
+        end: Last date of the range
+
+    Returns:
+        Occurrence dates in order, exceptions removed (empty for unreadable rules)
+    """
+    try:
+        first = date.fromisoformat(rule['start_date'])
+        last = date.fromisoformat(rule['end_date']) if rule.get('end_date') else end
+    except (KeyError, TypeError, ValueError):
+        return []
+    start, end = max(start, first), min(end, last)
+    if start > end:
+        return []
+
+    frequency = rule.get('frequency')
+    if frequency in FREQUENCY_STEPS:
+        step = FREQUENCY_STEPS[frequency]
+        current = first + timedelta(days=-(-(start - first).days // step) * step)
+        dates = []
+        while current <= end:
+            dates.append(current)
+            current += timedelta(days=step)
+    elif frequency == 'monthly':
+        nth = (first.day - 1) // 7 + 1
+        dates = []
+        for month_index in range(start.year * 12 + start.month - 1, end.year * 12 + end.month):
+            day = _nth_weekday(month_index // 12, month_index % 12 + 1, first.weekday(), nth)
+            if day is not None and start <= day <= end:
+                dates.append(day)
+    else:
+        return []
+
+    exceptions = set(rule.get('exceptions') or ())
+    return [day for day in dates if format_date_key(day) not in exceptions]
+
+
+def build_occurrence(rule_id: str, rule: Mapping[str, Any], booking_date: date) -> Dict[str, Any]:
+    """Room blocker entry of one occurrence of a rule"""
+    return {
+        'user_id': rule.get('user_id'),
+        'blocker_type': rule.get('blocker_type'),
+        'start_time': rule.get('start_time'),
+        'end_time': rule.get('end_time'),
+        'reason': rule.get('reason', ''),
+        'created_at': rule.get('created_at'),
+        'date': format_date_key(booking_date),
+        'room': rule.get('room'),
+        'entry_type': 'room_blocker',
+        'rule_id': rule_id
+    }
+
+
+def expand_rules(rules: Optional[Mapping[str, Mapping[str, Any]]], start: date,
+                 end: date) -> Dict[str, Dict[str, Any]]:
+    """
+    All occurrences of a set of rules from start to end (inclusive).
+
+    Args:
+        rules: Rule id -> rule entry (settings['blocker_rules'])
+        start: First date of the range
+        end: Last date of the range
+
+    Returns:
+        Occurrence key -> room blocker entry
+    """
+    occurrences = {}
+    for rule_id, rule in (rules or {}).items():
+        for day in rule_dates(rule, start, end):
+            occurrences[occurrence_key(rule_id, format_date_key(day))] = build_occurrence(rule_id, rule, day)
+    return occurrences
+
+
+def rule_conflicts(
+    bookings: Dict[str, Any],
+    rules: Optional[Mapping[str, Mapping[str, Any]]],
+    rule: Mapping[str, Any],
+    counters: Optional[Any] = None
+) -> List[date]:
+    """
+    Occurrence dates of a new rule that overlap existing room blockers.
+
+    One-off blockers and the occurrences of the other rules of the room are
+    checked on every occurrence up to the rule's end date; open-ended rules
+    up to RULE_CHECK_DAYS ahead, or to the room's last one-off blocker when
+    that is later.
+
+    Args:
+        bookings: Booking data dictionary
+        rules: Existing rules (settings['blocker_rules'])
+        rule: New rule entry (see build_blocker_rule)
+        counters: OccupancyCounters tracking bookings, to find the room's
+            blockers without scanning all bookings (optional)
+
+    Returns:
+        Conflicting occurrence dates in order (empty when the rule fits)
+    """
+    room = rule.get('room')
+    try:
+        start = date.fromisoformat(rule['start_date'])
+        end = date.fromisoformat(rule['end_date']) if rule.get('end_date') else None
+    except (KeyError, TypeError, ValueError):
+        return []
+    if end is None:
+        end = start + timedelta(days=RULE_CHECK_DAYS - 1)
+        end = max(end, _last_room_blocker(bookings, room, end, counters) or end)
+
+    # Other rules: one window comparison each, then their dates as a set
+    window_start, window_end = blocker_window(rule)
+    rule_days = set()
+    for other in (rules or {}).values():
+        other_start, other_end = blocker_window(other)
+        if other.get('room') == room and other_start < window_end and window_start < other_end:
+            rule_days.update(rule_dates(other, start, end))
+
+    conflicts = []
+    for day in rule_dates(rule, start, end):
+        if day in rule_days:
+            conflicts.append(day)
+        elif counters is not None:
+            # One-off blockers only (expanded occurrences in the index are not in bookings)
+            base = day.toordinal() * MINUTES_PER_DAY
+            if any(key in bookings for key in counters.blockers_overlapping(room, base + window_start,
+                                                                            base + window_end)):
+                conflicts.append(day)
+        elif blockers_overlapping(bookings, day, room, rule.get('start_time'), rule.get('end_time')):
+            conflicts.append(day)
+    return conflicts
+
+
+def _last_room_blocker(bookings: Dict[str, Any], room: str, after: date,
+                       counters: Optional[Any] = None) -> Optional[date]:
+    """Date of a room's last one-off blocker after a date (None when there is none)"""
+    after_key = format_date_key(after)
+    if counters is not None:
+        keys = counters.blockers_overlapping(room, (after.toordinal() + 1) * MINUTES_PER_DAY,
+                                             (date.max.toordinal() + 1) * MINUTES_PER_DAY)
+    else:
+        keys = [key for key, entry in bookings.items()
+                if entry.get('entry_type') == 'room_blocker' and entry.get('room') == room]
+    last = max((bookings[key].get('date') or '' for key in keys if key in bookings), default='')
+    try:
+        return date.fromisoformat(last) if last > after_key else None
+    except ValueError:
+        return None
+
+
+def skip_occurrence(rule: Dict[str, Any], booking_date: date) -> None:
+    """Add a date to a rule's exceptions (in place)"""
+    date_key = format_date_key(booking_date)
+    exceptions = rule.setdefault('exceptions', [])
+    if date_key not in exceptions:
+        exceptions.append(date_key)
+        exceptions.sort()
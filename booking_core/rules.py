@@ -0,0 +1,262 @@
+"""
+BIIS Desk Booking System - Booking Core: Booking Rules
+Author: [Your Name]
+Date: [Date]
+Description: Office layout, booking keys and booking rules without any UI
+
+DESIGN:
+- Plain functions over plain dicts - callers pass bookings/users explicitly
+- Shared by the Streamlit app, the JSON API, the CLIs and batch jobs
+- No Streamlit, PIL or pandas imports
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. KEYS & NAMES
+3. BOOKING RULES
+4. USER ARCHIVING
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+from datetime import date, datetime
+from typing import Dict, Any, Optional, List
+
+from booking_core.intervals import blockers_overlapping
+from booking_core.keys import booking_key_for, format_key
+from booking_core.slots import booking_slots, can_book, occupants, pack_occupants, slot_window
+
+# Office layout: room identifier -> number of desks
+ROOM_LAYOUT = {
+    'klein': 2,
+    'gross': 5
+}
+
+BOOKING_TYPES = ('full_day', 'half_am', 'half_pm', 'maybe')
+
+# Share of a desk-day occupied by each booking type
+BOOKING_TYPE_WEIGHTS = {
+    'full_day': 1.0,
+    'half_am': 0.5,
+    'half_pm': 0.5,
+    'maybe': 1.0
+}
+
+# Placeholder user for archived bookings of deleted users
+DELETED_USER_ID = 'DELETED_USER'
+
+DESK_NAME_MAX_LENGTH = 20
+
+
+# ============================================================================
+# 2. KEYS & NAMES
+# ============================================================================
+
+def format_date_key(booking_date: date) -> str:
+    """Convert date to string key for booking storage"""
+    return booking_date.strftime('%Y-%m-%d')
+
+
+def get_booking_key(booking_date: date, room: str, desk_num: int) -> str:
+    """Generate unique key for booking storage"""
+    return format_key(booking_key_for(booking_date, room, desk_num))
+
+
+def get_desk_name(desk_names: Dict[str, str], room: str, desk_num: int) -> str:
+    """
+    Get custom desk name or fallback to default naming.
+
+    Args:
+        desk_names: Desk name mappings ('room_desk' -> name)
+        room: Room identifier
+        desk_num: Desk number
+
+    Returns:
+        Custom name or 'Desk <n>'
+    """
+    return desk_names.get(f"{room}_{desk_num}", f"Desk {desk_num}")
+
+
+def find_user_id(users: Dict[str, Any], user: str) -> Optional[str]:
+    """Resolve a user ID or (case-insensitive) username to a user ID"""
+    if user in users:
+        return user
+    for user_id, user_data in users.items():
+        if user_data.get('username', '').lower() == user.lower():
+            return user_id
+    return None
+
+
+def get_username(booking: Dict[str, Any], users: Dict[str, Any]) -> str:
+    """Display name of a booking's owner, using archived data for deleted users"""
+    user_id = booking.get('user_id')
+    if user_id == DELETED_USER_ID:
+        return booking.get('archived_username', 'Deleted User')
+    return users.get(user_id, {}).get('username', 'Unknown User')
+
+
+# ============================================================================
+# 3. BOOKING RULES
+# ============================================================================
+
+def can_override_booking(current_booking: Optional[Dict[str, Any]], new_booking_type: str) -> bool:
+    """
+    Check if a new booking type fits on a desk next to its current occupants.
+
+    Maybe bookings can be overridden by any other type; half-day bookings
+    of opposite halves share the desk (see booking_core.slots).
+
+    Args:
+        current_booking: Existing booking entry (or None)
+        new_booking_type: Booking type of the new booking
+
+    Returns:
+        True if the new booking may be combined with the existing entry
+    """
+    return can_book(current_booking, new_booking_type)
+
+
+def build_booking(
+    booking_date: date,
+    room: str,
+    desk_num: int,
+    user_id: str,
+    booking_type: str,
+    created_via: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Build a desk booking entry in the storage format.
+
+    Args:
+        booking_date: Date of the booking
+        room: Room identifier
+        desk_num: Desk number
+        user_id: Booking user
+        booking_type: One of BOOKING_TYPES
+        created_via: Origin marker such as 'template' or 'api' (optional)
+
+    Returns:
+        Booking entry dict
+    """
+    booking_data = {
+        'user_id': user_id,
+        'booking_type': booking_type,
+        'created_at': datetime.now().isoformat(),
+        'date': format_date_key(booking_date),
+        'room': room,
+        'desk_num': desk_num,
+        'entry_type': 'desk_booking'
+    }
+    if created_via:
+        booking_data['created_via'] = created_via
+    return booking_data
+
+
+def check_desk_availability(
+    bookings: Dict[str, Any],
+    booking_date: date,
+    room: str,
+    booking_type: str = 'full_day',
+    counters: Optional[Any] = None
+) -> List[int]:
+    """
+    Desk numbers in a room where a booking of this type fits on a date.
+
+    A desk is available when the booking's slots are free on it and no
+    room blocker overlaps the slots' office hours.
+
+    Args:
+        bookings: Booking data dictionary
+        booking_date: Date to check
+        room: Room identifier
+        booking_type: Booking type to place (default: full day)
+        counters: OccupancyCounters tracking bookings, for an indexed blocker lookup (optional)
+
+    Returns:
+        Sorted list of available desk numbers
+    """
+    start_time, end_time = slot_window(booking_slots(booking_type))
+    if blockers_overlapping(bookings, booking_date, room, start_time, end_time, counters):
+        return []
+
+    return [
+        desk_num for desk_num in range(1, ROOM_LAYOUT.get(room, 0) + 1)
+        if can_book(bookings.get(get_booking_key(booking_date, room, desk_num)), booking_type)
+    ]
+
+
+# ============================================================================
+# 4. USER ARCHIVING
+# ============================================================================
+
+def archive_user_bookings(
+    user_id: str,
+    username: str,
+    bookings: Dict[str, Any],
+    today: Optional[date] = None,
+    counters: Optional[Any] = None
+) -> Dict[str, int]:
+    """
+    Remove a user's future bookings and archive the past ones.
+
+    Past entries keep their data and are reassigned to DELETED_USER with the
+    original username preserved, so history and exports stay readable. On
+    desks shared by two half-day bookers only the user's half is changed.
+
+    Args:
+        user_id: ID of the user being deleted
+        username: Username to preserve on archived entries
+        bookings: Bookings dictionary to modify in place
+        today: Cut-off date (defaults to today)
+        counters: OccupancyCounters to keep in sync (optional)
+
+    Returns:
+        Dict with 'deleted' and 'archived' counts
+    """
+    today = today or datetime.now().date()
+    result = {'deleted': 0, 'archived': 0}
+
+    user_bookings = [
+        (booking_key, booking)
+        for booking_key, booking in bookings.items()
+        if booking.get('user_id') == user_id
+        or (booking.get('second_half') and booking['second_half'].get('user_id') == user_id)
+    ]
+
+    archive_data = {
+        'user_id': DELETED_USER_ID,
+        'archived_username': username,
+        'archived_at': datetime.now().isoformat(),
+        'original_user_id': user_id
+    }
+
+    for booking_key, booking in user_bookings:
+        try:
+            booking_date = datetime.strptime(booking['date'], '%Y-%m-%d').date()
+        except (KeyError, ValueError) as e:
+            # Skip invalid booking entries
+            print(f"Warning: Invalid booking entry {booking_key}: {e}")
+            continue
+
+        others = [occupant for occupant in occupants(booking) if occupant.get('user_id') != user_id]
+        if booking_date >= today:
+            # Future/today bookings: delete completely (other half-day booker stays)
+            updated = pack_occupants(others)
+            result['deleted'] += 1
+        else:
+            # Past bookings: archive with preserved username
+            updated = pack_occupants(others + [
+                {**occupant, **archive_data} for occupant in occupants(booking)
+                if occupant.get('user_id') == user_id
+            ])
+            result['archived'] += 1
+
+        if updated is None:
+            del bookings[booking_key]
+        else:
+            bookings[booking_key] = updated
+        if counters is not None:
+            counters.replace(booking_key, booking, updated)
+
+    return result
@@ -0,0 +1,270 @@
+"""
+BIIS Desk Booking System - Booking Core: Half-Day Slots
+Author: [Your Name]
+Date: [Date]
+Description: AM/PM slot bitmasks per desk-day with one occupant per slot
+
+DESIGN:
+- A desk-day has two slots, AM and PM; every booking type and every room
+  blocker time window maps to a 2-bit mask (full_day/maybe = AM | PM)
+- Conflict checks, free-slot lookups and combining two half-day bookings
+  are bit operations on these masks instead of per-type special cases
+- A desk entry keeps its storage key and format: the first occupant (AM
+  first) is the entry itself, a PM occupant sharing the desk is stored in
+  the entry's 'second_half' field with its own user, type and timestamps.
+  Readers that only know single-occupant entries still see a valid booking
+- occupants() expands an entry into one standalone entry per occupant, so
+  counters, exports and analytics count both half-day bookers
+- 'maybe' occupants may be displaced by any non-'maybe' booking of an
+  overlapping slot (same rule as before, now per slot)
+- Blocker times are parsed with intervals.time_to_minutes, so slot masks and
+  the blocker interval index agree; unreadable times cover the whole day
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. SLOT MASKS
+3. OCCUPANTS
+4. COMBINING & REMOVING
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Tuple
+
+from booking_core.intervals import MINUTES_PER_DAY, time_to_minutes
+
+SLOT_AM = 0b01
+SLOT_PM = 0b10
+SLOT_ALL = SLOT_AM | SLOT_PM
+
+SLOT_NAMES = {SLOT_AM: 'AM', SLOT_PM: 'PM'}
+
+# Slots occupied by each booking type (unknown types occupy the whole day)
+BOOKING_TYPE_SLOTS = {
+    'full_day': SLOT_ALL,
+    'half_am': SLOT_AM,
+    'half_pm': SLOT_PM,
+    'maybe': SLOT_ALL
+}
+
+# Office hours of each slot (HH:MM, end exclusive); blocker windows are mapped onto these
+SLOT_WINDOWS = (
+    (SLOT_AM, '08:00', '12:00'),
+    (SLOT_PM, '12:00', '18:00')
+)
+
+# Entry field holding the second occupant of a shared desk
+SECOND_HALF_FIELD = 'second_half'
+
+# Fields that belong to one occupant rather than to the desk-day
+OCCUPANT_FIELDS = (
+    'user_id', 'booking_type', 'created_at', 'created_via',
+    'archived_username', 'archived_at', 'original_user_id'
+)
+
+
+# ============================================================================
+# 2. SLOT MASKS
+# ============================================================================
+
+def booking_slots(booking_type: Optional[str]) -> int:
+    """Slot mask occupied by a booking type"""
+    return BOOKING_TYPE_SLOTS.get(booking_type, SLOT_ALL)
+
+
+def time_window_slots(start_time: Optional[str], end_time: Optional[str]) -> int:
+    """
+    Slots overlapped by a time window.
+
+    Args:
+        start_time: Start time (HH:MM); missing means start of day
+        end_time: End time (HH:MM); missing means end of day
+
+    Returns:
+        Slot mask (SLOT_ALL for unreadable, empty or inverted windows, to stay on the safe side)
+    """
+    start = time_to_minutes(start_time) if start_time else 0
+    end = time_to_minutes(end_time) if end_time else MINUTES_PER_DAY
+    if start is None or end is None or start >= end:
+        return SLOT_ALL
+    mask = 0
+    for slot, slot_start, slot_end in SLOT_WINDOWS:
+        if start < time_to_minutes(slot_end) and time_to_minutes(slot_start) < end:
+            mask |= slot
+    return mask
+
+
+def slot_window(slots: int) -> Tuple[str, str]:
+    """Time window (HH:MM start, end) spanning the given slots"""
+    windows = [(start, end) for slot, start, end in SLOT_WINDOWS if slots & slot] or [SLOT_WINDOWS[0][1:]]
+    return windows[0][0], windows[-1][1]
+
+
+def blocker_slots(blocker: Optional[Mapping[str, Any]]) -> int:
+    """Slot mask covered by a room blocker (0 without a blocker)"""
+    if not blocker:
+        return 0
+    return time_window_slots(blocker.get('start_time'), blocker.get('end_time'))
+
+
+def occupied_slots(entry: Optional[Mapping[str, Any]]) -> int:
+    """Slot mask taken by the occupants of a desk entry (0 when free)"""
+    if not entry:
+        return 0
+    mask = booking_slots(entry.get('booking_type'))
+    second = entry.get(SECOND_HALF_FIELD)
+    if second:
+        mask |= booking_slots(second.get('booking_type'))
+    return mask
+
+
+def _fixed_slots(entry: Optional[Mapping[str, Any]], booking_type: str) -> int:
+    """Slots a new booking of this type cannot take over ('maybe' occupants yield)"""
+    if booking_type == 'maybe':
+        return occupied_slots(entry)
+    return sum(
+        booking_slots(occupant.get('booking_type'))
+        for occupant in occupants(entry)
+        if occupant.get('booking_type') != 'maybe'
+    )
+
+
+def free_slots(entry: Optional[Mapping[str, Any]], blocker: Optional[Mapping[str, Any]] = None) -> int:
+    """Slots of a desk-day that are neither booked nor covered by the room blocker"""
+    return SLOT_ALL & ~occupied_slots(entry) & ~blocker_slots(blocker)
+
+
+def can_book(entry: Optional[Mapping[str, Any]], booking_type: str,
+             blocker: Optional[Mapping[str, Any]] = None) -> bool:
+    """
+    Check whether a booking of this type fits next to a desk's occupants.
+
+    Args:
+        entry: Existing desk entry (or None)
+        booking_type: Type of the new booking
+        blocker: Room blocker of the day; its time window is treated as taken (optional)
+
+    Returns:
+        True if the new booking's slots are free or only held by 'maybe' occupants
+    """
+    return not booking_slots(booking_type) & (_fixed_slots(entry, booking_type) | blocker_slots(blocker))
+
+
+# ============================================================================
+# 3. OCCUPANTS
+# ============================================================================
+
+def occupants(entry: Optional[Mapping[str, Any]]) -> List[Mapping[str, Any]]:
+    """
+    One standalone booking entry per occupant of a desk entry.
+
+    Args:
+        entry: Desk entry (or None)
+
+    Returns:
+        The entry itself when it has a single occupant, otherwise the first
+        occupant and the second occupant merged with the desk-day fields
+    """
+    if not entry:
+        return []
+    second = entry.get(SECOND_HALF_FIELD)
+    if not second:
+        return [entry]
+    first = {name: value for name, value in entry.items() if name != SECOND_HALF_FIELD}
+
+    # Same field order as the first occupant, so either one writes back in the storage layout
+    other = {}
+    for name, value in first.items():
+        if name not in OCCUPANT_FIELDS:
+            other[name] = value
+        elif name in second:
+            other[name] = second[name]
+    other.update(second)
+    return [first, other]
+
+
+def occupant_ids(entry: Optional[Mapping[str, Any]]) -> List[str]:
+    """User IDs of all occupants of a desk entry"""
+    if not entry:
+        return []
+    second = entry.get(SECOND_HALF_FIELD)
+    if not second:
+        return [entry.get('user_id')]
+    return [entry.get('user_id'), second.get('user_id')]
+
+
+def slot_occupants(entry: Optional[Mapping[str, Any]]) -> Dict[int, Mapping[str, Any]]:
+    """Occupant per slot bit (full-day occupants appear under both slots)"""
+    result = {}
+    for occupant in occupants(entry):
+        mask = booking_slots(occupant.get('booking_type'))
+        for slot in SLOT_NAMES:
+            if mask & slot:
+                result[slot] = occupant
+    return result
+
+
+# ============================================================================
+# 4. COMBINING & REMOVING
+# ============================================================================
+
+def pack_occupants(entries: Iterable[Mapping[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Build the stored desk entry for a set of non-overlapping occupants.
+
+    Args:
+        entries: Standalone occupant entries (at most one per slot)
+
+    Returns:
+        Desk entry (AM occupant first), or None when there are no occupants
+    """
+    ordered = sorted(entries, key=lambda occupant: booking_slots(occupant.get('booking_type')))
+    if not ordered:
+        return None
+    entry = {name: value for name, value in ordered[0].items() if name != SECOND_HALF_FIELD}
+    if len(ordered) > 1:
+        entry[SECOND_HALF_FIELD] = {name: ordered[1][name] for name in OCCUPANT_FIELDS if name in ordered[1]}
+    return entry
+
+
+def combine_booking(existing: Optional[Mapping[str, Any]], booking: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Add a booking to a desk entry, displacing occupants of the slots it takes.
+
+    Callers check can_book() first; occupants displaced here are the
+    'maybe' bookings the new booking may take over.
+
+    Args:
+        existing: Current desk entry (or None)
+        booking: New single-occupant booking entry
+
+    Returns:
+        New desk entry holding all remaining occupants
+    """
+    taken = booking_slots(booking.get('booking_type'))
+    kept = [occupant for occupant in occupants(existing)
+            if not booking_slots(occupant.get('booking_type')) & taken]
+    return pack_occupants(kept + [booking])
+
+
+def remove_occupants(entry: Optional[Mapping[str, Any]], slots: int = SLOT_ALL,
+                     user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Remove the occupants of some slots (and optionally of one user) from a desk entry.
+
+    Args:
+        entry: Desk entry (or None)
+        slots: Slot mask whose occupants are removed (default: all)
+        user_id: Only remove occupants of this user (optional)
+
+    Returns:
+        Remaining desk entry, or None when the desk becomes free
+    """
+    kept = [
+        occupant for occupant in occupants(entry)
+        if not booking_slots(occupant.get('booking_type')) & slots
+        or (user_id is not None and occupant.get('user_id') != user_id)
+    ]
+    return pack_occupants(kept)
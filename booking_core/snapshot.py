@@ -0,0 +1,264 @@
+"""
+BIIS Desk Booking System - Booking Core: Warm-Start Snapshot
+Author: [Your Name]
+Date: [Date]
+Description: Binary snapshot of the parsed data files and their indexes
+
+DESIGN:
+- Every write of the JSON files bumps a generation number (data/.generation)
+- After a cold JSON parse, the parsed data plus the occupancy counters are
+  pickled to data/.snapshot.pickle together with the generation and the
+  (mtime, size) stamps of the JSON files
+- A later start loads the snapshot only when generation and stamps still
+  match, so hand edits and saves by other processes invalidate it
+- JSON stays the interchange format; the snapshot is a disposable cache
+  (delete it at any time) and is only read from the trusted data directory
+- Every write schedules a refresh (schedule_snapshot), debounced by
+  SNAPSHOT_DELAY seconds on a background thread, so a burst of saves costs
+  one snapshot and the next restart is warm again; the store writes its
+  in-memory data and counters, other writers reparse the JSON files
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. GENERATION NUMBER
+3. SNAPSHOT FILES
+4. WARM LOADING
+5. BACKGROUND REFRESH
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import gc
+import os
+import pickle
+import threading
+from typing import Dict, Any, Callable, Optional, Tuple
+
+from booking_core.profiling import span
+
+SNAPSHOT_FILE = '.snapshot.pickle'
+GENERATION_FILE = '.generation'
+
+# Bump when the pickled structure changes so old snapshots are ignored
+SNAPSHOT_FORMAT = 8
+
+JSON_FILES = ('users.json', 'bookings.json', 'settings.json')
+
+# Seconds without further writes before the snapshot is refreshed
+SNAPSHOT_DELAY = 2.0
+
+
+# ============================================================================
+# 2. GENERATION NUMBER
+# ============================================================================
+
+def read_generation(data_dir: str = 'data') -> int:
+    """Current data generation (0 when the data was never written)"""
+    try:
+        with open(os.path.join(data_dir, GENERATION_FILE), 'r', encoding='utf-8') as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def bump_generation(data_dir: str = 'data') -> int:
+    """Increment the data generation after a write and return the new value"""
+    generation = read_generation(data_dir) + 1
+    path = os.path.join(data_dir, GENERATION_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(str(generation))
+    os.replace(tmp_path, path)
+    return generation
+
+
+def file_stamps(data_dir: str = 'data') -> Dict[str, Optional[Tuple[int, int]]]:
+    """(mtime_ns, size) of each JSON data file, None when missing"""
+    stamps = {}
+    for filename in JSON_FILES:
+        try:
+            stat = os.stat(os.path.join(data_dir, filename))
+            stamps[filename] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            stamps[filename] = None
+    return stamps
+
+
+# ============================================================================
+# 3. SNAPSHOT FILES
+# ============================================================================
+
+def load_snapshot(data_dir: str = 'data') -> Optional[Dict[str, Any]]:
+    """
+    Load the snapshot if it matches the current generation and JSON files.
+
+    Returns:
+        Dict with 'data' (users/bookings/settings), 'counters' and 'stamps',
+        or None when there is no valid snapshot
+    """
+    path = os.path.join(data_dir, SNAPSHOT_FILE)
+    if not os.path.exists(path):
+        return None
+
+    # Validate against the cheap metadata before unpickling anything big
+    generation = read_generation(data_dir)
+    stamps = file_stamps(data_dir)
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()  # Building millions of small dicts triggers needless GC passes
+    try:
+        with open(path, 'rb') as f:
+            header = pickle.load(f)
+            if (header.get('format') != SNAPSHOT_FORMAT or header.get('generation') != generation
+                    or header.get('stamps') != stamps):
+                return None
+            snapshot = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError):
+        return None
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    snapshot['stamps'] = stamps
+    return snapshot
+
+
+def write_snapshot(
+    data_dir: str,
+    data: Dict[str, Dict[str, Any]],
+    counters: Any,
+    stamps: Dict[str, Optional[Tuple[int, int]]],
+    generation: int
+) -> bool:
+    """
+    Write the snapshot for data parsed from files with the given stamps.
+
+    Args:
+        data_dir: Directory with the JSON data files
+        data: Parsed users/bookings/settings
+        counters: OccupancyCounters built from data['bookings']
+        stamps: File stamps taken *before* the files were parsed
+        generation: Generation read before the files were parsed
+
+    Returns:
+        True if the snapshot was written
+    """
+    path = os.path.join(data_dir, SNAPSHOT_FILE)
+    tmp_path = f"{path}.tmp"
+    header = {'format': SNAPSHOT_FORMAT, 'generation': generation, 'stamps': stamps}
+    try:
+        with open(tmp_path, 'wb') as f:
+            # Header first so validation never unpickles the payload
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump({'data': data, 'counters': counters}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        return False
+
+
+# ============================================================================
+# 4. WARM LOADING
+# ============================================================================
+
+def load_data_warm(data_dir: str = 'data', write: bool = True, counters: bool = True) -> Dict[str, Any]:
+    """
+    Load users, bookings, settings and counters, preferring the snapshot.
+
+    Args:
+        data_dir: Directory with the JSON data files
+        write: Write a fresh snapshot after a cold JSON parse
+        counters: Build the counters after a cold JSON parse; without them
+            no snapshot is written ('counters' is None in the result)
+
+    Returns:
+        Dict with 'users', 'bookings', 'settings', 'counters', the file
+        'stamps' the data corresponds to and 'warm' (True when the snapshot
+        was used)
+    """
+    # Imported here to avoid a cycle (store uses generation helpers)
+    from booking_core.counters import OccupancyCounters
+    from booking_core.store import load_data_files
+
+    with span('load_snapshot'):
+        snapshot = load_snapshot(data_dir)
+    if snapshot is not None:
+        return {**snapshot['data'], 'counters': snapshot['counters'], 'stamps': snapshot['stamps'], 'warm': True}
+
+    generation = read_generation(data_dir)
+    stamps = file_stamps(data_dir)
+    data = load_data_files(data_dir)
+    if not counters:
+        return {**data, 'counters': None, 'stamps': stamps, 'warm': False}
+    occupancy = OccupancyCounters(data['bookings'])
+
+    if write and os.path.isdir(data_dir):
+        with span('write_snapshot'):
+            write_snapshot(data_dir, data, occupancy, stamps, generation)
+
+    return {**data, 'counters': occupancy, 'stamps': stamps, 'warm': False}
+
+
+# ============================================================================
+# 5. BACKGROUND REFRESH
+# ============================================================================
+
+_pending_refreshes: Dict[str, threading.Timer] = {}
+_pending_lock = threading.Lock()
+_refresh_lock = threading.Lock()  # One snapshot write at a time (shared temp file)
+
+
+def schedule_snapshot(
+    data_dir: str = 'data',
+    writer: Optional[Callable[[], Any]] = None,
+    delay: float = SNAPSHOT_DELAY
+) -> None:
+    """
+    Refresh the snapshot of a data directory once its writes pause.
+
+    A later call for the same directory replaces a pending refresh.
+
+    Args:
+        data_dir: Directory with the JSON data files
+        writer: Writes the snapshot from data already in memory (default:
+            reparse the JSON files with load_data_warm)
+        delay: Seconds to wait for further writes
+    """
+    key = os.path.abspath(data_dir)
+    with _pending_lock:
+        pending = _pending_refreshes.get(key)
+        if pending is not None:
+            pending.cancel()
+        timer = threading.Timer(delay, _run_refresh, (key, data_dir, writer))
+        timer.daemon = True
+        _pending_refreshes[key] = timer
+        timer.start()
+
+
+def _run_refresh(key: str, data_dir: str, writer: Optional[Callable[[], Any]]) -> None:
+    """Write one scheduled snapshot (failures only cost the next warm start)"""
+    with _pending_lock:
+        if _pending_refreshes.get(key) is threading.current_thread():
+            del _pending_refreshes[key]
+    with _refresh_lock:
+        try:
+            if writer is not None:
+                writer()
+            else:
+                load_data_warm(data_dir)
+        except Exception:  # pragma: no cover - the snapshot is a disposable cache
+            pass
+
+
+def flush_snapshots() -> None:
+    """Run all pending snapshot refreshes now (before a short-lived process exits)"""
+    with _pending_lock:
+        pending = list(_pending_refreshes.items())
+        _pending_refreshes.clear()
+    for key, timer in pending:
+        timer.cancel()
+        _run_refresh(key, *timer.args[1:])
+    with _refresh_lock:
+        pass  # Wait for a refresh that was already running
@@ -0,0 +1,642 @@
+"""
+BIIS Desk Booking System - Booking Core: Booking Store
+Author: [Your Name]
+Date: [Date]
+Description: Streamlit-free, thread-safe access to the JSON data files
+
+DESIGN:
+- JSON file helpers used by the app, the API and the CLIs alike
+- One pooled store instance per data directory, shared by all threads
+- Parsed JSON is kept in memory and only reparsed when a file changes on disk
+- Mutations run under a lock and write the touched file atomically
+- Booking counters (booking_aggregates) are kept in sync for O(1) availability
+- Parsed booking entries are compact read-only records (booking_core.records)
+  and are written back as plain JSON objects
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. JSON FILE HELPERS
+3. STORE POOL
+4. BOOKING STORE (data access + booking operations)
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import gc
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Dict, Any, Optional, List, Tuple, Iterator, Callable
+
+from booking_core.rules import (
+    ROOM_LAYOUT, BOOKING_TYPES, can_override_booking, build_booking, find_user_id, get_booking_key
+)
+from booking_core.slots import SLOT_ALL, SLOT_AM, SLOT_PM, combine_booking, occupant_ids, remove_occupants
+from booking_core.blockers import BLOCKER_TYPES, build_room_blocker, next_room_blocker_key, valid_blocker_window
+from booking_core.holidays import is_workday
+from booking_core.intervals import blockers_overlapping
+from booking_core.recurring import skip_occurrence
+from booking_core.counters import OccupancyCounters
+from booking_core.finder import find_free_desks
+from booking_core.teams import DEFAULT_MIN_MEMBERS, co_location_days, team_members
+from booking_core.ical import FEED_KINDS, CalendarFeedCache
+from booking_core.metrics import record_bookings, record_file_written, record_save
+from booking_core.profiling import count, span
+from booking_core.records import compact_entry, json_default
+from booking_core.snapshot import (
+    bump_generation, file_stamps, load_data_warm, read_generation, schedule_snapshot, write_snapshot
+)
+
+DATA_FILES = {
+    'users': 'users.json',
+    'bookings': 'bookings.json',
+    'settings': 'settings.json'
+}
+
+
+class BookingError(ValueError):
+    """Booking operation rejected by validation, with an HTTP-style status"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+# ============================================================================
+# 2. JSON FILE HELPERS
+# ============================================================================
+
+def load_json_file(filepath: str, object_hook: Optional[Callable[[dict], Any]] = None) -> Dict[str, Any]:
+    """Load a JSON data file, returning an empty dict if it does not exist"""
+    if not os.path.exists(filepath):
+        return {}
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f, object_hook=object_hook)
+
+
+def load_bookings_file(filepath: str) -> Dict[str, Any]:
+    """Load bookings.json with its entries parsed straight into compact records"""
+    gc_was_enabled = gc.isenabled()
+    gc.disable()  # Records hold no cycles; GC passes over millions of them are wasted
+    try:
+        return load_json_file(filepath, object_hook=compact_entry)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def write_json_file(filepath: str, data: Any) -> int:
+    """Write a JSON data file atomically (temp file + rename), returning its size"""
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, default=json_default)
+        size = f.tell()
+    os.replace(tmp_path, filepath)
+    count('bytes_written', size)
+    count('files_written')
+    record_file_written(filepath, size)
+    return size
+
+
+def load_data_files(data_dir: str = 'data') -> Dict[str, Dict[str, Any]]:
+    """
+    Load users, bookings and settings from a data directory.
+
+    Falls back to the legacy team_news.json when settings.json is missing.
+
+    Returns:
+        Dict with 'users', 'bookings' and 'settings'
+    """
+    with span('load_json'):
+        data = {name: (load_bookings_file if name == 'bookings' else load_json_file)(os.path.join(data_dir, filename))
+                for name, filename in DATA_FILES.items()}
+
+    legacy_news = os.path.join(data_dir, 'team_news.json')
+    if not data['settings'] and os.path.exists(legacy_news):
+        data['settings'] = {'team_news': load_json_file(legacy_news).get('news', '')}
+
+    return data
+
+
+def save_data_files(
+    users: Dict[str, Any],
+    bookings: Dict[str, Any],
+    settings: Dict[str, Any],
+    data_dir: str = 'data'
+) -> None:
+    """
+    Write users, bookings and settings to a data directory.
+
+    Raises:
+        OSError: If a file cannot be written
+    """
+    start = time.perf_counter()
+    with span('save_data_files'):
+        size = 0
+        for name, data in (('users', users), ('bookings', bookings), ('settings', settings)):
+            size += write_json_file(os.path.join(data_dir, DATA_FILES[name]), data)
+        bump_generation(data_dir)
+    record_save(time.perf_counter() - start, size)
+    schedule_snapshot(data_dir)
+
+
+# ============================================================================
+# 3. STORE POOL
+# ============================================================================
+
+_STORE_POOL: Dict[str, 'BookingStore'] = {}
+
+# Stamp that never matches a file, forcing a reparse on the next refresh
+_STALE_STAMP = (-1, -1)
+_STORE_POOL_LOCK = threading.Lock()
+
+
+def get_store(data_dir: str = 'data') -> 'BookingStore':
+    """
+    Return the pooled store for a data directory, creating it on first use.
+
+    All callers in a process share one store (and one parsed copy of the
+    data) per directory instead of reparsing the JSON files per request.
+    """
+    key = os.path.abspath(data_dir)
+    with _STORE_POOL_LOCK:
+        store = _STORE_POOL.get(key)
+        if store is None:
+            store = BookingStore(data_dir)
+            _STORE_POOL[key] = store
+        return store
+
+
+# ============================================================================
+# 4. BOOKING STORE
+# ============================================================================
+
+class BookingStore:
+    """Thread-safe in-memory view of the JSON data files"""
+
+    def __init__(self, data_dir: str = 'data'):
+        self.data_dir = data_dir
+        self.lock = threading.RLock()
+        self._data: Dict[str, Dict[str, Any]] = {name: {} for name in DATA_FILES}
+        self._stamps: Dict[str, Optional[Tuple[int, int]]] = {name: None for name in DATA_FILES}
+        self.counters = OccupancyCounters(self._data['bookings'])
+        self.feeds = CalendarFeedCache()
+        self._warm_started = False
+
+    def _path(self, name: str) -> str:
+        """Full path of a data file"""
+        return os.path.join(self.data_dir, DATA_FILES[name])
+
+    def _warm_start(self) -> None:
+        """First load: use the binary snapshot when it is still valid"""
+        data = load_data_warm(self.data_dir)
+        for name, filename in DATA_FILES.items():
+            self._data[name] = data[name]
+            self._stamps[name] = data.get('stamps', {}).get(filename, _STALE_STAMP)
+        self.counters = data['counters']
+
+    def _refresh(self) -> None:
+        """Reparse data files that changed on disk since the last read"""
+        if not self._warm_started:
+            self._warm_started = True
+            if os.path.isdir(self.data_dir):
+                self._warm_start()
+
+        for name in DATA_FILES:
+            try:
+                stat = os.stat(self._path(name))
+                stamp = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                stamp = None
+
+            if stamp == self._stamps[name]:
+                continue
+
+            if stamp is None:
+                self._data[name] = {}
+            elif name == 'bookings':
+                self._data[name] = load_bookings_file(self._path(name))
+            else:
+                self._data[name] = load_json_file(self._path(name))
+            self._stamps[name] = stamp
+
+            if name == 'bookings':
+                self.counters = OccupancyCounters(self._data['bookings'])
+
+    def _write(self, *names: str) -> None:
+        """Atomically write data files (one save) and remember their new stamps"""
+        start = time.perf_counter()
+        size = 0
+        for name in names:
+            path = self._path(name)
+            size += write_json_file(path, self._data[name])
+            stat = os.stat(path)
+            self._stamps[name] = (stat.st_mtime_ns, stat.st_size)
+        bump_generation(self.data_dir)
+        record_save(time.perf_counter() - start, size)
+        schedule_snapshot(self.data_dir, self._write_snapshot)
+
+    def _write_snapshot(self) -> None:
+        """Snapshot the in-memory data, unless another process wrote the files since"""
+        with self.lock:
+            stamps = file_stamps(self.data_dir)
+            if any(stamps.get(filename) != self._stamps[name] for name, filename in DATA_FILES.items()):
+                return
+            write_snapshot(self.data_dir, self._data, self.counters, stamps, read_generation(self.data_dir))
+
+    @contextmanager
+    def transaction(self, *names: str) -> Iterator[Dict[str, Dict[str, Any]]]:
+        """
+        Run a bulk mutation under the store lock and write each file once.
+
+        Yields the live users/bookings/settings dicts. When the block raises,
+        nothing is written and the in-memory copy is reloaded from disk on
+        the next access, discarding partial changes.
+
+        Args:
+            names: Data files the block modifies ('users', 'bookings', 'settings')
+        """
+        with self.lock:
+            self._refresh()
+            try:
+                yield self._data
+            except BaseException:
+                for name in names:
+                    self._stamps[name] = _STALE_STAMP
+                raise
+
+            if 'settings' in names:
+                self._data['settings']['updated'] = datetime.now().isoformat()
+            if names:
+                self._write(*names)
+            if 'bookings' in names:
+                self.counters = OccupancyCounters(self._data['bookings'])
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the current users, bookings and settings.
+
+        The returned dicts are shared - callers must treat them as read-only
+        and hold store.lock while iterating if writers may be active.
+        """
+        with self.lock:
+            self._refresh()
+            return dict(self._data)
+
+    @property
+    def users(self) -> Dict[str, Any]:
+        return self.load()['users']
+
+    @property
+    def bookings(self) -> Dict[str, Any]:
+        return self.load()['bookings']
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        return self.load()['settings']
+
+
+    # ------------------------------------------------------------------------
+    # Booking operations
+    # ------------------------------------------------------------------------
+
+    def _expand_rules(self, start: date, end: date) -> None:
+        """Expand recurring room blockers from start to end into the counters (lock held)"""
+        self.counters.expand_blocker_rules(self._data['settings'].get('blocker_rules'), start, end)
+
+    def _validate_location(self, room: str, desk_num: Optional[int] = None) -> None:
+        """Reject unknown rooms and desk numbers"""
+        if room not in ROOM_LAYOUT:
+            raise BookingError(f"Unknown room '{room}'")
+        if desk_num is not None and not 1 <= desk_num <= ROOM_LAYOUT[room]:
+            raise BookingError(f"Room '{room}' has no desk {desk_num}")
+
+    def _validate_booking_date(self, booking_date: date) -> None:
+        """Reject past dates, weekends and holidays (lock held)"""
+        if booking_date < date.today():
+            raise BookingError(f"{booking_date.isoformat()} is in the past")
+        if not is_workday(self._data['settings'].get('holidays', {}), booking_date):
+            raise BookingError(f"{booking_date.isoformat()} is not a workday")
+
+    def _validate_user(self, user_id: str) -> None:
+        """Reject unknown users"""
+        if user_id not in self._data['users']:
+            raise BookingError(f"Unknown user '{user_id}'", status=404)
+
+    def list_bookings(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        room: Optional[str] = None,
+        user_id: Optional[str] = None,
+        include_blockers: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        List bookings (and room blockers) matching the given filters.
+
+        Returns:
+            List of booking entries with their storage key under 'key'
+        """
+        start_key = start.strftime('%Y-%m-%d') if start else None
+        end_key = end.strftime('%Y-%m-%d') if end else None
+
+        with self.lock:
+            self._refresh()
+            bookings = self._data['bookings']
+
+            # Date ranges are slices of the ordered key index
+            if start or end:
+                candidates = self.counters.keys_between(start or date.min, end or date.max, room)
+                candidates.extend(self.counters.key_index.unindexed)
+            elif room:
+                candidates = self.counters.keys_for_room(room)
+            else:
+                candidates = bookings
+
+            results = []
+            for booking_key in candidates:
+                booking = bookings.get(booking_key)
+                if booking is None:
+                    continue
+                date_key = booking.get('date', '')
+                if start_key and date_key < start_key:
+                    continue
+                if end_key and date_key > end_key:
+                    continue
+                if room and booking.get('room') != room:
+                    continue
+                if user_id and user_id not in occupant_ids(booking):
+                    continue
+                if not include_blockers and booking.get('entry_type') == 'room_blocker':
+                    continue
+                results.append({'key': booking_key, **booking})
+
+        results.sort(key=lambda entry: entry['key'])
+        return results
+
+    def availability(self, booking_date: date) -> Dict[str, Dict[str, Any]]:
+        """
+        Free desks per room on a date, read from the booking counters.
+
+        Returns:
+            Mapping of room to free/total desk counts and blocked flag
+        """
+        date_key = booking_date.strftime('%Y-%m-%d')
+        with self.lock:
+            self._refresh()
+            self._expand_rules(booking_date, booking_date)
+            result = {}
+            for room in ROOM_LAYOUT:
+                free, total = self.counters.free_desks(date_key, room)
+                result[room] = {
+                    'free': free,
+                    'total': total,
+                    'blocked': self.counters.is_room_blocked(date_key, room)
+                }
+            return result
+
+    def free_desks(self, start: date, end: date, room: Optional[str] = None,
+                   slots: int = SLOT_ALL) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Free desks on each workday from start to end (see finder.find_free_desks).
+
+        Returns:
+            Mapping of date to a list of free desks (room, desk_num, am, pm)
+
+        Raises:
+            BookingError: If the range or room is invalid
+        """
+        with self.lock:
+            self._refresh()
+            self._expand_rules(start, end)
+            try:
+                days = find_free_desks(self._data['bookings'], start, end, room, slots, self.counters,
+                                       self._data['settings'].get('holidays'))
+            except ValueError as e:
+                raise BookingError(str(e))
+        return {
+            date_key: [
+                {'room': desk.room, 'desk_num': desk.desk_num,
+                 'am': bool(desk.slots & SLOT_AM), 'pm': bool(desk.slots & SLOT_PM)}
+                for desk in desks
+            ]
+            for date_key, desks in days.items()
+        }
+
+    def team_days(self, team: str, start: date, end: date,
+                  min_members: int = DEFAULT_MIN_MEMBERS) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Workdays from start to end with at least min_members of a team in.
+
+        Returns:
+            Mapping of date to the members' placements (user_id, room, desk_num, booking_type)
+
+        Raises:
+            BookingError: If the team has no members or the range is inverted
+        """
+        if end < start:
+            raise BookingError("End date is before the start date")
+        with self.lock:
+            self._refresh()
+            members = team_members(self._data['users'], team)
+            if not members:
+                raise BookingError(f"Unknown team '{team}'", status=404)
+            days = co_location_days(self._data['bookings'], self.counters, members, start, end,
+                                    min_members, self._data['settings'].get('holidays'))
+        return {date_key: [placement._asdict() for placement in placements]
+                for date_key, placements in days.items()}
+
+    def calendar_feed(self, kind: str, ident: str) -> Tuple[str, bytes]:
+        """
+        iCalendar feed of one user's or one room's bookings and blockers.
+
+        Args:
+            kind: 'user' or 'room'
+            ident: User ID/username or room identifier
+
+        Returns:
+            Tuple of (ETag, .ics body)
+
+        Raises:
+            BookingError: If the user or room does not exist
+        """
+        if kind not in FEED_KINDS:
+            raise BookingError(f"Unknown feed type '{kind}'", status=404)
+
+        with self.lock:
+            self._refresh()
+            if kind == 'room':
+                self._validate_location(ident)
+                calendar_name = f"BIIS Desk Booking - {ident.capitalize()}"
+            else:
+                user_id = find_user_id(self._data['users'], ident)
+                if user_id is None:
+                    raise BookingError(f"Unknown user '{ident}'", status=404)
+                ident = user_id
+                calendar_name = f"BIIS Desk Booking - {self._data['users'][user_id].get('username', user_id)}"
+
+            names_version = (self._stamps['users'], self._stamps['settings'])
+            return self.feeds.feed(
+                kind, ident, self._data['bookings'], self.counters, self._data['users'],
+                self._data['settings'].get('desk_names', {}), names_version, calendar_name
+            )
+
+    def create_booking(
+        self,
+        booking_date: date,
+        room: str,
+        desk_num: int,
+        user_id: str,
+        booking_type: str,
+        created_via: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a desk booking, honouring the override rules.
+
+        A half-day booking next to a booking of the other half shares the
+        desk entry with it (see booking_core.slots).
+
+        Raises:
+            BookingError: If validation fails or the desk is taken
+        """
+        self._validate_location(room, desk_num)
+        if booking_type not in BOOKING_TYPES:
+            raise BookingError(f"Invalid booking type '{booking_type}'")
+
+        booking_key = get_booking_key(booking_date, room, desk_num)
+        with self.lock:
+            self._refresh()
+            self._validate_user(user_id)
+            self._validate_booking_date(booking_date)
+
+            existing = self._data['bookings'].get(booking_key)
+            if existing and not can_override_booking(existing, booking_type):
+                raise BookingError("Cannot override existing booking", status=409)
+
+            booking_data = combine_booking(
+                existing, build_booking(booking_date, room, desk_num, user_id, booking_type, created_via)
+            )
+
+            self.counters.replace(booking_key, existing, booking_data)
+            self._data['bookings'][booking_key] = booking_data
+            self._write('bookings')
+            record_bookings(created=1, source=created_via or 'store')
+            return {'key': booking_key, **booking_data}
+
+    def remove_booking(self, booking_date: date, room: str, desk_num: int,
+                       cancelled_via: Optional[str] = None, slots: int = SLOT_ALL) -> bool:
+        """Remove a desk booking (or the occupant of some slots), returning False if none exists"""
+        self._validate_location(room, desk_num)
+        booking_key = get_booking_key(booking_date, room, desk_num)
+        with self.lock:
+            self._refresh()
+            bookings = self._data['bookings']
+            existing = bookings.get(booking_key)
+            remaining = remove_occupants(existing, slots)
+            if existing is None or remaining == existing:
+                return False
+            if remaining is None:
+                del bookings[booking_key]
+            else:
+                bookings[booking_key] = remaining
+            self.counters.replace(booking_key, existing, remaining)
+            self._write('bookings')
+            record_bookings(cancelled=1, source=cancelled_via or 'store')
+            return True
+
+    def create_room_blocker(
+        self,
+        booking_date: date,
+        room: str,
+        user_id: str,
+        blocker_type: str,
+        custom_time_start: Optional[str] = None,
+        custom_time_end: Optional[str] = None,
+        reason: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Add a room blocker for a room and date.
+
+        A room can hold several blockers per day as long as their time
+        windows do not overlap.
+
+        Raises:
+            BookingError: If validation fails, the window overlaps another
+                blocker or the day has no free blocker slot
+        """
+        self._validate_location(room)
+        if blocker_type not in BLOCKER_TYPES:
+            raise BookingError(f"Invalid blocker type '{blocker_type}'")
+
+        if blocker_type == 'custom' and not (custom_time_start and custom_time_end):
+            raise BookingError("Custom blockers need start_time and end_time")
+        if blocker_type == 'custom' and not valid_blocker_window(custom_time_start, custom_time_end):
+            raise BookingError("Custom blockers need HH:MM times with start_time before end_time")
+
+        with self.lock:
+            self._refresh()
+            self._validate_user(user_id)
+            bookings = self._data['bookings']
+
+            blocker_data = build_room_blocker(
+                booking_date, room, user_id, blocker_type, custom_time_start, custom_time_end, reason
+            )
+            self._expand_rules(booking_date, booking_date)
+            if blockers_overlapping(bookings, booking_date, room, blocker_data['start_time'],
+                                    blocker_data['end_time'], self.counters):
+                raise BookingError("Overlaps an existing room blocker", status=409)
+            blocker_key = next_room_blocker_key(bookings, booking_date, room)
+            if blocker_key is None:
+                raise BookingError("Too many room blockers on this day", status=409)
+
+            self.counters.replace(blocker_key, None, blocker_data)
+            bookings[blocker_key] = blocker_data
+            self._write('bookings')
+            return {'key': blocker_key, **blocker_data}
+
+    def remove_room_blocker(self, booking_date: date, room: str, start_time: Optional[str] = None) -> bool:
+        """
+        Remove a room's blockers on a date, returning False if none exists.
+
+        Occurrences of recurring blockers are skipped for that date (added
+        to the rule's exceptions); the rule itself is kept.
+
+        Args:
+            booking_date: Date of the blockers
+            room: Room identifier
+            start_time: Only remove the blocker starting at this time (HH:MM, optional)
+        """
+        self._validate_location(room)
+        with self.lock:
+            self._refresh()
+            self._expand_rules(booking_date, booking_date)
+            bookings = self._data['bookings']
+            removed = [
+                (blocker_key, blocker)
+                for blocker_key, blocker in blockers_overlapping(bookings, booking_date, room, counters=self.counters)
+                if start_time is None or blocker.get('start_time') == start_time
+            ]
+            if not removed:
+                return False
+            rules = self._data['settings'].get('blocker_rules', {})
+            changed = set()
+            for blocker_key, blocker in removed:
+                if blocker_key in bookings:
+                    del bookings[blocker_key]
+                    self.counters.replace(blocker_key, blocker, None)
+                    changed.add('bookings')
+                elif blocker.get('rule_id') in rules:
+                    skip_occurrence(rules[blocker['rule_id']], booking_date)
+                    changed.add('settings')
+            if 'settings' in changed:
+                self._data['settings']['updated'] = datetime.now().isoformat()
+            self._write(*sorted(changed))
+            return True
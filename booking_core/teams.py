@@ -0,0 +1,190 @@
+"""
+BIIS Desk Booking System - Booking Core: Teams
+Author: [Your Name]
+Date: [Date]
+Description: Team membership on users and teammate co-location queries
+
+DESIGN:
+- A user belongs to any number of teams, stored as a list of names under
+  the user's 'teams' field in users.json (no separate team registry)
+- Where members sit comes from the counters' user -> date -> booking keys
+  index (OccupancyCounters.user_keys_on): a query costs members x workdays
+  dict lookups, however many years of bookings exist
+- "Days with at least N of my team in" counts distinct members per day;
+  free desks next to them come from one finder pass over the same range
+  (booking_core.finder), ranked by room and desk distance to the team
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. TEAM MEMBERSHIP
+3. CO-LOCATION QUERIES
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+from collections import Counter
+from datetime import date
+from typing import Dict, Any, Iterable, List, Mapping, NamedTuple, Optional
+
+from booking_core.rules import ROOM_LAYOUT
+from booking_core.slots import occupants
+from booking_core.workdays import get_calendar
+
+# User field holding the team names
+TEAMS_FIELD = 'teams'
+
+# Default "at least N teammates in" threshold
+DEFAULT_MIN_MEMBERS = 3
+
+
+class Placement(NamedTuple):
+    """Where one member sits on one day"""
+
+    user_id: str
+    room: str
+    desk_num: int
+    booking_type: str
+
+
+# ============================================================================
+# 2. TEAM MEMBERSHIP
+# ============================================================================
+
+def parse_teams(text: Optional[str]) -> List[str]:
+    """
+    Parse comma separated team names.
+
+    Args:
+        text: e.g. 'Backend, Data'
+
+    Returns:
+        Team names in input order, blanks and case-insensitive duplicates removed
+    """
+    teams, seen = [], set()
+    for part in (text or '').split(','):
+        name = ' '.join(part.split())
+        if name and name.casefold() not in seen:
+            seen.add(name.casefold())
+            teams.append(name)
+    return teams
+
+
+def user_teams(user: Mapping[str, Any]) -> List[str]:
+    """Team names of a user (empty when not in any team)"""
+    return list(user.get(TEAMS_FIELD) or [])
+
+
+def all_teams(users: Mapping[str, Mapping[str, Any]]) -> List[str]:
+    """All team names used by any user, sorted"""
+    return sorted({team for user in users.values() for team in user_teams(user)}, key=str.casefold)
+
+
+def team_members(users: Mapping[str, Mapping[str, Any]], team: str) -> List[str]:
+    """User IDs of a team's members"""
+    return [user_id for user_id, user in users.items() if team in user_teams(user)]
+
+
+def teammates(users: Mapping[str, Mapping[str, Any]], user_id: str) -> List[str]:
+    """User IDs sharing at least one team with a user (the user excluded)"""
+    teams = set(user_teams(users.get(user_id, {})))
+    return [other_id for other_id, user in users.items()
+            if other_id != user_id and teams.intersection(user_teams(user))]
+
+
+# ============================================================================
+# 3. CO-LOCATION QUERIES
+# ============================================================================
+
+def team_placements(
+    bookings: Mapping[str, Any],
+    counters: Any,
+    member_ids: Iterable[str],
+    start: date,
+    end: date,
+    holidays: Optional[Mapping[str, Any]] = None
+) -> Dict[str, List[Placement]]:
+    """
+    Where the members sit on each workday from start to end (inclusive).
+
+    Args:
+        bookings: Booking data dictionary
+        counters: OccupancyCounters tracking bookings
+        member_ids: User IDs to look up
+        start: First date
+        end: Last date
+        holidays: settings['holidays'], skipped like weekends (optional)
+
+    Returns:
+        Date key -> placements in room and desk order, only days with at least one member in
+    """
+    member_ids = list(member_ids)
+    room_order = {room: position for position, room in enumerate(ROOM_LAYOUT)}
+    result = {}
+    for day in get_calendar(holidays).workdays(start, end):
+        date_key = day.isoformat()
+        placements = []
+        for user_id in member_ids:
+            for booking_key in counters.user_keys_on(user_id, date_key):
+                for occupant in occupants(bookings.get(booking_key)):
+                    if occupant.get('user_id') == user_id:
+                        placements.append(Placement(user_id, occupant.get('room'), occupant.get('desk_num'),
+                                                    occupant.get('booking_type')))
+        if placements:
+            placements.sort(key=lambda placement: (room_order.get(placement.room, len(room_order)),
+                                                   placement.desk_num or 0))
+            result[date_key] = placements
+    return result
+
+
+def co_location_days(
+    bookings: Mapping[str, Any],
+    counters: Any,
+    member_ids: Iterable[str],
+    start: date,
+    end: date,
+    min_members: int = DEFAULT_MIN_MEMBERS,
+    holidays: Optional[Mapping[str, Any]] = None
+) -> Dict[str, List[Placement]]:
+    """
+    Workdays from start to end on which at least min_members members are in.
+
+    Returns:
+        Date key -> placements (see team_placements), in date order
+    """
+    return {
+        date_key: placements
+        for date_key, placements in team_placements(bookings, counters, member_ids, start, end, holidays).items()
+        if len({placement.user_id for placement in placements}) >= min_members
+    }
+
+
+def desks_near(placements: Iterable[Placement], free_desks: Iterable[Any]) -> List[Any]:
+    """
+    Free desks ordered by closeness to the placed members.
+
+    Desks in the room holding most members come first, then by the desk
+    number distance to the nearest member in that room; desks in rooms
+    without members are left out.
+
+    Args:
+        placements: Members' placements on one day
+        free_desks: Free desks of that day (finder.FreeDesk)
+
+    Returns:
+        The free desks in rooms with members, closest first
+    """
+    placements = list(placements)
+    per_room = Counter(placement.room for placement in placements)
+    desks_per_room: Dict[str, List[int]] = {}
+    for placement in placements:
+        desks_per_room.setdefault(placement.room, []).append(placement.desk_num)
+
+    nearby = [desk for desk in free_desks if desk.room in per_room]
+    nearby.sort(key=lambda desk: (
+        -per_room[desk.room],
+        min(abs(desk.desk_num - (desk_num or 0)) for desk_num in desks_per_room[desk.room]),
+        desk.desk_num
+    ))
+    return nearby
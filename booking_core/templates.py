@@ -0,0 +1,234 @@
+"""
+BIIS Desk Booking System - Booking Core: Weekly Templates
+Author: [Your Name]
+Date: [Date]
+Description: Template validation and application logic without any UI
+
+DESIGN:
+- Templates map weekday names to booking types ({'monday': 'full_day', ...})
+- Validation and booking creation work on plain dicts passed by the caller
+- The Streamlit template dialog (template_management.py) wraps these
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. TEMPLATE DATA
+3. TEMPLATE VALIDATION
+4. TEMPLATE APPLICATION
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Optional, List, Tuple
+
+from booking_core.rules import ROOM_LAYOUT, build_booking, check_desk_availability, get_booking_key
+from booking_core.slots import can_book, combine_booking
+from booking_core.workdays import get_calendar, next_monday
+
+MAX_TEMPLATES_PER_USER = 5
+
+WEEKDAY_KEYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday']
+
+
+# ============================================================================
+# 2. TEMPLATE DATA
+# ============================================================================
+
+def validate_template(templates: Dict[str, Any], template_name: str, schedule: Dict[str, str]) -> Optional[str]:
+    """
+    Check whether a template may be saved.
+
+    Args:
+        templates: The user's existing templates
+        template_name: Name of the template to save
+        schedule: Weekday -> booking type mapping
+
+    Returns:
+        Error message, or None when the template is valid
+    """
+    if len(templates) >= MAX_TEMPLATES_PER_USER and template_name not in templates:
+        return f"Maximum {MAX_TEMPLATES_PER_USER} templates per user allowed!"
+
+    if not schedule:
+        return "Template must have at least one weekday selected!"
+
+    return None
+
+
+def build_template(template_name: str, schedule: Dict[str, str]) -> Dict[str, Any]:
+    """Build a template entry in the storage format"""
+    return {
+        'name': template_name,
+        'schedule': schedule,
+        'created_at': datetime.now().isoformat(),
+        'updated_at': datetime.now().isoformat(),
+        'version': 1
+    }
+
+
+# ============================================================================
+# 3. TEMPLATE VALIDATION
+# ============================================================================
+
+def get_future_weeks(max_weeks: int = 5, today: Optional[date] = None) -> List[Tuple[date, str]]:
+    """
+    List the upcoming weeks a template can be applied to.
+
+    Args:
+        max_weeks: Number of weeks to return
+        today: Reference date (defaults to today)
+
+    Returns:
+        List of (Monday date, display label), starting with next week
+    """
+    weeks = []
+    today = today or datetime.now().date()
+
+    # Start from next Monday
+    first_monday = next_monday(today)
+
+    for i in range(max_weeks):
+        week_start = first_monday + timedelta(weeks=i)
+        week_end = week_start + timedelta(days=4)  # Friday
+
+        if i == 0:
+            week_label = f"Next Week ({week_start.strftime('%d.%m')} - {week_end.strftime('%d.%m')})"
+        else:
+            week_label = f"In {i + 1} Weeks ({week_start.strftime('%d.%m')} - {week_end.strftime('%d.%m')})"
+
+        weeks.append((week_start, week_label))
+
+    return weeks
+
+
+def validate_template_application(
+    bookings: Dict[str, Any],
+    week_start: date,
+    schedule: Dict[str, str],
+    today: Optional[date] = None,
+    counters: Optional[Any] = None,
+    holidays: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Sort the template's weekdays into valid, blocked and past days.
+
+    Holidays count as blocked days.
+
+    Args:
+        bookings: Booking data dictionary
+        week_start: Monday of the target week
+        schedule: Weekday -> booking type mapping
+        today: Reference date (defaults to today)
+        counters: OccupancyCounters tracking bookings, for indexed blocker lookups (optional)
+        holidays: settings['holidays'] (optional)
+
+    Returns:
+        Dict with 'valid_days', 'blocked_days' and 'past_days', keyed by weekday
+    """
+    validation_result = {
+        'valid_days': {},
+        'blocked_days': {},
+        'past_days': {}
+    }
+
+    today = today or datetime.now().date()
+    calendar = get_calendar(holidays, today)
+
+    for i, weekday in enumerate(WEEKDAY_KEYS):
+        if weekday not in schedule:
+            continue
+
+        current_date = week_start + timedelta(days=i)
+
+        if current_date < today:
+            validation_result['past_days'][weekday] = {
+                'date': current_date,
+                'reason': 'Past date'
+            }
+            continue
+
+        if calendar.is_holiday(current_date):
+            holiday_name = calendar.holiday_name(current_date)
+            validation_result['blocked_days'][weekday] = {
+                'date': current_date,
+                'reason': f"Holiday ({holiday_name})" if holiday_name else 'Holiday'
+            }
+            continue
+
+        # Check availability for all rooms
+        day_availability = {}
+        for room, desk_count in ROOM_LAYOUT.items():
+            day_availability[room] = {
+                'available_desks': check_desk_availability(
+                    bookings, current_date, room, schedule[weekday], counters
+                ),
+                'total_desks': desk_count
+            }
+
+        has_available_desks = any(
+            availability['available_desks'] for availability in day_availability.values()
+        )
+
+        if has_available_desks:
+            validation_result['valid_days'][weekday] = {
+                'date': current_date,
+                'availability': day_availability,
+                'booking_type': schedule[weekday]
+            }
+        else:
+            validation_result['blocked_days'][weekday] = {
+                'date': current_date,
+                'reason': 'No available desks'
+            }
+
+    return validation_result
+
+
+# ============================================================================
+# 4. TEMPLATE APPLICATION
+# ============================================================================
+
+def build_template_bookings(
+    user_id: str,
+    desk_selections: Dict[str, Any],
+    bookings: Dict[str, Any]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Build the bookings for a template application, skipping taken desks.
+
+    A half-day template booking next to a booking of the other half is
+    combined with it into one shared desk entry.
+
+    Args:
+        user_id: Booking user
+        desk_selections: Selection key -> {'date', 'room', 'desk', 'booking_type'}
+        bookings: Current booking data (not modified)
+
+    Returns:
+        Mapping of booking key -> new desk entry (replacing bookings[key] if present)
+    """
+    new_bookings = {}
+
+    for selection_data in desk_selections.values():
+        try:
+            booking_date = selection_data['date']
+            room = selection_data['room']
+            desk_num = selection_data['desk']
+            booking_type = selection_data['booking_type']
+        except (KeyError, TypeError):
+            continue
+
+        booking_key = get_booking_key(booking_date, room, desk_num)
+
+        # Check availability
+        existing = new_bookings.get(booking_key) or bookings.get(booking_key)
+        if not can_book(existing, booking_type):
+            continue
+
+        new_bookings[booking_key] = combine_booking(existing, build_booking(
+            booking_date, room, desk_num, user_id, booking_type, created_via='template'
+        ))
+
+    return new_bookings
@@ -0,0 +1,260 @@
+"""
+BIIS Desk Booking System - Booking Core: Calendar Service
+Author: [Your Name]
+Date: [Date]
+Description: Precomputed workday, holiday and ISO-week tables and the app's week math
+
+DESIGN:
+- WorkCalendar covers whole years around today (CALENDAR_YEARS_BACK /
+  CALENDAR_YEARS_AHEAD): one flag byte, one ISO-week code and one running
+  workday count per day, so holiday/workday/ISO-week lookups are an array
+  index and counting workdays in a range is a subtraction
+- Dated and recurring ('MM-DD') holidays are resolved into the tables once;
+  dates outside the window fall back to computing the answer directly
+- get_calendar() keeps the calendars of the last few holiday sets per
+  process, so every rerun and every session reuses the same tables
+- The "current week" rule lives here only: from Friday WEEK_SWITCH_HOUR
+  and on weekends the app shows the next week as the current one
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. WEEK MATH
+3. WORK CALENDAR
+4. CALENDAR CACHE
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+from array import array
+from datetime import date, datetime, timedelta
+from threading import Lock
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+
+from booking_core.holidays import is_recurring_key
+
+# Whole years covered by the precomputed tables, relative to today's year
+CALENDAR_YEARS_BACK = 2
+CALENDAR_YEARS_AHEAD = 3
+
+# From this weekday and hour on, the next week is shown as the current week
+WEEK_SWITCH_WEEKDAY = 4  # Friday
+WEEK_SWITCH_HOUR = 14
+
+# Working days per week (Monday-Friday)
+WORKDAYS_PER_WEEK = 5
+
+# Calendars kept by get_calendar() (one per distinct holiday set)
+CALENDAR_CACHE_SIZE = 4
+
+_WORKDAY = 0b01
+_HOLIDAY = 0b10
+
+
+# ============================================================================
+# 2. WEEK MATH
+# ============================================================================
+
+def monday_of(day: date) -> date:
+    """Monday of the week containing a date"""
+    return day - timedelta(days=day.weekday())
+
+
+def next_monday(day: date) -> date:
+    """First Monday after a date (a week later when the date is a Monday)"""
+    return monday_of(day) + timedelta(days=7)
+
+
+def shows_next_week(now: datetime) -> bool:
+    """Check whether the next week is shown as the current one (Friday afternoon, weekend)"""
+    weekday = now.weekday()
+    return weekday > WEEK_SWITCH_WEEKDAY or (weekday == WEEK_SWITCH_WEEKDAY and now.hour >= WEEK_SWITCH_HOUR)
+
+
+def effective_week_start(now: Optional[datetime] = None) -> date:
+    """Monday of the week the app treats as the current week"""
+    now = now or datetime.now()
+    return next_monday(now.date()) if shows_next_week(now) else monday_of(now.date())
+
+
+def default_tab(now: Optional[datetime] = None) -> int:
+    """Day tab to open in the current week (today, or Monday once the next week is shown)"""
+    now = now or datetime.now()
+    return 0 if shows_next_week(now) else now.weekday()
+
+
+def week_dates(week_start: date) -> List[date]:
+    """Monday-Friday dates of a week"""
+    return [week_start + timedelta(days=i) for i in range(WORKDAYS_PER_WEEK)]
+
+
+# ============================================================================
+# 3. WORK CALENDAR
+# ============================================================================
+
+class WorkCalendar:
+    """Workday, holiday and ISO-week tables over a window of whole years"""
+
+    def __init__(self, holidays: Mapping[str, Any], first_year: int, last_year: int):
+        self.first = date(first_year, 1, 1)
+        self.last = date(last_year, 12, 31)
+        self._base = self.first.toordinal()
+        size = self.last.toordinal() - self._base + 1
+
+        # Holiday key -> name ('' when unnamed); ordinal -> name for the window
+        self._holidays = {
+            holiday_key: entry.get('name', '') if isinstance(entry, Mapping) else ''
+            for holiday_key, entry in holidays.items()
+        }
+        self._names = self._resolve(first_year, last_year)
+
+        flags = bytearray(size)
+        iso_weeks = array('l', [0] * size)
+        running = array('l', [0] * (size + 1))
+        year, week, weekday = self.first.isocalendar()
+        for index in range(size):
+            ordinal = self._base + index
+            if ordinal in self._names:
+                flags[index] |= _HOLIDAY
+            elif weekday <= WORKDAYS_PER_WEEK:
+                flags[index] |= _WORKDAY
+            iso_weeks[index] = year * 100 + week
+            running[index + 1] = running[index] + (flags[index] & _WORKDAY)
+
+            # Advance the ISO week without calling isocalendar() per day
+            weekday += 1
+            if weekday == 8:
+                weekday = 1
+                year, week, _ = date.fromordinal(ordinal + 1).isocalendar()
+        self._flags = flags
+        self._iso_weeks = iso_weeks
+        self._running = running
+
+    @staticmethod
+    def _holiday_dates(holiday_key: str, first_year: int, last_year: int) -> List[date]:
+        """Dates of a holiday key within the window (recurring keys once per year)"""
+        try:
+            if is_recurring_key(holiday_key):
+                month, day = int(holiday_key[:2]), int(holiday_key[3:])
+                dates = []
+                for year in range(first_year, last_year + 1):
+                    try:
+                        dates.append(date(year, month, day))
+                    except ValueError:
+                        continue  # 29.02. in non-leap years
+                return dates
+            day = date.fromisoformat(holiday_key)
+        except ValueError:
+            return []
+        return [day] if first_year <= day.year <= last_year else []
+
+    def _index(self, day: date) -> Optional[int]:
+        """Table index of a date, None outside the window"""
+        index = day.toordinal() - self._base
+        return index if 0 <= index < len(self._flags) else None
+
+    def covers(self, day: date) -> bool:
+        """Check whether a date lies inside the precomputed window"""
+        return self._index(day) is not None
+
+    def is_holiday(self, day: date) -> bool:
+        """Check whether a date is a holiday"""
+        index = self._index(day)
+        if index is None:
+            return day.toordinal() in self._outside_holidays(day.year)
+        return bool(self._flags[index] & _HOLIDAY)
+
+    def holiday_name(self, day: date) -> Optional[str]:
+        """Name of the holiday on a date ('' when unnamed), None when it is no holiday"""
+        if not self.is_holiday(day):
+            return None
+        names = self._names if self.covers(day) else self._outside_holidays(day.year)
+        return names.get(day.toordinal(), '')
+
+    def is_workday(self, day: date) -> bool:
+        """Check whether a date is a Monday-Friday non-holiday"""
+        index = self._index(day)
+        if index is None:
+            return day.weekday() < WORKDAYS_PER_WEEK and not self.is_holiday(day)
+        return bool(self._flags[index] & _WORKDAY)
+
+    def iso_week(self, day: date) -> Tuple[int, int]:
+        """ISO (year, week number) of a date"""
+        index = self._index(day)
+        if index is None:
+            year, week, _ = day.isocalendar()
+            return year, week
+        return divmod(self._iso_weeks[index], 100)
+
+    def count_workdays(self, start: date, end: date) -> int:
+        """Number of workdays from start to end (inclusive)"""
+        if end < start:
+            return 0
+        first, last = self._index(start), self._index(end)
+        if first is None or last is None:
+            return len(self.workdays(start, end))
+        return self._running[last + 1] - self._running[first]
+
+    def workdays(self, start: date, end: date) -> List[date]:
+        """Workdays from start to end (inclusive), in order"""
+        return [start + timedelta(days=offset) for offset in range((end - start).days + 1)
+                if self.is_workday(start + timedelta(days=offset))]
+
+    def holiday_keys(self, start: date, end: date) -> List[str]:
+        """'YYYY-MM-DD' keys of all holidays from start to end, recurring ones resolved"""
+        return [(start + timedelta(days=offset)).isoformat() for offset in range((end - start).days + 1)
+                if self.is_holiday(start + timedelta(days=offset))]
+
+    def _resolve(self, first_year: int, last_year: int) -> Dict[int, str]:
+        """Holiday ordinal -> name for a range of years, recurring keys resolved per year"""
+        names: Dict[int, str] = {}
+        for holiday_key, name in self._holidays.items():
+            for day in self._holiday_dates(holiday_key, first_year, last_year):
+                names.setdefault(day.toordinal(), name)
+        return names
+
+    def _outside_holidays(self, year: int) -> Dict[int, str]:
+        """Holiday ordinals of a year outside the window (rare, computed on demand)"""
+        return self._resolve(year, year)
+
+
+# ============================================================================
+# 4. CALENDAR CACHE
+# ============================================================================
+
+_CALENDARS: Dict[Tuple, WorkCalendar] = {}
+_CALENDARS_LOCK = Lock()
+
+
+def _fingerprint(holidays: Mapping[str, Any]) -> Tuple:
+    """Hashable summary of a holiday set (keys and names)"""
+    return tuple(sorted(
+        (holiday_key, entry.get('name', '') if isinstance(entry, Mapping) else '')
+        for holiday_key, entry in holidays.items()
+    ))
+
+
+def get_calendar(holidays: Optional[Mapping[str, Any]] = None, today: Optional[date] = None) -> WorkCalendar:
+    """
+    Shared calendar for a holiday set, built once per process and holiday set.
+
+    Args:
+        holidays: settings['holidays'] (dated and recurring keys)
+        today: Reference date for the window (default: today)
+
+    Returns:
+        WorkCalendar covering CALENDAR_YEARS_BACK to CALENDAR_YEARS_AHEAD years around today
+    """
+    holidays = holidays or {}
+    year = (today or date.today()).year
+    cache_key = (year, _fingerprint(holidays))
+
+    with _CALENDARS_LOCK:
+        calendar = _CALENDARS.get(cache_key)
+        if calendar is None:
+            calendar = WorkCalendar(holidays, year - CALENDAR_YEARS_BACK, year + CALENDAR_YEARS_AHEAD)
+            if len(_CALENDARS) >= CALENDAR_CACHE_SIZE:
+                _CALENDARS.pop(next(iter(_CALENDARS)))
+            _CALENDARS[cache_key] = calendar
+        return calendar
@@ -0,0 +1,356 @@
+"""
+BIIS Desk Booking System - Booking Export
+Author: [Your Name]
+Date: [Date]
+Description: Streaming CSV/Excel export of the booking history
+
+DESIGN:
+- Rows are generated one booking at a time and written in fixed-size chunks
+- The full table is never materialised (no DataFrame, no joined string)
+  when writing to a file; the Streamlit download button needs the whole
+  file, so the sidebar builds the bytes in memory (export_bytes) and is
+  limited to MAX_IN_APP_EXPORT_DAYS - longer ranges go through the CLI
+- Data files and usernames go through booking_core (load_data_files,
+  get_username), so archived bookings (DELETED_USER) export their
+  preserved username exactly as the app shows it
+- Spreadsheet formats (excel_csv, xlsx) prefix text cells starting with
+  = + - @ with a quote so they are never evaluated as formulas; plain CSV
+  stays unchanged for re-import (booking_admin import --from-export strips
+  the quote from Excel CSVs)
+- Usable from the Streamlit sidebar and from the command line
+
+USAGE:
+    python booking_export.py --from 2024-01-01 --to 2024-12-31 --room klein -o bookings.csv
+    python booking_export.py --user Matt --format xlsx -o matt.xlsx
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. ROW GENERATION
+3. CHUNKED WRITERS
+4. COMMAND LINE INTERFACE
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import argparse
+import csv
+import io
+import sys
+from datetime import date, datetime
+from typing import Dict, Any, Optional, Iterator, Tuple, BinaryIO, List
+
+from booking_core.rules import DELETED_USER_ID, get_username
+from booking_core.slots import occupants
+from booking_core.store import load_data_files
+
+EXPORT_COLUMNS = [
+    'date', 'weekday', 'room', 'desk_num', 'desk_name', 'user_id', 'username',
+    'booking_type', 'entry_type', 'start_time', 'end_time', 'reason',
+    'created_at', 'created_via', 'archived_at'
+]
+
+# Export formats: file extension and MIME type
+EXPORT_FORMATS = {
+    'csv': ('csv', 'text/csv'),
+    'excel_csv': ('csv', 'text/csv'),
+    'xlsx': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+}
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Longest range the sidebar exports in memory (a few thousand rows per year)
+MAX_IN_APP_EXPORT_DAYS = 366
+
+# Leading characters that make spreadsheet applications evaluate a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+# ============================================================================
+# 2. ROW GENERATION
+# ============================================================================
+
+def _resolve_user(booking: Dict[str, Any], users: Dict[str, Any]) -> Tuple[str, str]:
+    """Return (user_id, username), using archived data for deleted users"""
+    user_id = booking.get('user_id', '')
+    if user_id == DELETED_USER_ID:
+        user_id = booking.get('original_user_id', user_id)
+    return user_id, get_username(booking, users)
+
+
+def iter_export_rows(
+    bookings: Dict[str, Any],
+    users: Dict[str, Any],
+    desk_names: Optional[Dict[str, str]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    room: Optional[str] = None,
+    user: Optional[str] = None,
+    include_blockers: bool = False,
+    counters: Optional[Any] = None
+) -> Iterator[List[Any]]:
+    """
+    Yield export rows in date order, filtered by range, room and user.
+
+    Only the booking keys are sorted - rows are built lazily one at a time.
+
+    Args:
+        bookings: Booking data dictionary
+        users: User data dictionary
+        desk_names: Desk name mappings (optional)
+        start: First date to include (optional)
+        end: Last date to include (optional)
+        room: Room identifier (optional)
+        user: User ID or username, current or archived (optional)
+        include_blockers: Also export room blockers
+        counters: OccupancyCounters of the bookings; date ranges are then
+            read as a slice of its key index instead of sorting all keys
+
+    Yields:
+        Lists of values in EXPORT_COLUMNS order
+    """
+    desk_names = desk_names or {}
+    start_key = start.strftime('%Y-%m-%d') if start else None
+    end_key = end.strftime('%Y-%m-%d') if end else None
+    user_filter = user.strip().lower() if user else None
+
+    # Keys start with the ISO date, so sorting keys gives date order
+    if counters is not None and (start or end):
+        candidates = counters.keys_between(start or date.min, end or date.max, room)
+        candidates.extend(counters.key_index.unindexed)
+    else:
+        candidates = bookings
+
+    for booking_key in sorted(candidates):
+        booking = bookings.get(booking_key)
+        if booking is None:
+            continue
+        date_key = booking.get('date', '')
+
+        if start_key and date_key < start_key:
+            continue
+        if end_key and date_key > end_key:
+            continue
+        if room and booking.get('room') != room:
+            continue
+
+        entry_type = booking.get('entry_type', 'desk_booking')
+        if entry_type == 'room_blocker' and not include_blockers:
+            continue
+
+        try:
+            weekday = WEEKDAY_NAMES[datetime.strptime(date_key, '%Y-%m-%d').weekday()]
+        except ValueError:
+            weekday = ''
+
+        desk_num = booking.get('desk_num', '')
+        desk_name = ''
+        if desk_num != '':
+            desk_name = desk_names.get(f"{booking.get('room')}_{desk_num}", f"Desk {desk_num}")
+
+        # One row per occupant: a desk shared by two half-day bookers gives two rows
+        for occupant in occupants(booking):
+            user_id, username = _resolve_user(occupant, users)
+            if user_filter and user_filter not in (user_id.lower(), username.lower()):
+                continue
+
+            yield [
+                date_key,
+                weekday,
+                booking.get('room', ''),
+                desk_num,
+                desk_name,
+                user_id,
+                username,
+                occupant.get('booking_type', occupant.get('blocker_type', '')),
+                entry_type,
+                booking.get('start_time', ''),
+                booking.get('end_time', ''),
+                booking.get('reason', ''),
+                occupant.get('created_at', ''),
+                occupant.get('created_via', ''),
+                occupant.get('archived_at', '')
+            ]
+
+
+# ============================================================================
+# 3. CHUNKED WRITERS
+# ============================================================================
+
+def escape_formula(value: Any) -> Any:
+    """Quote a text cell that a spreadsheet would evaluate as a formula"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def unescape_formula(value: Any) -> Any:
+    """Undo escape_formula when a spreadsheet export is read back"""
+    if isinstance(value, str) and value[:1] == "'" and value[1:].startswith(FORMULA_PREFIXES):
+        return value[1:]
+    return value
+
+
+def iter_csv_chunks(
+    rows: Iterator[List[Any]],
+    excel: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Encode rows as CSV and yield them in chunks of chunk_size rows.
+
+    Args:
+        rows: Row iterator from iter_export_rows
+        excel: Use a BOM and ';' delimiter so Excel opens the file directly
+        chunk_size: Rows per yielded chunk
+
+    Yields:
+        UTF-8 encoded CSV chunks (the first chunk contains the header)
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=';' if excel else ',', lineterminator='\r\n')
+    writer.writerow(EXPORT_COLUMNS)
+    prefix = '\ufeff' if excel else ''
+
+    pending = 0
+    header_sent = False
+    for row in rows:
+        writer.writerow([escape_formula(value) for value in row] if excel else row)
+        pending += 1
+        if pending >= chunk_size:
+            yield (prefix + buffer.getvalue()).encode('utf-8')
+            prefix = ''
+            header_sent = True
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if pending or not header_sent:
+        yield (prefix + buffer.getvalue()).encode('utf-8')
+
+
+def write_xlsx(rows: Iterator[List[Any]], output: BinaryIO) -> int:
+    """
+    Write rows to an .xlsx workbook in openpyxl write-only (streaming) mode.
+
+    Args:
+        rows: Row iterator from iter_export_rows
+        output: Binary file object to write the workbook to
+
+    Returns:
+        Number of data rows written
+
+    Raises:
+        ImportError: If openpyxl is not installed
+    """
+    # Optional dependency - only needed for native Excel output
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Bookings')
+    sheet.append(EXPORT_COLUMNS)
+
+    count = 0
+    for row in rows:
+        sheet.append([escape_formula(value) for value in row])
+        count += 1
+
+    workbook.save(output)
+    return count
+
+
+def xlsx_available() -> bool:
+    """Check whether native Excel export is available"""
+    try:
+        import openpyxl  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def write_export(rows: Iterator[List[Any]], output: BinaryIO, export_format: str = 'csv',
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    """
+    Stream rows to a binary file object in the requested format.
+
+    Args:
+        rows: Row iterator from iter_export_rows
+        output: Binary file object to write to
+        export_format: One of EXPORT_FORMATS
+        chunk_size: Rows per CSV chunk
+    """
+    if export_format == 'xlsx':
+        write_xlsx(rows, output)
+        return
+
+    for chunk in iter_csv_chunks(rows, excel=export_format == 'excel_csv', chunk_size=chunk_size):
+        output.write(chunk)
+
+
+def export_bytes(rows: Iterator[List[Any]], export_format: str = 'csv') -> bytes:
+    """Whole export in memory, for download buttons (keep ranges within MAX_IN_APP_EXPORT_DAYS)"""
+    output = io.BytesIO()
+    write_export(rows, output, export_format)
+    return output.getvalue()
+
+
+# ============================================================================
+# 4. COMMAND LINE INTERFACE
+# ============================================================================
+
+def _parse_date(value: str) -> date:
+    """Parse an ISO date argument"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid date '{value}', use YYYY-MM-DD")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the export command line parser"""
+    parser = argparse.ArgumentParser(description="Export BIIS desk bookings")
+    parser.add_argument('--data-dir', default='data', help="Directory with the JSON data files")
+    parser.add_argument('--from', dest='start', type=_parse_date, help="First date (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='end', type=_parse_date, help="Last date (YYYY-MM-DD)")
+    parser.add_argument('--room', help="Room identifier, e.g. klein or gross")
+    parser.add_argument('--user', help="User ID or username (archived usernames work too)")
+    parser.add_argument('--include-blockers', action='store_true', help="Also export room blockers")
+    parser.add_argument('--format', dest='export_format', choices=list(EXPORT_FORMATS), default='csv')
+    parser.add_argument('-o', '--output', help="Output file (default: stdout)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    args = build_parser().parse_args(argv)
+
+    if args.export_format == 'xlsx':
+        if not args.output:
+            print("Excel export needs --output", file=sys.stderr)
+            return 2
+        if not xlsx_available():
+            print("Excel export requires openpyxl (pip install openpyxl)", file=sys.stderr)
+            return 1
+
+    data = load_data_files(args.data_dir)
+
+    rows = iter_export_rows(
+        data['bookings'], data['users'], data['settings'].get('desk_names', {}),
+        start=args.start, end=args.end, room=args.room, user=args.user,
+        include_blockers=args.include_blockers
+    )
+
+    if args.output:
+        with open(args.output, 'wb') as f:
+            write_export(rows, f, args.export_format)
+    else:
+        write_export(rows, sys.stdout.buffer, args.export_format)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+BIIS Desk Booking System - Rerun Instrumentation
+Author: [Your Name]
+Date: [Date]
+Description: Per-rerun timing profile for Streamlit sessions and the opt-in timing panel
+
+DESIGN:
+- Spans and counters come from booking_core.profiling; this module ties a
+  profile to each script run of a session
+- A run that ends in st.rerun() never reaches end_rerun(); the next run
+  records it as 'interrupted' so no run is lost from the history
+- st.markdown calls are counted (deltas and bytes) by wrapping the
+  DeltaGenerator method once per process; the wrapper only counts while a
+  profile is active on the calling thread
+- The panel renders at the very end of the run (Debug Mode), so it shows
+  the complete profile of the run that produced it
+- Every finished run feeds the rerun duration histogram and marks its
+  session active in booking_core.metrics
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. MARKDOWN COUNTING
+3. RERUN LIFECYCLE
+4. TIMING PANEL
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import functools
+from typing import Dict, Any, List, Optional
+
+from booking_core.metrics import REGISTRY, RERUN_DURATION
+from booking_core.profiling import RunProfile, count, current_profile, finish_profile, start_profile
+
+# Finished profiles kept per session for the panel
+PROFILE_HISTORY_SIZE = 20
+
+
+# ============================================================================
+# 2. MARKDOWN COUNTING
+# ============================================================================
+
+def install_markdown_counter() -> None:
+    """Count st.markdown deltas and bytes of the active profile (idempotent)"""
+    import streamlit as st
+    from streamlit.delta_generator import DeltaGenerator
+
+    if getattr(DeltaGenerator.markdown, '_biis_counted', False):
+        return
+    markdown = DeltaGenerator.markdown
+
+    @functools.wraps(markdown)
+    def counted_markdown(self, body, *args, **kwargs):
+        if current_profile() is not None:
+            count('markdown_deltas')
+            count('markdown_bytes', len(str(body).encode('utf-8')))
+        return markdown(self, body, *args, **kwargs)
+
+    counted_markdown._biis_counted = True
+    DeltaGenerator.markdown = counted_markdown
+    # st.markdown is a method bound to the main container at import time
+    st.markdown = st._main.markdown
+
+
+# ============================================================================
+# 3. RERUN LIFECYCLE
+# ============================================================================
+
+def _remember(profile: RunProfile) -> None:
+    """Add a finished profile to the session history and the metrics"""
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    RERUN_DURATION.observe(profile.duration_ms / 1000)
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        REGISTRY.touch_session(ctx.session_id)
+
+    history = st.session_state.setdefault('rerun_profiles', [])
+    history.append(profile)
+    del history[:-PROFILE_HISTORY_SIZE]
+
+
+def begin_rerun() -> RunProfile:
+    """Start the profile of this script run"""
+    import streamlit as st
+
+    previous = st.session_state.get('rerun_profile')
+    if previous is not None and previous.status == 'running':
+        _remember(finish_profile(previous, status='interrupted'))
+
+    install_markdown_counter()
+    profile = start_profile('rerun')
+    st.session_state.rerun_profile = profile
+    return profile
+
+
+def end_rerun() -> Optional[RunProfile]:
+    """Finish the profile of this script run and keep it in the history"""
+    import streamlit as st
+
+    profile = st.session_state.get('rerun_profile')
+    if profile is None or profile.status != 'running':
+        return None
+    _remember(finish_profile(profile))
+    return profile
+
+
+# ============================================================================
+# 4. TIMING PANEL
+# ============================================================================
+
+def _span_rows(profile: RunProfile) -> List[str]:
+    """Markdown table rows for the spans of a profile, in start order"""
+    rows = []
+    for recorded in sorted(profile.spans, key=lambda item: item['start_ms']):
+        indent = '&nbsp;&nbsp;' * recorded['depth']
+        rows.append(f"| {indent}{recorded['name']} | {recorded['duration_ms']:.1f} |")
+    return rows
+
+
+def render_timing_panel() -> None:
+    """Sidebar panel with the last run's spans, counters and recent run times"""
+    import streamlit as st
+
+    history: List[RunProfile] = st.session_state.get('rerun_profiles', [])
+    if not history:
+        return
+    profile = history[-1]
+
+    with st.sidebar.expander("⏱️ Rerun Timing", expanded=True):
+        st.markdown(f"**Last run:** {profile.duration_ms:.0f} ms ({profile.status})")
+
+        counters: Dict[str, Any] = profile.counters
+        if counters:
+            st.markdown('  \n'.join(f"`{name}`: {value:,}" for name, value in sorted(counters.items())))
+
+        rows = _span_rows(profile)
+        if rows:
+            st.markdown('\n'.join(["| Span | ms |", "|---|---:|"] + rows))
+        if profile.dropped_spans:
+            st.caption(f"{profile.dropped_spans} more spans not recorded")
+
+        recent = [f"{item.duration_ms:.0f}{'*' if item.status != 'complete' else ''}" for item in history]
+        st.caption(f"Recent runs (ms, * = interrupted): {', '.join(recent)}")
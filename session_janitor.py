@@ -0,0 +1,309 @@
+"""
+BIIS Desk Booking System - Session Janitor
+Author: [Your Name]
+Date: [Date]
+Description: Session memory report per key family and expiry of transient session state
+
+DESIGN:
+- Streamlit removes the state of widgets that are no longer rendered, but
+  plain st.session_state keys live as long as the browser tab; wall
+  displays keep one session open for weeks
+- Transient keys are grouped into families by prefix: per-desk confirm
+  flags (confirm_clear_/confirm_remove_ with the date in the key), delete
+  confirmations, template dialog state and cached week data
+- sweep_session_state() runs once per rerun and only touches keys that can
+  no longer be shown: desk confirmations outside the viewed week or already
+  answered, template dialog state idle for TEMPLATE_DIALOG_IDLE_MINUTES and
+  a utilisation grid built from an older booking version
+- session_memory_report() estimates bytes per family; large containers are
+  sampled and extrapolated so the Debug Mode panel stays fast with 1M bookings
+- The size estimate counts every object once per session, so strings shared
+  with the data cache or other sessions are included (upper bound)
+
+USAGE:
+    from session_janitor import sweep_session_state, render_memory_panel
+    sweep_session_state()           # every rerun, after session defaults
+    render_memory_panel()           # Debug Mode sidebar
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. KEY FAMILIES
+3. MEMORY REPORT
+4. JANITOR
+5. MEMORY PANEL
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import sys
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Dict, Any, List, Optional, MutableMapping
+
+from booking_core.metrics import SESSION_KEYS_EXPIRED
+
+# Template dialog state is dropped after this long without activity
+TEMPLATE_DIALOG_IDLE_MINUTES = 30
+
+# Items measured per container before the size is extrapolated
+SAMPLE_ITEMS = 2000
+
+# Containers nested deeper than this are counted shallowly
+MAX_DEPTH = 12
+
+# Per-desk confirmation flags set in render_desk: <prefix><room>_<desk>_<YYYY-MM-DD>
+DESK_CONFIRM_PREFIXES = ('confirm_clear_', 'confirm_remove_')
+
+# Plain session keys owned by the template dialog (see reset_template_dialog_state)
+TEMPLATE_DIALOG_KEYS = (
+    'template_dialog_state',
+    'template_just_saved',
+    'saved_template_name',
+    'template_dialog_fresh_start',
+    'pending_template_deletes'
+)
+
+
+# ============================================================================
+# 2. KEY FAMILIES
+# ============================================================================
+
+# Prefix -> family name; keys without a prefix form their own family
+KEY_FAMILIES = (
+    ('confirm_clear_', 'confirm_clear_*'),
+    ('confirm_remove_', 'confirm_remove_*'),
+    ('confirm_delete_', 'confirm_delete_*'),
+    ('delete_success_', 'delete_success_*'),
+    ('show_', 'show_* flags'),
+    ('template_', 'template widgets'),
+    ('room_select_', 'template widgets'),
+    ('desk_select_', 'template widgets'),
+    ('user_dropdown_', 'user dropdowns'),
+)
+
+
+def key_family(key: str) -> str:
+    """Family a session state key is reported under"""
+    if key in TEMPLATE_DIALOG_KEYS:
+        return 'template dialog'
+    for prefix, family in KEY_FAMILIES:
+        if key.startswith(prefix):
+            return family
+    return key
+
+
+def _desk_confirm_date(key: str) -> Optional[date]:
+    """Date encoded at the end of a confirm_clear_/confirm_remove_ key"""
+    try:
+        return datetime.strptime(key.rsplit('_', 1)[-1], '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+# ============================================================================
+# 3. MEMORY REPORT
+# ============================================================================
+
+_SCALARS = (str, bytes, int, float, bool, type(None), date)
+
+
+def estimate_size(obj: Any, seen: Optional[set] = None, depth: int = 0) -> int:
+    """
+    Approximate deep size of an object in bytes.
+
+    Containers with more than SAMPLE_ITEMS items are measured on their
+    first SAMPLE_ITEMS items and extrapolated.
+
+    Args:
+        obj: Object to measure
+        seen: ids already counted (shared between calls of one report)
+        depth: Current nesting depth
+
+    Returns:
+        Estimated size in bytes
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, _SCALARS) or depth >= MAX_DEPTH:
+        return size
+
+    if isinstance(obj, dict):
+        items = list(islice(obj.items(), SAMPLE_ITEMS))
+        nested = sum(estimate_size(k, seen, depth + 1) + estimate_size(v, seen, depth + 1) for k, v in items)
+        total = len(obj)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = list(islice(obj, SAMPLE_ITEMS))
+        nested = sum(estimate_size(item, seen, depth + 1) for item in items)
+        total = len(obj)
+    else:
+        # Plain objects (counters, grids, profiles): their attributes
+        attributes = getattr(obj, '__dict__', None)
+        nested = estimate_size(attributes, seen, depth + 1) if attributes is not None else 0
+        for slot in getattr(type(obj), '__slots__', ()):
+            nested += estimate_size(getattr(obj, slot, None), seen, depth + 1)
+        return size + nested
+
+    if items and total > len(items):
+        nested = nested * total // len(items)
+    return size + nested
+
+
+def session_memory_report(state: Optional[MutableMapping[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Estimated bytes per session state key family.
+
+    Args:
+        state: Session state mapping (default: st.session_state)
+
+    Returns:
+        List of {'family', 'keys', 'bytes'} sorted by size, largest first
+    """
+    if state is None:
+        import streamlit as st
+        state = st.session_state
+
+    families: Dict[str, Dict[str, Any]] = {}
+    seen: set = set()
+    for key in list(state.keys()):
+        try:
+            value = state[key]
+        except KeyError:
+            continue
+        family = families.setdefault(key_family(key), {'family': key_family(key), 'keys': 0, 'bytes': 0})
+        family['keys'] += 1
+        family['bytes'] += estimate_size(value, seen)
+
+    return sorted(families.values(), key=lambda item: item['bytes'], reverse=True)
+
+
+# ============================================================================
+# 4. JANITOR
+# ============================================================================
+
+def _template_dialog_idle(state: MutableMapping[str, Any], now: datetime) -> bool:
+    """True when the template dialog has had no activity for the idle timeout"""
+    dialog_state = state.get('template_dialog_state')
+    if not isinstance(dialog_state, dict):
+        return True
+    try:
+        last_activity = datetime.fromisoformat(dialog_state.get('last_activity', ''))
+    except (TypeError, ValueError):
+        return True
+    return now - last_activity > timedelta(minutes=TEMPLATE_DIALOG_IDLE_MINUTES)
+
+
+def find_expired_keys(state: MutableMapping[str, Any], week_start: Optional[date] = None,
+                      now: Optional[datetime] = None) -> List[str]:
+    """
+    Session keys that no longer affect what the session can show.
+
+    Args:
+        state: Session state mapping
+        week_start: Monday of the viewed week (default: state['current_week_start'])
+        now: Current time (default: datetime.now())
+
+    Returns:
+        Keys safe to delete
+    """
+    now = now or datetime.now()
+    week_start = week_start or state.get('current_week_start')
+    week_end = week_start + timedelta(days=7) if week_start else None
+    template_idle = _template_dialog_idle(state, now)
+    users = state.get('users') or {}
+
+    expired = []
+    for key in list(state.keys()):
+        if not isinstance(key, str):
+            continue
+
+        if key.startswith(DESK_CONFIRM_PREFIXES):
+            # Answered, or a desk of a week no longer on screen
+            day = _desk_confirm_date(key)
+            if not state.get(key) or day is None or week_end is None or not week_start <= day < week_end:
+                expired.append(key)
+
+        elif key.startswith('confirm_delete_'):
+            # Answered; open template confirmations go with the idle dialog
+            if not state.get(key) or (template_idle and key[len('confirm_delete_'):] not in users):
+                expired.append(key)
+
+        elif key.startswith('delete_success_') or key in TEMPLATE_DIALOG_KEYS:
+            if template_idle:
+                expired.append(key)
+
+    # Heatmap grid built from an older booking version is rebuilt on next use
+    grid = state.get('utilisation_grid')
+    counters = state.get('booking_counters')
+    if grid is not None and (counters is None or getattr(grid, 'version', None) != counters.version):
+        expired.append('utilisation_grid')
+
+    return expired
+
+
+def sweep_session_state(state: Optional[MutableMapping[str, Any]] = None,
+                        now: Optional[datetime] = None) -> List[str]:
+    """
+    Delete expired transient keys from the session (call once per rerun).
+
+    Args:
+        state: Session state mapping (default: st.session_state)
+        now: Current time (default: datetime.now())
+
+    Returns:
+        Deleted keys
+    """
+    if state is None:
+        import streamlit as st
+        state = st.session_state
+
+    expired = find_expired_keys(state, now=now)
+    for key in expired:
+        try:
+            del state[key]
+        except KeyError:
+            continue
+        SESSION_KEYS_EXPIRED.inc(family=key_family(key))
+
+    if expired:
+        stats = state.setdefault('session_janitor', {'sweeps': 0, 'expired': 0})
+        stats['sweeps'] += 1
+        stats['expired'] += len(expired)
+    return expired
+
+
+# ============================================================================
+# 5. MEMORY PANEL
+# ============================================================================
+
+def _format_bytes(size: int) -> str:
+    """Human readable byte count"""
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def render_memory_panel(limit: int = 12) -> None:
+    """Sidebar panel with the largest session state key families"""
+    import streamlit as st
+
+    report = session_memory_report()
+    total = sum(item['bytes'] for item in report)
+    keys = sum(item['keys'] for item in report)
+
+    with st.sidebar.expander("🧹 Session Memory", expanded=False):
+        st.markdown(f"**Session state:** ~{_format_bytes(total)} in {keys} keys")
+        rows = [f"| {item['family']} | {item['keys']} | {_format_bytes(item['bytes'])} |"
+                for item in report[:limit]]
+        st.markdown('\n'.join(["| Family | Keys | Size |", "|---|---:|---:|"] + rows))
+
+        stats = st.session_state.get('session_janitor')
+        if stats:
+            st.caption(f"Janitor expired {stats['expired']} keys in {stats['sweeps']} sweeps")
@@ -22,11 +22,14 @@ INDEX:
 # 1. IMPORTS & TYPE HINTS
 # ============================================================================
 
-import json
 import os
 from datetime import datetime
 from typing import Dict, Any, Optional, Union
-from PIL import Image
+
+# Streamlit-free booking core
+from booking_core.metrics import record_bookings
+from booking_core.rules import archive_user_bookings
+from booking_core.store import save_data_files
 
 
 # ============================================================================
@@ -56,7 +59,8 @@ def save_data_utility(
     bookings: Dict[str, Any],
     team_news: str,
     desk_names: Dict[str, str],
-    holidays: Optional[Dict[str, Any]] = None
+    holidays: Optional[Dict[str, Any]] = None,
+    blocker_rules: Optional[Dict[str, Any]] = None
 ) -> bool:
     """
     Save all application data to JSON files with optimized error handling.
@@ -67,34 +71,25 @@ def save_data_utility(
         team_news: Team news string
         desk_names: Desk name mappings
         holidays: Holiday data dictionary (optional)
+        blocker_rules: Recurring room blocker rules (optional)
 
     Returns:
         True if successful, False otherwise
     """
     try:
-        # Ensure data directory exists
-        os.makedirs('data', exist_ok=True)
-
-        # Prepare data for batch writing
-        data_files = {
-            'data/users.json': users,
-            'data/bookings.json': bookings,
-            'data/settings.json': {
-                'team_news': team_news,
-                'desk_names': desk_names,
-                'holidays': holidays or {},
-                'updated': datetime.now().isoformat()
-            }
+        settings = {
+            'team_news': team_news,
+            'desk_names': desk_names,
+            'holidays': holidays or {},
+            'blocker_rules': blocker_rules or {},
+            'updated': datetime.now().isoformat()
         }
 
-        # Write all files with consistent encoding and formatting
-        for filepath, data in data_files.items():
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
+        # Atomic writes via the booking core (temp file + rename per file)
+        save_data_files(users, bookings, settings, 'data')
         return True
 
-    except (OSError, IOError, json.JSONEncodeError) as e:
+    except (OSError, TypeError, ValueError) as e:
         # Import streamlit only when needed to avoid circular imports
         try:
             import streamlit as st
@@ -107,7 +102,8 @@ def save_data_utility(
 def delete_user_and_handle_bookings_utility(
     user_id: str,
     users: Dict[str, Any],
-    bookings: Dict[str, Any]
+    bookings: Dict[str, Any],
+    counters: Optional[Any] = None
 ) -> bool:
     """
     Delete user and handle associated bookings with optimized processing.
@@ -116,6 +112,7 @@ def delete_user_and_handle_bookings_utility(
         user_id: ID of user to delete
         users: Users dictionary to modify
         bookings: Bookings dictionary to modify
+        counters: OccupancyCounters to keep in sync (optional)
 
     Returns:
         True if successful, False otherwise
@@ -126,38 +123,10 @@ def delete_user_and_handle_bookings_utility(
     try:
         user_data = users[user_id]
         username = user_data.get('username', 'Deleted User')
-        today = datetime.now().date()
-
-        # Process bookings in batch for better performance
-        user_bookings = [
-            (booking_key, booking)
-            for booking_key, booking in bookings.items()
-            if booking.get('user_id') == user_id
-        ]
-
-        # Archive or delete bookings based on date
-        archive_data = {
-            'user_id': 'DELETED_USER',
-            'archived_username': username,
-            'archived_at': datetime.now().isoformat(),
-            'original_user_id': user_id
-        }
 
-        for booking_key, booking in user_bookings:
-            try:
-                booking_date = datetime.strptime(booking['date'], '%Y-%m-%d').date()
-
-                if booking_date >= today:
-                    # Future/today bookings: delete completely
-                    del bookings[booking_key]
-                else:
-                    # Past bookings: archive with preserved username
-                    bookings[booking_key].update(archive_data)
-
-            except (KeyError, ValueError) as e:
-                # Skip invalid booking entries
-                print(f"Warning: Invalid booking entry {booking_key}: {e}")
-                continue
+        # Delete future bookings, archive past ones with preserved username
+        result = archive_user_bookings(user_id, username, bookings, counters=counters)
+        record_bookings(cancelled=result['deleted'], source='user_deletion')
 
         # Clean up avatar file if it exists
         avatar_path = user_data.get('avatar_path')
@@ -235,6 +204,9 @@ def _resize_avatar_image(image_path: str, max_size: tuple[int, int] = (200, 200)
         Path to resized image or None if failed
     """
     try:
+        # Lazy import - PIL is only needed when an avatar is uploaded
+        from PIL import Image
+
         with Image.open(image_path) as img:
             # Convert to RGB if necessary (for JPEG compatibility)
             if img.mode in ('RGBA', 'LA', 'P'):
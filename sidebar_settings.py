@@ -25,7 +25,7 @@ INDEX:
 
 import streamlit as st
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 
 # Import shared utilities to avoid import loops
@@ -35,6 +35,10 @@ from shared_functions import (
     delete_user_and_handle_bookings_utility,
     save_avatar_utility
 )
+from booking_aggregates import get_session_counters
+from booking_core.holidays import parse_holiday_input, parse_holiday_lines, holiday_label
+from booking_core.workdays import get_calendar
+from booking_core.teams import TEAMS_FIELD, parse_teams, user_teams
 
 # ============================================================================
 # 2. USER MANAGEMENT DIALOGS
@@ -104,6 +108,8 @@ def manage_users_dialog():
     # Basic user information editing
     new_username = st.text_input("Username", value=user_data['username'])
     new_full_name = st.text_input("Full Name", value=user_data.get('full_name', ''))
+    new_teams = st.text_input("Teams", value=", ".join(user_teams(user_data)),
+                              help="Comma separated, e.g. 'Backend, Data'")
 
     # Optimized color selection
     available_colors = get_user_colors()
@@ -141,7 +147,8 @@ def manage_users_dialog():
 
     with col1:
         if st.button("💾 Update", key="dialog_update_user", type="primary", use_container_width=True):
-            _update_user(selected_user_id, new_username, new_full_name, new_color, new_avatar, user_data)
+            _update_user(selected_user_id, new_username, new_full_name, new_color, new_avatar, user_data,
+                         new_teams)
 
     with col2:
         if st.button("🗑️ Delete", key="dialog_delete_user", type="secondary", use_container_width=True):
@@ -168,7 +175,8 @@ def _handle_avatar_management(user_data: Dict[str, Any], user_id: str) -> None:
                     st.session_state.bookings,
                     st.session_state.team_news,
                     st.session_state.desk_names,
-                    st.session_state.holidays
+                    st.session_state.holidays,
+                    st.session_state.blocker_rules
                 )
                 st.success("Avatar removed!")
                 st.rerun()
@@ -176,7 +184,8 @@ def _handle_avatar_management(user_data: Dict[str, Any], user_id: str) -> None:
                 st.error(f"Failed to remove avatar: {e}")
 
 
-def _update_user(user_id: str, username: str, full_name: str, color: str, new_avatar, user_data: Dict[str, Any]) -> None:
+def _update_user(user_id: str, username: str, full_name: str, color: str, new_avatar, user_data: Dict[str, Any],
+                 teams: str = "") -> None:
     """Update user data with validation"""
     if not username or not username.strip():
         st.error("Username cannot be empty!")
@@ -187,7 +196,8 @@ def _update_user(user_id: str, username: str, full_name: str, color: str, new_av
         user_data.update({
             'username': username.strip(),
             'full_name': full_name.strip(),
-            'color': color
+            'color': color,
+            TEAMS_FIELD: parse_teams(teams)
         })
 
         # Handle new avatar
@@ -207,7 +217,8 @@ def _update_user(user_id: str, username: str, full_name: str, color: str, new_av
             st.session_state.bookings,
             st.session_state.team_news,
             st.session_state.desk_names,
-            st.session_state.holidays
+            st.session_state.holidays,
+            st.session_state.blocker_rules
         )
         st.success(f"User '{username}' updated!")
         st.rerun()
@@ -236,26 +247,14 @@ def _handle_user_deletion(user_id: str) -> None:
 def _execute_user_deletion(user_id: str) -> None:
     """Execute the actual user deletion with booking analysis"""
     try:
-        # Count affected bookings for user feedback
-        today = datetime.now().date()
-        future_bookings = 0
-        past_bookings = 0
-
-        for booking in st.session_state.bookings.values():
-            if booking.get('user_id') == user_id:
-                try:
-                    booking_date = datetime.strptime(booking['date'], '%Y-%m-%d').date()
-                    if booking_date >= today:
-                        future_bookings += 1
-                    else:
-                        past_bookings += 1
-                except (KeyError, ValueError):
-                    continue
+        # Count affected bookings for user feedback from the materialised counters
+        counters = get_session_counters()
+        future_bookings, past_bookings = counters.user_split(user_id, datetime.now().strftime('%Y-%m-%d'))
 
         # Perform deletion
         username = st.session_state.users[user_id]['username']
         success = delete_user_and_handle_bookings_utility(
-            user_id, st.session_state.users, st.session_state.bookings
+            user_id, st.session_state.users, st.session_state.bookings, counters
         )
 
         if success:
@@ -264,7 +263,8 @@ def _execute_user_deletion(user_id: str) -> None:
                 st.session_state.bookings,
                 st.session_state.team_news,
                 st.session_state.desk_names,
-                st.session_state.holidays
+                st.session_state.holidays,
+                st.session_state.blocker_rules
             )
             st.success(f"✅ User '{username}' deleted successfully!")
             if future_bookings > 0:
@@ -331,6 +331,15 @@ def holidays_dialog():
         if st.button("➕ Add", key="dialog_add_holiday", use_container_width=True):
             _add_holiday(holiday_input)
 
+    # Bulk import: single dates, ranges and yearly holidays, one per line
+    with st.expander("📋 Bulk Import"):
+        st.markdown("One per line: `25.12.2025`, `22.12.2025 - 02.01.2026` (range) or "
+                    "`01.08.` (every year), each optionally followed by a name")
+        bulk_input = st.text_area("Holidays", key="holiday_bulk_input", height=150,
+                                  placeholder="01.01. New Year\n01.08. National Day\n22.12.2025 - 02.01.2026 Office closed")
+        if st.button("📥 Import Holidays", key="dialog_import_holidays", use_container_width=True):
+            _import_holidays(bulk_input)
+
     # Show existing holidays
     _display_existing_holidays()
 
@@ -347,21 +356,16 @@ def _add_holiday(holiday_input: str) -> None:
         return
 
     try:
-        holiday_date = datetime.strptime(holiday_input, "%d.%m.%Y")
-        holiday_key = holiday_date.strftime("%Y-%m-%d")
-
-        st.session_state.holidays[holiday_key] = {
-            'date': holiday_key,
-            'display_date': holiday_input,
-            'added_date': datetime.now().isoformat()
-        }
+        holiday_key, holiday_data = parse_holiday_input(holiday_input)
+        st.session_state.holidays[holiday_key] = holiday_data
 
         save_data_utility(
             st.session_state.users,
             st.session_state.bookings,
             st.session_state.team_news,
             st.session_state.desk_names,
-            st.session_state.holidays
+            st.session_state.holidays,
+            st.session_state.blocker_rules
         )
 
         st.success(f"Holiday {holiday_input} added!")
@@ -371,6 +375,30 @@ def _add_holiday(holiday_input: str) -> None:
         st.error("Invalid date format! Use DD.MM.YYYY (e.g., 25.12.2025)")
 
 
+def _import_holidays(bulk_input: str) -> None:
+    """Add all holidays of a bulk input in one save"""
+    holidays, errors = parse_holiday_lines(bulk_input)
+    for error in errors:
+        st.error(error)
+    if errors or not holidays:
+        if not errors:
+            st.error("Please enter at least one holiday!")
+        return
+
+    st.session_state.holidays.update(holidays)
+    save_data_utility(
+        st.session_state.users,
+        st.session_state.bookings,
+        st.session_state.team_news,
+        st.session_state.desk_names,
+        st.session_state.holidays,
+        st.session_state.blocker_rules
+    )
+
+    st.success(f"{len(holidays)} holiday(s) imported!")
+    st.rerun()
+
+
 def _display_existing_holidays() -> None:
     """Display existing holidays with delete functionality"""
     if not st.session_state.holidays:
@@ -385,7 +413,7 @@ def _display_existing_holidays() -> None:
 
         with col_date:
             display_date = holiday_data.get('display_date', holiday_key)
-            st.markdown(f"🎉 **{display_date}**")
+            st.markdown(f"🎉 **{holiday_label(holiday_key, holiday_data)}**")
 
         with col_delete:
             if st.button("🗑️", key=f"delete_holiday_{holiday_key}",
@@ -396,11 +424,380 @@ def _display_existing_holidays() -> None:
                     st.session_state.bookings,
                     st.session_state.team_news,
                     st.session_state.desk_names,
-                    st.session_state.holidays
+                    st.session_state.holidays,
+                    st.session_state.blocker_rules
                 )
                 st.success(f"Holiday {display_date} deleted!")
                 st.rerun()
 
+
+@st.dialog("Occupancy Analytics", width="large")
+def analytics_dialog():
+    """Dialog with occupancy, utilisation and attendance analytics"""
+    st.markdown("### 📊 Occupancy Analytics")
+
+    # Lazy import pandas-based analytics only when the dialog opens
+    try:
+        import analytics
+    except ImportError:
+        st.error("Analytics require pandas and numpy to be installed.")
+        if st.button("✖ Close", key="dialog_close_analytics_missing", use_container_width=True):
+            st.rerun()
+        return
+
+    # Range and room filters
+    today = datetime.now().date()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        start_date = st.date_input("From", value=today - timedelta(days=90), key="analytics_start")
+    with col2:
+        end_date = st.date_input("To", value=today, key="analytics_end")
+    with col3:
+        room_options = {'All Rooms': None, 'Büro Klein': 'klein', 'Büro Gross': 'gross'}
+        room_display = st.selectbox("Room", options=list(room_options.keys()), key="analytics_room")
+
+    if end_date < start_date:
+        st.error("'From' date must be before 'To' date!")
+        return
+
+    df = analytics.filter_frame(analytics.get_session_frame(), start_date, end_date, room_options[room_display])
+    workdays = get_calendar(st.session_state.holidays).count_workdays(start_date, end_date)
+
+    if df.empty:
+        st.info("No bookings in the selected range.")
+    else:
+        st.markdown(f"**{len(df)}** bookings over **{workdays}** workdays")
+
+        desk_tab, day_tab, week_tab, half_tab, maybe_tab, user_tab = st.tabs(
+            ["Desks", "Days", "Weeks", "Half Days", "Maybe", "Users"]
+        )
+        with desk_tab:
+            st.dataframe(analytics.occupancy_per_desk(df, workdays), use_container_width=True)
+        with day_tab:
+            per_day = analytics.occupancy_per_day(df)
+            st.bar_chart(per_day['occupancy'])
+            st.dataframe(per_day, use_container_width=True)
+        with week_tab:
+            per_week = analytics.occupancy_per_week(df)
+            st.line_chart(per_week['occupancy'])
+            st.dataframe(per_week, use_container_width=True)
+        with half_tab:
+            half_days = analytics.half_day_utilisation(df)
+            st.line_chart(half_days[['am_utilisation', 'pm_utilisation']])
+            st.dataframe(half_days, use_container_width=True)
+        with maybe_tab:
+            st.caption("Share of past bookings that stayed tentative (there is no check-in data).")
+            st.dataframe(analytics.maybe_booking_shares(df, today), use_container_width=True)
+        with user_tab:
+            st.dataframe(analytics.user_attendance(df, workdays), use_container_width=True)
+
+    # Close button
+    st.markdown("---")
+    if st.button("✖ Close", key="dialog_close_analytics", use_container_width=True):
+        st.rerun()
+
+
+@st.dialog("Export Bookings")
+def export_dialog():
+    """Dialog for exporting the booking history as CSV or Excel"""
+    from booking_export import (
+        EXPORT_FORMATS, MAX_IN_APP_EXPORT_DAYS, export_bytes, iter_export_rows, xlsx_available
+    )
+
+    st.markdown("### 📤 Export Bookings")
+    st.markdown("Export bookings filtered by date range, room or user")
+
+    # Filters
+    today = datetime.now().date()
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("From", value=today.replace(month=1, day=1), key="export_start")
+    with col2:
+        end_date = st.date_input("To", value=today, key="export_end")
+
+    room_options = {'All Rooms': None, 'Büro Klein': 'klein', 'Büro Gross': 'gross'}
+    room_display = st.selectbox("Room", options=list(room_options.keys()), key="export_room")
+
+    user_options = {'All Users': None} | {
+        data['username']: user_id
+        for user_id, data in st.session_state.users.items()
+    }
+    user_display = st.selectbox("User", options=list(user_options.keys()), key="export_user")
+
+    format_options = {'CSV': 'csv', 'CSV for Excel (;)': 'excel_csv'}
+    if xlsx_available():
+        format_options['Excel (.xlsx)'] = 'xlsx'
+    format_display = st.radio("Format", options=list(format_options.keys()), horizontal=True,
+                              key="export_format")
+    include_blockers = st.checkbox("Include room blockers", key="export_include_blockers")
+
+    if end_date < start_date:
+        st.error("'From' date must be before 'To' date!")
+        return
+
+    # st.download_button needs the whole file in memory, so the range is capped
+    if (end_date - start_date).days + 1 > MAX_IN_APP_EXPORT_DAYS:
+        st.warning(f"The in-app export covers at most {MAX_IN_APP_EXPORT_DAYS} days. "
+                   f"For longer ranges use `python booking_admin.py export --from ... --to ... -o FILE`, "
+                   f"which streams to the file.")
+        return
+
+    if st.button("📦 Prepare Export", key="dialog_prepare_export", use_container_width=True):
+        export_format = format_options[format_display]
+        rows = iter_export_rows(
+            st.session_state.bookings,
+            st.session_state.users,
+            st.session_state.desk_names,
+            start=start_date,
+            end=end_date,
+            room=room_options[room_display],
+            user=user_options[user_display],
+            include_blockers=include_blockers,
+            counters=get_session_counters()
+        )
+
+        extension, mime = EXPORT_FORMATS[export_format]
+        st.download_button(
+            "⬇️ Download",
+            data=export_bytes(rows, export_format),
+            file_name=f"bookings_{start_date:%Y%m%d}_{end_date:%Y%m%d}.{extension}",
+            mime=mime,
+            key="dialog_download_export",
+            use_container_width=True
+        )
+
+    # Close button
+    st.markdown("---")
+    if st.button("✖ Close", key="dialog_close_export", use_container_width=True):
+        st.rerun()
+
+
+@st.dialog("Utilisation Heatmap", width="large")
+def heatmap_dialog():
+    """Dialog with desk x weekday and monthly calendar utilisation heatmaps"""
+    from utilisation_heatmap import get_session_grid, render_weekday_heatmap, render_month_calendars
+
+    st.markdown("### 🔥 Utilisation Heatmap")
+
+    # Range and view selection - only slices the cached grid
+    today = datetime.now().date()
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("From", value=today - timedelta(days=365), key="heatmap_start")
+    with col2:
+        end_date = st.date_input("To", value=today, key="heatmap_end")
+
+    if end_date < start_date:
+        st.error("'From' date must be before 'To' date!")
+        return
+
+    view = st.radio("View", options=["Desks × Weekdays", "Monthly Calendar"], horizontal=True,
+                    key="heatmap_view")
+
+    grid = get_session_grid()
+
+    if view == "Desks × Weekdays":
+        color_by_user = st.checkbox("Colour by most frequent user", key="heatmap_color_by_user")
+        st.markdown(
+            render_weekday_heatmap(
+                grid, start_date, end_date,
+                st.session_state.desk_names,
+                st.session_state.users,
+                get_calendar(st.session_state.holidays).holiday_keys(start_date, end_date),
+                color_by_user
+            ),
+            unsafe_allow_html=True
+        )
+    else:
+        month_columns = st.columns(3)
+        for i, (title, table_html) in enumerate(render_month_calendars(grid, start_date, end_date)):
+            with month_columns[i % 3]:
+                st.markdown(f"**{title}**")
+                st.markdown(table_html, unsafe_allow_html=True)
+
+    # Close button
+    st.markdown("---")
+    if st.button("✖ Close", key="dialog_close_heatmap", use_container_width=True):
+        st.rerun()
+
+@st.dialog("Find a Free Desk", width="large")
+def find_desk_dialog():
+    """Dialog listing free desks per day across a date range, with a shortcut to book one"""
+    from booking_core.finder import MAX_FINDER_DAYS, find_free_desks
+    from booking_core.recurring import expand_rules
+    from booking_core.rules import get_desk_name
+    from booking_core.slots import SLOT_ALL, SLOT_AM, SLOT_PM
+
+    st.markdown("### 🔎 Find a Free Desk")
+
+    today = datetime.now().date()
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("From", value=today, min_value=today, key="finder_start")
+    with col2:
+        end_date = st.date_input("To", value=today + timedelta(days=13), min_value=today, key="finder_end")
+
+    col3, col4 = st.columns(2)
+    with col3:
+        room_options = {'All Rooms': None, 'Büro Klein': 'klein', 'Büro Gross': 'gross'}
+        room_display = st.selectbox("Room", options=list(room_options.keys()), key="finder_room")
+    with col4:
+        half_options = {'Full Day': SLOT_ALL, 'Morning': SLOT_AM, 'Afternoon': SLOT_PM}
+        half_display = st.radio("Needed", options=list(half_options.keys()), horizontal=True,
+                                key="finder_half")
+
+    if end_date < start_date:
+        st.error("'From' date must be before 'To' date!")
+        return
+    if (end_date - start_date).days >= MAX_FINDER_DAYS:
+        st.error(f"Please search at most {MAX_FINDER_DAYS} days at once.")
+        return
+
+    # One pass over the range; recurring blockers expanded locally (the counters keep the viewed week)
+    free_days = find_free_desks(
+        st.session_state.bookings, start_date, end_date,
+        room=room_options[room_display],
+        slots=half_options[half_display],
+        counters=get_session_counters(),
+        holidays=st.session_state.holidays,
+        occurrences=expand_rules(st.session_state.blocker_rules, start_date, end_date)
+    )
+
+    if not free_days:
+        st.info("No workdays in the selected range.")
+    elif not any(free_days.values()):
+        st.warning("No free desk in the selected range.")
+
+    room_names = {'klein': 'Klein', 'gross': 'Gross'}
+    book_options = {}
+    for date_key, desks in free_days.items():
+        day = datetime.strptime(date_key, '%Y-%m-%d').date()
+        day_label = day.strftime('%a %d.%m.%Y')
+        if not desks:
+            st.markdown(f"**{day_label}** · no free desk")
+            continue
+
+        labels_per_room = {}
+        for desk in desks:
+            label = get_desk_name(st.session_state.desk_names, desk.room, desk.desk_num)
+            if desk.slots != SLOT_ALL:
+                label += " (AM)" if desk.slots == SLOT_AM else " (PM)"
+            room_name = room_names.get(desk.room, desk.room)
+            labels_per_room.setdefault(room_name, []).append(label)
+            book_options[f"{day_label} · {room_name}: {label}"] = (day, desk.room, desk.desk_num)
+        room_text = " · ".join(f"{room_name}: {', '.join(labels)}" for room_name, labels in labels_per_room.items())
+        st.markdown(f"**{day_label}** · {len(desks)} free · {room_text}")
+
+    if book_options:
+        st.markdown("---")
+        choice = st.selectbox("Book one of them", options=list(book_options.keys()), key="finder_choice")
+        if st.button("📅 Book Selected Desk", key="dialog_finder_book", use_container_width=True, type="primary"):
+            st.session_state.booking_desk = book_options[choice]
+            st.rerun()
+
+    # Close button
+    st.markdown("---")
+    if st.button("✖ Close", key="dialog_close_finder", use_container_width=True):
+        st.rerun()
+
+@st.dialog("My Team", width="large")
+def team_dialog():
+    """Dialog showing the days a team is in, where its members sit and free desks next to them"""
+    from booking_core.finder import find_free_desks
+    from booking_core.recurring import expand_rules
+    from booking_core.rules import get_desk_name
+    from booking_core.slots import SLOT_ALL, SLOT_AM
+    from booking_core.teams import DEFAULT_MIN_MEMBERS, all_teams, co_location_days, desks_near, team_members
+
+    st.markdown("### 👥 My Team")
+
+    users = st.session_state.users
+    teams = all_teams(users)
+    if not teams:
+        st.info("No teams yet - assign users to teams in Manage Users.")
+        if st.button("✖ Close", key="dialog_close_team_empty", use_container_width=True):
+            st.rerun()
+        return
+
+    # Default to the first team of the session user
+    session_user = users.get(st.session_state.get('selected_user_for_session'), {})
+    own_teams = [team for team in user_teams(session_user) if team in teams]
+    default_team = teams.index(own_teams[0]) if own_teams else 0
+
+    today = datetime.now().date()
+    month_starts = [today.replace(day=1)]
+    for _ in range(2):
+        month_starts.append((month_starts[-1] + timedelta(days=32)).replace(day=1))
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        team = st.selectbox("Team", options=teams, index=default_team, key="team_select")
+    with col2:
+        month_start = st.selectbox("Month", options=month_starts, format_func=lambda d: d.strftime('%B %Y'),
+                                   key="team_month")
+    members = team_members(users, team)
+    with col3:
+        min_members = st.number_input("At least", min_value=1, max_value=len(members),
+                                      value=min(DEFAULT_MIN_MEMBERS, len(members)), key="team_min")
+
+    start_date = max(month_start, today)
+    end_date = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    st.caption(f"{len(members)} members: " + ", ".join(users[user_id]['username'] for user_id in members))
+
+    counters = get_session_counters()
+    free_days = {}
+    days = co_location_days(st.session_state.bookings, counters, members, start_date, end_date,
+                            int(min_members), st.session_state.holidays)
+    if not days:
+        st.info(f"No day left in {month_start.strftime('%B')} with at least {int(min_members)} of {team} in.")
+    else:
+        # One finder pass over the month for the desks next to them
+        free_days = find_free_desks(
+            st.session_state.bookings, start_date, end_date,
+            counters=counters,
+            holidays=st.session_state.holidays,
+            occurrences=expand_rules(st.session_state.blocker_rules, start_date, end_date)
+        )
+
+    room_names = {'klein': 'Klein', 'gross': 'Gross'}
+    book_options = {}
+    for date_key, placements in days.items():
+        day = datetime.strptime(date_key, '%Y-%m-%d').date()
+        day_label = day.strftime('%a %d.%m.%Y')
+        seated_per_room = {}
+        for placement in placements:
+            seat = get_desk_name(st.session_state.desk_names, placement.room, placement.desk_num)
+            if placement.booking_type in ('half_am', 'half_pm'):
+                seat += ", AM" if placement.booking_type == 'half_am' else ", PM"
+            username = users.get(placement.user_id, {}).get('username', placement.user_id)
+            seated_per_room.setdefault(room_names.get(placement.room, placement.room), []).append(f"{username} ({seat})")
+        present = len({placement.user_id for placement in placements})
+        room_text = " · ".join(f"{room_name}: {', '.join(seats)}" for room_name, seats in seated_per_room.items())
+        st.markdown(f"**{day_label}** · {present} in · {room_text}")
+
+        nearby = desks_near(placements, free_days.get(date_key, []))[:3]
+        if nearby:
+            labels = []
+            for desk in nearby:
+                label = f"{room_names.get(desk.room, desk.room)}: {get_desk_name(st.session_state.desk_names, desk.room, desk.desk_num)}"
+                if desk.slots != SLOT_ALL:
+                    label += " (AM)" if desk.slots == SLOT_AM else " (PM)"
+                labels.append(label)
+                book_options[f"{day_label} · {label}"] = (day, desk.room, desk.desk_num)
+            st.caption("Free next to them: " + ", ".join(labels))
+
+    if book_options:
+        st.markdown("---")
+        choice = st.selectbox("Sit with your team", options=list(book_options.keys()), key="team_choice")
+        if st.button("📅 Book Selected Desk", key="dialog_team_book", use_container_width=True, type="primary"):
+            st.session_state.booking_desk = book_options[choice]
+            st.rerun()
+
+    # Close button
+    st.markdown("---")
+    if st.button("✖ Close", key="dialog_close_team", use_container_width=True):
+        st.rerun()
+
 # ============================================================================
 # 3. OPTIMIZED TOGGLE FUNCTIONS
 # ============================================================================
@@ -468,7 +865,7 @@ def display_interface_info() -> None:
         st.info("💡 Clean interface active")
 
     if st.session_state.debug_mode:
-        st.warning("🐛 Debug info enabled")
+        st.warning("🐛 Rerun timing panel enabled")
     else:
         st.success("✨ Clean display active")
 
@@ -575,6 +972,17 @@ def _render_user_management_section() -> None:
             st.session_state.show_all_users = True
             st.rerun()
 
+    col5, col6 = st.columns(2)
+    with col5:
+        if st.button("My Team", use_container_width=True):
+            st.session_state.show_team = True
+            st.rerun()
+
+    with col6:
+        if st.button("Cancel Days", use_container_width=True):
+            st.session_state.show_cancel_bookings = True
+            st.rerun()
+
     # Display user count efficiently
     user_count = len(st.session_state.users)
     st.markdown(f"**Total Users:** {user_count}")
@@ -664,6 +1072,28 @@ def _render_quick_actions_section() -> None:
     if st.button("Refresh", use_container_width=True):
         _refresh_application_data()
 
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Analytics", use_container_width=True):
+            st.session_state.show_analytics = True
+            st.rerun()
+
+    with col2:
+        if st.button("Export", use_container_width=True):
+            st.session_state.show_export = True
+            st.rerun()
+
+    col3, col4 = st.columns(2)
+    with col3:
+        if st.button("Heatmap", use_container_width=True):
+            st.session_state.show_heatmap = True
+            st.rerun()
+
+    with col4:
+        if st.button("Find Desk", use_container_width=True):
+            st.session_state.show_find_desk = True
+            st.rerun()
+
 
 def _render_interface_section() -> None:
     """Render interface controls section with toggle visibility"""
@@ -724,6 +1154,7 @@ def _refresh_application_data() -> None:
                         st.session_state.team_news = data.get('team_news', '')
                         st.session_state.desk_names = data.get('desk_names', {})
                         st.session_state.holidays = data.get('holidays', {})
+                        st.session_state.blocker_rules = data.get('blocker_rules', {})
 
                 except (json.JSONDecodeError, KeyError) as e:
                     st.warning(f"Could not load {data_type}: {e}")
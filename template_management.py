@@ -25,6 +25,12 @@ from typing import Dict, List, Any, Optional, Tuple
 
 # Import shared utilities
 from shared_functions import save_data_utility
+from booking_aggregates import get_session_counters
+
+# Import Streamlit-free booking domain core
+from booking_core import rules as booking_rules
+from booking_core import templates as template_rules
+from booking_core.metrics import record_bookings
 
 
 # ============================================================================
@@ -59,24 +65,14 @@ def save_user_template(user_id: str, template_name: str, schedule: Dict[str, str
 
         templates = st.session_state.users[user_id]['templates']
 
-        # Check 5-template limit
-        if len(templates) >= 5 and template_name not in templates:
-            st.error("❌ Maximum 5 templates per user allowed!")
-            return False
-
-        # Validate schedule
-        if not schedule:
-            st.error("❌ Template must have at least one weekday selected!")
+        # Check template limit and schedule
+        error = template_rules.validate_template(templates, template_name, schedule)
+        if error:
+            st.error(f"❌ {error}")
             return False
 
         # Create template data
-        template_data = {
-            'name': template_name,
-            'schedule': schedule,
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat(),
-            'version': 1
-        }
+        template_data = template_rules.build_template(template_name, schedule)
 
         # Update session state
         st.session_state.users[user_id]['templates'][template_name] = template_data
@@ -87,7 +83,8 @@ def save_user_template(user_id: str, template_name: str, schedule: Dict[str, str
             st.session_state.bookings,
             st.session_state.team_news,
             st.session_state.desk_names,
-            st.session_state.holidays
+            st.session_state.holidays,
+            st.session_state.blocker_rules
         )
 
         # CRITICAL: Force reload data after save
@@ -98,6 +95,7 @@ def save_user_template(user_id: str, template_name: str, schedule: Dict[str, str
             except:
                 # Fallback: clear cache
                 st.cache_data.clear()
+                st.cache_resource.clear()
 
         return success
 
@@ -135,6 +133,7 @@ def delete_user_template(user_id: str, template_name: str) -> bool:
             'team_news': st.session_state.get('team_news', ''),
             'desk_names': st.session_state.get('desk_names', {}),
             'holidays': st.session_state.get('holidays', {}),
+            'blocker_rules': st.session_state.get('blocker_rules', {}),
             'updated': datetime.now().isoformat()
         }
 
@@ -148,6 +147,7 @@ def delete_user_template(user_id: str, template_name: str) -> bool:
         except:
             # If import fails, clear all caches
             st.cache_data.clear()
+            st.cache_resource.clear()
 
         return True
 
@@ -162,108 +162,39 @@ def delete_user_template(user_id: str, template_name: str) -> bool:
 
 def get_future_weeks(max_weeks: int = 5) -> List[Tuple[datetime, str]]:
     """Get list of future weeks"""
-    weeks = []
-    today = datetime.now().date()
-
-    # Start from next Monday
-    days_until_monday = (7 - today.weekday()) % 7
-    if days_until_monday == 0:
-        days_until_monday = 7
-
-    next_monday = today + timedelta(days=days_until_monday)
-
-    for i in range(max_weeks):
-        week_start = next_monday + timedelta(weeks=i)
-        week_end = week_start + timedelta(days=4)  # Friday
-
-        if i == 0:
-            week_label = f"Next Week ({week_start.strftime('%d.%m')} - {week_end.strftime('%d.%m')})"
-        else:
-            week_label = f"In {i + 1} Weeks ({week_start.strftime('%d.%m')} - {week_end.strftime('%d.%m')})"
-
-        weeks.append((week_start, week_label))
-
-    return weeks
+    return template_rules.get_future_weeks(max_weeks)
 
 
 def get_desk_name(room: str, desk_num: int) -> str:
     """Get custom desk name or fallback to default"""
-    desk_key = f"{room}_{desk_num}"
-    return st.session_state.desk_names.get(desk_key, f"Desk {desk_num}")
-
+    return booking_rules.get_desk_name(st.session_state.desk_names, room, desk_num)
 
-def check_desk_availability(date: datetime, room: str) -> List[int]:
-    """Check which desks are available"""
-    date_key = date.strftime('%Y-%m-%d')
-    desk_count = 2 if room == "klein" else 5
-    available_desks = []
 
-    # Check if room is blocked
-    room_blocker_key = f"{date_key}_{room}_ROOM_BLOCKER"
-    if room_blocker_key in st.session_state.bookings:
-        return []
+def get_blocker_counters(start: datetime, end: datetime):
+    """Session counters with recurring room blockers expanded from start to end"""
+    counters = get_session_counters()
+    counters.expand_blocker_rules(
+        st.session_state.get('blocker_rules'),
+        start.date() if isinstance(start, datetime) else start,
+        end.date() if isinstance(end, datetime) else end
+    )
+    return counters
 
-    # Check individual desks
-    for desk_num in range(1, desk_count + 1):
-        booking_key = f"{date_key}_{room}_{desk_num}"
-        if booking_key not in st.session_state.bookings:
-            available_desks.append(desk_num)
 
-    return available_desks
+def check_desk_availability(date: datetime, room: str) -> List[int]:
+    """Check which desks are available"""
+    return booking_rules.check_desk_availability(
+        st.session_state.bookings, date, room, counters=get_blocker_counters(date, date)
+    )
 
 
 def validate_template_application(user_id: str, week_start: datetime, schedule: Dict[str, str]) -> Dict[str, Any]:
     """Validate template application"""
-    validation_result = {
-        'valid_days': {},
-        'blocked_days': {},
-        'past_days': {}
-    }
-
-    today = datetime.now().date()
-    weekdays = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday']
-
-    for i, weekday in enumerate(weekdays):
-        if weekday not in schedule:
-            continue
-
-        current_date = week_start + timedelta(days=i)
-
-        if current_date < today:
-            validation_result['past_days'][weekday] = {
-                'date': current_date,
-                'reason': 'Past date'
-            }
-            continue
-
-        # Check availability for both rooms
-        day_availability = {}
-        for room in ['klein', 'gross']:
-            available_desks = check_desk_availability(current_date, room)
-            day_availability[room] = {
-                'available_desks': available_desks,
-                'total_desks': 2 if room == "klein" else 5
-            }
-
-        # Check if any desks available
-        has_available_desks = any(
-            day_availability[room]['available_desks']
-            for room in ['klein', 'gross']
-        )
-
-        if has_available_desks:
-            validation_result['valid_days'][weekday] = {
-                'date': current_date,
-                'availability': day_availability,
-                'booking_type': schedule[weekday]
-            }
-        else:
-            validation_result['blocked_days'][weekday] = {
-                'date': current_date,
-                'reason': 'No available desks'
-            }
-
-    return validation_result
+    counters = get_blocker_counters(week_start, week_start + timedelta(days=4))
+    return template_rules.validate_template_application(
+        st.session_state.bookings, week_start, schedule, counters=counters,
+        holidays=st.session_state.get('holidays')
+    )
 
 
 # ============================================================================
@@ -732,7 +663,7 @@ def template_apply_view():
             st.error(f"• {day.title()}: {info['reason']}")
 
     if validation['blocked_days']:
-        st.error("**Blocked Days (No Available Desks):**")
+        st.error("**Blocked Days (Holidays or No Available Desks):**")
         for day, info in validation['blocked_days'].items():
             st.error(f"• {day.title()}: {info['reason']}")
 
@@ -836,41 +767,14 @@ def template_apply_view():
 
 def apply_template_bookings(user_id: str, desk_selections: Dict[str, Any]) -> int:
     """Apply template bookings"""
-    success_count = 0
+    # Build all bookings first, skipping desks that are already taken
+    new_bookings = template_rules.build_template_bookings(user_id, desk_selections, st.session_state.bookings)
 
-    for selection_key, selection_data in desk_selections.items():
-        try:
-            date = selection_data['date']
-            room = selection_data['room']
-            desk_num = selection_data['desk']
-            booking_type = selection_data['booking_type']
-
-            # Create booking key
-            date_key = date.strftime('%Y-%m-%d')
-            booking_key = f"{date_key}_{room}_{desk_num}"
-
-            # Check availability
-            if booking_key in st.session_state.bookings:
-                continue
-
-            # Create booking data
-            booking_data = {
-                'user_id': user_id,
-                'booking_type': booking_type,
-                'created_at': datetime.now().isoformat(),
-                'date': date_key,
-                'room': room,
-                'desk_num': desk_num,
-                'entry_type': 'desk_booking',
-                'created_via': 'template'
-            }
-
-            # Save booking
-            st.session_state.bookings[booking_key] = booking_data
-            success_count += 1
-
-        except Exception:
-            continue
+    counters = get_session_counters()
+    for booking_key, booking_data in new_bookings.items():
+        counters.replace(booking_key, st.session_state.bookings.get(booking_key), booking_data)
+        st.session_state.bookings[booking_key] = booking_data
+    success_count = len(new_bookings)
 
     # Save to disk
     if success_count > 0:
@@ -879,8 +783,10 @@ def apply_template_bookings(user_id: str, desk_selections: Dict[str, Any]) -> in
             st.session_state.bookings,
             st.session_state.team_news,
             st.session_state.desk_names,
-            st.session_state.holidays
+            st.session_state.holidays,
+            st.session_state.blocker_rules
         )
+        record_bookings(created=success_count, source='template')
 
         # Force reload data after booking creation
         try:
@@ -888,6 +794,7 @@ def apply_template_bookings(user_id: str, desk_selections: Dict[str, Any]) -> in
             force_reload_data()
         except:
             st.cache_data.clear()
+            st.cache_resource.clear()
 
     return success_count
 
@@ -0,0 +1,98 @@
+"""
+BIIS Desk Booking System - Tests: Admin CLI
+Author: [Your Name]
+Date: [Date]
+Description: Import conflicts and per-occupant cancel/stats of booking_admin
+"""
+
+import json
+import os
+from datetime import date
+
+import pytest
+
+from booking_admin import main
+from booking_core.rules import DELETED_USER_ID, build_booking, get_booking_key
+from booking_core.slots import combine_booking, occupant_ids
+from booking_core.store import save_data_files
+
+DAY = date(2026, 11, 2)
+KEY = get_booking_key(DAY, 'klein', 1)
+USERS = {'anna': {'username': 'anna'}, 'ben': {'username': 'ben'}}
+
+
+def _bookings(data_dir):
+    with open(os.path.join(data_dir, 'bookings.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _archived(booking_type):
+    entry = build_booking(DAY, 'klein', 1, DELETED_USER_ID, booking_type)
+    entry.update({'archived_username': 'carl', 'original_user_id': 'carl'})
+    return entry
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    return str(tmp_path)
+
+
+def _write_csv(data_dir, *rows):
+    path = os.path.join(data_dir, 'import.csv')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('date,room,desk_num,user_id,booking_type\n')
+        for row in rows:
+            f.write(','.join(row) + '\n')
+    return path
+
+
+def test_import_skip_keeps_existing_maybe(data_dir):
+    save_data_files(USERS, {KEY: build_booking(DAY, 'klein', 1, 'anna', 'maybe')}, {}, data_dir)
+    path = _write_csv(data_dir, (DAY.isoformat(), 'klein', '1', 'ben', 'full_day'))
+
+    assert main(['--data-dir', data_dir, 'import', path, '--on-conflict', 'skip']) == 0
+    assert _bookings(data_dir)[KEY]['user_id'] == 'anna'
+
+    assert main(['--data-dir', data_dir, 'import', path, '--on-conflict', 'replace']) == 0
+    assert _bookings(data_dir)[KEY]['user_id'] == 'ben'
+
+
+def test_import_fills_free_half_of_shared_desk(data_dir):
+    save_data_files(USERS, {KEY: build_booking(DAY, 'klein', 1, 'anna', 'half_am')}, {}, data_dir)
+    path = _write_csv(data_dir, (DAY.isoformat(), 'klein', '1', 'ben', 'half_pm'))
+
+    assert main(['--data-dir', data_dir, 'import', path, '--on-conflict', 'skip']) == 0
+    assert occupant_ids(_bookings(data_dir)[KEY]) == ['anna', 'ben']
+
+
+def test_cancel_keeps_archived_half(data_dir):
+    shared = combine_booking(_archived('half_am'), build_booking(DAY, 'klein', 1, 'anna', 'half_pm'))
+    save_data_files(USERS, {KEY: shared}, {}, data_dir)
+
+    assert main(['--data-dir', data_dir, 'cancel', '--from', DAY.isoformat(), '--to', DAY.isoformat(),
+                 '--room', 'klein']) == 0
+    assert occupant_ids(_bookings(data_dir)[KEY]) == [DELETED_USER_ID]
+
+
+def test_stats_count_every_occupant(data_dir, capsys):
+    shared = combine_booking(_archived('half_am'), build_booking(DAY, 'klein', 1, 'anna', 'half_pm'))
+    save_data_files(USERS, {KEY: shared}, {}, data_dir)
+
+    assert main(['--data-dir', data_dir, 'stats']) == 0
+    output = capsys.readouterr().out
+    assert 'Desk bookings:  2 (1 archived)' in output
+    assert 'half_am=1, half_pm=1' in output
+
+
+def test_import_unescapes_only_exports(data_dir):
+    save_data_files(USERS, {}, {}, data_dir)
+    path = os.path.join(data_dir, 'import.csv')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("date;room;desk_num;user_id;booking_type;reason;entry_type\n")
+        f.write(f"{DAY.isoformat()};klein;;anna;full_day;'-1 desk;room_blocker\n")
+
+    assert main(['--data-dir', data_dir, 'import', path]) == 0
+    assert next(iter(_bookings(data_dir).values()))['reason'] == "'-1 desk"
+
+    assert main(['--data-dir', data_dir, 'import', path, '--from-export', '--on-conflict', 'replace']) == 0
+    assert next(iter(_bookings(data_dir).values()))['reason'] == "-1 desk"
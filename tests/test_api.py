@@ -0,0 +1,127 @@
+"""
+BIIS Desk Booking System - Tests: JSON API
+Author: [Your Name]
+Date: [Date]
+Description: Store validation and status codes through the HTTP API
+"""
+
+import http.client
+import json
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+from booking_api import create_server
+from booking_core.ical import feed_key
+from booking_core.store import save_data_files
+
+TOKEN = 'secret'
+
+
+def _next_weekday(weekday: int) -> date:
+    day = date.today() + timedelta(days=1)
+    while day.weekday() != weekday:
+        day += timedelta(days=1)
+    return day
+
+
+@pytest.fixture
+def api(tmp_path):
+    """Request function against a server on a fresh data directory"""
+    holiday = _next_weekday(2)
+    save_data_files({'anna': {'username': 'anna'}}, {},
+                    {'holidays': {holiday.isoformat(): {'name': 'Test holiday'}}}, str(tmp_path))
+    server = create_server('127.0.0.1', 0, str(tmp_path), token=TOKEN)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+
+    def request(method, path, payload=None, headers=None, auth=True):
+        conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+        body = json.dumps(payload) if payload is not None else None
+        headers = {**({'Authorization': f'Bearer {TOKEN}'} if auth else {}), **(headers or {})}
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        data = response.read()
+        conn.close()
+        return response, data
+
+    yield request
+    server.shutdown()
+    server.server_close()
+
+
+def _booking(day, **fields):
+    return {'date': day.isoformat(), 'room': 'klein', 'desk_num': 1, 'user_id': 'anna',
+            'booking_type': 'full_day', **fields}
+
+
+def test_booking_on_workday_is_created(api):
+    response, _ = api('POST', '/bookings', _booking(_next_weekday(0)))
+    assert response.status == 201
+
+
+@pytest.mark.parametrize('day', [
+    _next_weekday(5),                       # Saturday
+    _next_weekday(2),                       # Configured holiday
+    date.today() - timedelta(days=7),       # Past
+])
+def test_booking_outside_workdays_is_rejected(api, day):
+    response, data = api('POST', '/bookings', _booking(day))
+    assert response.status == 400
+    assert 'error' in json.loads(data)
+
+
+@pytest.mark.parametrize('fields', [
+    {'room': ['gross']},
+    {'user_id': 42},
+    {'booking_type': {'type': 'full_day'}},
+    {'date': 20261102},
+])
+def test_malformed_booking_payload_is_rejected(api, fields):
+    response, _ = api('POST', '/bookings', _booking(_next_weekday(0), **fields))
+    assert response.status == 400
+
+
+def test_malformed_blocker_times_are_rejected(api):
+    payload = {'date': _next_weekday(0).isoformat(), 'room': 'klein', 'user_id': 'anna',
+               'blocker_type': 'custom', 'start_time': ['09:00'], 'end_time': '10:00'}
+    response, _ = api('POST', '/blockers', payload)
+    assert response.status == 400
+
+
+def test_head_returns_headers_only(api):
+    response, data = api('HEAD', '/health')
+    assert response.status == 200
+    assert int(response.getheader('Content-Length')) > 0
+    assert data == b''
+
+
+def test_feed_key_unlocks_only_its_feed(api):
+    key = feed_key(TOKEN, 'room', 'klein')
+    response, _ = api('GET', f'/calendar/room/klein.ics?key={key}', auth=False)
+    assert response.status == 200
+
+    for path in (f'/calendar/room/gross.ics?key={key}', f'/bookings?key={key}',
+                 '/calendar/room/klein.ics?key=0000', '/calendar/room/klein.ics'):
+        response, _ = api('GET', path, auth=False)
+        assert response.status == 401
+
+
+def test_feed_etag_answers_not_modified(api):
+    api('POST', '/bookings', _booking(_next_weekday(0)))
+    path = f"/calendar/user/anna.ics?key={feed_key(TOKEN, 'user', 'anna')}"
+    response, body = api('GET', path, auth=False)
+    etag = response.getheader('ETag')
+    assert response.status == 200 and etag and b'BEGIN:VEVENT' in body
+
+    response, body = api('GET', path, headers={'If-None-Match': etag}, auth=False)
+    assert response.status == 304 and body == b''
+
+    response, body = api('HEAD', path, auth=False)
+    assert response.status == 200 and response.getheader('ETag') == etag and body == b''
+
+    # A new booking changes the feed and its ETag
+    api('POST', '/bookings', _booking(_next_weekday(1)))
+    response, _ = api('GET', path, headers={'If-None-Match': etag}, auth=False)
+    assert response.status == 200 and response.getheader('ETag') != etag
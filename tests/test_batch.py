@@ -0,0 +1,58 @@
+"""
+BIIS Desk Booking System - Tests: Batch Cancellation Undo
+Author: [Your Name]
+Date: [Date]
+Description: plan_restore against bookings made after the cancellation
+"""
+
+from datetime import date
+
+from booking_core.batch import plan_cancellations, plan_restore
+from booking_core.counters import OccupancyCounters
+from booking_core.rules import build_booking, get_booking_key
+from booking_core.slots import combine_booking, occupant_ids
+
+DAY = date(2026, 11, 2)
+KEY = get_booking_key(DAY, 'klein', 1)
+
+
+def _cancel(bookings, user_id):
+    """Apply a cancellation of the user's bookings on DAY, returning its undo handle"""
+    plan = plan_cancellations(bookings, OccupancyCounters(bookings), user_id, DAY, DAY)
+    for booking_key, entry in plan.changes.items():
+        if entry is None:
+            del bookings[booking_key]
+        else:
+            bookings[booking_key] = entry
+    return plan.previous
+
+
+def test_restore_into_free_desk():
+    bookings = {KEY: build_booking(DAY, 'klein', 1, 'anna', 'full_day')}
+    previous = _cancel(bookings, 'anna')
+    assert KEY not in bookings
+
+    changes, conflicts = plan_restore(bookings, 'anna', previous)
+    assert conflicts == []
+    assert changes[KEY]['user_id'] == 'anna'
+
+
+def test_restore_keeps_other_half_of_shared_desk():
+    bookings = {KEY: combine_booking(build_booking(DAY, 'klein', 1, 'anna', 'half_am'),
+                                     build_booking(DAY, 'klein', 1, 'ben', 'half_pm'))}
+    previous = _cancel(bookings, 'anna')
+    assert occupant_ids(bookings[KEY]) == ['ben']
+
+    changes, conflicts = plan_restore(bookings, 'anna', previous)
+    assert conflicts == []
+    assert occupant_ids(changes[KEY]) == ['anna', 'ben']
+
+
+def test_maybe_booked_since_cancel_is_a_conflict():
+    bookings = {KEY: build_booking(DAY, 'klein', 1, 'anna', 'full_day')}
+    previous = _cancel(bookings, 'anna')
+    bookings[KEY] = build_booking(DAY, 'klein', 1, 'ben', 'maybe')
+
+    changes, conflicts = plan_restore(bookings, 'anna', previous)
+    assert conflicts == [KEY]
+    assert changes == {}
@@ -0,0 +1,86 @@
+"""
+BIIS Desk Booking System - Tests: Occupancy Counters
+Author: [Your Name]
+Date: [Date]
+Description: Free-desk figures of the counters against slot availability
+"""
+
+from datetime import date
+
+from booking_core.blockers import build_room_blocker, get_room_blocker_key
+from booking_core.counters import OccupancyCounters
+from booking_core.rules import ROOM_LAYOUT, build_booking, get_booking_key
+from booking_core.slots import combine_booking
+
+DAY = date(2026, 11, 2)
+DATE_KEY = DAY.isoformat()
+KLEIN_DESKS = ROOM_LAYOUT['klein']
+
+
+def _book(bookings, counters, desk_num, user_id, booking_type):
+    """Book a desk (sharing it with a half-day occupant) and record it in the counters"""
+    booking_key = get_booking_key(DAY, 'klein', desk_num)
+    old = bookings.get(booking_key)
+    new = combine_booking(old, build_booking(DAY, 'klein', desk_num, user_id, booking_type))
+    bookings[booking_key] = new
+    counters.replace(booking_key, old, new)
+
+
+def test_half_booked_desk_stays_free():
+    bookings = {}
+    counters = OccupancyCounters(bookings)
+    _book(bookings, counters, 1, 'anna', 'half_am')
+    assert counters.free_desks(DATE_KEY, 'klein') == (KLEIN_DESKS, KLEIN_DESKS)
+
+    # The afternoon taken by a second booker: the shared desk is fully booked
+    _book(bookings, counters, 1, 'ben', 'half_pm')
+    assert counters.booked_desks(DATE_KEY, 'klein') == 1
+    assert counters.free_desks(DATE_KEY, 'klein') == (KLEIN_DESKS - 1, KLEIN_DESKS)
+
+
+def test_half_booked_desk_next_to_a_blocker_of_the_other_half():
+    bookings = {}
+    counters = OccupancyCounters(bookings)
+    _book(bookings, counters, 1, 'anna', 'half_pm')
+    _book(bookings, counters, 2, 'ben', 'half_am')
+
+    blocker_key = get_room_blocker_key(DAY, 'klein')
+    blocker = build_room_blocker(DAY, 'klein', 'anna', 'morning')
+    bookings[blocker_key] = blocker
+    counters.replace(blocker_key, None, blocker)
+
+    # Desk 1 has no slot left (AM blocked, PM booked); desk 2's afternoon is still free
+    assert counters.free_desks(DATE_KEY, 'klein') == (KLEIN_DESKS - 1, KLEIN_DESKS)
+
+
+def test_counters_built_from_existing_bookings_match_incremental_updates():
+    bookings = {}
+    counters = OccupancyCounters(bookings)
+    _book(bookings, counters, 1, 'anna', 'half_am')
+    _book(bookings, counters, 2, 'ben', 'full_day')
+    assert OccupancyCounters(bookings).free_desks(DATE_KEY) == counters.free_desks(DATE_KEY)
+
+
+def test_user_aggregates_follow_mutations():
+    bookings = {}
+    counters = OccupancyCounters(bookings)
+    _book(bookings, counters, 1, 'anna', 'half_am')
+    _book(bookings, counters, 1, 'ben', 'half_pm')
+    _book(bookings, counters, 2, 'anna', 'maybe')
+
+    assert counters.user_total('anna') == 2
+    assert counters.user_type_counts('anna') == {'half_am': 1, 'maybe': 1}
+    assert counters.user_split('anna', DATE_KEY) == (2, 0)
+
+    # The cutoff moves forward and back again
+    next_day = date.fromordinal(DAY.toordinal() + 1).isoformat()
+    assert counters.user_split('anna', next_day) == (0, 2)
+    assert counters.user_split('ben', DATE_KEY) == (1, 0)
+
+    # Bookings changed after the cutoff moved land on the right side
+    counters.user_split('anna', next_day)
+    booking_key = get_booking_key(DAY, 'klein', 2)
+    counters.replace(booking_key, bookings.pop(booking_key), None)
+    assert counters.user_total('anna') == 1
+    assert counters.user_split('anna', next_day) == (0, 1)
+    assert counters.user_split('anna', DATE_KEY) == (1, 0)
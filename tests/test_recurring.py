@@ -0,0 +1,58 @@
+"""
+BIIS Desk Booking System - Tests: Recurring Room Blockers
+Author: [Your Name]
+Date: [Date]
+Description: Conflicts of a new rule with one-off blockers and other rules
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from booking_core.blockers import build_room_blocker, get_room_blocker_key
+from booking_core.counters import OccupancyCounters
+from booking_core.recurring import build_blocker_rule, rule_conflicts
+
+START = date(2026, 11, 2)  # Monday
+LATER = START + timedelta(weeks=3)
+
+
+def _rule(start_time='09:00', end_time='10:00', **fields):
+    rule = build_blocker_rule('klein', 'anna', 'custom', 'weekly', START, None, start_time, end_time)
+    rule.update(fields)
+    return rule
+
+
+@pytest.mark.parametrize('indexed', [False, True])
+def test_one_off_blocker_on_later_occurrence(indexed):
+    bookings = {get_room_blocker_key(LATER, 'klein'): build_room_blocker(
+        LATER, 'klein', 'ben', 'custom', '09:30', '11:00')}
+    counters = OccupancyCounters(bookings) if indexed else None
+
+    assert rule_conflicts(bookings, {}, _rule(), counters) == [LATER]
+    assert rule_conflicts(bookings, {}, _rule('10:00', '11:00'), counters) == [LATER]
+    assert rule_conflicts(bookings, {}, _rule('13:00', '14:00'), counters) == []
+
+
+def test_other_rule_conflicts_from_its_first_date():
+    other = build_blocker_rule('klein', 'ben', 'custom', 'biweekly', LATER, None, '09:00', '12:00')
+    conflicts = rule_conflicts({}, {'other': other}, _rule(), OccupancyCounters({}))
+    assert conflicts[:2] == [LATER, LATER + timedelta(weeks=2)]
+
+    # Other room, or a window that does not overlap
+    assert rule_conflicts({}, {'other': {**other, 'room': 'gross'}}, _rule(), None) == []
+    assert rule_conflicts({}, {'other': other}, _rule('12:00', '13:00'), None) == []
+
+
+def test_unreadable_dates_give_no_conflicts():
+    assert rule_conflicts({}, {}, _rule(end_date='31.12.2026')) == []
+    assert rule_conflicts({}, {}, _rule(start_date=None)) == []
+
+
+@pytest.mark.parametrize('indexed', [False, True])
+def test_open_ended_rule_checked_up_to_last_blocker(indexed):
+    far = START + timedelta(weeks=80)
+    bookings = {get_room_blocker_key(far, 'klein'): build_room_blocker(far, 'klein', 'ben', 'full_day')}
+    counters = OccupancyCounters(bookings) if indexed else None
+    assert rule_conflicts(bookings, {}, _rule(), counters) == [far]
+    assert rule_conflicts(bookings, {}, _rule(end_date=(far - timedelta(days=1)).isoformat()), counters) == []
@@ -0,0 +1,32 @@
+"""
+BIIS Desk Booking System - Tests: Half-Day Slots
+Author: [Your Name]
+Date: [Date]
+Description: Slot masks of booking types and blocker time windows
+"""
+
+from booking_core.intervals import blocker_window
+from booking_core.slots import SLOT_ALL, SLOT_AM, SLOT_PM, time_window_slots
+
+
+def test_padded_windows_map_to_their_slots():
+    assert time_window_slots('09:00', '10:00') == SLOT_AM
+    assert time_window_slots('13:00', '17:00') == SLOT_PM
+    assert time_window_slots('11:00', '13:00') == SLOT_ALL
+    assert time_window_slots(None, '12:00') == SLOT_AM
+    assert time_window_slots('12:00', None) == SLOT_PM
+
+
+def test_unpadded_hour_is_parsed_like_the_interval_index():
+    # '9:00' is not HH:MM: the interval index blocks the whole day, and so must the slots
+    blocker = {'start_time': '9:00', 'end_time': '10:00'}
+    assert blocker_window(blocker) == (0, 24 * 60)
+    assert time_window_slots('9:00', '10:00') == SLOT_ALL
+    assert time_window_slots('09:00', '9:30') == SLOT_ALL
+    # Compared as text, '8:00'-'9:00' overlapped no slot at all and freed the room
+    assert time_window_slots('8:00', '9:00') == SLOT_ALL
+
+
+def test_inverted_or_unreadable_windows_cover_the_whole_day():
+    assert time_window_slots('10:00', '09:00') == SLOT_ALL
+    assert time_window_slots('abc', '10:00') == SLOT_ALL
@@ -0,0 +1,40 @@
+"""
+BIIS Desk Booking System - Tests: Warm-Start Snapshot
+Author: [Your Name]
+Date: [Date]
+Description: The snapshot is refreshed after writes so restarts stay warm
+"""
+
+import os
+from datetime import date, timedelta
+
+from booking_core.rules import get_booking_key
+from booking_core.snapshot import SNAPSHOT_FILE, flush_snapshots, load_data_warm
+from booking_core.store import BookingStore, save_data_files
+
+
+def _next_workday() -> date:
+    day = date.today() + timedelta(days=7)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+def test_snapshot_stays_warm_after_write(tmp_path):
+    data_dir = str(tmp_path)
+    save_data_files({'anna': {'username': 'anna'}}, {}, {}, data_dir)
+    flush_snapshots()
+    os.remove(os.path.join(data_dir, SNAPSHOT_FILE))
+
+    assert load_data_warm(data_dir)['warm'] is False
+    assert load_data_warm(data_dir)['warm'] is True
+
+    day = _next_workday()
+    BookingStore(data_dir).create_booking(day, 'klein', 1, 'anna', 'full_day')
+    flush_snapshots()
+
+    data = load_data_warm(data_dir)
+    assert data['warm'] is True
+    booking_key = get_booking_key(day, 'klein', 1)
+    assert data['bookings'][booking_key]['user_id'] == 'anna'
+    assert data['counters'].booked_desks(day.isoformat(), 'klein') == 1
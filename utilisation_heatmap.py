@@ -0,0 +1,295 @@
+"""
+BIIS Desk Booking System - Utilisation Heatmap
+Author: [Your Name]
+Date: [Date]
+Description: Precomputed NumPy utilisation grids for desk heatmaps
+
+DESIGN:
+- One pass over the bookings builds a desks x days grid (weights + occupants)
+- The grid is cached per session and keyed by the booking data version
+- Changing the viewed date range only slices the cached grid
+- Weekday and calendar views are reductions over the slice
+
+INDEX:
+1. IMPORTS & CONSTANTS
+2. UTILISATION GRID
+3. CACHED SESSION ACCESS
+4. HTML RENDERING
+"""
+
+# ============================================================================
+# 1. IMPORTS & CONSTANTS
+# ============================================================================
+
+import calendar
+from datetime import date, datetime
+from typing import Dict, Any, Optional, Iterable, List, Tuple
+
+import numpy as np
+
+from booking_core.rules import ROOM_LAYOUT, BOOKING_TYPE_WEIGHTS
+from booking_core.slots import occupants as desk_occupants
+
+WEEKDAY_LABELS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri']
+
+# Base colour for utilisation shading (BIIS green)
+HEAT_RGB = (102, 180, 70)
+
+
+# ============================================================================
+# 2. UTILISATION GRID
+# ============================================================================
+
+class UtilisationGrid:
+    """Desks x days matrix of utilisation weights and occupant codes"""
+
+    def __init__(self, bookings: Dict[str, Any], version: int = 0):
+        self.version = version
+        self.desks = [(room, desk) for room, count in ROOM_LAYOUT.items() for desk in range(1, count + 1)]
+        desk_index = {desk: i for i, desk in enumerate(self.desks)}
+
+        self.user_ids: List[str] = []
+        user_index: Dict[str, int] = {}
+        rows, ordinals, weights, occupants = [], [], [], []
+
+        # Single pass over the bookings - everything else works on the arrays
+        for booking in bookings.values():
+            if booking.get('entry_type') == 'room_blocker':
+                continue
+            row = desk_index.get((booking.get('room'), booking.get('desk_num')))
+            if row is None:
+                continue
+            try:
+                ordinal = datetime.strptime(booking['date'], '%Y-%m-%d').toordinal()
+            except (KeyError, ValueError):
+                continue
+
+            # Both halves of a shared desk add their weight; the PM occupant is shown
+            for occupant in desk_occupants(booking):
+                user_id = occupant.get('user_id')
+                if user_id == 'DELETED_USER':
+                    user_id = occupant.get('original_user_id', user_id)
+                if user_id not in user_index:
+                    user_index[user_id] = len(self.user_ids)
+                    self.user_ids.append(user_id)
+
+                rows.append(row)
+                ordinals.append(ordinal)
+                weights.append(BOOKING_TYPE_WEIGHTS.get(occupant.get('booking_type'), 1.0))
+                occupants.append(user_index[user_id])
+
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        self.first_ordinal = int(ordinals.min()) if len(ordinals) else date.today().toordinal()
+        n_days = int(ordinals.max()) - self.first_ordinal + 1 if len(ordinals) else 0
+
+        self.utilisation = np.zeros((len(self.desks), n_days), dtype=np.float32)
+        self.occupants = np.full((len(self.desks), n_days), -1, dtype=np.int32)
+        if n_days:
+            columns = ordinals - self.first_ordinal
+            np.add.at(self.utilisation, (rows, columns), weights)
+            np.minimum(self.utilisation, 1.0, out=self.utilisation)
+            self.occupants[rows, columns] = occupants
+
+    def range_view(
+        self,
+        start: date,
+        end: date,
+        holidays: Optional[Iterable[str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Slice the grid to the workdays of an inclusive date range.
+
+        Days outside the precomputed grid count as unbooked.
+
+        Args:
+            start: First date of the range
+            end: Last date of the range
+            holidays: Iterable of 'YYYY-MM-DD' holiday keys to skip (optional)
+
+        Returns:
+            Tuple of (day ordinals, utilisation desks x days, occupants desks x days)
+        """
+        ordinals = np.arange(start.toordinal(), end.toordinal() + 1)
+        ordinals = ordinals[(ordinals - 1) % 7 < 5]
+        if holidays:
+            holiday_ordinals = [datetime.strptime(key, '%Y-%m-%d').toordinal() for key in holidays]
+            ordinals = ordinals[~np.isin(ordinals, holiday_ordinals)]
+
+        columns = ordinals - self.first_ordinal
+        inside = (columns >= 0) & (columns < self.utilisation.shape[1])
+
+        values = np.zeros((len(self.desks), len(ordinals)), dtype=np.float32)
+        occupants = np.full((len(self.desks), len(ordinals)), -1, dtype=np.int32)
+        values[:, inside] = self.utilisation[:, columns[inside]]
+        occupants[:, inside] = self.occupants[:, columns[inside]]
+        return ordinals, values, occupants
+
+    def weekday_matrix(self, start: date, end: date, holidays: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Mean utilisation per desk and weekday over a date range.
+
+        Returns:
+            Array of shape (desks, 5) with values between 0 and 1
+        """
+        ordinals, values, _ = self.range_view(start, end, holidays)
+        weekday_onehot = np.eye(5, dtype=np.float32)[(ordinals - 1) % 7]
+        days_per_weekday = np.maximum(weekday_onehot.sum(axis=0), 1)
+        return (values @ weekday_onehot) / days_per_weekday
+
+    def dominant_users(self, start: date, end: date, holidays: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Most frequent occupant per desk and weekday over a date range.
+
+        Returns:
+            Array of shape (desks, 5) with indexes into user_ids (-1 when unused)
+        """
+        ordinals, _, occupants = self.range_view(start, end, holidays)
+        n_users = max(len(self.user_ids), 1)
+        weekdays = np.broadcast_to((ordinals - 1) % 7, occupants.shape)
+        desk_rows = np.broadcast_to(np.arange(len(self.desks))[:, None], occupants.shape)
+
+        booked = occupants >= 0
+        codes = (desk_rows[booked] * 5 + weekdays[booked]) * n_users + occupants[booked]
+        counts = np.bincount(codes, minlength=len(self.desks) * 5 * n_users)
+        counts = counts.reshape(len(self.desks), 5, n_users)
+
+        dominant = counts.argmax(axis=2).astype(np.int32)
+        dominant[counts.max(axis=2) == 0] = -1
+        return dominant
+
+    def daily_utilisation(self, start: date, end: date) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Office-wide utilisation per workday over a date range.
+
+        Returns:
+            Tuple of (day ordinals, mean utilisation across all desks)
+        """
+        ordinals, values, _ = self.range_view(start, end)
+        return ordinals, values.mean(axis=0)
+
+
+# ============================================================================
+# 3. CACHED SESSION ACCESS
+# ============================================================================
+
+def get_session_grid() -> UtilisationGrid:
+    """
+    Return the session's utilisation grid, rebuilding it only when the
+    booking data version has changed.
+    """
+    # Import streamlit only when needed to keep this module UI-free
+    import streamlit as st
+    from booking_aggregates import get_session_counters
+
+    version = get_session_counters().version
+    grid = st.session_state.get('utilisation_grid')
+    if grid is None or grid.version != version:
+        grid = UtilisationGrid(st.session_state.bookings, version)
+        st.session_state.utilisation_grid = grid
+    return grid
+
+
+# ============================================================================
+# 4. HTML RENDERING
+# ============================================================================
+
+def _hex_to_rgb(color: str) -> Tuple[int, int, int]:
+    """Convert '#RRGGBB' to an RGB tuple, falling back to the heat colour"""
+    try:
+        color = color.lstrip('#')
+        return int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16)
+    except (AttributeError, ValueError, IndexError):
+        return HEAT_RGB
+
+
+def _cell(value: float, rgb: Tuple[int, int, int] = HEAT_RGB, label: Optional[str] = None) -> str:
+    """Render one heatmap cell with opacity proportional to utilisation"""
+    alpha = 0.08 + 0.92 * float(value)
+    text = label if label is not None else f"{value:.0%}"
+    return (f'<td class="heatmap-cell" style="background-color: rgba({rgb[0]}, {rgb[1]}, {rgb[2]}, {alpha:.2f});">'
+            f'{text}</td>')
+
+
+def render_weekday_heatmap(
+    grid: UtilisationGrid,
+    start: date,
+    end: date,
+    desk_names: Dict[str, str],
+    users: Dict[str, Any],
+    holidays: Optional[Iterable[str]] = None,
+    color_by_user: bool = False
+) -> str:
+    """
+    Render a desks x weekdays heatmap table as HTML.
+
+    Args:
+        grid: Precomputed utilisation grid
+        start: First date of the range
+        end: Last date of the range
+        desk_names: Desk name mappings
+        users: User data dictionary (for user colours)
+        holidays: Holiday keys to skip (optional)
+        color_by_user: Shade cells with the most frequent occupant's colour
+
+    Returns:
+        HTML table markup
+    """
+    matrix = grid.weekday_matrix(start, end, holidays)
+    dominant = grid.dominant_users(start, end, holidays) if color_by_user else None
+
+    header = ''.join(f'<th>{label}</th>' for label in WEEKDAY_LABELS)
+    rows_html = []
+    for row, (room, desk_num) in enumerate(grid.desks):
+        desk_label = desk_names.get(f"{room}_{desk_num}", f"Desk {desk_num}")
+        cells = []
+        for weekday in range(5):
+            value = matrix[row, weekday]
+            if dominant is not None and dominant[row, weekday] >= 0:
+                user_id = grid.user_ids[dominant[row, weekday]]
+                user_data = users.get(user_id, {})
+                rgb = _hex_to_rgb(user_data.get('color', '#666666'))
+                cells.append(_cell(value, rgb, f"{user_data.get('username', '📋')} {value:.0%}"))
+            else:
+                cells.append(_cell(value))
+        room_label = "Klein" if room == "klein" else "Gross"
+        rows_html.append(f'<tr><th>{room_label} · {desk_label}</th>{"".join(cells)}</tr>')
+
+    return f'<table class="heatmap-table"><tr><th></th>{header}</tr>{"".join(rows_html)}</table>'
+
+
+def render_month_calendars(grid: UtilisationGrid, start: date, end: date) -> List[Tuple[str, str]]:
+    """
+    Render one Monday-Friday calendar table per month in the range.
+
+    Args:
+        grid: Precomputed utilisation grid
+        start: First date of the range
+        end: Last date of the range
+
+    Returns:
+        List of (month title, HTML table markup)
+    """
+    ordinals, daily = grid.daily_utilisation(start, end)
+    by_ordinal = dict(zip(ordinals.tolist(), daily.tolist()))
+
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        header = ''.join(f'<th>{label}</th>' for label in WEEKDAY_LABELS)
+        weeks_html = []
+        for week in calendar.Calendar().monthdatescalendar(year, month):
+            cells = []
+            for day in week[:5]:
+                ordinal = day.toordinal()
+                if day.month != month or ordinal not in by_ordinal:
+                    cells.append('<td class="heatmap-cell heatmap-empty"></td>')
+                else:
+                    cells.append(_cell(by_ordinal[ordinal], label=f"{day.day}"))
+            weeks_html.append(f'<tr>{"".join(cells)}</tr>')
+
+        title = date(year, month, 1).strftime('%B %Y')
+        months.append((title, f'<table class="heatmap-table"><tr>{header}</tr>{"".join(weeks_html)}</table>'))
+
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    return months